@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+AE300 .ae3 Dump Ingestion
+=========================
+Streams raw AE300 ECU data-logger dumps (data/ECU/DataLog_*.ae3) straight
+into per-session columnar NumPy arrays, with no intermediate AustroView CSV
+export and no dependency on a ../AustroView/Data/Parsed checkout.
+
+The .ae3 format is encrypted, so the decoding itself is pluggable. A
+decoder is any callable
+
+    decoder(path) -> iterable of (session_number, chunk)
+
+where chunk is a dict of equal-length arrays for consecutive records of
+that session:
+
+    "t"      record time, epoch seconds (ECU clock)       required
+    "volts"  channel 808, Battery Voltage [V]             required
+    "rpm"    engine speed [rpm]                           optional
+
+Chunks of one session may be interleaved with other sessions'; they are
+appended in arrival order, so a decoder can stream records straight off
+the dump without buffering. Decoders are selected by name (register_decoder)
+or by a "module:function" spec, from --decoder or the VOLTS_AE3_DECODER
+environment variable; a sibling ../AustroView checkout is put on the import
+path so its decoder can be named directly.
+
+Each dump is decoded once: the session arrays are stored through the parse
+cache (data/cache/ae3_sessions/), keyed by the dump's size/mtime and the
+decoder spec.
+
+Usage:
+    python ae3_ingest.py --decoder mydecoder:iter_records
+    VOLTS_AE3_DECODER=mydecoder:iter_records python ae3_ingest.py --ecu data/ECU
+"""
+
+import argparse
+import importlib
+import io
+import os
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from ecu_catalog import cruise_stats
+from flight_store import epoch_to_datetime
+from logio import glob_logs
+from parse_cache import cached_arrays, disable_cache
+
+if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+SCRIPT_DIR = Path(__file__).parent
+AE3_DIR = SCRIPT_DIR / "data" / "ECU"
+AUSTROVIEW_DIR = SCRIPT_DIR / ".." / "AustroView"
+DECODER_ENV = "VOLTS_AE3_DECODER"
+AE3_CACHE_VERSION = 1
+AE3_CHANNELS = ("t", "volts", "rpm")
+
+DECODERS = {}
+
+Ae3Session = namedtuple("Ae3Session", "number start end path t volts rpm")
+
+
+class DecoderUnavailable(RuntimeError):
+    """No .ae3 decoder is configured or the configured one cannot be loaded."""
+
+
+def register_decoder(name, decoder):
+    """Make decoder(path) selectable as --decoder NAME."""
+    DECODERS[name] = decoder
+
+
+def resolve_decoder(spec=None):
+    """(spec, decoder callable) for a registered name or "module:function" spec.
+
+    spec defaults to $VOLTS_AE3_DECODER. Raises DecoderUnavailable with an
+    explanation if nothing is configured or the spec cannot be imported.
+    """
+    spec = spec or os.environ.get(DECODER_ENV)
+    if not spec:
+        raise DecoderUnavailable(
+            ".ae3 dumps are encrypted and this repository has no built-in decoder. "
+            f"Pass --decoder module:function or set {DECODER_ENV} to a callable "
+            "decoder(path) yielding (session_number, {'t', 'volts', 'rpm'}) chunks, "
+            "e.g. one wrapping the AustroView decoder.")
+    if spec in DECODERS:
+        return spec, DECODERS[spec]
+    module_name, _, func_name = spec.partition(":")
+    if not func_name:
+        raise DecoderUnavailable(f"Decoder spec {spec!r} is neither a registered name "
+                                 f"({', '.join(sorted(DECODERS)) or 'none registered'}) nor module:function")
+    if AUSTROVIEW_DIR.is_dir() and str(AUSTROVIEW_DIR) not in sys.path:
+        sys.path.append(str(AUSTROVIEW_DIR))
+    try:
+        decoder = getattr(importlib.import_module(module_name), func_name)
+    except (ImportError, AttributeError) as e:
+        raise DecoderUnavailable(f"Cannot load .ae3 decoder {spec!r}: {e}") from None
+    return spec, decoder
+
+
+# =============================================================================
+# Streaming decode into per-session columns
+# =============================================================================
+
+def decode_dump(path, decoder):
+    """Run decoder over one dump, appending chunks into per-session columns.
+
+    Returns a dict of flat arrays: session (numbers), offsets (session i is
+    rows offsets[i]:offsets[i + 1]) and one array per channel in
+    AE3_CHANNELS, rpm all-NaN where the decoder gave none.
+    """
+    chunks = {}
+    for number, chunk in decoder(path):
+        t = np.asarray(chunk["t"], dtype=np.float64)
+        volts = np.asarray(chunk["volts"], dtype=np.float64)
+        rpm = np.asarray(chunk["rpm"], dtype=np.float64) if chunk.get("rpm") is not None \
+            else np.full(len(t), np.nan)
+        if not (len(t) == len(volts) == len(rpm)):
+            raise ValueError(f"{Path(path).name}: session {number} chunk has unequal channel lengths")
+        parts = chunks.setdefault(int(number), {name: [] for name in AE3_CHANNELS})
+        parts["t"].append(t)
+        parts["volts"].append(volts)
+        parts["rpm"].append(rpm)
+
+    numbers = sorted(chunks)
+    columns = {name: [np.concatenate(chunks[n][name]) for n in numbers] for name in AE3_CHANNELS}
+    lengths = [len(c) for c in columns["t"]]
+    out = {
+        "session": np.array(numbers, dtype=np.int64),
+        "offsets": np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+    }
+    for name in AE3_CHANNELS:
+        out[name] = np.concatenate(columns[name]) if numbers else np.array([], dtype=np.float64)
+    return out
+
+
+def ingest_dump(path, decoder_spec=None):
+    """Per-session arrays of one .ae3 dump (see decode_dump), decoded once and cached."""
+    spec, decoder = resolve_decoder(decoder_spec)
+    return cached_arrays("ae3_sessions", path, lambda p: decode_dump(p, decoder),
+                         version=f"{AE3_CACHE_VERSION}|{spec}")
+
+
+def dump_sessions(path, arrays):
+    """Ae3Session tuples (array views, not copies) for one ingested dump."""
+    sessions = []
+    offsets = arrays["offsets"]
+    for i, number in enumerate(arrays["session"].tolist()):
+        rows = slice(offsets[i], offsets[i + 1])
+        t = arrays["t"][rows]
+        ok = ~np.isnan(t)
+        if not ok.any():
+            continue
+        sessions.append(Ae3Session(number, float(t[ok][0]), float(t[ok][-1]), Path(path), t,
+                                   arrays["volts"][rows], arrays["rpm"][rows]))
+    return sessions
+
+
+def ae3_sessions(ae3_dir=AE3_DIR, decoder_spec=None, utc_offset_s=0.0):
+    """All sessions in every dump under ae3_dir, one per engine run, by start time.
+
+    A session re-exported by several dumps is kept once, from the dump
+    holding the most records for it. Times are shifted by the ECU clock's
+    offset east of UTC. Raises DecoderUnavailable if dumps exist but no
+    decoder is configured.
+    """
+    dumps = glob_logs(ae3_dir, "*.ae3") if Path(ae3_dir).is_dir() else []
+    best = {}
+    for path in dumps:
+        for s in dump_sessions(path, ingest_dump(path, decoder_spec)):
+            key = (s.number, round(s.start))
+            if key not in best or len(s.t) > len(best[key].t):
+                best[key] = s
+    return sorted((s._replace(start=s.start - utc_offset_s, end=s.end - utc_offset_s,
+                              t=s.t - utc_offset_s) for s in best.values()),
+                  key=lambda s: s.start)
+
+
+def ae3_session_stats(ae3_dir=AE3_DIR, decoder_spec=None):
+    """Per-session cruise stats from the .ae3 dumps, in voltage_history.parse_ecu_sessions' format."""
+    out = []
+    for s in ae3_sessions(ae3_dir, decoder_spec):
+        rpm = s.rpm if not np.isnan(s.rpm).all() else None
+        st = cruise_stats(s.volts, rpm)
+        if st["mean"] is None:
+            continue
+        out.append({"date": epoch_to_datetime(s.start), "file": f"{s.path.name} session {s.number}",
+                    "mean": st["mean"], "std": st["std"], "min": st["min"], "n_cruise": st["n_cruise"]})
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode AE300 .ae3 dumps into cached per-session arrays")
+    parser.add_argument("--ecu", default=str(AE3_DIR), help="Directory of .ae3 dumps (default: data/ECU)")
+    parser.add_argument("--decoder", default=None,
+                        help=f"Decoder name or module:function (default: ${DECODER_ENV})")
+    parser.add_argument("--no-cache", action="store_true", help="Decode again, bypassing data/cache/")
+    args = parser.parse_args()
+    if args.no_cache:
+        disable_cache()
+
+    dumps = glob_logs(args.ecu, "*.ae3") if Path(args.ecu).is_dir() else []
+    if not dumps:
+        print(f"No .ae3 dumps found in {args.ecu}")
+        sys.exit(1)
+    try:
+        sessions = ae3_sessions(args.ecu, args.decoder)
+    except DecoderUnavailable as e:
+        print(f"{len(dumps)} .ae3 dumps in {args.ecu}, but they cannot be decoded:\n  {e}")
+        sys.exit(2)
+
+    print(f"{len(dumps)} dumps, {len(sessions)} sessions\n")
+    print(f"{'Session':>7}  {'Start (ECU clock)':<19} {'Min':>5} {'Records':>8} {'Mean V':>7} {'Min V':>6}  Dump")
+    print("-" * 80)
+    for s in sessions:
+        v = s.volts[s.volts > 0]
+        mean = f"{v.mean():>7.2f}" if len(v) else f"{'-':>7}"
+        vmin = f"{v.min():>6.2f}" if len(v) else f"{'-':>6}"
+        print(f"{s.number:>7}  {epoch_to_datetime(s.start):%Y-%m-%d %H:%M:%S} {(s.end - s.start) / 60:>5.0f} "
+              f"{len(s.t):>8} {mean} {vmin}  {s.path.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark Suite
+========================
+Times every analysis stage on synthetic inputs (synth_logs.py) at fleet
+and multi-day scales, and compares against a saved baseline:
+
+  Flight scales (1 .. 10,000 G1000 logs):
+    parse_g1000    voltage_analysis.parse_g1000 over every log
+    resample       resample_to_common against a 2 s reference series, per flight
+    compute_stats  voltage_analysis.compute_stats on each resampled pair
+    pettitt        voltage_history.pettitt_test over the per-flight means
+    plot           voltage_history.analyze_tail (all history PNGs)
+
+  VDL48 scales (minutes .. days of 2 s samples):
+    parse_vdl      voltage_analysis.parse_vdl
+    segment_vdl    voltage_analysis.segment_vdl
+
+  report           generate_report pipeline on the real data/ inputs
+                   (parse, segment, resample, stats, figures, HTML build)
+
+Each stage records wall time (best of --repeat runs, plus every run's
+time), rows processed, throughput and peak traced memory (one extra run
+under tracemalloc, so the timed runs carry no tracing overhead). A stage is
+only flagged as slower when the change exceeds both --tolerance and the
+run-to-run spread seen in either the baseline or the current runs. Synthetic inputs are generated once
+into the work directory and reused. The parse cache is bypassed, so parse
+timings are always cold.
+
+Usage:
+    python bench_pipeline.py                                   # quick: 1/10/100 flights, 15 min/1 h/8 h VDL
+    python bench_pipeline.py --flights 1 10 100 1000 10000 --vdl-hours 0.25 1 8 24 72
+    python bench_pipeline.py --stages parse_g1000 segment_vdl --baseline data/bench/baseline.json
+    python bench_pipeline.py --update-baseline data/bench/baseline.json
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import voltage_analysis as va
+from flight_table import FlightRecord, FlightTable
+from parse_cache import disable_cache
+from synth_logs import VDL_SAMPLE_S, FaultSpec, generate, vdl_text
+from voltage_history import analyze_tail, pettitt_test
+
+if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+WORK_DIR = Path(__file__).parent / "data" / "bench"
+BENCH_TAIL = "N0BENCH"
+BENCH_SEED = 1234
+RESULTS_VERSION = 1
+
+FLIGHT_STAGES = ("parse_g1000", "resample", "compute_stats", "pettitt", "plot")
+VDL_STAGES = ("parse_vdl", "segment_vdl")
+STAGES = FLIGHT_STAGES + VDL_STAGES + ("report",)
+
+
+# =============================================================================
+# Synthetic inputs
+# =============================================================================
+
+def flight_inputs(work_dir, n_flights, workers=None):
+    """Paths of n_flights synthetic G1000 logs, generating them on first use."""
+    root = work_dir / "g1000"
+    marker = root / "inputs.json"
+    info = json.loads(marker.read_text()) if marker.exists() else {}
+    if info.get("flights", 0) < n_flights or info.get("seed") != BENCH_SEED:
+        print(f"  generating {n_flights} synthetic flights into {root} ...")
+        t0 = time.perf_counter()
+        generate(root, n_flights, (BENCH_TAIL,), FaultSpec(), BENCH_SEED, workers=workers)
+        marker.write_text(json.dumps({"flights": n_flights, "seed": BENCH_SEED}))
+        print(f"  ... {time.perf_counter() - t0:.1f} s")
+    return sorted((root / BENCH_TAIL).glob("log_*.csv"))[:n_flights]
+
+
+def vdl_trace(seconds, rng):
+    """Flight / engine-off idle / flight / disconnected voltage trace at 2 s."""
+    n = max(int(seconds / VDL_SAMPLE_S), 200)
+    f1, idle, f2 = int(n * 0.4), int(n * 0.2), int(n * 0.35)
+    idle_v = 25.4 + 1.0 * np.exp(-np.arange(idle) / max(idle / 4, 1))
+    v = np.concatenate([np.full(f1, 28.0), idle_v, np.full(f2, 28.0), np.zeros(n - f1 - idle - f2)])
+    return np.where(v > 0, v + rng.normal(0, 0.03, n), 0.0)
+
+
+def vdl_input(work_dir, hours):
+    path = work_dir / "vdl" / f"LOG_VD_{hours:g}h.CSV"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        volts = vdl_trace(hours * 3600, np.random.default_rng([BENCH_SEED, int(hours * 3600)]))
+        t = np.arange(len(volts)) * float(VDL_SAMPLE_S)
+        path.write_bytes(vdl_text(t, volts, datetime(2019, 3, 1, 1, 28, 59)).encode("utf-8"))
+    return path
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+def max_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def measure(stage, scale, fn, repeat):
+    """Time fn() (best of repeat) and trace its peak allocation; fn returns rows processed."""
+    times = []
+    rows = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            gc.collect()
+            t0 = time.perf_counter()
+            rows = fn()
+            times.append(time.perf_counter() - t0)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    best = min(times)
+    result = {
+        "stage": stage, "scale": scale, "rows": int(rows), "seconds": best, "times": times,
+        "rows_per_s": rows / best if best > 0 else None,
+        "peak_mb": peak / 1e6, "max_rss_mb": max_rss_mb(),
+    }
+    print(f"  {stage:<14} {scale:>12} {rows:>12,} rows {best:>9.3f} s "
+          f"{result['rows_per_s'] or 0:>14,.0f} rows/s {result['peak_mb']:>9.1f} MB")
+    return result
+
+
+def _stats_from_parse(fpath, times, volts):
+    """Per-flight FlightRecord like voltage_history.flight_stats (plot input only)."""
+    cruise = volts[volts > 25.0]
+    cruise = cruise if len(cruise) else volts
+    return FlightRecord(
+        tail=BENCH_TAIL, date=times[0], file=fpath.name, n_samples=len(volts), n_cruise=len(cruise),
+        mean=float(np.mean(cruise)), median=float(np.median(cruise)), std=float(np.std(cruise)),
+        min=float(np.min(volts)), max=float(np.max(cruise)),
+        pct_below_26=float(np.mean(cruise < 26.0) * 100), n_below_255=int(np.sum(volts < 25.5)),
+    )
+
+
+def bench_flights(work_dir, n, stages, repeat, workers):
+    files = flight_inputs(work_dir, n, workers)
+    scale = f"{n} flights"
+    results = []
+    parsed = [va.parse_g1000(f) for f in files]
+    n_rows = sum(len(v) for _, v in parsed)
+
+    if "parse_g1000" in stages:
+        results.append(measure("parse_g1000", scale,
+                               lambda: sum(len(va.parse_g1000(f)[1]) for f in files), repeat))
+
+    # 2 s reference series standing in for the VDL48, offset by +1.2 V
+    refs = [(t[::2], v[::2] + 1.2) for t, v in parsed]
+    resampled = [va.resample_to_common(t, v, rt, rv) for (t, v), (rt, rv) in zip(parsed, refs)]
+    if "resample" in stages:
+        def run():
+            return sum(len(va.resample_to_common(t, v, rt, rv)[0])
+                       for (t, v), (rt, rv) in zip(parsed, refs))
+        results.append(measure("resample", scale, run, repeat))
+
+    if "compute_stats" in stages:
+        def run():
+            for i, (_, g, v) in enumerate(resampled):
+                va.compute_stats(g, v, f"Flight {i}")
+            return sum(len(g) for _, g, _ in resampled)
+        results.append(measure("compute_stats", scale, run, repeat))
+
+    flights = FlightTable.from_records(_stats_from_parse(f, t, v) for f, (t, v) in zip(files, parsed))
+    means = flights.mean
+    if "pettitt" in stages and n >= 2:
+        results.append(measure("pettitt", scale, lambda: len(pettitt_test(means)[3]), repeat))
+
+    if "plot" in stages and n >= 2:
+        out_dir = work_dir / "plots"
+        out_dir.mkdir(exist_ok=True)
+        def run():
+            analyze_tail(BENCH_TAIL, flights, out_dir)
+            return n_rows
+        results.append(measure("plot", scale, run, repeat))
+    return results
+
+
+def bench_vdl(work_dir, hours, stages, repeat):
+    path = vdl_input(work_dir, hours)
+    scale = f"{hours:g} h VDL"
+    results = []
+    if "parse_vdl" in stages:
+        results.append(measure("parse_vdl", scale, lambda: len(va.parse_vdl(path)[1]), repeat))
+    if "segment_vdl" in stages:
+        _, volts = va.parse_vdl(path)
+        def run():
+            va.segment_vdl(volts)
+            return len(volts)
+        results.append(measure("segment_vdl", scale, run, repeat))
+    return results
+
+
+def bench_report(repeat):
+    import generate_report as gr
+
+    def run():
+        g1_t, g1_v = gr.parse_g1000(gr.FLIGHT1_CSV)
+        g2_t, g2_v = gr.parse_g1000(gr.FLIGHT2_CSV)
+        sample_s, vv = gr.parse_vdl(gr.VDL_CSV)
+        seg1, idle, seg2 = gr.segment_vdl(vv)
+        c1, g1r, v1r = gr.resample_to_common(g1_t, g1_v, gr.align_vdl_to_g1000(g1_t, sample_s, seg1),
+                                             vv[seg1[0]:seg1[1]])
+        c2, g2r, v2r = gr.resample_to_common(g2_t, g2_v, gr.align_vdl_to_g1000(g2_t, sample_s, seg2),
+                                             vv[seg2[0]:seg2[1]])
+        s1, s2 = gr.compute_stats(g1r, v1r), gr.compute_stats(g2r, v2r)
+        sc = gr.compute_stats(np.concatenate([g1r, g2r]), np.concatenate([v1r, v2r]))
+        ctx = gr.report_context(gr.DEFAULT_INVESTIGATION, g1_t, g2_t, vv, idle)
+        html = gr.build_html(ctx, {
+            "overview": lambda: gr.make_vdl_overview(sample_s, vv, seg1, idle, seg2),
+            "comparison": lambda: gr.make_flight_comparison(c1, g1r, v1r, c2, g2r, v2r),
+            "hist": lambda: gr.make_histograms(s1["diff"], s2["diff"]),
+            "scatter": lambda: gr.make_scatter(g1r, v1r, g2r, v2r),
+        }, s1, s2, sc)
+        assert html
+        return len(g1_v) + len(g2_v) + len(vv)
+    return [measure("report", "data/ inputs", run, repeat)]
+
+
+# =============================================================================
+# Results and baseline comparison
+# =============================================================================
+
+def git_commit():
+    head = Path(__file__).parent / ".git" / "HEAD"
+    try:
+        ref = head.read_text().strip()
+        if ref.startswith("ref: "):
+            return (head.parent / ref[5:]).read_text().strip()[:12]
+        return ref[:12]
+    except OSError:
+        return None
+
+
+def results_doc(results):
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(), "python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "cpu_count": os.cpu_count(),
+        },
+        "results": {f"{r['stage']}|{r['scale']}": r for r in results},
+    }
+
+
+def noise(r):
+    """Relative run-to-run spread of one result ((slowest - fastest) / fastest)."""
+    times = r.get("times") or [r["seconds"]]
+    return (max(times) - min(times)) / min(times) if min(times) > 0 else 0.0
+
+
+def compare(current, baseline, tolerance):
+    """Print time and memory ratios vs baseline. Returns the number of regressions.
+
+    Time changes count only beyond max(tolerance, the repeat spread of either run).
+    """
+    print(f"\nComparison vs baseline ({baseline['meta'].get('commit')}, "
+          f"{baseline['meta'].get('timestamp')}), tolerance {tolerance:.0%}:")
+    print(f"  {'Stage':<14} {'Scale':>12} {'Base s':>9} {'Now s':>9} {'Time':>7} {'Noise':>7} {'Mem':>7}")
+    regressions = 0
+    for key, r in current["results"].items():
+        b = baseline["results"].get(key)
+        if b is None:
+            print(f"  {r['stage']:<14} {r['scale']:>12}  (no baseline)")
+            continue
+        t_ratio = r["seconds"] / b["seconds"] if b["seconds"] > 0 else float("nan")
+        # Sub-megabyte peaks are allocator noise, not a memory trend
+        m_ratio = r["peak_mb"] / b["peak_mb"] if b["peak_mb"] >= 1.0 else float("nan")
+        band = max(tolerance, noise(r), noise(b))
+        flag = ""
+        if t_ratio > 1 + band or m_ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif t_ratio < 1 - band:
+            flag = "  faster"
+        print(f"  {r['stage']:<14} {r['scale']:>12} {b['seconds']:>9.3f} {r['seconds']:>9.3f} "
+              f"{t_ratio:>6.2f}x {band:>6.0%} {m_ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on synthetic inputs")
+    parser.add_argument("--flights", type=int, nargs="+", default=[1, 10, 100],
+                        help="Flight counts to benchmark (default: 1 10 100)")
+    parser.add_argument("--vdl-hours", type=float, nargs="+", default=[0.25, 1, 8],
+                        help="VDL48 recording lengths in hours (default: 0.25 1 8)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the best is kept")
+    parser.add_argument("--work-dir", default=str(WORK_DIR), help="Synthetic inputs and plot scratch space")
+    parser.add_argument("--output", default=None, help="Results JSON (default: <work-dir>/results.json)")
+    parser.add_argument("--baseline", default=None, help="Compare against this results JSON")
+    parser.add_argument("--update-baseline", default=None, metavar="PATH",
+                        help="Also save these results as the new baseline at PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Minimum slowdown / memory growth flagged as a regression; time is also "
+                             "held to the repeat spread of both runs (default: 0.25)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for input generation")
+    args = parser.parse_args()
+
+    disable_cache()
+    work_dir = Path(args.work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    stages = set(args.stages)
+    results = []
+
+    print(f"Benchmarking {', '.join(s for s in STAGES if s in stages)} (best of {args.repeat})\n")
+    if stages & set(FLIGHT_STAGES):
+        flight_inputs(work_dir, max(args.flights), args.workers)
+        for n in sorted(args.flights):
+            results += bench_flights(work_dir, n, stages, args.repeat, args.workers)
+    if stages & set(VDL_STAGES):
+        for hours in sorted(args.vdl_hours):
+            results += bench_vdl(work_dir, hours, stages, args.repeat)
+    if "report" in stages:
+        results += bench_report(args.repeat)
+
+    doc = results_doc(results)
+    out = Path(args.output) if args.output else work_dir / "results.json"
+    out.write_text(json.dumps(doc, indent=2, default=str))
+    print(f"\nResults saved to {out}")
+    if args.update_baseline:
+        Path(args.update_baseline).write_text(json.dumps(doc, indent=2, default=str))
+        print(f"Baseline saved to {args.update_baseline}")
+
+    if args.baseline:
+        regressions = compare(doc, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if regressions:
+            print(f"\n{regressions} regression(s) beyond {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
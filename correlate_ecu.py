@@ -7,16 +7,26 @@ independent measurement for the two flights of N238PS on 2026-02-08.
 Data sources:
   - G1000 NXi volt1:   data/N238PS_*_20260208-*.csv  (1-sec sampling)
   - Triplett VDL48:     data/LOG_VD.CSV               (2-sec sampling)
-  - AE300 ECU ch808:    ../AustroView/Data/Parsed/     (1-sec sampling)
+  - AE300 ECU ch808:    ../AustroView/Data/Parsed/ or data/ECU/*.ae3  (1-sec sampling)
 
 Flight 1: KBOW -> KSPG (15:51 - 16:47 UTC)
 Flight 2: KSPG -> KBOW (18:10 - 19:25 UTC)
+
+ECU sessions are paired with each flight by time overlap (session_index),
+so no session numbers are hardcoded. Without the AustroView CSV export,
+sessions are decoded straight from the .ae3 dumps in data/ECU (ae3_ingest).
+--history runs the G1000 vs ECU comparison over every flight in a
+directory in one batch.
+
+Usage:
+    python correlate_ecu.py
+    python correlate_ecu.py --ecu-dir ../AustroView/Data/Parsed --ecu-utc-offset 0
+    python correlate_ecu.py --history data/source
 """
 
 import sys
 import io
-import csv
-import glob
+import argparse
 import numpy as np
 import matplotlib
 matplotlib.use("Agg")
@@ -26,6 +36,15 @@ from datetime import datetime, timedelta
 from scipy import stats
 from pathlib import Path
 
+from ae3_ingest import AE3_DIR, Ae3Session, DecoderUnavailable, ae3_sessions
+from ecu_reader import read_ecu_session
+from flight_store import epoch_to_datetime, to_epoch
+from g1000_reader import load_g1000_channels
+from logio import glob_logs, open_log
+from pairwise_stats import pair_records, pairwise_stats
+from session_index import MIN_OVERLAP_S, IntervalIndex, ecu_sessions, g1000_flights, pair_flights
+from vdl_mmap import load_vdl_mapped, segment_voltage
+
 # Fix Windows console encoding
 if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
@@ -51,123 +70,109 @@ def parse_g1000(filepath):
     """Parse a G1000 NXi data log CSV, returning timestamps and volt1 values."""
     times = []
     volt1 = []
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    headers = [h.strip() for h in lines[2].split(",")]
-    date_idx = headers.index("Lcl Date")
-    time_idx = headers.index("Lcl Time")
-    volt1_idx = headers.index("volt1")
-    for line in lines[7:]:
-        parts = line.split(",")
-        if len(parts) <= volt1_idx:
-            continue
-        date_str = parts[date_idx].strip()
-        time_str = parts[time_idx].strip()
-        v1_str = parts[volt1_idx].strip()
-        if not date_str or not time_str or not v1_str:
-            continue
-        try:
-            dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-            v1 = float(v1_str)
-            times.append(dt)
-            volt1.append(v1)
-        except ValueError:
-            continue
+    with open_log(filepath) as f:
+        for _ in range(2):
+            next(f, "")
+        headers = [h.strip() for h in next(f, "").split(",")]
+        date_idx = headers.index("Lcl Date")
+        time_idx = headers.index("Lcl Time")
+        volt1_idx = headers.index("volt1")
+        for _ in range(4):
+            next(f, "")
+        for line in f:
+            parts = line.split(",")
+            if len(parts) <= volt1_idx:
+                continue
+            date_str = parts[date_idx].strip()
+            time_str = parts[time_idx].strip()
+            v1_str = parts[volt1_idx].strip()
+            if not date_str or not time_str or not v1_str:
+                continue
+            try:
+                dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
+                v1 = float(v1_str)
+                times.append(dt)
+                volt1.append(v1)
+            except ValueError:
+                continue
     return np.array(times), np.array(volt1)
 
 
 def parse_vdl(filepath):
-    """Parse the VDL48 CSV, returning elapsed seconds and voltage."""
-    times_str = []
-    voltages = []
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    for line in lines[12:]:
-        line = line.strip()
-        if not line:
-            continue
-        parts = line.split(",")
-        if len(parts) < 3:
-            continue
-        try:
-            t = parts[1].strip()
-            v = float(parts[2].strip())
-            times_str.append(t)
-            voltages.append(v)
-        except ValueError:
-            continue
-    t0 = datetime.strptime(times_str[0], "%H:%M:%S")
-    elapsed = []
-    for ts in times_str:
-        dt = datetime.strptime(ts, "%H:%M:%S")
-        elapsed.append((dt - t0).total_seconds())
-    return np.array(elapsed), np.array(voltages)
+    """Parse the VDL48 CSV, returning the sampling period (s) and voltage (a float32 memmap)."""
+    return load_vdl_mapped(filepath)
 
 
-def segment_vdl(elapsed, voltage):
+def segment_vdl(voltage):
     """Segment VDL data into Flight 1, Idle, Flight 2."""
-    FLIGHT_THRESHOLD = 27.0
-    ZERO_THRESHOLD = 1.0
-    WINDOW = 30
-    last_nonzero = len(voltage) - 1
-    while last_nonzero > 0 and voltage[last_nonzero] < ZERO_THRESHOLD:
-        last_nonzero -= 1
-    end_f1 = None
-    for i in range(WINDOW, last_nonzero):
-        if all(voltage[i:i + WINDOW] < FLIGHT_THRESHOLD):
-            end_f1 = i
-            break
-    start_f2 = None
-    if end_f1 is not None:
-        for i in range(end_f1 + WINDOW, last_nonzero):
-            if all(voltage[i:i + WINDOW] > FLIGHT_THRESHOLD):
-                start_f2 = i
-                break
-    end_f2 = last_nonzero + 1
-    if end_f1 is None or start_f2 is None:
-        raise RuntimeError("Could not segment VDL data into flight phases.")
-    return (0, end_f1), (end_f1, start_f2), (start_f2, end_f2)
-
-
-def align_vdl_to_g1000(g1000_times, vdl_elapsed, vdl_seg):
+    return segment_voltage(voltage)
+
+
+def align_vdl_to_g1000(g1000_times, sample_s, vdl_seg):
     """Create datetime array for a VDL segment aligned to G1000 timestamps."""
     seg_start, seg_end = vdl_seg
     g1000_start = g1000_times[0]
-    vdl_seg_elapsed = vdl_elapsed[seg_start:seg_end] - vdl_elapsed[seg_start]
+    vdl_seg_elapsed = np.arange(seg_end - seg_start) * sample_s
     return np.array([
         g1000_start + timedelta(seconds=float(s)) for s in vdl_seg_elapsed
     ])
 
 
-def parse_ecu(session_pattern):
-    """Parse an AustroView session CSV, returning timestamps and battery voltage.
+def load_ecu_sessions(args):
+    """ECU sessions from the AustroView CSV export, else decoded from the .ae3 dumps.
 
-    Args:
-        session_pattern: glob pattern to find the session CSV file.
-
-    Returns:
-        (times, voltage) as numpy arrays.
+    Exits with an explanation if neither source is usable.
+    """
+    offset = args.ecu_utc_offset * 3600
+    sessions = ecu_sessions(args.ecu_dir, offset)
+    if sessions:
+        print(f"  {len(sessions)} ECU sessions in {args.ecu_dir}")
+        return sessions
+    try:
+        sessions = ae3_sessions(args.ae3_dir, args.decoder, offset)
+    except DecoderUnavailable as e:
+        print(f"  No AustroView session CSVs in {args.ecu_dir}, and the .ae3 dumps in "
+              f"{args.ae3_dir} cannot be decoded:\n  {e}")
+        sys.exit(1)
+    print(f"  {len(sessions)} ECU sessions decoded from {args.ae3_dir}")
+    return sessions
+
+
+def session_arrays(session, utc_offset_s=0.0):
+    """(UTC epoch seconds, volts) of one ECU session, NaN rows dropped.
+
+    CSV sessions are read column-wise; sessions decoded from an .ae3 dump
+    already carry their arrays (shifted to UTC).
     """
-    matches = sorted(glob.glob(str(session_pattern)))
-    if not matches:
-        raise FileNotFoundError(f"No AustroView CSV matching: {session_pattern}")
-    filepath = matches[-1]  # newest if multiple matches
-    print(f"  ECU file: {Path(filepath).name}")
+    if isinstance(session, Ae3Session):
+        t, volts = session.t, session.volts
+    else:
+        t, volts, _ = read_ecu_session(session.path, rpm=False)
+        t = t - utc_offset_s
+    ok = ~np.isnan(t) & ~np.isnan(volts)
+    return t[ok], volts[ok]
 
-    times = []
-    voltages = []
-    with open(filepath, "r") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                dt = datetime.strptime(row["Timestamp"], "%Y-%m-%d %H:%M:%S")
-                v = float(row["Battery Voltage [V]"])
-                times.append(dt)
-                voltages.append(v)
-            except (ValueError, KeyError):
-                continue
 
-    return np.array(times), np.array(voltages)
+def ecu_for_flight(sessions, g_times, utc_offset_s=0.0, min_overlap_s=MIN_OVERLAP_S):
+    """ECU timestamps and voltage covering a G1000 flight.
+
+    Sessions overlapping the flight's time range are found through the
+    session interval index; if the engine was restarted in flight, the
+    sessions are concatenated in time order.
+    """
+    index = IntervalIndex.of(sessions)
+    matched = index.overlapping(to_epoch(g_times[0]), to_epoch(g_times[-1]), min_overlap_s)
+    if not matched:
+        raise FileNotFoundError(
+            f"No ECU session overlapping {g_times[0]:%Y-%m-%d %H:%M:%S} - "
+            f"{g_times[-1]:%H:%M:%S} UTC")
+    parts = []
+    for session in matched:
+        print(f"  ECU file: {Path(session.path).name}")
+        parts.append(session_arrays(session, utc_offset_s))
+    t = np.concatenate([t for t, _ in parts])
+    return (t.astype(np.int64).astype("datetime64[s]").astype(object),
+            np.concatenate([v for _, v in parts]), [s.number for s in matched])
 
 
 # =============================================================================
@@ -177,7 +182,8 @@ def parse_ecu(session_pattern):
 def resample_three(g_times, g_volts, v_times, v_volts, e_times, e_volts):
     """Resample G1000, VDL, and ECU onto a common 2-second grid.
 
-    Uses the overlapping time range of all three sources.
+    Uses the overlapping time range of all three sources. NaN VDL samples
+    (malformed rows) are interpolated across.
     """
     ref_t0 = g_times[0]
     g_sec = np.array([(t - ref_t0).total_seconds() for t in g_times])
@@ -189,7 +195,8 @@ def resample_three(g_times, g_volts, v_times, v_volts, e_times, e_volts):
     common_t = np.arange(t_start, t_end, 2.0)
 
     g_interp = np.interp(common_t, g_sec, g_volts)
-    v_interp = np.interp(common_t, v_sec, v_volts)
+    ok = ~np.isnan(v_volts)
+    v_interp = np.interp(common_t, v_sec[ok], v_volts[ok])
     e_interp = np.interp(common_t, e_sec, e_volts)
 
     common_dt = np.array([ref_t0 + timedelta(seconds=float(s)) for s in common_t])
@@ -200,52 +207,35 @@ def resample_three(g_times, g_volts, v_times, v_volts, e_times, e_volts):
 # Statistics
 # =============================================================================
 
+THREE_WAY_SOURCES = [("G1000", "G1000 volt1"), ("VDL48", "VDL48 ref"), ("ECU", "ECU ch808")]
+THREE_WAY_PAIRS = [(0, 1), (0, 2), (2, 1)]   # G1000-VDL48, G1000-ECU, ECU-VDL48
+
+
 def compute_pair_stats(a, b, a_label, b_label):
     """Compute pairwise statistics between two voltage arrays."""
-    diff = a - b
-    r, p_corr = stats.pearsonr(a, b)
-    t_stat, p_paired = stats.ttest_rel(a, b)
-    return {
-        "a_label": a_label,
-        "b_label": b_label,
-        "a_mean": np.mean(a),
-        "b_mean": np.mean(b),
-        "diff_mean": np.mean(diff),
-        "diff_median": np.median(diff),
-        "diff_std": np.std(diff),
-        "diff_min": np.min(diff),
-        "diff_max": np.max(diff),
-        "diff_p2_5": np.percentile(diff, 2.5),
-        "diff_p97_5": np.percentile(diff, 97.5),
-        "pearson_r": r,
-        "p_corr": p_corr,
-        "t_stat": t_stat,
-        "p_paired": p_paired,
-        "diff": diff,
-    }
+    return pair_records(pairwise_stats(np.vstack([a, b]), [a_label, b_label]))[0]
 
 
-def print_three_way_stats(g, v, e, label):
-    """Print statistics for all three pairs."""
-    pairs = [
-        compute_pair_stats(g, v, "G1000", "VDL48"),
-        compute_pair_stats(g, e, "G1000", "ECU"),
-        compute_pair_stats(e, v, "ECU", "VDL48"),
-    ]
+def print_source_stats(x, sources, label, pairs=None):
+    """Print per-source and pairwise statistics for the (K x N) resampled matrix x.
+
+    sources is a list of (label, description) per row; pairs defaults to
+    every i < j. Returns the pair dicts (see pairwise_stats.pair_records).
+    """
+    res = pairwise_stats(x, [name for name, _ in sources], pairs)
+    n = res["n"]
 
     print(f"\n{'='*70}")
     print(f"  {label}")
     print(f"{'='*70}")
-    print(f"  Samples (paired, 2-sec grid):  {len(g)}")
-    print(f"  Duration:                      {len(g)*2/60:.1f} min")
-    print(f"")
-    print(f"  G1000 volt1  - mean: {np.mean(g):6.2f} V   std: {np.std(g):.3f} V   "
-          f"range: [{np.min(g):.2f}, {np.max(g):.2f}]")
-    print(f"  VDL48 ref    - mean: {np.mean(v):6.2f} V   std: {np.std(v):.3f} V   "
-          f"range: [{np.min(v):.2f}, {np.max(v):.2f}]")
-    print(f"  ECU ch808    - mean: {np.mean(e):6.2f} V   std: {np.std(e):.3f} V   "
-          f"range: [{np.min(e):.2f}, {np.max(e):.2f}]")
-
+    print(f"  Samples (paired, 2-sec grid):  {n}")
+    print(f"  Duration:                      {n*2/60:.1f} min")
+    print()
+    for k, (_, desc) in enumerate(sources):
+        print(f"  {desc:<12} - mean: {res['source_mean'][k]:6.2f} V   std: {res['source_std'][k]:.3f} V   "
+              f"range: [{res['source_min'][k]:.2f}, {res['source_max'][k]:.2f}]")
+
+    pairs = pair_records(res)
     for p in pairs:
         sig = "***" if p["p_paired"] < 0.001 else ("**" if p["p_paired"] < 0.01 else "")
         print(f"\n  {p['a_label']} - {p['b_label']}:")
@@ -254,11 +244,17 @@ def print_three_way_stats(g, v, e, label):
         print(f"    95% range:   [{p['diff_p2_5']:+.3f}, {p['diff_p97_5']:+.3f}] V")
         print(f"    Min/Max:     [{p['diff_min']:+.3f}, {p['diff_max']:+.3f}] V")
         print(f"    Pearson r:   {p['pearson_r']:.4f}  (p = {p['p_corr']:.2e})")
+        print(f"    Slope:       {p['slope']:.3f} V/V  (intercept {p['intercept']:+.2f} V)")
         print(f"    Paired t:    t = {p['t_stat']:.2f},  p = {p['p_paired']:.2e}  {sig}")
 
     return pairs
 
 
+def print_three_way_stats(g, v, e, label):
+    """Print statistics for all three pairs."""
+    return print_source_stats(np.vstack([g, v, e]), THREE_WAY_SOURCES, label, THREE_WAY_PAIRS)
+
+
 # =============================================================================
 # Plotting
 # =============================================================================
@@ -367,6 +363,28 @@ def plot_three_way_histograms(pairs1, pairs2):
 # =============================================================================
 
 def main():
+    parser = argparse.ArgumentParser(description="Three-source voltage correlation: G1000 vs VDL48 vs AE300 ECU")
+    parser.add_argument("--ecu-dir", default=str(AUSTROVIEW_PARSED),
+                        help="Directory of AustroView session CSVs (default: ../AustroView/Data/Parsed)")
+    parser.add_argument("--ae3-dir", default=str(AE3_DIR),
+                        help="Raw .ae3 dumps, decoded when --ecu-dir has no CSVs (default: data/ECU)")
+    parser.add_argument("--decoder", default=None,
+                        help="Decoder for .ae3 dumps, name or module:function (default: $VOLTS_AE3_DECODER)")
+    parser.add_argument("--ecu-utc-offset", type=float, default=0.0,
+                        help="ECU clock offset from UTC in hours (default: 0)")
+    parser.add_argument("--history", metavar="DIR", default=None,
+                        help="Batch mode: pair every G1000 log in DIR with its ECU session(s) "
+                             "and compare G1000 vs ECU per flight")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for --history parsing (default: CPU count, 1 = no pool)")
+    args = parser.parse_args()
+    if args.history:
+        run_history(args)
+    else:
+        run(args)
+
+
+def run(args):
     print("Three-Source Voltage Correlation: G1000 vs VDL48 vs AE300 ECU")
     print("Aircraft: N238PS (Diamond DA40NG)  Date: 2026-02-08")
     print("=" * 70)
@@ -384,28 +402,27 @@ def main():
 
     # --- Parse VDL48 ---
     print("\nParsing VDL48 log...")
-    vdl_elapsed, vdl_voltage = parse_vdl(VDL_CSV)
-    print(f"  {len(vdl_voltage)} samples over {vdl_elapsed[-1]/60:.1f} min")
+    vdl_sample_s, vdl_voltage = parse_vdl(VDL_CSV)
+    print(f"  {len(vdl_voltage)} samples over {(len(vdl_voltage) - 1) * vdl_sample_s / 60:.1f} min")
 
-    seg_f1, seg_idle, seg_f2 = segment_vdl(vdl_elapsed, vdl_voltage)
-    vdl_f1_times = align_vdl_to_g1000(g1_times, vdl_elapsed, seg_f1)
+    seg_f1, seg_idle, seg_f2 = segment_vdl(vdl_voltage)
+    vdl_f1_times = align_vdl_to_g1000(g1_times, vdl_sample_s, seg_f1)
     vdl_f1_volts = vdl_voltage[seg_f1[0]:seg_f1[1]]
-    vdl_f2_times = align_vdl_to_g1000(g2_times, vdl_elapsed, seg_f2)
+    vdl_f2_times = align_vdl_to_g1000(g2_times, vdl_sample_s, seg_f2)
     vdl_f2_volts = vdl_voltage[seg_f2[0]:seg_f2[1]]
 
-    # --- Parse ECU ---
+    # --- Parse ECU (sessions paired to each flight by time overlap) ---
     print("\nParsing AE300 ECU data...")
-    ecu1_pattern = AUSTROVIEW_PARSED / "DataLog_*_session80_*.csv"
-    ecu2_pattern = AUSTROVIEW_PARSED / "DataLog_*_session81_*.csv"
+    sessions = load_ecu_sessions(args)
 
-    print("  Flight 1 (session 80):")
-    e1_times, e1_volts = parse_ecu(ecu1_pattern)
-    print(f"    {len(e1_volts)} samples, "
+    print("  Flight 1:")
+    e1_times, e1_volts, e1_sessions = ecu_for_flight(sessions, g1_times, args.ecu_utc_offset * 3600)
+    print(f"    session {', '.join(map(str, e1_sessions))}: {len(e1_volts)} samples, "
           f"{e1_times[0].strftime('%H:%M:%S')} - {e1_times[-1].strftime('%H:%M:%S')} UTC")
 
-    print("  Flight 2 (session 81):")
-    e2_times, e2_volts = parse_ecu(ecu2_pattern)
-    print(f"    {len(e2_volts)} samples, "
+    print("  Flight 2:")
+    e2_times, e2_volts, e2_sessions = ecu_for_flight(sessions, g2_times, args.ecu_utc_offset * 3600)
+    print(f"    session {', '.join(map(str, e2_sessions))}: {len(e2_volts)} samples, "
           f"{e2_times[0].strftime('%H:%M:%S')} - {e2_times[-1].strftime('%H:%M:%S')} UTC")
 
     # --- Three-way resampling ---
@@ -464,5 +481,52 @@ def main():
     print("\nAnalysis complete.")
 
 
+def resample_pair(a_t, a_v, b_t, b_v, step=2.0):
+    """Resample two (epoch seconds, values) series onto a common grid over their overlap."""
+    grid = np.arange(max(a_t[0], b_t[0]), min(a_t[-1], b_t[-1]), step)
+    return grid, np.interp(grid, a_t, a_v), np.interp(grid, b_t, b_v)
+
+
+def run_history(args):
+    """G1000 vs ECU statistics for every flight in args.history with overlapping ECU sessions."""
+    print("Batch G1000 vs AE300 ECU Correlation")
+    print("=" * 70)
+    sessions = load_ecu_sessions(args)
+    flights = g1000_flights(glob_logs(args.history, "*.csv"), args.workers)
+    pairs = [(f, m) for f, m in pair_flights(flights, sessions) if m]
+    print(f"{len(flights)} flights, {len(sessions)} ECU sessions, {len(pairs)} flights with ECU data\n")
+    if not pairs:
+        return
+
+    print(f"{'Date (UTC)':<17} {'Session':>8} {'N':>6} {'G1000':>7} {'ECU':>7} "
+          f"{'Diff':>7} {'Std':>6} {'r':>7}  File")
+    print("-" * 100)
+    all_g, all_e = [], []
+    for flight, matched in pairs:
+        g_t, data = load_g1000_channels(flight.path, ("volt1",))
+        ok = ~np.isnan(data["volt1"])
+        parts = [session_arrays(s, args.ecu_utc_offset * 3600) for s in matched]
+        e_t = np.concatenate([t for t, _ in parts])
+        e_volts = np.concatenate([v for _, v in parts])
+        if ok.sum() < 2 or len(e_t) < 2:
+            continue
+        _, g_rs, e_rs = resample_pair(g_t[ok], data["volt1"][ok], e_t, e_volts)
+        if len(g_rs) < 3:
+            continue
+        p = compute_pair_stats(g_rs, e_rs, "G1000", "ECU")
+        all_g.append(g_rs)
+        all_e.append(e_rs)
+        label = "+".join(str(s.number) for s in matched)
+        print(f"{epoch_to_datetime(flight.start):%Y-%m-%d %H:%M} {label:>8} {len(g_rs):>6} "
+              f"{p['a_mean']:>7.2f} {p['b_mean']:>7.2f} {p['diff_mean']:>+7.3f} {p['diff_std']:>6.3f} "
+              f"{p['pearson_r']:>7.3f}  {flight.path.name}")
+
+    if all_g:
+        p = compute_pair_stats(np.concatenate(all_g), np.concatenate(all_e), "G1000", "ECU")
+        print(f"\nPooled over {len(all_g)} flights ({len(p['diff'])} paired samples): "
+              f"G1000 - ECU = {p['diff_mean']:+.3f} V (std {p['diff_std']:.3f} V, "
+              f"95% [{p['diff_p2_5']:+.3f}, {p['diff_p97_5']:+.3f}]), r = {p['pearson_r']:.3f}")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Cross-Channel Correlation Engine
+================================
+Correlates volt1 -- or its short-term noise, or the G1000 - reference
+offset -- against any set of G1000 channels (E1 RPM, OAT, volt2, E1 OilT,
+fuel flow, ...) for every flight and for all flights pooled.
+
+Everything is computed from per-flight sufficient statistics in matrix
+form. For each flight the samples form an (n x p) matrix Z = [target,
+channels...] with a validity mask M; the four products M'M, Z'M, (Z^2)'M
+and Z'Z give pairwise-complete counts, sums, sums of squares and cross
+products for every channel pair at once. Pooled statistics are simply the
+sum over flights, and per-flight and pooled multiple regressions are
+solved as one batched pseudo-inverse. The pooled regression only sums
+flights that logged every channel: a channel a flight never logged is
+zero-filled for that flight's own fit, and those zeros must not be pooled
+as readings. All flights x all channels finish in
+one run, reading parsed arrays from the parse cache (or the flight store).
+
+Targets:
+    volt1        raw volt1
+    volt1_noise  volt1 minus its 60-sample centred moving average
+    offset       volt1 minus the VDL48 reference (flights with a VDL48 log)
+
+Outputs (output/): correlation_per_flight.csv, correlation_matrix.png
+
+Usage:
+    python correlation.py                                   # data/source/, cruise only
+    python correlation.py --target volt1_noise --channels rpm oat volt2 oilt
+    python correlation.py --source data --target offset --phase all
+    python correlation.py --store data/flights.sqlite --tail N238PS
+"""
+
+import argparse
+import csv
+import io
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from flight_phases import CRUISE, PHASE_CHANNELS, PHASE_NAMES, classify_phases, load_flight_phases
+from flight_store import FlightStore
+from g1000_reader import G1000_CHANNELS, load_g1000_channels
+from logio import glob_logs, strip_compression_suffix
+
+if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+SOURCE_DIR = Path(__file__).parent / "data" / "source"
+OUTPUT_DIR = Path(__file__).parent / "output"
+
+DEFAULT_CHANNELS = ("rpm", "pct_pwr", "fflow", "oilt", "oilp", "oat", "volt2", "ias", "altind")
+TARGETS = ("volt1", "volt1_noise", "offset")
+NOISE_WINDOW = 60
+MIN_PAIRS = 30
+
+
+# =============================================================================
+# Per-flight sample matrices
+# =============================================================================
+
+def _detrend(x, n=NOISE_WINDOW):
+    """x minus its NaN-aware centred n-sample moving average."""
+    valid = ~np.isnan(x)
+    kernel = np.ones(n)
+    num = np.convolve(np.where(valid, x, 0.0), kernel, mode="same")
+    den = np.convolve(valid.astype(float), kernel, mode="same")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return x - num / den
+
+
+def _reference_volts(path, t):
+    """VDL48 reference interpolated onto G1000 times, or None if the flight has none."""
+    from volt_monitor import vdl_reference
+
+    ref = vdl_reference(path)
+    if not ref:
+        return None
+    rt, rv = np.array(ref).T
+    out = np.interp(t, rt, rv)
+    out[(t < rt[0]) | (t > rt[-1])] = np.nan
+    return out
+
+
+def target_series(target, t, volt1, path=None):
+    if target == "volt1":
+        return volt1
+    if target == "volt1_noise":
+        return _detrend(volt1)
+    ref = _reference_volts(path, t)
+    return None if ref is None else volt1 - ref
+
+
+def flight_matrix(path, target, channels, phase="cruise"):
+    """(name, Z) with Z = [target, channels...] for the selected phase, or None."""
+    if phase == "all":
+        t, data = load_g1000_channels(path, ("volt1",) + tuple(channels))
+        keep = np.ones(len(t), dtype=bool)
+    else:
+        t, data, phases = load_flight_phases(path, ("volt1",) + tuple(channels))
+        keep = phases == PHASE_NAMES.index(phase)
+    volt1 = np.where(data["volt1"] > 0, data["volt1"], np.nan)
+    y = target_series(target, t, volt1, path)
+    if y is None or not np.any(keep):
+        return None
+    z = np.column_stack([y] + [data[c] for c in channels])[keep]
+    return strip_compression_suffix(Path(path).name), z
+
+
+def _matrix_job(job):
+    """Worker entry point: (path, target, channels, phase) -> (name, sufficient stats) or None."""
+    path, target, channels, phase = job
+    fm = flight_matrix(path, target, channels, phase)
+    if fm is None:
+        return None
+    return fm[0], sufficient_stats(fm[1])
+
+
+# =============================================================================
+# Batched statistics
+# =============================================================================
+
+def sufficient_stats(z):
+    """Pairwise-complete and complete-case sufficient statistics of one (n x p) matrix.
+
+    Returns a dict of p x p (and regression) arrays that add across flights.
+    """
+    m = ~np.isnan(z)
+    mf = m.astype(float)
+    zm = np.where(m, z, 0.0)
+    # A channel this flight never logged must not empty the complete-case rows;
+    # zero-filled, pinv gives it a zero coefficient
+    logged = m.any(axis=0)
+    zr = np.where(logged, z, 0.0)
+    complete = ~np.isnan(zr).any(axis=1)
+    a = np.column_stack([np.ones(complete.sum()), zr[complete][:, 1:]])
+    return {
+        "n": mf.T @ mf,            # pairs with both i and j valid
+        "s": zm.T @ mf,            # sum of i where j valid
+        "q": (zm * zm).T @ mf,     # sum of i^2 where j valid
+        "p": zm.T @ zm,            # sum of i*j over valid pairs
+        "ata": a.T @ a,            # complete-case normal equations for y ~ 1 + X
+        "aty": a.T @ zr[complete][:, 0],
+        "logged": logged.astype(float),  # summed: flights that logged each column
+    }
+
+
+def stack_stats(stats):
+    """List of per-flight sufficient-stat dicts -> dict of stacked (F x ...) arrays."""
+    return {k: np.stack([s[k] for s in stats]) for k in stats[0]}
+
+
+def correlations(st):
+    """Pearson r and least-squares slope (row on column) from (batched) sufficient stats.
+
+    st holds arrays of shape (..., p, p). Returns (r, slope, n): r[i, j] is the
+    pairwise-complete correlation of i and j, slope[i, j] the slope of i
+    regressed on j. Entries with fewer than MIN_PAIRS pairs are NaN.
+    """
+    n, s, q, p = st["n"], st["s"], st["q"], st["p"]
+    st_t = np.swapaxes(s, -1, -2)  # sum of j where i valid
+    q_t = np.swapaxes(q, -1, -2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = n * p - s * st_t
+        var_i = n * q - s * s
+        var_j = n * q_t - st_t * st_t
+        r = cov / np.sqrt(var_i * var_j)
+        slope = cov / var_j
+    few = n < MIN_PAIRS
+    r[few] = np.nan
+    slope[few] = np.nan
+    return r, slope, n
+
+
+def regressions(st):
+    """Multiple regression target ~ 1 + channels, batched over leading axes.
+
+    Returns coefficients of shape (..., 1 + k), intercept first. pinv keeps
+    flights with a constant or missing channel solvable.
+    """
+    return (np.linalg.pinv(st["ata"]) @ st["aty"][..., None])[..., 0]
+
+
+def summarize(names, stats, target, channels):
+    """Per-flight and pooled results from a list of per-flight sufficient stats.
+
+    Returns dict: names (F,), per_flight (stacked stats), pooled (summed stats),
+    r_flight (F x k), slope_flight (F x k), n_flight (F x k),
+    r_pooled / slope_pooled / n_pooled (p x p), coef_flight (F x 1+k), coef_pooled (1+k),
+    n_regression_flights. coef_pooled is fitted over the flights that logged
+    every channel (NaN if none did).
+    """
+    per_flight = stack_stats(stats)
+    pooled = {k: v.sum(axis=0) for k, v in per_flight.items()}
+    full = per_flight["logged"].all(axis=1)
+    pooled["ata"] = per_flight["ata"][full].sum(axis=0)
+    pooled["aty"] = per_flight["aty"][full].sum(axis=0)
+    coef_pooled = regressions(pooled) if full.any() else np.full(len(channels) + 1, np.nan)
+    r_f, slope_f, n_f = correlations(per_flight)
+    r_p, slope_p, n_p = correlations(pooled)
+    return {
+        "target": target, "channels": list(channels), "names": names,
+        "per_flight": per_flight, "pooled": pooled,
+        "r_flight": r_f[:, 0, 1:], "slope_flight": slope_f[:, 0, 1:], "n_flight": n_f[:, 0, 1:],
+        "r_pooled": r_p, "slope_pooled": slope_p, "n_pooled": n_p,
+        "coef_flight": regressions(per_flight), "coef_pooled": coef_pooled,
+        "n_regression_flights": int(full.sum()),
+    }
+
+
+def run(paths, target="volt1", channels=DEFAULT_CHANNELS, phase="cruise", workers=None):
+    """Per-flight and pooled statistics for every flight in `paths` (see summarize())."""
+    jobs = [(p, target, tuple(channels), phase) for p in paths]
+    if workers == 1 or len(jobs) < 2:
+        results = [_matrix_job(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_matrix_job, jobs, chunksize=4))
+    results = [r for r in results if r is not None]
+    if not results:
+        return None
+    return summarize([name for name, _ in results], [s for _, s in results], target, channels)
+
+
+def run_store(db, target="volt1", channels=DEFAULT_CHANNELS, phase="cruise", tail=None):
+    """run() over flights already ingested into the flight store (flight_store.py)."""
+    if target == "offset":
+        raise ValueError("The offset target needs the VDL48 log; run on CSVs (--source) instead")
+    wanted = list(dict.fromkeys(("volt1",) + tuple(channels) + PHASE_CHANNELS))
+    with FlightStore(db) as store:
+        fl = store.flights(tail=tail)
+        s = store.samples(wanted, flight_ids=fl["id"])
+    if len(s["t"]) == 0:
+        return None
+    # Rows come back in time order, so take flight ids in order of appearance
+    bounds = np.flatnonzero(np.diff(s["flight_id"])) + 1
+    file_of = dict(zip(fl["id"].tolist(), fl["file"].tolist()))
+    names, stats = [], []
+    for fid, idx in zip(s["flight_id"][np.r_[0, bounds]], np.split(np.arange(len(s["t"])), bounds)):
+        data = {c: s[c][idx] for c in wanted}
+        keep = (np.ones(len(idx), dtype=bool) if phase == "all"
+                else classify_phases(data) == PHASE_NAMES.index(phase))
+        volt1 = np.where(data["volt1"] > 0, data["volt1"], np.nan)
+        y = target_series(target, s["t"][idx], volt1)
+        if not np.any(keep):
+            continue
+        names.append(str(file_of[int(fid)]))
+        stats.append(sufficient_stats(np.column_stack([y] + [data[c] for c in channels])[keep]))
+    return summarize(names, stats, target, channels) if stats else None
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def print_summary(res):
+    ch = res["channels"]
+    r_f = res["r_flight"]
+    print(f"\n{res['target']} vs channels: {len(res['names'])} flights, "
+          f"{int(res['n_pooled'][0, 0]):,} samples pooled\n")
+    print(f"{'Channel':<10} {'Header':<10} {'Pooled r':>9} {'Slope':>11} {'Pairs':>9} "
+          f"{'Median r':>9} {'r IQR':>15} {'Flights':>8}")
+    print("-" * 90)
+    coef = res["coef_pooled"]
+    for j, c in enumerate(ch):
+        col = r_f[:, j][~np.isnan(r_f[:, j])]
+        iqr = (f"{np.percentile(col, 25):+.2f}..{np.percentile(col, 75):+.2f}" if len(col) else "-")
+        print(f"{c:<10} {G1000_CHANNELS[c]:<10} {res['r_pooled'][0, j + 1]:>+9.3f} "
+              f"{res['slope_pooled'][0, j + 1]:>+11.5f} {int(res['n_pooled'][0, j + 1]):>9,} "
+              f"{np.median(col) if len(col) else np.nan:>+9.3f} {iqr:>15} {len(col):>8}")
+    print(f"\nPooled multiple regression ({res['n_regression_flights']} flights logging every channel): "
+          f"{res['target']} = {coef[0]:+.3f}" + "".join(f" {b:+.5f}*{c}" for b, c in zip(coef[1:], ch)))
+
+
+def write_per_flight_csv(res, out_path):
+    ch = res["channels"]
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["file"] + [f"r_{c}" for c in ch] + [f"slope_{c}" for c in ch]
+                   + [f"n_{c}" for c in ch] + ["intercept"] + [f"coef_{c}" for c in ch])
+        for i, name in enumerate(res["names"]):
+            w.writerow([name] + [f"{x:.4f}" for x in res["r_flight"][i]]
+                       + [f"{x:.6f}" for x in res["slope_flight"][i]]
+                       + [int(x) for x in res["n_flight"][i]]
+                       + [f"{x:.6f}" for x in res["coef_flight"][i]])
+
+
+def plot_matrices(res, out_path):
+    """Pooled correlation matrix next to the per-flight target-vs-channel r heatmap."""
+    labels = [res["target"]] + res["channels"]
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7), gridspec_kw={"width_ratios": [1, 1.3]})
+
+    im = ax1.imshow(res["r_pooled"], cmap="RdBu_r", vmin=-1, vmax=1)
+    ax1.set_xticks(range(len(labels)))
+    ax1.set_xticklabels(labels, rotation=45, ha="right")
+    ax1.set_yticks(range(len(labels)))
+    ax1.set_yticklabels(labels)
+    for i in range(len(labels)):
+        for j in range(len(labels)):
+            v = res["r_pooled"][i, j]
+            if not np.isnan(v):
+                ax1.text(j, i, f"{v:.2f}", ha="center", va="center", fontsize=7,
+                         color="white" if abs(v) > 0.6 else "black")
+    ax1.set_title(f"Pooled correlation ({len(res['names'])} flights)")
+
+    ax2.imshow(res["r_flight"].T, cmap="RdBu_r", vmin=-1, vmax=1, aspect="auto", interpolation="nearest")
+    ax2.set_yticks(range(len(res["channels"])))
+    ax2.set_yticklabels(res["channels"])
+    ax2.set_xlabel("Flight (chronological by file name)")
+    ax2.set_title(f"Per-flight r: {res['target']} vs channel")
+    fig.colorbar(im, ax=[ax1, ax2], shrink=0.8, label="Pearson r")
+    plt.savefig(out_path, dpi=150, bbox_inches="tight")
+    plt.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched volt1 vs channel correlation over all flights")
+    parser.add_argument("--source", default=str(SOURCE_DIR), help="Directory of G1000 CSVs (default: data/source)")
+    parser.add_argument("--store", default=None, help="Read from a flight_store.py database instead of CSVs")
+    parser.add_argument("--tail", default=None, help="Tail number filter for --store")
+    parser.add_argument("--target", choices=TARGETS, default="volt1")
+    parser.add_argument("--channels", nargs="+", default=list(DEFAULT_CHANNELS),
+                        choices=[c for c in G1000_CHANNELS if c != "volt1"])
+    parser.add_argument("--phase", default=PHASE_NAMES[CRUISE], choices=list(PHASE_NAMES) + ["all"],
+                        help="Only use samples in this flight phase (default: cruise)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.store:
+        res = run_store(args.store, args.target, args.channels, args.phase, args.tail)
+    else:
+        source = Path(args.source)
+        paths = [p for p in glob_logs(source, "*.csv") if p.name.upper() != "LOG_VD.CSV"]
+        if not paths:
+            print(f"No CSV files found in {source}")
+            sys.exit(1)
+        print(f"Correlating {args.target} against {len(args.channels)} channels over {len(paths)} logs "
+              f"({args.phase} samples)...")
+        res = run(paths, args.target, args.channels, args.phase, args.workers)
+    if res is None:
+        print("No flights with usable samples.")
+        sys.exit(1)
+
+    print_summary(res)
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    csv_path = OUTPUT_DIR / "correlation_per_flight.csv"
+    png_path = OUTPUT_DIR / "correlation_matrix.png"
+    write_per_flight_csv(res, csv_path)
+    plot_matrices(res, png_path)
+    print(f"\nSaved: {csv_path}")
+    print(f"Saved: {png_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Transient Dip Event Catalog
+===========================
+Finds every volt1 excursion below a set of thresholds in every G1000 flight
+and records it in a persistent SQLite catalog (data/dip_events.sqlite).
+
+Detection is one vectorized pass per flight: runs below each threshold come
+from run-length encoding (flight_store.runs_below), and per-run minimum,
+position of the minimum and coincident channels are gathered with NumPy
+reductions -- no per-sample Python loop.
+
+Each event records:
+    start time, duration, lowest volt1, depth below the threshold,
+    drop below the flight's running-engine baseline (median volt1 with
+    E1 RPM > 1000), and E1 RPM / IAS / AltInd at the lowest point.
+
+Flights are rescanned only when the source file or the detection settings
+change, so re-running over thousands of flights only touches new logs.
+
+Usage:
+    python dip_events.py scan                                   # data/source/ as N238PS
+    python dip_events.py scan --fleet data/fleet --thresholds 25.5 24.0 22.0
+    python dip_events.py query --below 24 --min-drop 3 --tail N238PS
+    python dip_events.py query --start 2024-03-01 --end 2024-06-01 --sort duration
+    python dip_events.py summary
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from flight_store import epoch_to_datetime, runs_below, to_epoch
+from g1000_reader import load_g1000_channels
+from logio import glob_logs, strip_compression_suffix
+from parse_cache import file_signature
+
+DATA_DIR = Path(__file__).parent / "data"
+SOURCE_DIR = DATA_DIR / "source"
+DEFAULT_DB = DATA_DIR / "dip_events.sqlite"
+HOME_TAIL = "N238PS"
+
+DEFAULT_THRESHOLDS = (25.5, 24.0)
+DEFAULT_MIN_SECONDS = 0.0
+ENGINE_RUNNING_RPM = 1000.0
+EVENT_CHANNELS = ("volt1", "rpm", "ias", "altind")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scanned (
+    id          INTEGER PRIMARY KEY,
+    tail        TEXT NOT NULL,
+    file        TEXT NOT NULL,
+    signature   TEXT NOT NULL,
+    settings    TEXT NOT NULL,
+    start_time  REAL,
+    baseline    REAL,
+    n_events    INTEGER NOT NULL,
+    UNIQUE (tail, file)
+);
+CREATE TABLE IF NOT EXISTS events (
+    flight_id   INTEGER NOT NULL REFERENCES scanned (id) ON DELETE CASCADE,
+    threshold   REAL NOT NULL,
+    start_time  REAL NOT NULL,
+    duration    REAL NOT NULL,
+    min_volt    REAL NOT NULL,
+    depth       REAL NOT NULL,
+    drop_v      REAL,
+    rpm         REAL,
+    ias         REAL,
+    altind      REAL
+);
+CREATE INDEX IF NOT EXISTS events_flight ON events (flight_id);
+CREATE INDEX IF NOT EXISTS events_threshold_start ON events (threshold, start_time);
+CREATE INDEX IF NOT EXISTS events_min_volt ON events (min_volt);
+"""
+
+EVENT_FIELDS = ("threshold", "start_time", "duration", "min_volt", "depth", "drop_v", "rpm", "ias", "altind")
+
+
+def detect_dips(t, data, thresholds=DEFAULT_THRESHOLDS, min_seconds=DEFAULT_MIN_SECONDS):
+    """All runs of volt1 below each threshold in one flight.
+
+    t: sample times (s); data: dict with volt1, rpm, ias, altind arrays.
+    Returns (events, baseline): events is a dict of equal-length arrays
+    keyed by EVENT_FIELDS, baseline the running-engine median volt1 (NaN if
+    the engine never ran).
+    """
+    # Copy: data may be shared cached arrays. Zero/negative readings are dropouts, not dips.
+    v = np.array(data["volt1"], dtype=float)
+    v[v <= 0] = np.nan
+    running = np.asarray(data["rpm"], dtype=float) > ENGINE_RUNNING_RPM
+    baseline = float(np.nanmedian(v[running])) if np.any(running & ~np.isnan(v)) else float("nan")
+    period = float(np.median(np.diff(t))) if len(t) > 1 else 1.0
+
+    parts = {k: [] for k in EVENT_FIELDS}
+    for thr in thresholds:
+        starts, ends = runs_below(t, v, thr, min_seconds)
+        if len(starts) == 0:
+            continue
+        # Per-run argmin: sort in-run samples by (run, value) and take each run's first
+        lengths = ends - starts
+        first = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        run_id = np.repeat(np.arange(len(starts)), lengths)
+        idx = np.repeat(starts - first, lengths) + np.arange(lengths.sum())
+        order = np.lexsort((v[idx], run_id))
+        low_idx = idx[order[first]]
+
+        lows = v[low_idx]
+        parts["threshold"].append(np.full(len(starts), thr))
+        parts["start_time"].append(t[starts])
+        parts["duration"].append(t[ends - 1] - t[starts] + period)
+        parts["min_volt"].append(lows)
+        parts["depth"].append(thr - lows)
+        parts["drop_v"].append(baseline - lows)
+        for ch in ("rpm", "ias", "altind"):
+            parts[ch].append(np.asarray(data[ch], dtype=float)[low_idx])
+    events = {k: (np.concatenate(p) if p else np.array([], dtype=float)) for k, p in parts.items()}
+    return events, baseline
+
+
+def _scan_job(job):
+    """Worker entry point: (tail, path, thresholds, min_seconds) -> (scan result, None),
+    or (None, error message) for a log that cannot be read."""
+    tail, path, thresholds, min_seconds = job
+    try:
+        t, data = load_g1000_channels(path, EVENT_CHANNELS)
+    except Exception as e:  # any unreadable log (truncated gzip, bad zstd frame, ...) is skipped, not fatal
+        return None, f"{tail}/{Path(path).name}: {type(e).__name__}: {e}"
+    events, baseline = detect_dips(t, data, thresholds, min_seconds)
+    start = float(t[0]) if len(t) else None
+    return (tail, strip_compression_suffix(Path(path).name), file_signature(path), start, baseline, events), None
+
+
+class DipCatalog:
+    """SQLite catalog of volt1 dip events across all scanned flights."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def scan(self, files_by_tail, thresholds=DEFAULT_THRESHOLDS, min_seconds=DEFAULT_MIN_SECONDS,
+             workers=None):
+        """Scan {tail: [csv paths]}; skips files already scanned with the same settings.
+
+        A log that cannot be read is skipped (and retried on the next scan).
+        Returns (flights scanned, events added, error message per skipped log).
+        """
+        settings = json.dumps({"thresholds": sorted(thresholds, reverse=True), "min_seconds": min_seconds})
+        known = {(tail, f): (sig, s) for tail, f, sig, s in
+                 self.conn.execute("SELECT tail, file, signature, settings FROM scanned")}
+        jobs = [(tail, p, tuple(thresholds), min_seconds)
+                for tail, paths in files_by_tail.items() for p in paths
+                if known.get((tail, strip_compression_suffix(Path(p).name))) != (file_signature(p), settings)]
+        if not jobs:
+            return 0, 0, []
+
+        pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 and len(jobs) > 1 else None
+        results = pool.map(_scan_job, jobs, chunksize=4) if pool else map(_scan_job, jobs)
+        n_flights = n_events = 0
+        failures = []
+        try:
+            for result, error in results:
+                if error:
+                    failures.append(error)
+                    continue
+                tail, name, sig, start, baseline, events = result
+                self._store(tail, name, sig, settings, start, baseline, events)
+                n_flights += 1
+                n_events += len(events["start_time"])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return n_flights, n_events, failures
+
+    def _store(self, tail, name, signature, settings, start, baseline, events):
+        n = len(events["start_time"])
+        with self.conn:
+            self.conn.execute("DELETE FROM scanned WHERE tail = ? AND file = ?", (tail, name))
+            fid = self.conn.execute(
+                "INSERT INTO scanned (tail, file, signature, settings, start_time, baseline, n_events) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (tail, name, signature, settings, start,
+                 None if np.isnan(baseline) else baseline, n)).lastrowid
+            cols = [np.where(np.isnan(events[k]), None, events[k]).tolist() for k in EVENT_FIELDS]
+            self.conn.executemany(
+                f"INSERT INTO events (flight_id, {', '.join(EVENT_FIELDS)}) "
+                f"VALUES ({', '.join('?' * (len(EVENT_FIELDS) + 1))})",
+                zip([fid] * n, *cols))
+
+    def query(self, below=None, tail=None, start=None, end=None, min_duration=None,
+              min_drop=None, min_rpm=None, sort="start_time", limit=None):
+        """Events matching all given filters.
+
+        below selects the threshold the events were detected at (default:
+        the highest scanned threshold, i.e. every excursion). Returns a dict
+        of arrays: tail, file plus EVENT_FIELDS.
+        """
+        if below is None:
+            row = self.conn.execute("SELECT MAX(threshold) FROM events").fetchone()
+            below = row[0] if row[0] is not None else 0.0
+        clauses, params = ["e.threshold = ?"], [below]
+        for sql, value in (("s.tail = ?", tail), ("e.start_time >= ?", to_epoch(start)),
+                           ("e.start_time < ?", to_epoch(end)), ("e.duration >= ?", min_duration),
+                           ("e.drop_v >= ?", min_drop), ("e.rpm >= ?", min_rpm)):
+            if value is not None:
+                clauses.append(sql)
+                params.append(value)
+        order = {"start_time": "e.start_time", "depth": "e.min_volt", "duration": "e.duration DESC"}[sort]
+        sql = (f"SELECT s.tail, s.file, {', '.join('e.' + k for k in EVENT_FIELDS)} "
+               "FROM events e JOIN scanned s ON s.id = e.flight_id "
+               f"WHERE {' AND '.join(clauses)} ORDER BY {order}")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = self.conn.execute(sql, params).fetchall()
+        cols = list(zip(*rows)) if rows else [[]] * (len(EVENT_FIELDS) + 2)
+        out = {"tail": np.array(cols[0], dtype=str), "file": np.array(cols[1], dtype=str)}
+        out.update({k: np.array(c, dtype=float) for k, c in zip(EVENT_FIELDS, cols[2:])})
+        return out
+
+    def summary(self):
+        """Per-tail, per-threshold rows: (tail, threshold, flights, flights with events, events, lowest)."""
+        return self.conn.execute(
+            "SELECT s.tail, e.threshold, "
+            "  (SELECT COUNT(*) FROM scanned s2 WHERE s2.tail = s.tail), "
+            "  COUNT(DISTINCT e.flight_id), COUNT(*), MIN(e.min_volt) "
+            "FROM events e JOIN scanned s ON s.id = e.flight_id "
+            "GROUP BY s.tail, e.threshold ORDER BY s.tail, e.threshold DESC").fetchall()
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalog of volt1 transient dips across all flights")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help="Catalog path (default: data/dip_events.sqlite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_scan = sub.add_parser("scan", help="Detect dips in new/changed flights")
+    p_scan.add_argument("--source", default=str(SOURCE_DIR), help="Directory of CSVs for one aircraft")
+    p_scan.add_argument("--tail", default=HOME_TAIL, help=f"Tail number for --source (default: {HOME_TAIL})")
+    p_scan.add_argument("--fleet", default=None, help="Directory with one subdirectory of CSVs per tail")
+    p_scan.add_argument("--thresholds", type=float, nargs="+", default=list(DEFAULT_THRESHOLDS),
+                        help="volt1 thresholds in V (default: 25.5 24.0)")
+    p_scan.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="Ignore runs shorter than this (default: 0, keep single-sample dips)")
+    p_scan.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+
+    p_q = sub.add_parser("query", help="List events")
+    p_q.add_argument("--below", type=float, default=None, help="Detection threshold (default: highest scanned)")
+    p_q.add_argument("--tail", default=None)
+    p_q.add_argument("--start", default=None, help="Events on/after (YYYY-MM-DD)")
+    p_q.add_argument("--end", default=None, help="Events before (YYYY-MM-DD)")
+    p_q.add_argument("--min-duration", type=float, default=None, help="Seconds")
+    p_q.add_argument("--min-drop", type=float, default=None, help="Volts below the flight baseline")
+    p_q.add_argument("--min-rpm", type=float, default=None, help="Only events with E1 RPM >= this")
+    p_q.add_argument("--sort", choices=["start_time", "depth", "duration"], default="start_time")
+    p_q.add_argument("--limit", type=int, default=50)
+
+    sub.add_parser("summary", help="Event counts per tail and threshold")
+    args = parser.parse_args()
+
+    with DipCatalog(args.db) as catalog:
+        if args.command == "scan":
+            if args.fleet:
+                files_by_tail = {d.name: glob_logs(d, "*.csv")
+                                 for d in sorted(Path(args.fleet).iterdir()) if d.is_dir()}
+            else:
+                source = Path(args.source)
+                if not source.exists():
+                    print(f"Source directory not found: {source}")
+                    sys.exit(1)
+                files_by_tail = {args.tail: glob_logs(source, "*.csv")}
+            n_files = sum(len(v) for v in files_by_tail.values())
+            print(f"Scanning {n_files} CSV files for volt1 dips below "
+                  f"{', '.join(f'{x:g}' for x in args.thresholds)} V...")
+            t0 = time.perf_counter()
+            n_flights, n_events, failures = catalog.scan(files_by_tail, args.thresholds, args.min_seconds,
+                                                         args.workers)
+            print(f"  {n_flights} flights scanned ({n_events} events), "
+                  f"{n_files - n_flights - len(failures)} unchanged ({time.perf_counter() - t0:.1f} s)")
+            if failures:
+                print(f"  {len(failures)} unreadable log(s) skipped:")
+                for error in failures:
+                    print(f"    {error}")
+
+        elif args.command == "query":
+            t0 = time.perf_counter()
+            ev = catalog.query(args.below, args.tail, args.start, args.end, args.min_duration,
+                               args.min_drop, args.min_rpm, args.sort, args.limit)
+            dt_ms = (time.perf_counter() - t0) * 1000
+            print(f"{len(ev['start_time'])} events ({dt_ms:.0f} ms)\n")
+            print(f"{'Tail':<8} {'Start (UTC)':<19} {'Dur':>5} {'Min V':>6} {'Depth':>6} {'Drop':>6} "
+                  f"{'RPM':>5} {'IAS':>4} {'Alt':>6}  File")
+            print("-" * 110)
+            for i in range(len(ev["start_time"])):
+                print(f"{ev['tail'][i]:<8} {epoch_to_datetime(ev['start_time'][i]):%Y-%m-%d %H:%M:%S} "
+                      f"{ev['duration'][i]:>4.0f}s {ev['min_volt'][i]:>6.2f} {ev['depth'][i]:>6.2f} "
+                      f"{ev['drop_v'][i]:>6.2f} {ev['rpm'][i]:>5.0f} {ev['ias'][i]:>4.0f} "
+                      f"{ev['altind'][i]:>6.0f}  {ev['file'][i]}")
+
+        elif args.command == "summary":
+            print(f"{'Tail':<8} {'Below':>6} {'Flights':>8} {'w/ dips':>8} {'Events':>7} {'Lowest':>7}")
+            print("-" * 50)
+            for tail, thr, n_fl, n_hit, n_ev, low in catalog.summary():
+                print(f"{tail:<8} {thr:>6.1f} {n_fl:>8} {n_hit:>8} {n_ev:>7} {low:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
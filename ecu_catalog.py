@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+ECU Session Catalog
+===================
+Persistent SQLite catalog (data/ecu_sessions.sqlite) of AustroView ECU
+sessions. Every DataLog_*.ae3 export re-exports the sessions it contains, so
+the same engine run usually appears as several session CSVs across dumps.
+
+Each session is identified once by its start time (from the filename),
+length and content hash:
+
+  - A session CSV whose path, size and mtime are already recorded is not
+    opened at all.
+  - A new file is hashed (read, not parsed); if the identity is already
+    known it is just linked to the existing session as another export.
+  - Cruise statistics are computed once per session, from one export, and
+    stored with a version number, so repeat history runs read the stats
+    from the catalog without touching any ECU CSV.
+
+Where two exports of one start time differ (e.g. a truncated dump), the
+longest is reported.
+
+Usage:
+    python ecu_catalog.py                                 # ../AustroView/Data/Parsed
+    python ecu_catalog.py --ecu data/synth/N238PS/ecu --db /tmp/ecu.sqlite
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from ecu_reader import read_ecu_session
+from flight_phases import CRUISE, classify_phases
+from logio import glob_logs, open_log_reader, strip_compression_suffix
+from parse_cache import file_signature
+
+DATA_DIR = Path(__file__).parent / "data"
+DEFAULT_DB = DATA_DIR / "ecu_sessions.sqlite"
+ECU_PARSED_DIR = Path(__file__).parent / ".." / "AustroView" / "Data" / "Parsed"
+
+SESSION_GLOB = "*_session*_2*.csv"
+SESSION_RE = re.compile(r"session(\d+)_(\d{8})_(\d{6})\.csv$")
+STATS_VERSION = 1
+HASH_CHUNK = 1 << 20
+
+MIN_SAMPLES = 60
+MIN_CRUISE = 30
+ALTERNATOR_ONLINE_V = 25.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id            INTEGER PRIMARY KEY,
+    number        INTEGER NOT NULL,
+    start_time    TEXT NOT NULL,
+    n_bytes       INTEGER NOT NULL,
+    content_hash  TEXT NOT NULL,
+    file          TEXT NOT NULL,
+    stats_version INTEGER,
+    n_samples     INTEGER,
+    n_cruise      INTEGER,
+    mean          REAL,
+    std           REAL,
+    min           REAL,
+    UNIQUE (start_time, n_bytes, content_hash)
+);
+CREATE TABLE IF NOT EXISTS files (
+    path        TEXT PRIMARY KEY,
+    signature   TEXT NOT NULL,
+    session_id  INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS files_session ON files (session_id);
+"""
+
+
+def content_identity(path):
+    """(length in bytes, sha1 hex) of a log's decompressed content, streamed."""
+    digest = hashlib.sha1()
+    n = 0
+    with open_log_reader(path) as f:
+        while True:
+            chunk = f.read(HASH_CHUNK)
+            if not chunk:
+                break
+            digest.update(chunk)
+            n += len(chunk)
+    return n, digest.hexdigest()
+
+
+def cruise_stats(volts, rpms=None):
+    """Cruise voltage stats of one session's battery voltage (and engine speed) arrays.
+
+    Cruise comes from flight_phases on the engine speed; without one, the
+    alternator-online test (voltage > 25 V) is used. Returns a dict, with
+    mean/std/min None when the session has fewer than 60 valid samples or
+    30 in cruise.
+    """
+    valid = volts > 0
+    varr = volts[valid]
+    out = {"n_samples": len(varr), "n_cruise": 0, "mean": None, "std": None, "min": None}
+    if len(varr) < MIN_SAMPLES:
+        return out
+    if rpms is not None:
+        cruise = varr[classify_phases({"rpm": rpms[valid]}) == CRUISE]
+    else:
+        cruise = varr[varr > ALTERNATOR_ONLINE_V]
+    out["n_cruise"] = len(cruise)
+    if len(cruise) < MIN_CRUISE:
+        return out
+    out.update(mean=float(np.mean(cruise)), std=float(np.std(cruise)), min=float(np.min(varr)))
+    return out
+
+
+def session_stats(path):
+    """cruise_stats() of one session CSV."""
+    _, volts, rpms = read_ecu_session(path)
+    return cruise_stats(volts, rpms)
+
+
+class EcuCatalog:
+    """SQLite catalog of ECU sessions, their exports and cached cruise stats."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def scan(self, ecu_dir):
+        """Record every session CSV under ecu_dir.
+
+        Returns (session ids present in ecu_dir, files seen, files hashed).
+        Files already recorded with the same size and mtime are not opened.
+        """
+        known = {p: (sig, sid) for p, sig, sid in
+                 self.conn.execute("SELECT path, signature, session_id FROM files")}
+        ids, n_files, n_hashed = [], 0, 0
+        with self.conn:
+            for path in glob_logs(ecu_dir, SESSION_GLOB):
+                name = strip_compression_suffix(path.name)
+                m = SESSION_RE.search(name)
+                if not m:
+                    continue
+                n_files += 1
+                apath, sig = os.path.abspath(path), file_signature(path)
+                cached = known.get(apath)
+                if cached is not None and cached[0] == sig:
+                    ids.append(cached[1])
+                    continue
+                n_bytes, digest = content_identity(path)
+                n_hashed += 1
+                start = m.group(2) + m.group(3)
+                row = self.conn.execute(
+                    "SELECT id FROM sessions WHERE start_time = ? AND n_bytes = ? AND content_hash = ?",
+                    (start, n_bytes, digest)).fetchone()
+                sid = row[0] if row else self.conn.execute(
+                    "INSERT INTO sessions (number, start_time, n_bytes, content_hash, file) "
+                    "VALUES (?, ?, ?, ?, ?)", (int(m.group(1)), start, n_bytes, digest, name)).lastrowid
+                self.conn.execute("INSERT OR REPLACE INTO files (path, signature, session_id) VALUES (?, ?, ?)",
+                                  (apath, sig, sid))
+                ids.append(sid)
+        return sorted(set(ids)), n_files, n_hashed
+
+    def distinct(self, ids):
+        """One session id per start time among ids: the longest content (earliest recorded on ties)."""
+        best = {}
+        for sid, start, n_bytes in self._select("id, start_time, n_bytes", ids):
+            if start not in best or n_bytes > best[start][1]:
+                best[start] = (sid, n_bytes)
+        return sorted(sid for sid, _ in best.values())
+
+    def _select(self, columns, ids):
+        rows = []
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows += self.conn.execute(f"SELECT {columns} FROM sessions WHERE id IN "
+                                      f"({', '.join('?' * len(chunk))}) ORDER BY id", chunk).fetchall()
+        return rows
+
+    def update_stats(self, ids):
+        """Compute cruise stats for sessions in ids that lack current ones. Returns sessions parsed."""
+        stale = [sid for sid, version in self._select("id, stats_version", ids) if version != STATS_VERSION]
+        n = 0
+        for sid in stale:
+            paths = [p for (p,) in self.conn.execute(
+                "SELECT path FROM files WHERE session_id = ? ORDER BY path", (sid,)) if os.path.exists(p)]
+            if not paths:
+                continue
+            st = session_stats(paths[0])
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE sessions SET stats_version = ?, n_samples = ?, n_cruise = ?, mean = ?, std = ?, "
+                    "min = ? WHERE id = ?",
+                    (STATS_VERSION, st["n_samples"], st["n_cruise"], st["mean"], st["std"], st["min"], sid))
+            n += 1
+        return n
+
+    def sessions(self, ecu_dir):
+        """Per-session cruise stats for ecu_dir, one entry per engine run, sorted by date.
+
+        Same dicts as voltage_history.parse_ecu_sessions: date, file, mean,
+        std, min, n_cruise; sessions without enough cruise data are omitted.
+        """
+        ids, _, _ = self.scan(ecu_dir)
+        ids = self.distinct(ids)
+        self.update_stats(ids)
+        return self.report(ids)
+
+    def report(self, ids):
+        """Cruise-stats dicts for the given session ids (see sessions())."""
+        out = [{
+            "date": datetime.strptime(start, "%Y%m%d%H%M%S"), "file": fname,
+            "mean": mean, "std": std, "min": vmin, "n_cruise": n_cruise,
+        } for start, fname, mean, std, vmin, n_cruise
+            in self._select("start_time, file, mean, std, min, n_cruise", ids) if mean is not None]
+        out.sort(key=lambda s: s["date"])
+        return out
+
+    def summary(self):
+        """(sessions, export files, sessions with stats)."""
+        return self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM sessions), (SELECT COUNT(*) FROM files), "
+            "(SELECT COUNT(*) FROM sessions WHERE mean IS NOT NULL)").fetchone()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalog of AustroView ECU sessions with cached cruise stats")
+    parser.add_argument("--ecu", default=str(ECU_PARSED_DIR),
+                        help="Directory of AustroView session CSVs (default: ../AustroView/Data/Parsed)")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help="Catalog path (default: data/ecu_sessions.sqlite)")
+    args = parser.parse_args()
+
+    ecu_dir = Path(args.ecu)
+    if not ecu_dir.is_dir():
+        print(f"ECU directory not found: {ecu_dir}")
+        sys.exit(1)
+
+    with EcuCatalog(args.db) as catalog:
+        t0 = time.perf_counter()
+        ids, n_files, n_hashed = catalog.scan(ecu_dir)
+        picked = catalog.distinct(ids)
+        n_parsed = catalog.update_stats(picked)
+        sessions = catalog.report(picked)
+        print(f"{n_files} session files in {ecu_dir}: {len(picked)} distinct sessions, "
+              f"{n_files - len(picked)} duplicate exports")
+        print(f"  {n_hashed} files hashed, {n_parsed} sessions parsed ({time.perf_counter() - t0:.2f} s)\n")
+
+        print(f"{'Date':<17} {'Cruise V':>8} {'Std':>6} {'Min':>6} {'N cruise':>9}  File")
+        print("-" * 90)
+        for s in sessions:
+            print(f"{s['date']:%Y-%m-%d %H:%M} {s['mean']:>8.2f} {s['std']:>6.3f} {s['min']:>6.2f} "
+                  f"{s['n_cruise']:>9}  {s['file']}")
+        n_sessions, n_exports, n_stats = catalog.summary()
+        print(f"\nCatalog {args.db}: {n_sessions} sessions, {n_exports} export files, {n_stats} with cruise stats")
+
+
+if __name__ == "__main__":
+    main()
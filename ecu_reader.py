@@ -0,0 +1,98 @@
+"""
+Columnar AustroView ECU Session Reader
+======================================
+Reads only the needed channels from an AustroView session CSV. The AE300
+export is wide (hundreds of ECU channels per row), but the voltage analysis
+needs just Timestamp, Battery Voltage [V] (channel 808) and engine speed.
+Column indices are resolved from the header once; the body is bulk-loaded
+with np.loadtxt restricted to those columns, and timestamps go through
+NumPy's vectorized datetime64 parser instead of a strptime() call per row.
+
+Blank or malformed cells become NaN (NaN time for bad timestamps), so every
+returned array has one entry per data row.
+"""
+
+import numpy as np
+
+from logio import open_log
+
+ECU_TIMESTAMP = "Timestamp"
+ECU_VOLTAGE = "Battery Voltage [V]"
+
+
+def ecu_rpm_column(fieldnames):
+    """Name of the engine speed column in an AustroView CSV header, or None."""
+    for name in fieldnames:
+        lower = name.lower()
+        if lower.startswith("engine speed") or "rpm" in lower:
+            return name
+    return None
+
+
+def _to_float(col):
+    """String column -> float64, blanks and junk as NaN."""
+    col = np.char.strip(col)
+    try:
+        return np.where(col == "", "nan", col).astype(np.float64)
+    except ValueError:
+        out = np.full(len(col), np.nan)
+        for i, s in enumerate(col.tolist()):
+            try:
+                out[i] = float(s)
+            except ValueError:
+                pass
+        return out
+
+
+def _to_epoch(col):
+    """'YYYY-MM-DD HH:MM:SS' column -> float64 epoch seconds, NaN where unparseable."""
+    col = np.char.strip(col)
+    try:
+        return np.array(col, dtype="datetime64[s]").astype(np.int64).astype(np.float64)
+    except ValueError:
+        out = np.full(len(col), np.nan)
+        for i, s in enumerate(col.tolist()):
+            try:
+                out[i] = float(np.datetime64(s, "s").astype(np.int64))
+            except ValueError:
+                pass
+        return out
+
+
+def _split_columns(lines, indices):
+    """String columns at the given indices; short rows get blank cells."""
+    if not lines:
+        return [np.array([], dtype=str) for _ in indices]
+    try:
+        cols = np.loadtxt(lines, delimiter=",", usecols=indices, dtype=str, ndmin=2,
+                          comments=None, quotechar='"')
+        return [cols[:, k] for k in range(len(indices))]
+    except ValueError:
+        rows = [line.rstrip("\r\n").split(",") for line in lines]
+        return [np.array([r[i] if i < len(r) else "" for r in rows], dtype=str) for i in indices]
+
+
+def read_ecu_session(filepath, rpm=True):
+    """Read Timestamp, battery voltage and (optionally) engine speed from a session CSV.
+
+    Returns (t, volts, rpm): t is float64 UTC-naive epoch seconds (the ECU
+    clock as recorded), volts and rpm are float64 arrays. rpm is None if
+    not requested or if the export has no engine speed column; volts is
+    all-NaN if Battery Voltage [V] is missing.
+    """
+    with open_log(filepath, errors="replace") as f:
+        header = [h.strip() for h in f.readline().split(",")]
+        lines = [line for line in f if line.strip()]
+
+    wanted = [ECU_TIMESTAMP, ECU_VOLTAGE]
+    rpm_col = ecu_rpm_column(header) if rpm else None
+    if rpm_col:
+        wanted.append(rpm_col)
+    present = [name for name in wanted if name in header]
+    cols = dict(zip(present, _split_columns(lines, [header.index(name) for name in present])))
+
+    n = len(lines)
+    t = _to_epoch(cols[ECU_TIMESTAMP]) if ECU_TIMESTAMP in cols else np.full(n, np.nan)
+    volts = _to_float(cols[ECU_VOLTAGE]) if ECU_VOLTAGE in cols else np.full(n, np.nan)
+    rpms = _to_float(cols[rpm_col]) if rpm_col else None
+    return t, volts, rpms
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Local FlySto.net Stand-in Server
+================================
+Serves the subset of the FlySto API that flysto_download.py uses, so the
+downloader can be exercised and benchmarked offline:
+
+    POST /api/login                         -> 204 + session cookie
+    GET  /api/log-list                      -> obfuscated RESPONSE, list of log IDs
+    GET  /api/log-summary?logs=a,b,...      -> obfuscated RESPONSE, per-log file list
+    GET  /log-files/<id>/<format>/<file>    -> raw log bytes (supports Range)
+
+JSON responses use the same RESPONSE encoding as the real service and may
+carry the 'wait' prefix. Latency, failure injection and corpus size are
+configurable.
+
+Usage:
+    python fake_flysto.py                           # 200 logs on http://127.0.0.1:8765
+    python fake_flysto.py --logs 2000 --latency 50  # bigger corpus, 50 ms per request
+    python fake_flysto.py --fail-rate 0.05 --truncate-rate 0.02
+
+Then point the downloader at it:
+    FLYSTO_URL=http://127.0.0.1:8765 FLYSTO_EMAIL=test@example.com \\
+    FLYSTO_PASSWORD=test python flysto_download.py --output /tmp/flysto_source
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from flysto_download import decode_flysto
+
+DATA_DIR = Path(__file__).parent / "data"
+
+DEFAULT_EMAIL = "test@example.com"
+DEFAULT_PASSWORD = "test"
+
+
+def encode_flysto(s: str) -> str:
+    """Encode a string with FlySto's response obfuscation (the mapping is its own inverse)."""
+    return decode_flysto(s)
+
+
+# =============================================================================
+# Corpus
+# =============================================================================
+
+def build_corpus(n_logs, source_files, seed=0, start=datetime(2023, 6, 1, 14, 0)):
+    """Build a synthetic log catalog of n_logs entries, most recent first.
+
+    Each entry is a dict with 'id', 'file' (G1000-style log filename),
+    'format' and 'path' (the source file whose bytes are served). Source files
+    are cycled so the corpus can be much larger than the files on disk.
+    """
+    rng = random.Random(seed)
+    airports = ["KBOW", "KSPG", "KLAL", "KORL", "KTPA", "KSRQ", "KGIF", "KPIE"]
+    logs = []
+    when = start
+    for i in range(n_logs):
+        when += timedelta(hours=rng.randint(6, 96), minutes=rng.randint(0, 59))
+        fname = f"log_{when:%y%m%d_%H%M%S}_{rng.choice(airports)}.csv"
+        logs.append({
+            "id": f"{rng.getrandbits(40):010x}",
+            "file": fname,
+            "format": "G3000",
+            "path": source_files[i % len(source_files)],
+        })
+    logs.reverse()  # FlySto lists most recent first
+    return logs
+
+
+class FakeFlySto:
+    """Server state: corpus, credentials, fault settings and counters."""
+
+    def __init__(self, logs, latency=0.0, jitter=0.0, fail_rate=0.0, wait_rate=0.0,
+                 truncate_rate=0.0, email=DEFAULT_EMAIL, password=DEFAULT_PASSWORD,
+                 seed=0):
+        self.logs = logs
+        self.by_id = {log["id"]: log for log in logs}
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.wait_rate = wait_rate
+        self.truncate_rate = truncate_rate
+        self.email = email
+        self.password = password
+        self.tokens = set()
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {"requests": 0, "failures": 0, "truncated": 0,
+                         "files": 0, "bytes": 0}
+        self._file_cache = {}
+
+    def file_bytes(self, path):
+        with self.lock:
+            data = self._file_cache.get(path)
+            if data is None:
+                data = Path(path).read_bytes()
+                self._file_cache[path] = data
+        return data
+
+    def roll(self, rate):
+        with self.lock:
+            return rate > 0 and self.rng.random() < rate
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.counters[key] += n
+
+    def delay(self):
+        if self.latency or self.jitter:
+            with self.lock:
+                extra = self.rng.uniform(0, self.jitter)
+            time.sleep(self.latency + extra)
+
+
+# =============================================================================
+# HTTP handler
+# =============================================================================
+
+class FlyStoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: FakeFlySto = None  # set per server by make_server()
+
+    def log_message(self, fmt, *args):
+        pass  # keep benchmark output clean
+
+    # --- helpers ---
+
+    def _send(self, status, body=b"", content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _send_json(self, obj):
+        payload = json.dumps({"RESPONSE": encode_flysto(json.dumps(obj))})
+        if self.state.roll(self.state.wait_rate):
+            payload = "wait\n" + payload
+        self._send(200, payload.encode("utf-8"))
+
+    def _authorized(self):
+        cookie = self.headers.get("Cookie", "")
+        m = re.search(r"session=([0-9a-f]+)", cookie)
+        return bool(m and m.group(1) in self.state.tokens)
+
+    def _preamble(self):
+        """Common per-request latency, counting and failure injection. False = already answered."""
+        st = self.state
+        st.count("requests")
+        st.delay()
+        if st.roll(st.fail_rate):
+            st.count("failures")
+            self._send(503, b"Service Unavailable", "text/plain")
+            return False
+        return True
+
+    # --- endpoints ---
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        if not self._preamble():
+            return
+        if urlparse(self.path).path != "/api/login":
+            self._send(404, b"Not Found", "text/plain")
+            return
+        try:
+            creds = json.loads(body or b"{}")
+        except ValueError:
+            creds = {}
+        if creds.get("email") != self.state.email or creds.get("password") != self.state.password:
+            self._send(401, b"Unauthorized", "text/plain")
+            return
+        token = f"{random.getrandbits(64):016x}"
+        with self.state.lock:
+            self.state.tokens.add(token)
+        self._send(204, headers={"Set-Cookie": f"session={token}; Path=/"})
+
+    def do_GET(self):
+        if not self._preamble():
+            return
+        url = urlparse(self.path)
+        if not self._authorized():
+            self._send(401, b"Unauthorized", "text/plain")
+            return
+
+        if url.path == "/api/log-list":
+            self._send_json([log["id"] for log in self.state.logs])
+        elif url.path == "/api/log-summary":
+            ids = parse_qs(url.query).get("logs", [""])[0].split(",")
+            items = []
+            for log_id in ids:
+                log = self.state.by_id.get(log_id)
+                if log is None:
+                    continue
+                items.append({"id": log_id, "summary": {"data": {"t3": [
+                    {"format": log["format"], "file": log["file"]},
+                    {"format": "KML", "file": log["file"].replace(".csv", ".kml")},
+                ]}}})
+            self._send_json({"items": items})
+        elif url.path.startswith("/log-files/"):
+            self._serve_file(url.path)
+        else:
+            self._send(404, b"Not Found", "text/plain")
+
+    def _serve_file(self, path):
+        parts = path.split("/")
+        if len(parts) != 5:
+            self._send(404, b"Not Found", "text/plain")
+            return
+        _, _, log_id, fmt, fname = parts
+        log = self.state.by_id.get(log_id)
+        if log is None or fmt != log["format"] or fname != log["file"]:
+            self._send(404, b"Not Found", "text/plain")
+            return
+
+        data = self.state.file_bytes(log["path"])
+        status, start = 200, 0
+        headers = {"Accept-Ranges": "bytes"}
+        m = re.match(r"bytes=(\d+)-$", self.headers.get("Range", ""))
+        if m and int(m.group(1)) < len(data):
+            status, start = 206, int(m.group(1))
+            headers["Content-Range"] = f"bytes {start}-{len(data) - 1}/{len(data)}"
+        body = data[start:]
+
+        if self.state.roll(self.state.truncate_rate):
+            # Announce the full length, send part of it, then drop the connection
+            self.state.count("truncated")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/csv")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+
+        self.state.count("files")
+        self.state.count("bytes", len(body))
+        self._send(status, body, "text/csv", headers)
+
+
+def make_server(state, host="127.0.0.1", port=0):
+    """Create (but do not start) a threaded server for `state`. port=0 picks a free port."""
+    handler = type("BoundFlyStoHandler", (FlyStoHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve_in_background(state, host="127.0.0.1", port=0):
+    """Start a server on a daemon thread. Returns (server, base_url); call server.shutdown() to stop."""
+    server = make_server(state, host, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the FlySto.net API")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    parser.add_argument("--logs", type=int, default=200, help="Number of logs in the corpus (default: 200)")
+    parser.add_argument("--source", default=None,
+                        help="Directory of CSVs to serve (default: the G1000 CSVs in data/)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed per-request latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency up to N ms")
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with HTTP 503")
+    parser.add_argument("--wait-rate", type=float, default=0.5,
+                        help="Fraction of JSON responses carrying the 'wait' prefix (default: 0.5)")
+    parser.add_argument("--truncate-rate", type=float, default=0.0,
+                        help="Fraction of file downloads cut off halfway")
+    parser.add_argument("--email", default=DEFAULT_EMAIL, help=f"Accepted email (default: {DEFAULT_EMAIL})")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Accepted password (default: test)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for corpus and fault injection")
+    args = parser.parse_args()
+
+    source_dir = Path(args.source) if args.source else DATA_DIR
+    source_files = sorted(source_dir.glob("*.csv"))
+    if args.source is None:
+        source_files = [p for p in source_files if p.name.startswith("N")]
+    if not source_files:
+        print(f"No CSV files found in {source_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    logs = build_corpus(args.logs, source_files, seed=args.seed)
+    state = FakeFlySto(logs, latency=args.latency / 1000.0, jitter=args.jitter / 1000.0,
+                       fail_rate=args.fail_rate, wait_rate=args.wait_rate,
+                       truncate_rate=args.truncate_rate, email=args.email,
+                       password=args.password, seed=args.seed)
+    server = make_server(state, args.host, args.port)
+    print(f"Fake FlySto serving {len(logs)} logs from {len(source_files)} source files "
+          f"on http://{args.host}:{server.server_address[1]}")
+    print(f"  Login: {args.email} / {args.password}   latency: {args.latency:.0f}+{args.jitter:.0f} ms   "
+          f"fail: {args.fail_rate:.0%}   truncate: {args.truncate_rate:.0%}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        c = state.counters
+        print(f"\n{c['requests']} requests, {c['files']} files ({c['bytes']:,} bytes), "
+              f"{c['failures']} injected failures, {c['truncated']} truncated downloads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Flight-Phase Classifier
+=======================
+Labels every sample of a G1000 flight (or AustroView ECU session) with a
+flight phase using E1 RPM, IAS, GndSpd, VSpd and AltInd, in one vectorized
+pass -- no per-sample Python loop.
+
+Phases:
+    PRE_START  engine not yet running
+    TAXI       engine running on the ground (incl. landing roll-out below 35 kt)
+    RUNUP      engine running, stationary, RPM at run-up power
+    TAKEOFF    takeoff roll and initial climb until the first level-off
+    CRUISE     airborne, not descending (incl. later climbs)
+    DESCENT    airborne descending, plus the high-speed landing roll
+    SHUTDOWN   engine stopped after having run
+
+Channels that are missing (all NaN) degrade gracefully: without IAS the
+airborne test uses GndSpd plus height above the field from AltInd; with RPM
+only (ECU sessions) running samples at run-up power or above are CRUISE and
+the rest TAXI.
+
+Replaces the old "volt1 > 25.0 V means alternator online" cruise heuristic,
+which mislabelled low-voltage cruise samples as ground time.
+"""
+
+import numpy as np
+
+from g1000_reader import load_g1000_channels
+from parse_cache import cached_arrays
+
+PRE_START, TAXI, RUNUP, TAKEOFF, CRUISE, DESCENT, SHUTDOWN = range(7)
+PHASE_NAMES = ("pre-start", "taxi", "runup", "takeoff", "cruise", "descent", "shutdown")
+
+PHASE_CHANNELS = ("rpm", "ias", "gndspd", "vspd", "altind")
+
+ENGINE_RUNNING_RPM = 500.0   # E1 RPM above this = engine running
+RUNUP_RPM = 1600.0           # stationary at or above this = run-up
+STATIONARY_KT = 3.0          # GndSpd below this = not moving
+ROLL_KT = 35.0               # ground speed of a takeoff / landing roll
+AIRBORNE_IAS = 50.0          # IAS above this = flying
+AIRBORNE_AGL_FT = 200.0      # fallback without IAS: height above the field
+LEVEL_FPM = 300.0            # |smoothed VSpd| below this = level flight
+VSPD_SMOOTH_S = 30           # VSpd moving-average window (samples ~ seconds)
+TAKEOFF_MAX_SAMPLES = 900    # initial climb never runs longer than this (~15 min at 1 Hz)
+
+PHASES_CACHE_VERSION = 1
+
+
+def _has(x):
+    return x is not None and np.any(~np.isnan(x))
+
+
+def _smooth(x, n):
+    """NaN-aware centred moving average."""
+    valid = ~np.isnan(x)
+    kernel = np.ones(n)
+    num = np.convolve(np.where(valid, x, 0.0), kernel, mode="same")
+    den = np.convolve(valid.astype(float), kernel, mode="same")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return num / den
+
+
+def _ffill_index(mask):
+    """For each sample, index of the most recent True in mask (-1 if none yet)."""
+    return np.maximum.accumulate(np.where(mask, np.arange(len(mask)), -1))
+
+
+def _bfill_index(mask):
+    """For each sample, index of the next True in mask (len(mask) if none)."""
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    return np.minimum.accumulate(idx[::-1])[::-1]
+
+
+def classify_phases(data):
+    """Phase code (int8, see PHASE_NAMES) per sample.
+
+    data maps channel short names (see PHASE_CHANNELS) to equal-length float
+    arrays; absent or all-NaN channels are tolerated.
+    """
+    rpm = np.asarray(data["rpm"], dtype=float)
+    n = len(rpm)
+    ias, gs, vspd, alt = (np.asarray(data[ch], dtype=float) if ch in data and _has(data[ch]) else None
+                          for ch in ("ias", "gndspd", "vspd", "altind"))
+
+    running = rpm > ENGINE_RUNNING_RPM
+    ran_before = np.maximum.accumulate(running) if n else running
+    phase = np.where(ran_before, SHUTDOWN, PRE_START).astype(np.int8)
+
+    if ias is None and gs is None:
+        # RPM only (ECU sessions): power setting is all we know
+        phase[running] = TAXI
+        phase[running & (rpm >= RUNUP_RPM)] = CRUISE
+        return phase
+
+    gs_ = np.nan_to_num(gs, nan=0.0) if gs is not None else np.zeros(n)
+    if ias is not None:
+        airborne = np.nan_to_num(ias, nan=0.0) > AIRBORNE_IAS
+    else:
+        on_ramp = running & (gs_ < STATIONARY_KT)
+        ground_alt = np.nanmedian(alt[on_ramp]) if alt is not None and np.any(on_ramp) else np.nan
+        airborne = gs_ > AIRBORNE_IAS
+        if not np.isnan(ground_alt):
+            airborne &= np.nan_to_num(alt - ground_alt, nan=0.0) > AIRBORNE_AGL_FT
+    airborne &= ran_before  # a gliding engine-out still counts as flying
+
+    # Ground phases
+    ground = running & ~airborne
+    phase[ground] = TAXI
+    phase[ground & (gs_ < STATIONARY_KT) & (rpm >= RUNUP_RPM)] = RUNUP
+    fast = ground & (gs_ >= ROLL_KT)
+    if np.any(fast):
+        last_air, next_air = _ffill_index(airborne), _bfill_index(airborne)
+        i = np.arange(n)
+        toward_takeoff = (next_air - i) < np.where(last_air < 0, n + 1, i - last_air)
+        phase[fast & toward_takeoff] = TAKEOFF
+        phase[fast & ~toward_takeoff] = DESCENT
+
+    # Airborne phases
+    if np.any(airborne):
+        vs = _smooth(vspd, VSPD_SMOOTH_S) if vspd is not None else np.zeros(n)
+        phase[airborne] = CRUISE
+        vs = np.nan_to_num(vs, nan=0.0)
+        # Initial climb: from liftoff until the first level-off after climbing,
+        # within each airborne segment
+        liftoff = airborne & ~np.concatenate(([False], airborne[:-1]))
+        seg_start = _ffill_index(liftoff)
+        climbed = _ffill_index(airborne & (vs > LEVEL_FPM)) >= seg_start
+        leveled = _ffill_index(airborne & climbed & (vs < LEVEL_FPM))
+        initial = (leveled < seg_start) & (np.arange(n) - seg_start < TAKEOFF_MAX_SAMPLES)
+        phase[airborne & initial] = TAKEOFF
+        phase[airborne & (vs < -LEVEL_FPM)] = DESCENT
+    return phase
+
+
+def phase_durations(t, phase):
+    """Seconds spent in each phase: dict name -> seconds."""
+    if len(t) < 2:
+        return {name: 0.0 for name in PHASE_NAMES}
+    dt = np.diff(t, append=t[-1])
+    dt = np.clip(dt, 0.0, 10.0)  # don't credit logging gaps to a phase
+    totals = np.bincount(phase, weights=dt, minlength=len(PHASE_NAMES))
+    return {name: float(totals[i]) for i, name in enumerate(PHASE_NAMES)}
+
+
+def load_flight_phases(filepath, channels=("volt1",)):
+    """G1000 channels plus per-sample phase, classified during the (cached) parse.
+
+    Returns (t, data, phase) with data restricted to `channels`.
+    """
+    def compute(path):
+        t, data = load_g1000_channels(path, PHASE_CHANNELS)
+        return {"phase": classify_phases(data)}
+
+    t, data = load_g1000_channels(filepath, channels)
+    phase = cached_arrays("g1000_phases", filepath, compute, version=PHASES_CACHE_VERSION)["phase"]
+    return t, data, phase
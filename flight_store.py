@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Local Time-Series Store for All Flights
+=======================================
+An embedded SQLite database (data/flights.sqlite) holding per-sample
+volt1/volt2 plus key engine and air-data channels for every ingested
+G1000 flight, indexed by tail, flight start time and sample time.
+
+Ad-hoc questions such as "all flights in March with volt1 < 25.5 V for
+more than 5 s" become an indexed range query plus one vectorized pass,
+instead of re-parsing the whole CSV archive.
+
+Python API (all query results are NumPy arrays):
+
+    store = FlightStore()
+    fl = store.flights(tail="N238PS", start="2024-03-01", end="2024-04-01")
+    s = store.samples(["volt1", "rpm"], flight_ids=fl["id"])
+    hits = store.flights_with_excursion("volt1", 25.5, 5.0, tail="N238PS",
+                                        start="2024-03-01", end="2024-04-01")
+
+Usage:
+    python flight_store.py ingest                          # data/source/ as N238PS
+    python flight_store.py ingest --source DIR --tail N541SA
+    python flight_store.py ingest --fleet data/fleet       # one subdirectory per tail
+    python flight_store.py info
+    python flight_store.py query --tail N238PS --start 2024-03-01 --end 2024-04-01 \\
+        --below 25.5 --min-seconds 5
+"""
+
+import argparse
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from g1000_reader import G1000_CHANNELS, load_g1000_channels
+from logio import glob_logs, strip_compression_suffix
+from parse_cache import file_signature
+
+DATA_DIR = Path(__file__).parent / "data"
+SOURCE_DIR = DATA_DIR / "source"
+DEFAULT_DB = DATA_DIR / "flights.sqlite"
+HOME_TAIL = "N238PS"
+
+CHANNELS = tuple(G1000_CHANNELS)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS flights (
+    id          INTEGER PRIMARY KEY,
+    tail        TEXT NOT NULL,
+    file        TEXT NOT NULL,
+    signature   TEXT NOT NULL,
+    start_time  REAL NOT NULL,
+    end_time    REAL NOT NULL,
+    n_samples   INTEGER NOT NULL,
+    UNIQUE (tail, file)
+);
+CREATE INDEX IF NOT EXISTS flights_tail_start ON flights (tail, start_time);
+CREATE INDEX IF NOT EXISTS flights_start ON flights (start_time);
+
+CREATE TABLE IF NOT EXISTS samples (
+    flight_id   INTEGER NOT NULL REFERENCES flights (id) ON DELETE CASCADE,
+    t           REAL NOT NULL,
+    {", ".join(f"{c} REAL" for c in CHANNELS)},
+    PRIMARY KEY (flight_id, t)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_t ON samples (t);
+"""
+
+
+def to_epoch(when):
+    """datetime / 'YYYY-MM-DD[ HH:MM[:SS]]' / POSIX seconds -> POSIX seconds (naive = UTC)."""
+    if when is None:
+        return None
+    if isinstance(when, (int, float, np.floating, np.integer)):
+        return float(when)
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+def epoch_to_datetime(t):
+    """POSIX seconds -> naive UTC datetime (matches the rest of the scripts)."""
+    return datetime.fromtimestamp(float(t), tz=timezone.utc).replace(tzinfo=None)
+
+
+def runs_below(t, values, threshold, min_seconds=0.0):
+    """Run-length encode samples below threshold.
+
+    Returns (start_idx, end_idx) arrays of runs (end exclusive) whose
+    duration t[end-1] - t[start] + sample period is at least min_seconds.
+    NaN samples break a run.
+    """
+    below = np.asarray(values) < threshold
+    edges = np.diff(np.concatenate(([0], below.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0 or min_seconds <= 0:
+        return starts, ends
+    period = np.median(np.diff(t)) if len(t) > 1 else 1.0
+    duration = t[ends - 1] - t[starts] + period
+    keep = duration >= min_seconds
+    return starts[keep], ends[keep]
+
+
+def _parse_job(job):
+    """Worker entry point: (tail, path) -> ((tail, name, signature, t, data), None),
+    or (None, error message) for a log that cannot be read."""
+    tail, path = job
+    try:
+        t, data = load_g1000_channels(path, CHANNELS)
+    except Exception as e:  # any unreadable log (truncated gzip, bad zstd frame, ...) is skipped, not fatal
+        return None, f"{tail}/{Path(path).name}: {type(e).__name__}: {e}"
+    return (tail, strip_compression_suffix(Path(path).name), file_signature(path), t, data), None
+
+
+def _check_channels(channels):
+    # Channel names are interpolated into SQL, so only known columns get through
+    bad = [c for c in channels if c not in CHANNELS]
+    if bad:
+        raise ValueError(f"Unknown channel(s): {', '.join(bad)}")
+
+
+class FlightStore:
+    """SQLite-backed per-sample store for G1000 flights."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- ingestion ---
+
+    def _known_signatures(self):
+        return {(tail, file): sig for tail, file, sig in
+                self.conn.execute("SELECT tail, file, signature FROM flights")}
+
+    def ingest(self, files_by_tail, workers=None):
+        """Ingest {tail: [csv paths]}. Unchanged files are skipped, changed ones replaced.
+
+        Files are parsed in parallel (through the parse cache); inserts run in
+        this process. A log that cannot be read is skipped (and retried on the
+        next ingest). Returns (flights added or updated, error message per
+        skipped log).
+        """
+        known = self._known_signatures()
+        jobs = [(tail, p) for tail, paths in files_by_tail.items() for p in paths
+                if known.get((tail, strip_compression_suffix(Path(p).name))) != file_signature(p)]
+        if not jobs:
+            return 0, []
+
+        pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 and len(jobs) > 1 else None
+        results = pool.map(_parse_job, jobs, chunksize=4) if pool else map(_parse_job, jobs)
+        n, failures = 0, []
+        try:
+            for flight, error in results:
+                if error:
+                    failures.append(error)
+                elif self.add_flight(*flight):
+                    n += 1
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return n, failures
+
+    def add_flight(self, tail, name, signature, t, data):
+        """Insert (or replace) one flight's samples. Returns False if it has no timestamps."""
+        if len(t) == 0:
+            return False
+        # Duplicate timestamps (G1000 occasionally repeats a second) keep the first row
+        t, first = np.unique(t, return_index=True)
+        cols = [np.where(np.isnan(data[c][first]), None, data[c][first]).tolist()
+                if c in data else [None] * len(t) for c in CHANNELS]
+        with self.conn:
+            self.conn.execute("DELETE FROM flights WHERE tail = ? AND file = ?", (tail, name))
+            cur = self.conn.execute(
+                "INSERT INTO flights (tail, file, signature, start_time, end_time, n_samples) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (tail, name, signature, float(t[0]), float(t[-1]), len(t)))
+            fid = cur.lastrowid
+            placeholders = ", ".join("?" * (len(CHANNELS) + 2))
+            self.conn.executemany(
+                f"INSERT INTO samples (flight_id, t, {', '.join(CHANNELS)}) VALUES ({placeholders})",
+                zip([fid] * len(t), t.tolist(), *cols))
+        return True
+
+    # --- queries ---
+
+    def flights(self, tail=None, start=None, end=None):
+        """Flights (optionally for one tail) starting in [start, end).
+
+        Returns a dict of arrays: id, tail, file, start_time, end_time, n_samples.
+        """
+        where, params = self._flight_filter(tail, start, end)
+        rows = self.conn.execute(
+            "SELECT id, tail, file, start_time, end_time, n_samples FROM flights"
+            f"{where} ORDER BY start_time", params).fetchall()
+        cols = list(zip(*rows)) if rows else [[]] * 6
+        return {
+            "id": np.array(cols[0], dtype=np.int64),
+            "tail": np.array(cols[1], dtype=str),
+            "file": np.array(cols[2], dtype=str),
+            "start_time": np.array(cols[3], dtype=float),
+            "end_time": np.array(cols[4], dtype=float),
+            "n_samples": np.array(cols[5], dtype=np.int64),
+        }
+
+    def samples(self, channels=("volt1",), flight_ids=None, tail=None, start=None, end=None):
+        """Samples of the given channels, ordered by flight then time.
+
+        Select either explicit flight_ids, or flights by tail and start-time
+        range. Returns a dict of arrays: flight_id, t and one float array
+        per channel (NaN where the G1000 logged a blank).
+        """
+        _check_channels(channels)
+        if flight_ids is None:
+            flight_ids = self.flights(tail, start, end)["id"]
+        flight_ids = [int(i) for i in flight_ids]
+        out = {"flight_id": [], "t": []}
+        out.update({c: [] for c in channels})
+        select = f"SELECT t, {', '.join(channels)} FROM samples WHERE flight_id = ? ORDER BY t"
+        for fid in flight_ids:
+            rows = self.conn.execute(select, (fid,)).fetchall()
+            if not rows:
+                continue
+            arr = np.array(rows, dtype=float)  # None -> nan
+            out["flight_id"].append(np.full(len(arr), fid, dtype=np.int64))
+            out["t"].append(arr[:, 0])
+            for i, c in enumerate(channels, start=1):
+                out[c].append(arr[:, i])
+        return {k: (np.concatenate(v) if v else np.array([], dtype=np.int64 if k == "flight_id" else float))
+                for k, v in out.items()}
+
+    def samples_between(self, start, end, channels=("volt1",), tail=None):
+        """Samples in the sample-time range [start, end) across all flights (uses the t index)."""
+        _check_channels(channels)
+        params = [to_epoch(start), to_epoch(end)]
+        sql = (f"SELECT s.flight_id, s.t, {', '.join('s.' + c for c in channels)} "
+               "FROM samples s")
+        if tail is not None:
+            sql += " JOIN flights f ON f.id = s.flight_id WHERE f.tail = ? AND s.t >= ? AND s.t < ?"
+            params.insert(0, tail)
+        else:
+            sql += " WHERE s.t >= ? AND s.t < ?"
+        rows = self.conn.execute(sql + " ORDER BY s.t", params).fetchall()
+        arr = np.array(rows, dtype=float).reshape(-1, len(channels) + 2)
+        out = {"flight_id": arr[:, 0].astype(np.int64), "t": arr[:, 1]}
+        out.update({c: arr[:, i] for i, c in enumerate(channels, start=2)})
+        return out
+
+    def flights_with_excursion(self, channel, below, min_seconds, tail=None, start=None, end=None):
+        """Flights with `channel` below `below` for at least min_seconds continuously.
+
+        Returns a dict of arrays: id, file, start_time, n_runs, longest (s), lowest (V).
+        """
+        fl = self.flights(tail, start, end)
+        ids, files, starts, n_runs, longest, lowest = [], [], [], [], [], []
+        for fid, fname, fstart in zip(fl["id"], fl["file"], fl["start_time"]):
+            s = self.samples([channel], flight_ids=[fid])
+            rs, re_ = runs_below(s["t"], s[channel], below, min_seconds)
+            if len(rs) == 0:
+                continue
+            period = np.median(np.diff(s["t"])) if len(s["t"]) > 1 else 1.0
+            ids.append(fid)
+            files.append(fname)
+            starts.append(fstart)
+            n_runs.append(len(rs))
+            longest.append(float(np.max(s["t"][re_ - 1] - s["t"][rs] + period)))
+            v = s[channel]
+            lowest.append(float(min(np.nanmin(v[a:b]) for a, b in zip(rs, re_))))
+        return {
+            "id": np.array(ids, dtype=np.int64), "file": np.array(files, dtype=str),
+            "start_time": np.array(starts, dtype=float), "n_runs": np.array(n_runs, dtype=np.int64),
+            "longest": np.array(longest, dtype=float), "lowest": np.array(lowest, dtype=float),
+        }
+
+    def _flight_filter(self, tail, start, end):
+        clauses, params = [], []
+        if tail is not None:
+            clauses.append("tail = ?")
+            params.append(tail)
+        if start is not None:
+            clauses.append("start_time >= ?")
+            params.append(to_epoch(start))
+        if end is not None:
+            clauses.append("start_time < ?")
+            params.append(to_epoch(end))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-sample time-series store for G1000 flights")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help="Database path (default: data/flights.sqlite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ing = sub.add_parser("ingest", help="Ingest G1000 CSVs (skips unchanged files)")
+    p_ing.add_argument("--source", default=str(SOURCE_DIR), help="Directory of CSVs for one aircraft")
+    p_ing.add_argument("--tail", default=HOME_TAIL, help=f"Tail number for --source (default: {HOME_TAIL})")
+    p_ing.add_argument("--fleet", default=None, help="Directory with one subdirectory of CSVs per tail")
+    p_ing.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+
+    sub.add_parser("info", help="Summarize the store contents")
+
+    p_q = sub.add_parser("query", help="Find flights with a sustained excursion below a threshold")
+    p_q.add_argument("--tail", default=None)
+    p_q.add_argument("--start", default=None, help="Flights starting on/after (YYYY-MM-DD)")
+    p_q.add_argument("--end", default=None, help="Flights starting before (YYYY-MM-DD)")
+    p_q.add_argument("--channel", default="volt1", choices=CHANNELS)
+    p_q.add_argument("--below", type=float, default=25.5, help="Threshold (default: 25.5)")
+    p_q.add_argument("--min-seconds", type=float, default=5.0, help="Minimum run length (default: 5)")
+    args = parser.parse_args()
+
+    with FlightStore(args.db) as store:
+        if args.command == "ingest":
+            if args.fleet:
+                files_by_tail = {d.name: glob_logs(d, "*.csv")
+                                 for d in sorted(Path(args.fleet).iterdir()) if d.is_dir()}
+            else:
+                files_by_tail = {args.tail: glob_logs(Path(args.source), "*.csv")}
+            n_files = sum(len(v) for v in files_by_tail.values())
+            print(f"Ingesting {n_files} CSV files from {len(files_by_tail)} aircraft into {store.path}...")
+            t0 = time.perf_counter()
+            n, failures = store.ingest(files_by_tail, args.workers)
+            print(f"  {n} flights added/updated, {n_files - n - len(failures)} unchanged or empty "
+                  f"({time.perf_counter() - t0:.1f} s)")
+            if failures:
+                print(f"  {len(failures)} unreadable log(s) skipped:")
+                for error in failures:
+                    print(f"    {error}")
+
+        elif args.command == "info":
+            rows = store.conn.execute(
+                "SELECT tail, COUNT(*), SUM(n_samples), MIN(start_time), MAX(start_time) "
+                "FROM flights GROUP BY tail ORDER BY tail").fetchall()
+            print(f"{'Tail':<10} {'Flights':>8} {'Samples':>12} {'First':>12} {'Last':>12}")
+            print("-" * 58)
+            for tail, n, ns, first, last in rows:
+                print(f"{tail:<10} {n:>8} {ns:>12,} {epoch_to_datetime(first):%Y-%m-%d} "
+                      f"  {epoch_to_datetime(last):%Y-%m-%d}")
+
+        elif args.command == "query":
+            t0 = time.perf_counter()
+            hits = store.flights_with_excursion(args.channel, args.below, args.min_seconds,
+                                                args.tail, args.start, args.end)
+            dt_ms = (time.perf_counter() - t0) * 1000
+            print(f"{len(hits['id'])} flights with {args.channel} < {args.below} V "
+                  f"for >= {args.min_seconds:g} s  ({dt_ms:.0f} ms)\n")
+            print(f"{'Start (UTC)':<17} {'Runs':>5} {'Longest':>8} {'Lowest':>7}  File")
+            print("-" * 80)
+            for i in range(len(hits["id"])):
+                print(f"{epoch_to_datetime(hits['start_time'][i]):%Y-%m-%d %H:%M} "
+                      f"{hits['n_runs'][i]:>5} {hits['longest'][i]:>7.0f}s "
+                      f"{hits['lowest'][i]:>7.2f}  {hits['file'][i]}")
+
+
+if __name__ == "__main__":
+    main()
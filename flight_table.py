@@ -0,0 +1,130 @@
+"""
+Per-Flight Summary Table
+========================
+Structure-of-arrays container for per-flight voltage summaries: one typed
+NumPy column per field instead of one dict per flight. Columns are read
+directly by the plotting and statistics code (table.mean, table.date, ...),
+and filtering, sorting and per-tail splits are single vectorized index
+operations, so memory and plot setup stay flat as the flight count grows.
+
+    table = FlightTable.from_records(records)        # FlightRecord tuples
+    recent = table[table.date >= np.datetime64("2025-01-01")]
+    worst = table.sort("mean")[:10]
+    by_tail = table.split("tail")
+
+Workers return FlightRecord namedtuples (no per-instance dict, cheap to
+pickle); the parent assembles them into one table.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+FLIGHT_FIELDS = ("tail", "date", "file", "n_samples", "n_cruise", "mean", "median", "std",
+                 "min", "max", "pct_below_26", "n_below_255")
+FLIGHT_DTYPES = {
+    "tail": str, "date": "datetime64[s]", "file": str,
+    "n_samples": np.int32, "n_cruise": np.int32, "n_below_255": np.int32,
+    "mean": np.float64, "median": np.float64, "std": np.float64, "min": np.float64,
+    "max": np.float64, "pct_below_26": np.float64,
+}
+
+FlightRecord = namedtuple("FlightRecord", FLIGHT_FIELDS)
+
+
+def _column(name, values):
+    dtype = FLIGHT_DTYPES[name]
+    if dtype is str:
+        # Fixed-width unicode sized to the longest value
+        return np.array(values, dtype=str) if len(values) else np.array([], dtype="U1")
+    return np.array(values, dtype=dtype)
+
+
+class FlightTable:
+    """Per-flight summaries as equal-length typed NumPy columns.
+
+    table.<field> and table["<field>"] return a column; indexing with an int
+    returns a FlightRecord; indexing with a slice, boolean mask or index
+    array returns a new FlightTable.
+    """
+    __slots__ = ("columns",)
+
+    def __init__(self, columns):
+        lengths = {len(c) for c in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"FlightTable columns differ in length: {sorted(lengths)}")
+        object.__setattr__(self, "columns", {name: columns[name] for name in FLIGHT_FIELDS})
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from FlightRecord tuples (None entries are skipped)."""
+        rows = [r for r in records if r is not None]
+        values = list(zip(*rows)) if rows else [()] * len(FLIGHT_FIELDS)
+        return cls({name: _column(name, list(col)) for name, col in zip(FLIGHT_FIELDS, values)})
+
+    @classmethod
+    def empty(cls):
+        return cls.from_records([])
+
+    @classmethod
+    def concat(cls, tables):
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return cls.empty()
+        return cls({name: np.concatenate([t.columns[name] for t in tables]) for name in FLIGHT_FIELDS})
+
+    def __len__(self):
+        return len(self.columns["date"])
+
+    def __reduce__(self):
+        return FlightTable, (self.columns,)
+
+    def __getattr__(self, name):
+        if name == "columns":  # not yet set (e.g. mid-unpickle)
+            raise AttributeError(name)
+        try:
+            return self.columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FlightTable columns are read-only; build a new table instead")
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.columns[key]
+        if isinstance(key, (int, np.integer)):
+            return self.record(int(key))
+        return FlightTable({name: col[key] for name, col in self.columns.items()})
+
+    def __repr__(self):
+        return f"FlightTable({len(self)} flights, tails={np.unique(self.columns['tail']).tolist()})"
+
+    def record(self, i):
+        """Row i as a FlightRecord of plain Python values (date as datetime)."""
+        return FlightRecord(*(self.columns[name][i].item() for name in FLIGHT_FIELDS))
+
+    def records(self):
+        return [self.record(i) for i in range(len(self))]
+
+    def filter(self, mask):
+        """Rows where the boolean mask is True."""
+        return self[np.asarray(mask, dtype=bool)]
+
+    def sort(self, by="date", descending=False):
+        """Sort by one column name or a sequence of names (first = primary key); ascending is stable."""
+        keys = [by] if isinstance(by, str) else list(by)
+        order = np.lexsort([self.columns[k] for k in reversed(keys)])
+        return self[order[::-1] if descending else order]
+
+    def split(self, by="tail"):
+        """{value: FlightTable} per distinct value of a column, each in original row order."""
+        col = self.columns[by]
+        values, inverse = np.unique(col, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(values) + 1))
+        return {v.item(): self[order[bounds[i]:bounds[i + 1]]] for i, v in enumerate(values)}
+
+    def dates(self):
+        """Flight dates as datetime objects (for strftime / non-NumPy consumers)."""
+        return self.columns["date"].astype(object)
@@ -10,10 +10,12 @@ Usage:
     python flysto_download.py --list           # list available logs without downloading
     python flysto_download.py --force          # re-download even if file exists
     python flysto_download.py --last 10        # download only the 10 most recent logs
+    python flysto_download.py --compress auto  # store logs compressed (zstd if available, else gzip)
 
 Environment variables (optional, will prompt if not set):
     FLYSTO_EMAIL    - FlySto account email
     FLYSTO_PASSWORD - FlySto account password
+    FLYSTO_URL      - API base URL (default https://www.flysto.net; see fake_flysto.py)
 """
 
 import argparse
@@ -25,6 +27,13 @@ import time
 
 import requests
 
+from logio import compressed_name, find_log, open_log_writer, resolve_compression, stored_forms
+
+FLYSTO_URL = os.environ.get('FLYSTO_URL', 'https://www.flysto.net').rstrip('/')
+
+MAX_ATTEMPTS = 5        # requests per API call / file download, including the first
+RETRY_BACKOFF_S = 0.5   # doubled after every failed attempt
+
 
 def decode_flysto(s: str) -> str:
     """Decode FlySto's obfuscated response encoding."""
@@ -34,10 +43,34 @@ def decode_flysto(s: str) -> str:
     )
 
 
+def retry_delay(attempt: int) -> float:
+    """Backoff before retry number attempt (1-based)."""
+    return RETRY_BACKOFF_S * 2 ** (attempt - 1)
+
+
+def request_with_retry(session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+    """session.request() retried with exponential backoff on 5xx responses and connection errors.
+
+    After MAX_ATTEMPTS the last 5xx response is returned (or the last
+    connection error raised) for the caller to handle.
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            resp = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_ATTEMPTS:
+                raise
+        else:
+            if resp.status_code < 500 or attempt == MAX_ATTEMPTS:
+                return resp
+            resp.close()
+        time.sleep(retry_delay(attempt))
+
+
 def api_request(session: requests.Session, path: str, params: dict = None):
     """Make an authenticated GET request to FlySto API, decode the response."""
-    url = f'https://www.flysto.net{path}'
-    resp = session.get(url, params=params)
+    url = f'{FLYSTO_URL}{path}'
+    resp = request_with_retry(session, 'GET', url, params=params)
     resp.raise_for_status()
 
     raw = resp.text
@@ -55,7 +88,7 @@ def api_request(session: requests.Session, path: str, params: dict = None):
 
 def login(session: requests.Session, email: str, password: str):
     """Authenticate to FlySto. Returns True on success."""
-    resp = session.post('https://www.flysto.net/api/login', json={
+    resp = request_with_retry(session, 'POST', f'{FLYSTO_URL}/api/login', json={
         'email': email,
         'password': password,
     })
@@ -88,18 +121,57 @@ def get_file_info(session: requests.Session, log_ids: list[str]) -> dict:
 
 
 def download_file(session: requests.Session, log_id: str, format_id: str,
-                  file_name: str, dest_path: str) -> bool:
-    """Download a single source log file. Returns True on success."""
-    url = f'https://www.flysto.net/log-files/{log_id}/{format_id}/{file_name}'
-    resp = session.get(url, stream=True)
-    if resp.status_code != 200:
-        print(f"  FAILED: HTTP {resp.status_code} for {file_name}", file=sys.stderr)
-        return False
-
+                  file_name: str, dest_path: str, compression: str = 'none') -> bool:
+    """Download a single source log file. Returns True on success.
+
+    With compression 'gzip' or 'zstd' the response is compressed on the fly
+    as it streams in; dest_path should then carry the matching suffix.
+    5xx responses, connection errors and streams cut off mid-file are
+    retried with backoff, up to MAX_ATTEMPTS requests in all. A retry
+    resumes where the cut-off stream stopped (Range request); if the server
+    answers with the whole file instead, the bytes already written are skipped.
+    """
+    url = f'{FLYSTO_URL}/log-files/{log_id}/{format_id}/{file_name}'
+    # Write to a .part file and rename on completion, so an interrupted
+    # download is retried on the next run instead of being skipped as present
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    with open(dest_path, 'wb') as f:
-        for chunk in resp.iter_content(chunk_size=8192):
-            f.write(chunk)
+    part_path = dest_path + '.part'
+    received = 0  # bytes of the file already written to part_path
+    error = None
+    with open_log_writer(part_path, compression) as f:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            if attempt > 1:
+                time.sleep(retry_delay(attempt - 1))
+            headers = {'Range': f'bytes={received}-'} if received else None
+            try:
+                resp = session.request('GET', url, headers=headers, stream=True)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e.__class__.__name__
+                continue
+            if resp.status_code not in (200, 206):
+                error = f"HTTP {resp.status_code}"
+                resp.close()
+                if resp.status_code >= 500:
+                    continue
+                break
+            skip = received if resp.status_code == 200 else 0
+            try:
+                for chunk in resp.iter_content(chunk_size=8192):
+                    if skip:
+                        n = min(skip, len(chunk))
+                        chunk, skip = chunk[n:], skip - n
+                    f.write(chunk)
+                    received += len(chunk)
+            except requests.RequestException as e:
+                error = e.__class__.__name__
+                continue
+            error = None
+            break
+    if error:
+        os.remove(part_path)
+        print(f"  FAILED: {error} for {file_name}", file=sys.stderr)
+        return False
+    os.replace(part_path, dest_path)
     return True
 
 
@@ -110,7 +182,10 @@ def main():
     parser.add_argument('--last', type=int, default=0, help='Only process the N most recent logs')
     parser.add_argument('--output', default='data/source', help='Output directory (default: data/source)')
     parser.add_argument('--format', default='G3000', help='Log format to download (default: G3000)')
+    parser.add_argument('--compress', default='none', choices=['none', 'gzip', 'zstd', 'auto'],
+                        help='Store logs compressed (auto = zstd if installed, else gzip)')
     args = parser.parse_args()
+    compression = resolve_compression(args.compress)
 
     # Get credentials
     email = os.environ.get('FLYSTO_EMAIL')
@@ -155,7 +230,7 @@ def main():
         print(f"\n{'Log ID':<12} {'Filename'}")
         print('-' * 60)
         for log_id, fmt, fname in downloads:
-            exists = os.path.exists(os.path.join(args.output, fname))
+            exists = find_log(args.output, fname) is not None
             marker = ' [local]' if exists else ''
             print(f"{log_id:<12} {fname}{marker}")
         return
@@ -167,15 +242,19 @@ def main():
     failed = 0
 
     for i, (log_id, fmt, fname) in enumerate(downloads, 1):
-        dest = os.path.join(args.output, fname)
-        if os.path.exists(dest) and not args.force:
+        dest = os.path.join(args.output, compressed_name(fname, compression))
+        if find_log(args.output, fname) is not None and not args.force:
             skipped += 1
             continue
 
         print(f"[{i}/{len(downloads)}] Downloading {fname}...", end=' ', flush=True)
-        if download_file(session, log_id, fmt, fname, dest):
+        if download_file(session, log_id, fmt, fname, dest, compression):
             size = os.path.getsize(dest)
             print(f"{size:,} bytes")
+            # Drop any other stored form of this log so readers see the fresh copy
+            for old in stored_forms(args.output, fname):
+                if os.path.abspath(old) != os.path.abspath(dest):
+                    os.remove(old)
             downloaded += 1
         else:
             failed += 1
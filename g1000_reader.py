@@ -0,0 +1,120 @@
+"""
+Multi-channel G1000 NXi CSV Reader
+==================================
+Reads any set of numeric channels from a G1000 NXi data log in one pass.
+Column indices are resolved once from the header row; timestamps are built
+from the Lcl Date / Lcl Time / UTCOfst columns with NumPy's vectorized
+ISO-8601 parser instead of a strptime() call per row.
+
+Blank cells (channel not yet valid, avionics initializing) become NaN, so
+every returned array has one entry per timestamped row.
+"""
+
+import numpy as np
+
+from logio import open_log
+from parse_cache import cached_arrays
+
+# Store/short name -> G1000 CSV column header
+G1000_CHANNELS = {
+    "volt1": "volt1",
+    "volt2": "volt2",
+    "rpm": "E1 RPM",
+    "pct_pwr": "E1 %Pwr",
+    "fflow": "E1 FFlow",
+    "oilt": "E1 OilT",
+    "oilp": "E1 OilP",
+    "oat": "OAT",
+    "ias": "IAS",
+    "gndspd": "GndSpd",
+    "vspd": "VSpd",
+    "altind": "AltInd",
+}
+
+CHANNELS_CACHE_VERSION = 1
+
+
+def _utc_offset_seconds(ofst):
+    """'+05:30' / '-04:00' -> seconds east of UTC (0 if blank or malformed)."""
+    ofst = ofst.strip()
+    if len(ofst) < 6 or ofst[0] not in "+-":
+        return 0
+    try:
+        secs = int(ofst[1:3]) * 3600 + int(ofst[4:6]) * 60
+    except ValueError:
+        return 0
+    return secs if ofst[0] == "+" else -secs
+
+
+def _to_float(s):
+    s = s.strip()
+    if not s:
+        return np.nan
+    try:
+        return float(s)
+    except ValueError:
+        return np.nan
+
+
+def read_g1000_channels(filepath, channels=tuple(G1000_CHANNELS)):
+    """Read selected channels from a G1000 CSV.
+
+    Returns (t, data): t is a float64 array of UTC POSIX seconds, data maps
+    each requested short name to a float64 array (NaN where blank).
+    Channels missing from this log's header come back all-NaN. An empty or
+    headerless file (no Lcl Date / Lcl Time columns on line 3) has no rows.
+    """
+    with open_log(filepath, errors="replace") as f:
+        head = [f.readline() for _ in range(3)]
+        headers = [h.strip() for h in head[2].split(",")]
+        if "Lcl Date" not in headers or "Lcl Time" not in headers:
+            return np.zeros(0), {name: np.zeros(0) for name in channels}
+        date_idx = headers.index("Lcl Date")
+        time_idx = headers.index("Lcl Time")
+        ofst_idx = headers.index("UTCOfst") if "UTCOfst" in headers else None
+        col_idx = {name: headers.index(G1000_CHANNELS[name])
+                   if G1000_CHANNELS[name] in headers else None
+                   for name in channels}
+
+        stamps, offsets = [], []
+        rows = {name: [] for name in channels}
+        for line in f:
+            parts = line.split(",")
+            if len(parts) <= time_idx:
+                continue
+            d, t = parts[date_idx].strip(), parts[time_idx].strip()
+            if not d or not t:
+                continue  # initialization rows
+            stamps.append(f"{d}T{t}")
+            offsets.append(_utc_offset_seconds(parts[ofst_idx]) if ofst_idx is not None
+                           and ofst_idx < len(parts) else 0)
+            for name, idx in col_idx.items():
+                rows[name].append(_to_float(parts[idx]) if idx is not None and idx < len(parts)
+                                  else np.nan)
+
+    try:
+        local = np.array(stamps, dtype="datetime64[s]").astype(np.int64).astype(float)
+    except ValueError:
+        # A malformed timestamp somewhere: fall back to per-row parsing
+        local = np.array([_parse_stamp(s) for s in stamps], dtype=float)
+    t = local - np.array(offsets, dtype=float)
+    keep = ~np.isnan(t)
+    data = {name: np.array(vals, dtype=float)[keep] for name, vals in rows.items()}
+    return t[keep], data
+
+
+def _parse_stamp(s):
+    try:
+        return float(np.datetime64(s, "s").astype(np.int64))
+    except ValueError:
+        return np.nan
+
+
+def load_g1000_channels(filepath, channels=tuple(G1000_CHANNELS)):
+    """read_g1000_channels() for all known channels through the parse cache, then subset."""
+    def compute(path):
+        t, data = read_g1000_channels(path)
+        return {"t": t, **data}
+
+    arrays = cached_arrays("g1000_channels", filepath, compute, version=CHANNELS_CACHE_VERSION)
+    return arrays["t"], {name: arrays[name] for name in channels}
@@ -1,20 +1,74 @@
 """
 Generate a self-contained HTML report for the G1000 vs VDL48 voltage analysis.
 All images are embedded as base64 so the report is a single shareable file.
+
+A report covers one investigation: a pair of G1000 flights flown with a
+VDL48 reference logger on board. With no arguments the N238PS 2026-02-08
+investigation is reported. --manifest takes a JSON list of investigations
+and generates all their reports in parallel; parsed G1000 and VDL48 inputs
+go through the parse cache (data/cache/), so a logger file or flight shared
+by several investigations is parsed once.
+
+Manifest (paths relative to the manifest file; tail, date, name and routes
+default to what the G1000 filenames and data say):
+
+    {"investigations": [
+      {"tail": "N238PS", "date": "2026-02-08", "aircraft": "Diamond DA40NG",
+       "reference": "LOG_VD.CSV",
+       "flights": [{"csv": "N238PS_KBOW-KSPG_20260208-1551UTC.csv", "route": "KBOW to KSPG"},
+                   "N238PS_KSPG-KBOW_20260208-1812UTC.csv"]}
+    ]}
+
+Images are embedded as PNG by default; --image-format png8 / svg / webp,
+--dpi / --figure-dpi and a --max-size budget (DPI is lowered until the
+report fits) keep reports small enough to email.
+
+--interactive writes a single offline HTML file instead: G1000, VDL48 and
+(when available) ECU voltage embedded as base64 Float32 arrays at several
+min/max-decimated resolutions, drawn by a small built-in canvas viewer that
+decodes finer levels only when zoomed in. A manifest entry may name its
+ECU source with "ecu" (AustroView session CSVs or .ae3 dumps).
+
+Usage:
+    python generate_report.py
+    python generate_report.py --manifest data/report_manifest.json --workers 4
+    python generate_report.py --image-format png8 --figure-dpi scatter=100 --max-size 0.5
+    python generate_report.py --interactive
 """
 
 import sys
 import io
+import argparse
 import base64
+import json
+import os
+import re
 import numpy as np
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from datetime import datetime, timedelta
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
 from scipy import stats
 from pathlib import Path
 
+from ae3_ingest import AE3_DIR, DecoderUnavailable, ae3_sessions
+from correlate_ecu import session_arrays
+from g1000_reader import load_g1000_channels
+from instrument import add_profile_arguments, profile_run, stage, timed
+from parse_cache import disable_cache
+from session_index import ECU_PARSED_DIR, MIN_OVERLAP_S, IntervalIndex, ecu_sessions
+from vdl_mmap import load_vdl_mapped, segment_voltage
+from vdl_reader import vdl_header
+from volt_monitor import LOW_VOLTS
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = features = None
+
 if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
@@ -26,84 +80,133 @@ VDL_CSV = DATA_DIR / "LOG_VD.CSV"
 OUTPUT_DIR = Path(__file__).parent / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Embedded image encodings: "png" (matplotlib's RGBA PNG), "png8" (palette-
+# quantized, optimized PNG), "svg" (vector, long lines min/max-decimated)
+# and "webp" (lossy). png8 and webp need Pillow.
+IMAGE_FORMATS = ("png", "png8", "svg", "webp")
+IMAGE_MIME = {"png": "image/png", "png8": "image/png", "svg": "image/svg+xml", "webp": "image/webp"}
+DEFAULT_DPI = 150
+PALETTE_COLORS = 64
+WEBP_QUALITY = 80
+SVG_MAX_POINTS = 2000            # per line after min/max decimation
+SVG_RASTER_POINTS = 1000         # scatter collections larger than this are embedded as raster
+BUDGET_DPI_SCALES = (1.0, 0.75, 0.5)
+FIGURE_NAMES = ("overview", "comparison", "hist", "scatter")
+
+# Report wording thresholds: findings are stated only when the statistics support them
+SYSTEMATIC_OFFSET_V = 0.1        # G1000 volt1 resolution; smaller mean offsets are "no offset"
+EXCESS_NOISE_RATIO = 1.5         # G1000 std dev over VDL std dev that counts as excess noise
+WEAK_CORRELATION_R = 0.3         # |r| below this: readings largely independent
+DEEP_DIP_V = 1.0                 # worst-case difference that counts as a transient dip
+
+ImageOptions = namedtuple("ImageOptions", "format dpi figure_dpi max_bytes",
+                          defaults=("png", DEFAULT_DPI, None, None))
+
+# <tail>_<dep>-<arr>_<YYYYMMDD>-<HHMM>UTC.csv, as exported by flysto_download.py
+G1000_NAME_RE = re.compile(r"^(?P<tail>[^_]+)_(?P<dep>[A-Z0-9]{3,4})-(?P<arr>[A-Z0-9]{3,4})_\d{8}")
+
+Investigation = namedtuple("Investigation", "name tail date aircraft reference flights routes ecu",
+                           defaults=(None,))
+
+DEFAULT_INVESTIGATION = Investigation(
+    "N238PS_20260208", "N238PS", date(2026, 2, 8), "Diamond DA40NG", VDL_CSV,
+    (FLIGHT1_CSV, FLIGHT2_CSV), ("KBOW to KSPG", "KSPG to KBOW"))
+
+
+# =============================================================================
+# Investigations
+# =============================================================================
+
+def route_from_filename(path):
+    """'KBOW to KSPG' from a flysto-style G1000 filename, else the file stem."""
+    m = G1000_NAME_RE.match(Path(path).name)
+    return f"{m.group('dep')} to {m.group('arr')}" if m else Path(path).name.split(".")[0]
+
+
+def tail_from_filename(path):
+    m = G1000_NAME_RE.match(Path(path).name)
+    return m.group("tail") if m else None
+
+
+def investigation_from_entry(entry, base_dir):
+    """Investigation for one manifest entry; relative paths are resolved against base_dir."""
+    flights = [f if isinstance(f, dict) else {"csv": f} for f in entry["flights"]]
+    if len(flights) != 2:
+        raise ValueError(f"Investigation {entry.get('name') or entry['reference']!r}: "
+                         f"a report covers a pair of flights, got {len(flights)}")
+    paths = tuple(Path(base_dir) / f["csv"] for f in flights)
+    return Investigation(
+        entry.get("name"),
+        entry.get("tail") or tail_from_filename(paths[0]) or "Unknown",
+        date.fromisoformat(entry["date"]) if entry.get("date") else None,
+        entry.get("aircraft", ""),
+        Path(base_dir) / entry["reference"],
+        paths,
+        tuple(f.get("route") or route_from_filename(p) for f, p in zip(flights, paths)),
+        Path(base_dir) / entry["ecu"] if entry.get("ecu") else None,
+    )
+
+
+def load_manifest(path):
+    """Investigations listed in a JSON manifest (a list, or {"investigations": [...]})."""
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    entries = doc["investigations"] if isinstance(doc, dict) else doc
+    return [investigation_from_entry(e, path.parent) for e in entries]
+
+
+def resolve_investigation(inv):
+    """Fill in a missing date (first G1000 sample, UTC) and name (<tail>_<YYYYMMDD>)."""
+    if inv.date is None:
+        times, _ = parse_g1000(inv.flights[0])
+        if not len(times):
+            raise ValueError(f"{inv.flights[0]}: no G1000 samples")
+        inv = inv._replace(date=times[0].date())
+    if inv.name is None:
+        inv = inv._replace(name=f"{inv.tail}_{inv.date:%Y%m%d}")
+    return inv
+
+
+def report_filename(inv):
+    return f"Voltage_Analysis_Report_{inv.name}.html"
+
+
+def interactive_filename(inv):
+    return f"Voltage_Analysis_Interactive_{inv.name}.html"
+
 
 # =============================================================================
-# Parsing (same as voltage_analysis.py)
+# Parsing (same as voltage_analysis.py, through the parse cache)
 # =============================================================================
 
+@timed("parse_g1000", rows=lambda result: len(result[1]))
 def parse_g1000(filepath):
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    headers = [h.strip() for h in lines[2].split(",")]
-    date_idx = headers.index("Lcl Date")
-    time_idx = headers.index("Lcl Time")
-    volt1_idx = headers.index("volt1")
-    times, volt1 = [], []
-    for line in lines[7:]:
-        parts = line.split(",")
-        if len(parts) <= volt1_idx:
-            continue
-        d, t, v = parts[date_idx].strip(), parts[time_idx].strip(), parts[volt1_idx].strip()
-        if not d or not t or not v:
-            continue
-        try:
-            times.append(datetime.strptime(f"{d} {t}", "%Y-%m-%d %H:%M:%S"))
-            volt1.append(float(v))
-        except ValueError:
-            continue
-    return np.array(times), np.array(volt1)
+    """UTC sample times (naive datetimes) and volt1 of a G1000 log, rows without volt1 dropped."""
+    t, data = load_g1000_channels(filepath, ("volt1",))
+    ok = ~np.isnan(data["volt1"])
+    times = t[ok].astype(np.int64).astype("datetime64[s]").astype(datetime)
+    return times, data["volt1"][ok]
 
 
+@timed("parse_vdl", rows=lambda result: len(result[1]))
 def parse_vdl(filepath):
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-    times_str, voltages = [], []
-    for line in lines[12:]:
-        line = line.strip()
-        if not line:
-            continue
-        parts = line.split(",")
-        if len(parts) < 3:
-            continue
-        try:
-            times_str.append(parts[1].strip())
-            voltages.append(float(parts[2].strip()))
-        except ValueError:
-            continue
-    t0 = datetime.strptime(times_str[0], "%H:%M:%S")
-    elapsed = [(datetime.strptime(ts, "%H:%M:%S") - t0).total_seconds() for ts in times_str]
-    return np.array(elapsed), np.array(voltages)
-
-
-def segment_vdl(elapsed, voltage):
-    FLIGHT_THRESHOLD = 27.0
-    ZERO_THRESHOLD = 1.0
-    WINDOW = 30
-    last_nonzero = len(voltage) - 1
-    while last_nonzero > 0 and voltage[last_nonzero] < ZERO_THRESHOLD:
-        last_nonzero -= 1
-    end_f1 = None
-    for i in range(WINDOW, last_nonzero):
-        if all(voltage[i:i + WINDOW] < FLIGHT_THRESHOLD):
-            end_f1 = i
-            break
-    start_f2 = None
-    if end_f1 is not None:
-        for i in range(end_f1 + WINDOW, last_nonzero):
-            if all(voltage[i:i + WINDOW] > FLIGHT_THRESHOLD):
-                start_f2 = i
-                break
-    end_f2 = last_nonzero + 1
-    return (0, end_f1), (end_f1, start_f2), (start_f2, end_f2)
+    return load_vdl_mapped(filepath)
 
 
-def align_vdl_to_g1000(g1000_times, vdl_elapsed, vdl_seg):
+@timed()
+def segment_vdl(voltage):
+    return segment_voltage(voltage)
+
+
+def align_vdl_to_g1000(g1000_times, sample_s, vdl_seg):
     seg_start, seg_end = vdl_seg
     g1000_start = g1000_times[0]
-    vdl_seg_elapsed = vdl_elapsed[seg_start:seg_end] - vdl_elapsed[seg_start]
+    vdl_seg_elapsed = np.arange(seg_end - seg_start) * sample_s
     return np.array([g1000_start + timedelta(seconds=float(s)) for s in vdl_seg_elapsed])
 
 
+@timed("resample", rows=lambda result: len(result[0]))
 def resample_to_common(g_times, g_volts, v_times, v_volts):
     g_epoch = np.array([(t - g_times[0]).total_seconds() for t in g_times])
     v_epoch = np.array([(t - g_times[0]).total_seconds() for t in v_times])
@@ -111,11 +214,13 @@ def resample_to_common(g_times, g_volts, v_times, v_volts):
     t_end = min(g_epoch[-1], v_epoch[-1])
     common_t = np.arange(t_start, t_end, 2.0)
     g_interp = np.interp(common_t, g_epoch, g_volts)
-    v_interp = np.interp(common_t, v_epoch, v_volts)
+    ok = ~np.isnan(v_volts)
+    v_interp = np.interp(common_t, v_epoch[ok], v_volts[ok])
     common_dt = np.array([g_times[0] + timedelta(seconds=float(s)) for s in common_t])
     return common_dt, g_interp, v_interp
 
 
+@timed("compute_stats", rows=lambda result: len(result["diff"]))
 def compute_stats(g1000_v, vdl_v):
     diff = g1000_v - vdl_v
     r, p_corr = stats.pearsonr(g1000_v, vdl_v)
@@ -136,20 +241,134 @@ def compute_stats(g1000_v, vdl_v):
 
 
 # =============================================================================
-# Plot helpers (return base64 PNG strings)
+# Plot helpers (return matplotlib figures; write_figure() embeds them)
 # =============================================================================
 
-def fig_to_base64(fig, dpi=150):
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight", facecolor="white")
-    plt.close(fig)
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode("ascii")
+class Base64Writer(io.RawIOBase):
+    """Write-only binary stream that base64-encodes everything written to it
+    straight into a text stream, holding back at most two bytes between
+    writes (base64 works in 3-byte groups)."""
+
+    def __init__(self, out):
+        super().__init__()
+        self.out = out
+        self.pending = b""
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        n_in = len(data)
+        data = self.pending + bytes(data)
+        n = len(data) - len(data) % 3
+        self.out.write(base64.b64encode(data[:n]).decode("ascii"))
+        self.pending = data[n:]
+        return n_in
+
+    def close(self):
+        """Encode the final partial group (with padding); out stays open."""
+        if self.pending:
+            self.out.write(base64.b64encode(self.pending).decode("ascii"))
+            self.pending = b""
+        super().close()
+
+
+def resolve_image_format(fmt):
+    """Resolve a requested image format to one this installation can write.
+
+    webp needs Pillow built with WebP support and falls back to png8; png8
+    needs Pillow and falls back to png. Fallbacks print a warning.
+    """
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"Unknown image format: {fmt}")
+    if fmt == "webp" and (features is None or not features.check("webp")):
+        print("  Pillow with WebP support not installed - falling back to png8", file=sys.stderr)
+        fmt = "png8"
+    if fmt == "png8" and Image is None:
+        print("  Pillow not installed - falling back to png", file=sys.stderr)
+        fmt = "png"
+    return fmt
+
+
+def figure_dpi(images, name, scale=1.0):
+    """DPI for the named figure: its per-figure override or the report default, scaled."""
+    return max(1, round((images.figure_dpi or {}).get(name, images.dpi) * scale))
+
+
+def minmax_indices(y, n_buckets):
+    """Indices of the min and max sample of each of n_buckets equal runs of y, in order.
+
+    Keeping both extremes per bucket preserves spikes and dips that plain
+    stride decimation would drop. NaNs are ignored.
+    """
+    n = len(y)
+    size = -(-n // n_buckets)
+    rows = np.full(-(-n // size) * size, np.nan)
+    rows[:n] = y
+    rows = rows.reshape(-1, size)
+    nan = np.isnan(rows)
+    base = np.arange(len(rows)) * size
+    idx = np.concatenate([base + np.argmin(np.where(nan, np.inf, rows), axis=1),
+                          base + np.argmax(np.where(nan, -np.inf, rows), axis=1), [0, n - 1]])
+    return np.unique(idx[idx < n])
+
 
+def thin_for_vector(fig, max_points=SVG_MAX_POINTS, raster_points=SVG_RASTER_POINTS):
+    """Prepare fig for vector output: min/max-decimate long lines and rasterize dense scatters."""
+    for ax in fig.axes:
+        for line in ax.get_lines():
+            x, y = np.asarray(line.get_xdata()), np.asarray(line.get_ydata(), dtype=np.float64)
+            if len(y) > max_points:
+                keep = minmax_indices(y, max_points // 2)
+                line.set_data(x[keep], y[keep])
+        for coll in ax.collections:
+            if len(coll.get_offsets()) > raster_points:
+                coll.set_rasterized(True)
 
-def make_vdl_overview(vdl_elapsed, vdl_voltage, seg_f1, seg_idle, seg_f2):
+
+@timed("image_encode")
+def write_figure(out, fig, dpi=DEFAULT_DPI, fmt="png"):
+    """Render fig as a data URI straight into the text stream out, then close it.
+
+    png and svg are encoded as matplotlib writes them, so neither the image
+    bytes nor the base64 text of the whole image is held in memory; png8 and
+    webp re-encode matplotlib's PNG through Pillow, holding one image.
+    """
+    out.write(f"data:{IMAGE_MIME[fmt]};base64,")
+    enc = Base64Writer(out)
+    save = {"dpi": dpi, "bbox_inches": "tight", "facecolor": "white"}
+    try:
+        if fmt == "png":
+            fig.savefig(enc, format="png", **save)
+        elif fmt == "svg":
+            thin_for_vector(fig)
+            fig.savefig(enc, format="svg", metadata={"Date": None}, **save)
+        else:
+            buf = io.BytesIO()
+            fig.savefig(buf, format="png", **save)
+            buf.seek(0)
+            img = Image.open(buf).convert("RGB")
+            if fmt == "png8":
+                img.quantize(colors=PALETTE_COLORS, method=Image.Quantize.MEDIANCUT).save(
+                    enc, format="PNG", optimize=True)
+            else:
+                img.save(enc, format="WEBP", quality=WEBP_QUALITY, method=6)
+    finally:
+        plt.close(fig)
+    enc.close()
+
+
+def fig_to_base64(fig, dpi=DEFAULT_DPI, fmt="png"):
+    """Base64 image of fig as a string (closes fig); write_figure() avoids the copy."""
+    buf = io.StringIO()
+    write_figure(buf, fig, dpi, fmt)
+    return buf.getvalue().split(",", 1)[1]
+
+
+@timed()
+def make_vdl_overview(sample_s, vdl_voltage, seg_f1, seg_idle, seg_f2):
     fig, ax = plt.subplots(figsize=(13, 3.5))
-    minutes = vdl_elapsed / 60.0
+    minutes = np.arange(len(vdl_voltage)) * (sample_s / 60.0)
     ax.plot(minutes, vdl_voltage, color="black", linewidth=0.5, alpha=0.8)
     colors = {"Flight 1": "#4A90D9", "Idle (engine off)": "#E8943A", "Flight 2": "#50B86C"}
     for label, (s, e) in [("Flight 1", seg_f1), ("Idle (engine off)", seg_idle),
@@ -162,14 +381,16 @@ def make_vdl_overview(vdl_elapsed, vdl_voltage, seg_f1, seg_idle, seg_f2):
     ax.legend(loc="center right", fontsize=9)
     ax.grid(True, alpha=0.3)
     fig.tight_layout()
-    return fig_to_base64(fig)
+    return fig
 
 
-def make_flight_comparison(common1_t, g1_rs, v1_rs, common2_t, g2_rs, v2_rs):
+@timed()
+def make_flight_comparison(common1_t, g1_rs, v1_rs, common2_t, g2_rs, v2_rs,
+                           routes=DEFAULT_INVESTIGATION.routes):
     fig, axes = plt.subplots(2, 1, figsize=(13, 7.5))
     for ax, ct, gv, vv, title in [
-        (axes[0], common1_t, g1_rs, v1_rs, "Flight 1: KBOW to KSPG"),
-        (axes[1], common2_t, g2_rs, v2_rs, "Flight 2: KSPG to KBOW"),
+        (axes[0], common1_t, g1_rs, v1_rs, f"Flight 1: {routes[0]}"),
+        (axes[1], common2_t, g2_rs, v2_rs, f"Flight 2: {routes[1]}"),
     ]:
         diff = gv - vv
         ax2 = ax.twinx()
@@ -189,14 +410,15 @@ def make_flight_comparison(common1_t, g1_rs, v1_rs, common2_t, g2_rs, v2_rs):
         ax.grid(True, alpha=0.3)
     fig.suptitle("G1000 volt1 vs VDL48 Reference Voltage", fontsize=13, fontweight="bold", y=1.01)
     fig.tight_layout()
-    return fig_to_base64(fig)
+    return fig
 
 
-def make_histograms(diff1, diff2):
+@timed()
+def make_histograms(diff1, diff2, routes=DEFAULT_INVESTIGATION.routes):
     fig, axes = plt.subplots(1, 2, figsize=(12, 4), sharey=True)
     for ax, diff, label, color in [
-        (axes[0], diff1, "Flight 1 (KBOW to KSPG)", "#4A90D9"),
-        (axes[1], diff2, "Flight 2 (KSPG to KBOW)", "#50B86C"),
+        (axes[0], diff1, f"Flight 1 ({routes[0]})", "#4A90D9"),
+        (axes[1], diff2, f"Flight 2 ({routes[1]})", "#50B86C"),
     ]:
         ax.hist(diff, bins=60, color=color, alpha=0.7, edgecolor="white", linewidth=0.3)
         ax.axvline(np.mean(diff), color="#D94A4A", linestyle="--", linewidth=1.2,
@@ -210,9 +432,10 @@ def make_histograms(diff1, diff2):
     fig.suptitle("Distribution of Voltage Differences (G1000 - VDL)", fontsize=12,
                  fontweight="bold", y=1.02)
     fig.tight_layout()
-    return fig_to_base64(fig)
+    return fig
 
 
+@timed()
 def make_scatter(g1, v1, g2, v2):
     fig, ax = plt.subplots(figsize=(6, 6))
     ax.scatter(v1, g1, s=1, alpha=0.3, color="#4A90D9", label="Flight 1")
@@ -233,13 +456,82 @@ def make_scatter(g1, v1, g2, v2):
     ax.set_aspect("equal")
     ax.grid(True, alpha=0.3)
     fig.tight_layout()
-    return fig_to_base64(fig)
+    return fig
 
 
 # =============================================================================
 # HTML Report
 # =============================================================================
 
+REPORT_CSS = """\
+  * { margin: 0; padding: 0; box-sizing: border-box; }
+  body {
+    font-family: -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+    color: #1a1a1a; background: #f5f5f5; line-height: 1.6;
+  }
+  .page {
+    max-width: 900px; margin: 0 auto; background: white;
+    padding: 48px 56px; box-shadow: 0 1px 4px rgba(0,0,0,0.08);
+  }
+  h1 { font-size: 22px; margin-bottom: 4px; color: #1a3a5c; }
+  h2 { font-size: 17px; color: #2a5a8a; margin: 32px 0 12px 0;
+        border-bottom: 2px solid #dde4ec; padding-bottom: 4px; }
+  h3 { font-size: 14px; color: #3a3a3a; margin: 20px 0 8px 0; }
+  .subtitle { font-size: 13px; color: #666; margin-bottom: 24px; }
+  p, li { font-size: 13px; margin-bottom: 8px; }
+  ul { padding-left: 24px; }
+  img { width: 100%; height: auto; margin: 12px 0 20px 0; border: 1px solid #e8e8e8; }
+  table {
+    width: 100%; border-collapse: collapse; font-size: 12.5px; margin-bottom: 16px;
+  }
+  th, td { padding: 5px 10px; text-align: left; border-bottom: 1px solid #e8e8e8; }
+  th { background: #f0f4f8; color: #2a5a8a; font-weight: 600; }
+  td.neg { color: #c0392b; font-weight: 600; }
+  .summary-box {
+    background: #fdf2f0; border-left: 4px solid #c0392b; padding: 14px 18px;
+    margin: 20px 0; border-radius: 0 4px 4px 0;
+  }
+  .summary-box p { margin-bottom: 4px; }
+  .summary-box strong { color: #c0392b; }
+  .finding { background: #f0f7ff; border-left: 4px solid #2a5a8a; padding: 14px 18px;
+              margin: 16px 0; border-radius: 0 4px 4px 0; }
+  .cols { display: flex; gap: 24px; }
+  .cols > div { flex: 1; }
+  .small { font-size: 11px; color: #888; }
+  @media print {
+    body { background: white; }
+    .page { box-shadow: none; padding: 24px; }
+    img { break-inside: avoid; }
+    h2 { break-before: auto; }
+  }
+"""
+
+
+def report_context(inv, g1_times, g2_times, vdl_voltage, seg_idle):
+    """Investigation-specific text for build_html(): names, dates, times, logger details."""
+    header = vdl_header(inv.reference)
+    day = inv.date or g1_times[0].date()
+
+    def hhmm(t):
+        return (t + timedelta(seconds=30)).strftime("%H:%M")
+
+    idle = vdl_voltage[seg_idle[0]:seg_idle[1]]
+    idle = idle[idle > 1.0]
+    return {
+        "tail": inv.tail,
+        "aircraft": f"{inv.tail} ({inv.aircraft})" if inv.aircraft else inv.tail,
+        "date": day,
+        "date_long": f"{day:%B} {day.day}, {day.year}",
+        "routes": inv.routes,
+        "times": [f"{hhmm(t[0])} - {hhmm(t[-1])}" for t in (g1_times, g2_times)],
+        "durations": [(t[-1] - t[0]).total_seconds() / 60 for t in (g1_times, g2_times)],
+        "idle_min": (seg_idle[1] - seg_idle[0]) * header.sample_s / 60,
+        "idle_low": float(np.min(idle)) if len(idle) else float("nan"),
+        "vdl_serial": header.fields.get("Serial ID") or "unknown",
+        "vdl_sample_s": header.sample_s,
+    }
+
+
 def stats_table_html(s, label):
     sig = "Highly significant (p &lt; 0.001)" if s["p_paired"] < 0.001 else \
           "Significant (p &lt; 0.05)" if s["p_paired"] < 0.05 else "Not significant"
@@ -269,216 +561,889 @@ def stats_table_html(s, label):
     """
 
 
-def build_html(img_overview, img_comparison, img_hist, img_scatter, s1, s2, sc):
-    return f"""<!DOCTYPE html>
+def offset_direction(s):
+    """"lower"/"higher" if the G1000 reads systematically off the reference, else None."""
+    if s["p_paired"] >= 0.05 or abs(s["diff_mean"]) < SYSTEMATIC_OFFSET_V:
+        return None
+    return "lower" if s["diff_mean"] < 0 else "higher"
+
+
+def significance_text(s):
+    return ("highly statistically significant (paired t-test, p &lt; 0.001)" if s["p_paired"] < 0.001
+            else f"statistically significant (paired t-test, p = {s['p_paired']:.3f})")
+
+
+def report_findings(s1, s2, sc):
+    """What the statistics support, as flags and numbers for the narrative."""
+    direction = offset_direction(sc)
+    excess_noise = sc["g_std"] > EXCESS_NOISE_RATIO * sc["v_std"]
+    weak = abs(sc["r"]) < WEAK_CORRELATION_R
+    return {
+        "direction": direction,
+        "excess_noise": excess_noise,
+        "weak_correlation": weak,
+        "deep_dips": sc["diff_min"] <= -DEEP_DIP_V,
+        "flights_differ": abs(abs(s1["diff_mean"]) - abs(s2["diff_mean"])) >= SYSTEMATIC_OFFSET_V,
+        # Spurious annunciations: the G1000 crosses LOW VOLTS while the bus itself never does
+        "spurious_low_volts": direction == "lower" and sc["g_min"] < LOW_VOLTS <= sc["v_min"],
+        # The high-resistance measurement/ground path signature seen on N238PS
+        "ground_path": direction == "lower" and excess_noise and weak,
+        "below_line": float(np.mean(sc["diff"] < 0)),
+        "above_line": float(np.mean(sc["diff"] > 0)),
+    }
+
+
+def key_finding_html(sc, f):
+    if f["direction"] is None:
+        why = (f"is not statistically significant (paired t-test, p = {sc['p_paired']:.3f})"
+               if sc["p_paired"] >= 0.05 else f"is below the G1000's {SYSTEMATIC_OFFSET_V:g} V resolution")
+        return (f"The G1000 NXi agrees on average with an independent reference logger: the mean "
+                f"difference is <strong>{sc['diff_mean']:+.2f} V</strong>, which {why}.")
+    verb = "under-reports" if f["direction"] == "lower" else "over-reports"
+    text = (f"The G1000 NXi consistently {verb} bus voltage\n  compared to an independent reference logger. "
+            f"The mean offset is\n  <strong>{sc['diff_mean']:+.2f} V</strong> (G1000 reads {f['direction']}), "
+            f"with the difference\n  being {significance_text(sc)}.")
+    if f["spurious_low_volts"]:
+        text += (f"\n  The G1000 reading drops to {sc['g_min']:.1f} V while the reference never falls below "
+                 f"{LOW_VOLTS:.0f} V:\n  this under-reading is sufficient to trigger spurious LOW VOLTS "
+                 f"annunciations\n  during normal alternator operation.")
+    return text
+
+
+def comparison_html(sc, f):
+    if f["direction"] is None:
+        level = "tracks it on average"
+    else:
+        level = f"consistently reads {f['direction']}"
+    noise = ("exhibits substantially more fluctuation" if f["excess_noise"]
+             else "shows comparable fluctuation")
+    text = (f"""<p>The green trace (VDL48 reference) averages ~{sc['v_mean']:.1f} V during both flights.
+The blue trace (G1000 volt1) {level} and {noise}
+({sc['g_std']:.3f} vs {sc['v_std']:.3f} V std dev). The red trace shows the instantaneous difference.</p>
+""")
+    if f["deep_dips"]:
+        cause = (" These dips are consistent with variable voltage drop\n  across a resistive connection in "
+                 "the G1000's measurement or ground path." if f["ground_path"] else "")
+        text += f"""
+<div class="finding">
+  <p><strong>Observation:</strong> The G1000 voltage trace shows transient dips
+  not present in the VDL reference.{cause}
+  The worst-case dip reaches {sc['diff_min']:+.1f} V below the VDL reading.</p>
+</div>
+"""
+    return text
+
+
+def _shift_text(s):
+    d = offset_direction(s)
+    return "centred near zero" if d is None else f"shifted {'below' if d == 'lower' else 'above'} zero"
+
+
+def distribution_html(s1, s2, f):
+    d1, d2 = offset_direction(s1), offset_direction(s2)
+    if d1 == d2 and d1 is not None:
+        text = (f"Both flights show distributions {_shift_text(s1)}, confirming the G1000\n"
+                f"systematically reads {d1}.")
+    elif d1 == d2:
+        text = "Both flights show distributions centred near zero."
+    else:
+        text = f"Flight 1's differences are {_shift_text(s1)}; Flight 2's are {_shift_text(s2)}."
+    if f["flights_differ"]:
+        big, small = (("Flight 1", s1), ("Flight 2", s2))
+        if abs(s2["diff_mean"]) > abs(s1["diff_mean"]):
+            big, small = small, big
+        text += (f" {big[0]} shows a larger mean offset ({big[1]['diff_mean']:+.3f} V)\nthan {small[0]} "
+                 f"({small[1]['diff_mean']:+.3f} V), suggesting the magnitude varies with\noperating conditions.")
+    else:
+        text += (f" The two flights show similar mean offsets ({s1['diff_mean']:+.3f} V and "
+                 f"{s2['diff_mean']:+.3f} V).")
+    return f"<p>{text}</p>"
+
+
+def scatter_html(sc, f):
+    if f["direction"] is not None:
+        share = f["below_line"] if f["direction"] == "lower" else f["above_line"]
+        side = "below" if f["direction"] == "lower" else "above"
+        reading = "under-reading" if f["direction"] == "lower" else "over-reading"
+        text = (f"{'Nearly all' if share >= 0.95 else 'Most'} data points ({share:.0%}) fall {side} the "
+                f"1:1 line, confirming the systematic\n{reading}.")
+    else:
+        text = (f"Data points fall on both sides of the 1:1 line ({f['below_line']:.0%} below, "
+                f"{f['above_line']:.0%} above).")
+    r2 = sc["r"] ** 2
+    if f["weak_correlation"]:
+        text += (f" The low r-squared value ({r2:.2f}) indicates the G1000 fluctuations are\n"
+                 f"largely independent of actual bus voltage changes")
+        text += (", pointing to an issue in the\nG1000's voltage sensing path rather than a simple "
+                 "calibration offset." if f["ground_path"] else ".")
+    else:
+        text += f" The r-squared value ({r2:.2f}) shows the G1000 follows actual bus voltage changes"
+        text += (", so the offset behaves like a calibration error rather than a variable drop."
+                 if f["direction"] is not None else ".")
+    return f"<p>{text}</p>"
+
+
+def interpretation_html(s1, s2, sc, f):
+    """Sections 7-8: the high-resistance ground path diagnosis where the data show its
+    signature, otherwise a neutral summary of the comparison."""
+    if not f["ground_path"]:
+        offset = ("no systematic offset" if f["direction"] is None else
+                  f"a systematic offset of {sc['diff_mean']:+.2f} V (G1000 reads {f['direction']})")
+        noise = ("more" if f["excess_noise"] else "no more")
+        return f"""
+<h2>7. Interpretation</h2>
+<p>Compared with the VDL48 reference, the G1000 shows {offset}, {noise} fluctuation than the
+bus itself ({sc['g_std']:.3f} vs {sc['v_std']:.3f} V std dev) and a correlation of r = {sc['r']:.2f}.
+This is not the pattern of a high-resistance connection in the G1000's measurement or ground
+return path (a variable under-reading with excess noise that does not follow the bus).</p>
+"""
+    evidence = [f"""<li><strong>Variable offset, not constant:</strong> A calibration error would produce
+  a fixed offset. The observed difference varies from {sc['diff_min']:+.1f} V to
+  {sc['diff_max']:+.1f} V, with a standard deviation of {sc['diff_std']:.2f} V.</li>""",
+                f"""<li><strong>G1000 shows excess noise:</strong> The VDL sees a stable bus ({sc['v_std']:.3f} V std dev)
+  while the G1000 fluctuates much more ({sc['g_std']:.3f} V std dev). The extra variance
+  comes from current-dependent voltage drops across a resistive connection.</li>""",
+                f"""<li><strong>Weak correlation (r = {sc['r']:.2f}):</strong> The two instruments
+  are measuring the same bus, yet their readings are largely uncorrelated. This
+  means the G1000's voltage fluctuations are driven by its own ground/sensing path
+  impedance, not by actual bus voltage changes.</li>"""]
+    if f["deep_dips"]:
+        evidence.append(f"""<li><strong>Transient deep dips:</strong> Momentary dips to {sc['diff_min']:+.1f} V below
+  reference are consistent with high-current events (radio transmit, servo actuation)
+  pulling current through a resistive ground, causing instantaneous offset spikes.</li>""")
+    if f["flights_differ"]:
+        evidence.append(f"""<li><strong>Different magnitude between flights:</strong> Flight 1 mean offset was
+  {s1['diff_mean']:+.2f} V vs Flight 2 at {s2['diff_mean']:+.2f} V. Thermal expansion,
+  vibration settling, or connector seating changes between flights can alter
+  contact resistance.</li>""")
+    items = "\n  ".join(evidence)
+    return f"""
+<h2>7. Interpretation and Probable Cause</h2>
+<p>The data pattern is consistent with a <strong>high-resistance connection</strong> in the
+G1000's voltage measurement or ground return path. Key evidence:</p>
+<ul>
+  {items}
+</ul>
+
+<h2>8. Recommended Actions</h2>
+<ul>
+  <li>Inspect G1000 GDU and GIA unit ground terminals at the airframe ground bus for
+  corrosion, loose hardware, paint under ring terminals, or cracked terminals.</li>
+  <li>Measure resistance from the G1000 ground pin (at the connector) to battery
+  negative. Values above ~0.02-0.05 ohms would explain the observed offset
+  (at 20 A load, 0.05 ohms = 1.0 V drop).</li>
+  <li>Inspect the main airframe ground bus to battery/engine ground strap.</li>
+  <li>Check the G1000 harness connector pins (GDU 1050/1060, GIA 63W) for the
+  voltage sensing and ground pins specifically.</li>
+  <li>After repair, repeat this test to verify the offset is eliminated.</li>
+</ul>
+"""
+
+
+def html_sections(ctx, figures, s1, s2, sc):
+    """The report as a sequence of HTML text sections and, where each image goes,
+    a (name, zero-argument callable making the figure) pair from figures.
+
+    Findings and interpretation are worded from the statistics (report_findings()).
+    """
+    r1, r2 = ctx["routes"]
+    f = report_findings(s1, s2, sc)
+    yield f"""<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>Voltage Analysis Report - N238PS - 2026-02-08</title>
+<title>Voltage Analysis Report - {ctx['tail']} - {ctx['date']:%Y-%m-%d}</title>
 <style>
-  * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-  body {{
-    font-family: -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-    color: #1a1a1a; background: #f5f5f5; line-height: 1.6;
-  }}
-  .page {{
-    max-width: 900px; margin: 0 auto; background: white;
-    padding: 48px 56px; box-shadow: 0 1px 4px rgba(0,0,0,0.08);
-  }}
-  h1 {{ font-size: 22px; margin-bottom: 4px; color: #1a3a5c; }}
-  h2 {{ font-size: 17px; color: #2a5a8a; margin: 32px 0 12px 0;
-        border-bottom: 2px solid #dde4ec; padding-bottom: 4px; }}
-  h3 {{ font-size: 14px; color: #3a3a3a; margin: 20px 0 8px 0; }}
-  .subtitle {{ font-size: 13px; color: #666; margin-bottom: 24px; }}
-  p, li {{ font-size: 13px; margin-bottom: 8px; }}
-  ul {{ padding-left: 24px; }}
-  img {{ width: 100%; height: auto; margin: 12px 0 20px 0; border: 1px solid #e8e8e8; }}
-  table {{
-    width: 100%; border-collapse: collapse; font-size: 12.5px; margin-bottom: 16px;
-  }}
-  th, td {{ padding: 5px 10px; text-align: left; border-bottom: 1px solid #e8e8e8; }}
-  th {{ background: #f0f4f8; color: #2a5a8a; font-weight: 600; }}
-  td.neg {{ color: #c0392b; font-weight: 600; }}
-  .summary-box {{
-    background: #fdf2f0; border-left: 4px solid #c0392b; padding: 14px 18px;
-    margin: 20px 0; border-radius: 0 4px 4px 0;
-  }}
-  .summary-box p {{ margin-bottom: 4px; }}
-  .summary-box strong {{ color: #c0392b; }}
-  .finding {{ background: #f0f7ff; border-left: 4px solid #2a5a8a; padding: 14px 18px;
-              margin: 16px 0; border-radius: 0 4px 4px 0; }}
-  .cols {{ display: flex; gap: 24px; }}
-  .cols > div {{ flex: 1; }}
-  .small {{ font-size: 11px; color: #888; }}
-  @media print {{
-    body {{ background: white; }}
-    .page {{ box-shadow: none; padding: 24px; }}
-    img {{ break-inside: avoid; }}
-    h2 {{ break-before: auto; }}
-  }}
-</style>
+{REPORT_CSS}</style>
 </head>
 <body>
 <div class="page">
 
 <h1>Voltage Measurement Correlation Report</h1>
 <p class="subtitle">
-  Aircraft N238PS (Diamond DA40NG) &mdash; Garmin G1000 NXi vs Triplett VDL48<br>
-  Date of flights: February 8, 2026 &nbsp;|&nbsp; Report generated: {datetime.now().strftime('%B %d, %Y')}
+  Aircraft {ctx['aircraft']} &mdash; Garmin G1000 NXi vs Triplett VDL48<br>
+  Date of flights: {ctx['date_long']} &nbsp;|&nbsp; Report generated: {datetime.now().strftime('%B %d, %Y')}
 </p>
 
 <div class="summary-box">
-  <p><strong>Key Finding:</strong> The G1000 NXi consistently under-reports bus voltage
-  compared to an independent reference logger. The mean offset is
-  <strong>{sc['diff_mean']:+.2f} V</strong> (G1000 reads lower), with the difference
-  being highly statistically significant (paired t-test, p &lt; 0.001).
-  This under-reading is sufficient to trigger spurious LOW VOLTS annunciations
-  during normal alternator operation.</p>
+  <p><strong>Key Finding:</strong> {key_finding_html(sc, f)}</p>
 </div>
 
 <h2>1. Test Setup</h2>
-<p>A Triplett VDL48 voltage data logger (2-second sampling) was connected to the
+<p>A Triplett VDL48 voltage data logger ({ctx['vdl_sample_s']:g}-second sampling) was connected to the
 aircraft electrical bus as an independent reference. Two flights were conducted
 with the G1000 NXi data logging enabled (1-second sampling):</p>
 <table>
   <tr><th></th><th>Flight 1</th><th>Flight 2</th></tr>
-  <tr><td>Route</td><td>KBOW to KSPG</td><td>KSPG to KBOW</td></tr>
-  <tr><td>Time (UTC)</td><td>15:51 - 16:47</td><td>18:10 - 19:25</td></tr>
-  <tr><td>Duration</td><td>~56 min</td><td>~75 min</td></tr>
+  <tr><td>Route</td><td>{r1}</td><td>{r2}</td></tr>
+  <tr><td>Time (UTC)</td><td>{ctx['times'][0]}</td><td>{ctx['times'][1]}</td></tr>
+  <tr><td>Duration</td><td>~{ctx['durations'][0]:.0f} min</td><td>~{ctx['durations'][1]:.0f} min</td></tr>
   <tr><td>G1000 samples</td><td>{s1['n']:,}</td><td>{s2['n']:,}</td></tr>
 </table>
-<p>The VDL48 recorded continuously across both flights and the ~85-minute ground
+<p>The VDL48 recorded continuously across both flights and the ~{ctx['idle_min']:.0f}-minute ground
 stop between them, capturing three distinct phases visible in the overview below.</p>
 
 <h2>2. VDL48 Full Recording Overview</h2>
-<img src="data:image/png;base64,{img_overview}" alt="VDL Overview">
-<p class="small">The VDL48 shows stable ~28.3 V during both flights (alternator charging),
-a gradual decay to ~25.5 V during the engine-off idle period, and 0 V after disconnection.</p>
+<img src=\""""
+    yield "overview", figures["overview"]
+    yield f"""" alt="VDL Overview">
+<p class="small">The VDL48 shows stable ~{sc['v_mean']:.1f} V during both flights (alternator charging),
+a gradual decay to ~{ctx['idle_low']:.1f} V during the engine-off idle period, and 0 V after disconnection.</p>
 
 <h2>3. Flight-by-Flight Voltage Comparison</h2>
-<img src="data:image/png;base64,{img_comparison}" alt="Flight Comparison">
-<p>The green trace (VDL48 reference) remains steady at ~28.3 V during both flights.
-The blue trace (G1000 volt1) consistently reads lower and exhibits substantially
-more fluctuation. The red trace shows the instantaneous difference.</p>
-
-<div class="finding">
-  <p><strong>Observation:</strong> The G1000 voltage trace shows frequent transient dips
-  not present in the VDL reference. These dips are consistent with variable voltage drop
-  across a resistive connection in the G1000's measurement or ground path.
-  The worst-case dip reaches {sc['diff_min']:+.1f} V below the VDL reading.</p>
-</div>
-
+<img src=\""""
+    yield "comparison", figures["comparison"]
+    yield f"""" alt="Flight Comparison">
+{comparison_html(sc, f)}
 <h2>4. Statistical Analysis</h2>
 <div class="cols">
-  <div>{stats_table_html(s1, "Flight 1: KBOW to KSPG")}</div>
-  <div>{stats_table_html(s2, "Flight 2: KSPG to KBOW")}</div>
+  <div>{stats_table_html(s1, f"Flight 1: {r1}")}</div>
+  <div>{stats_table_html(s2, f"Flight 2: {r2}")}</div>
 </div>
 {stats_table_html(sc, "Combined (Both Flights)")}
 
 <h2>5. Distribution of Differences</h2>
-<img src="data:image/png;base64,{img_hist}" alt="Difference Histograms">
-<p>Both flights show distributions shifted well below zero, confirming the G1000
-systematically reads lower. Flight 1 shows a larger mean offset ({s1['diff_mean']:+.3f} V)
-than Flight 2 ({s2['diff_mean']:+.3f} V), suggesting the magnitude varies with
-operating conditions.</p>
+<img src=\""""
+    yield "hist", figures["hist"]
+    yield f"""" alt="Difference Histograms">
+{distribution_html(s1, s2, f)}
 
 <h2>6. Correlation Scatter Plot</h2>
-<img src="data:image/png;base64,{img_scatter}" alt="Scatter Plot">
-<p>Nearly all data points fall below the 1:1 line, confirming the systematic
-under-reading. The low r-squared value indicates the G1000 fluctuations are
-largely independent of actual bus voltage changes, pointing to an issue in the
-G1000's voltage sensing path rather than a simple calibration offset.</p>
+<img src=\""""
+    yield "scatter", figures["scatter"]
+    yield f"""" alt="Scatter Plot">
+{scatter_html(sc, f)}
+{interpretation_html(s1, s2, sc, f)}
+<p class="small" style="margin-top: 32px; padding-top: 12px; border-top: 1px solid #ddd;">
+  Analysis performed using G1000 NXi data logs and Triplett VDL48 (S/N: {ctx['vdl_serial']},
+  {ctx['vdl_sample_s']:g}-sec sampling). Statistical methods: paired t-test, Pearson correlation, linear
+  interpolation to common 2-second grid. All times UTC.
+</p>
 
-<h2>7. Interpretation and Probable Cause</h2>
-<p>The data pattern is consistent with a <strong>high-resistance connection</strong> in the
-G1000's voltage measurement or ground return path. Key evidence:</p>
-<ul>
-  <li><strong>Variable offset, not constant:</strong> A calibration error would produce
-  a fixed offset. The observed difference varies from {sc['diff_min']:+.1f} V to
-  {sc['diff_max']:+.1f} V, with a standard deviation of {sc['diff_std']:.2f} V.</li>
-  <li><strong>G1000 shows excess noise:</strong> The VDL sees a stable bus ({sc['v_std']:.3f} V std dev)
-  while the G1000 fluctuates much more ({sc['g_std']:.3f} V std dev). The extra variance
-  comes from current-dependent voltage drops across a resistive connection.</li>
-  <li><strong>Near-zero correlation (r = {sc['r']:.2f}):</strong> The two instruments
-  are measuring the same bus, yet their readings are essentially uncorrelated. This
-  means the G1000's voltage fluctuations are driven by its own ground/sensing path
-  impedance, not by actual bus voltage changes.</li>
-  <li><strong>Transient deep dips:</strong> Momentary dips to {sc['diff_min']:+.1f} V below
-  reference are consistent with high-current events (radio transmit, servo actuation)
-  pulling current through a resistive ground, causing instantaneous offset spikes.</li>
-  <li><strong>Different magnitude between flights:</strong> Flight 1 mean offset was
-  {s1['diff_mean']:+.2f} V vs Flight 2 at {s2['diff_mean']:+.2f} V. Thermal expansion,
-  vibration settling, or connector seating changes between flights can alter
-  contact resistance.</li>
-</ul>
+</div>
+</body>
+</html>"""
+
+
+class ReportTooLarge(ValueError):
+    """The written report exceeds the ImageOptions size budget."""
+
+
+def _write_sections(out, sections, images, dpi_scale):
+    for section in sections:
+        if isinstance(section, str):
+            out.write(section)
+        else:
+            name, make_figure = section
+            write_figure(out, make_figure(), figure_dpi(images, name, dpi_scale), images.format)
+
+
+@timed()
+def write_report(path, sections, images=ImageOptions(), dpi_scale=1.0):
+    """Stream html_sections() output to path, rendering and encoding one figure at a time.
+
+    Written to a temporary file and moved into place, so an interrupted run
+    never leaves a truncated report. Returns the report size in bytes;
+    raises ReportTooLarge if it exceeds images.max_bytes, leaving no report
+    (an older report at path is removed rather than left looking current).
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as out:
+            _write_sections(out, sections, images, dpi_scale)
+        size = tmp.stat().st_size
+        if images.max_bytes is not None and size > images.max_bytes:
+            path.unlink(missing_ok=True)
+            raise ReportTooLarge(f"{path.name}: {size / 1e6:.2f} MB exceeds the "
+                                 f"{images.max_bytes / 1e6:.2f} MB budget")
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return size
+
+
+def build_html(ctx, figures, s1, s2, sc, images=ImageOptions()):
+    """The whole report as one string (for tests and benchmarks; write_report() streams)."""
+    out = io.StringIO()
+    _write_sections(out, html_sections(ctx, figures, s1, s2, sc), images, 1.0)
+    return out.getvalue()
+
+
+# =============================================================================
+# Interactive report (embedded multi-resolution data + canvas viewer)
+# =============================================================================
+
+ZOOM_FACTOR = 4                  # each level's buckets are this much narrower than the next coarser one
+ZOOM_MIN_POINTS = 1000           # the coarsest level has at most about this many points per series
+
+SERIES_STYLE = [("G1000 volt1", "#4A90D9"), ("VDL48 reference", "#50B86C"), ("ECU ch808", "#E8943A")]
+
+VIEWER_CSS = """\
+  .viewer-controls { display: flex; flex-wrap: wrap; gap: 8px; align-items: center;
+                     margin: 8px 0; font-size: 12.5px; }
+  .viewer-controls button { font: inherit; padding: 3px 10px; border: 1px solid #c8d2dc;
+                            background: #f0f4f8; color: #2a5a8a; border-radius: 3px; cursor: pointer; }
+  .viewer-controls label { margin-left: 8px; cursor: pointer; }
+  #volts-chart { display: block; width: 100%; height: 400px; border: 1px solid #e8e8e8;
+                 cursor: grab; touch-action: none; }
+  #volts-readout { min-height: 1.6em; font-family: Menlo, Consolas, monospace; }
+"""
+
+VIEWER_JS = """\
+(function () {
+  "use strict";
+  var D = JSON.parse(document.getElementById("volts-data").textContent);
+  var canvas = document.getElementById("volts-chart"), g = canvas.getContext("2d");
+  var readout = document.getElementById("volts-readout");
+  var M = {l: 48, r: 12, t: 10, b: 26};
+  var tMin = Infinity, tMax = -Infinity, view, hover = null, drag = null;
+
+  function f32(b64) {
+    var s = atob(b64), bytes = new Uint8Array(s.length);
+    for (var i = 0; i < s.length; i++) bytes[i] = s.charCodeAt(i);
+    return new Float32Array(bytes.buffer);
+  }
+  // Levels are stored coarsest first; each is decoded the first time a view needs it
+  function decode(L) {
+    if (!L.tv) { L.tv = f32(L.t); L.vv = f32(L.v); L.t = L.v = null; }
+    return L;
+  }
+  function pickLevel(s, width) {
+    var frac = (view.x1 - view.x0) / (tMax - tMin);
+    for (var i = 0; i < s.levels.length - 1; i++) {
+      if (s.levels[i].n * frac >= width) break;
+    }
+    return decode(s.levels[i]);
+  }
+  function lowerBound(a, x) {
+    var lo = 0, hi = a.length;
+    while (lo < hi) { var mid = (lo + hi) >> 1; if (a[mid] < x) lo = mid + 1; else hi = mid; }
+    return lo;
+  }
+  function niceStep(raw, steps) {
+    for (var i = 0; i < steps.length; i++) if (steps[i] >= raw) return steps[i];
+    return steps[steps.length - 1] * Math.ceil(raw / steps[steps.length - 1]);
+  }
+  function clock(t, seconds) {
+    return new Date((t + D.t0) * 1000).toISOString().substr(11, seconds ? 8 : 5);
+  }
+  function setView(x0, x1) {
+    var span = Math.min(Math.max(x1 - x0, 10), tMax - tMin);
+    x0 = Math.min(Math.max(x0, tMin), tMax - span);
+    view = {x0: x0, x1: x0 + span};
+    draw();
+  }
+
+  D.series.forEach(function (s) {
+    var L = decode(s.levels[0]);
+    s.visible = true;
+    tMin = Math.min(tMin, L.tv[0]);
+    tMax = Math.max(tMax, L.tv[L.tv.length - 1]);
+  });
+
+  function draw() {
+    var W = canvas.clientWidth, H = canvas.clientHeight, dpr = window.devicePixelRatio || 1;
+    canvas.width = W * dpr; canvas.height = H * dpr;
+    g.setTransform(dpr, 0, 0, dpr, 0, 0);
+    g.clearRect(0, 0, W, H);
+    var pw = W - M.l - M.r, ph = H - M.t - M.b, lo = Infinity, hi = -Infinity, shown = [], points = 0;
+    D.series.forEach(function (s) {
+      if (!s.visible) return;
+      var L = pickLevel(s, pw);
+      var i0 = Math.max(lowerBound(L.tv, view.x0) - 1, 0);
+      var i1 = Math.min(lowerBound(L.tv, view.x1) + 1, L.tv.length);
+      for (var i = i0; i < i1; i++) {
+        var v = L.vv[i];
+        if (v < lo) lo = v;
+        if (v > hi) hi = v;
+      }
+      shown.push({s: s, L: L, i0: i0, i1: i1});
+      points += i1 - i0;
+    });
+    if (!(hi >= lo)) { lo = 0; hi = 30; }
+    var pad = Math.max((hi - lo) * 0.05, 0.05);
+    lo -= pad; hi += pad;
+    function X(t) { return M.l + (t - view.x0) / (view.x1 - view.x0) * pw; }
+    function Y(v) { return M.t + (hi - v) / (hi - lo) * ph; }
+
+    g.font = "11px sans-serif"; g.lineWidth = 1; g.strokeStyle = "#e8e8e8"; g.fillStyle = "#555";
+    g.textAlign = "right"; g.textBaseline = "middle";
+    var ys = niceStep((hi - lo) / 6, [0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10]);
+    for (var v = Math.ceil(lo / ys) * ys; v <= hi; v += ys) {
+      var y = Math.round(Y(v)) + 0.5;
+      g.beginPath(); g.moveTo(M.l, y); g.lineTo(M.l + pw, y); g.stroke();
+      g.fillText(v.toFixed(ys < 0.1 ? 2 : 1), M.l - 4, y);
+    }
+    g.textAlign = "center"; g.textBaseline = "top";
+    var xs = niceStep((view.x1 - view.x0) / 8, [1, 2, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200]);
+    for (var t = Math.ceil((view.x0 + D.t0) / xs) * xs - D.t0; t <= view.x1; t += xs) {
+      var x = Math.round(X(t)) + 0.5;
+      g.beginPath(); g.moveTo(x, M.t); g.lineTo(x, M.t + ph); g.stroke();
+      g.fillText(clock(t, xs < 60), x, M.t + ph + 5);
+    }
+
+    g.save();
+    g.beginPath(); g.rect(M.l, M.t, pw, ph); g.clip();
+    shown.forEach(function (d) {
+      var tv = d.L.tv, vv = d.L.vv, pen = false;
+      g.strokeStyle = d.s.color; g.beginPath();
+      for (var i = d.i0; i < d.i1; i++) {
+        if (vv[i] !== vv[i]) { pen = false; continue; }
+        if (pen) g.lineTo(X(tv[i]), Y(vv[i])); else g.moveTo(X(tv[i]), Y(vv[i]));
+        pen = true;
+      }
+      g.stroke();
+    });
+    var text = "";
+    if (hover !== null && hover >= M.l && hover <= M.l + pw) {
+      var th = view.x0 + (hover - M.l) / pw * (view.x1 - view.x0);
+      g.strokeStyle = "#999"; g.beginPath(); g.moveTo(hover + 0.5, M.t); g.lineTo(hover + 0.5, M.t + ph); g.stroke();
+      text = clock(th, true) + " UTC";
+      shown.forEach(function (d) {
+        var tv = d.L.tv, i = Math.min(lowerBound(tv, th), tv.length - 1);
+        if (i > 0 && th - tv[i - 1] < tv[i] - th) i--;
+        var near = Math.abs(tv[i] - th) <= 5 * (view.x1 - view.x0) / pw + 2;
+        var val = near && d.L.vv[i] === d.L.vv[i] ? d.L.vv[i].toFixed(2) + " V" : "-";
+        text += "   <span style=\\"color:" + d.s.color + "\\">&#9632;</span> " + d.s.name + " " + val;
+      });
+    } else {
+      text = clock(view.x0, true) + " - " + clock(view.x1, true) + " UTC, " + points.toLocaleString() + " points drawn";
+    }
+    readout.innerHTML = text;
+    g.restore();
+  }
+
+  canvas.addEventListener("wheel", function (e) {
+    e.preventDefault();
+    var r = canvas.getBoundingClientRect(), pw = r.width - M.l - M.r;
+    var f = Math.min(Math.max((e.clientX - r.left - M.l) / pw, 0), 1);
+    var at = view.x0 + f * (view.x1 - view.x0), k = e.deltaY < 0 ? 1 / 1.25 : 1.25;
+    setView(at - f * (view.x1 - view.x0) * k, at + (1 - f) * (view.x1 - view.x0) * k);
+  }, {passive: false});
+  canvas.addEventListener("pointerdown", function (e) {
+    drag = {x: e.clientX, x0: view.x0, x1: view.x1};
+    canvas.setPointerCapture(e.pointerId);
+    canvas.style.cursor = "grabbing";
+  });
+  canvas.addEventListener("pointermove", function (e) {
+    var r = canvas.getBoundingClientRect();
+    hover = e.clientX - r.left;
+    if (drag) {
+      var dt = (e.clientX - drag.x) / (r.width - M.l - M.r) * (drag.x1 - drag.x0);
+      setView(drag.x0 - dt, drag.x1 - dt);
+    } else {
+      draw();
+    }
+  });
+  canvas.addEventListener("pointerup", function () { drag = null; canvas.style.cursor = "grab"; });
+  canvas.addEventListener("pointerleave", function () { hover = null; if (!drag) draw(); });
+  canvas.addEventListener("dblclick", function () { setView(tMin, tMax); });
+  document.querySelectorAll("[data-range]").forEach(function (b) {
+    b.addEventListener("click", function () {
+      var r = b.getAttribute("data-range").split(",");
+      setView(+r[0], +r[1]);
+    });
+  });
+  document.querySelectorAll("[data-series]").forEach(function (c) {
+    c.addEventListener("change", function () {
+      D.series[+c.getAttribute("data-series")].visible = c.checked;
+      draw();
+    });
+  });
+  window.addEventListener("resize", draw);
+  setView(tMin, tMax);
+})();
+"""
+
+
+def _epoch(times):
+    """Naive-UTC datetime array -> float64 epoch seconds."""
+    return np.array(times, dtype="datetime64[s]").astype(np.int64).astype(np.float64)
 
-<h2>8. Recommended Actions</h2>
-<ul>
-  <li>Inspect G1000 GDU and GIA unit ground terminals at the airframe ground bus for
-  corrosion, loose hardware, paint under ring terminals, or cracked terminals.</li>
-  <li>Measure resistance from the G1000 ground pin (at the connector) to battery
-  negative. Values above ~0.02-0.05 ohms would explain the observed offset
-  (at 20 A load, 0.05 ohms = 1.0 V drop).</li>
-  <li>Inspect the main airframe ground bus to battery/engine ground strap.</li>
-  <li>Check the G1000 harness connector pins (GDU 1050/1060, GIA 63W) for the
-  voltage sensing and ground pins specifically.</li>
-  <li>After repair, repeat this test to verify the offset is eliminated.</li>
-</ul>
+
+def resolution_levels(segments, factor=ZOOM_FACTOR, min_points=ZOOM_MIN_POINTS):
+    """Multi-resolution polylines of one series, coarsest first.
+
+    segments is a list of (t, v) arrays (e.g. one per flight). The finest
+    level is every sample; each coarser level keeps the min and max sample
+    of buckets factor times wider (minmax_indices), so dips stay visible at
+    every zoom. Segments are joined by a NaN sample halfway between them,
+    which the viewer draws as a gap; t stays sorted for binary search.
+    """
+    segments = [(t, v) for t, v in segments if len(t)]
+    levels, bucket = [], 1
+    while True:
+        ts, vs = [], []
+        for k, (t, v) in enumerate(segments):
+            if bucket > 1 and len(v) > 2:
+                keep = minmax_indices(v, max(1, len(v) // bucket))
+                t, v = t[keep], v[keep]
+            if k:
+                ts.append([(ts[-1][-1] + t[0]) / 2])
+                vs.append([np.nan])
+            ts.append(t)
+            vs.append(v)
+        level = (np.concatenate(ts), np.concatenate(vs))
+        if levels and len(level[0]) >= len(levels[-1][0]):
+            break
+        levels.append(level)
+        if len(level[0]) <= min_points:
+            break
+        bucket *= factor
+    return levels[::-1]
+
+
+def ecu_segments(inv, windows):
+    """ECU channel 808 (UTC epoch s, volts) inside each (start, end) window.
+
+    Sessions come from inv.ecu (AustroView CSVs or .ae3 dumps), by default
+    ../AustroView/Data/Parsed then data/ECU. Returns (segments, note): no
+    segments and a note saying why when no ECU source is usable.
+    """
+    csv_dir = Path(inv.ecu) if inv.ecu else ECU_PARSED_DIR
+    sessions = ecu_sessions(csv_dir)
+    if not sessions:
+        try:
+            sessions = ae3_sessions(Path(inv.ecu) if inv.ecu else AE3_DIR)
+        except DecoderUnavailable:
+            return [], "ECU data not shown: the .ae3 dumps need a decoder (see ae3_ingest.py)."
+    index = IntervalIndex.of(sessions)
+    segments = []
+    for lo, hi in windows:
+        parts = [session_arrays(s) for s in index.overlapping(lo, hi, MIN_OVERLAP_S)]
+        if parts:
+            t, v = np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+            keep = (t >= lo) & (t <= hi)
+            segments.append((t[keep], v[keep]))
+    return segments, None if segments else "ECU data not shown: no ECU session overlaps these flights."
+
+
+def _f32_base64(values):
+    return base64.b64encode(np.asarray(values, dtype="<f4").tobytes()).decode("ascii")
+
+
+def interactive_sections(ctx, series, flights, t0, ecu_note, s1, s2, sc):
+    """The interactive report as HTML text sections, one resolution level per section.
+
+    series: [(name, color, levels)] with levels from resolution_levels();
+    flights: [(label, start, end)] in epoch seconds; t0: epoch seconds that
+    the embedded Float32 times are relative to.
+    """
+    r1, r2 = ctx["routes"]
+    buttons = "\n".join(f'  <button data-range="{start - t0:.0f},{end - t0:.0f}">{label}</button>'
+                        for label, start, end in flights)
+    legend = "\n".join(f'  <label><input type="checkbox" data-series="{k}" checked> '
+                       f'<span style="color:{color}">&#9632;</span> {name}</label>'
+                       for k, (name, color, _) in enumerate(series))
+    note = f'<p class="small">{ecu_note}</p>\n' if ecu_note else ""
+    yield f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Interactive Voltage Report - {ctx['tail']} - {ctx['date']:%Y-%m-%d}</title>
+<style>
+{REPORT_CSS}{VIEWER_CSS}</style>
+</head>
+<body>
+<div class="page">
+
+<h1>Interactive Voltage Report</h1>
+<p class="subtitle">
+  Aircraft {ctx['aircraft']} &mdash; {" vs ".join(name for name, _, _ in series)}<br>
+  Date of flights: {ctx['date_long']} &nbsp;|&nbsp; Report generated: {datetime.now().strftime('%B %d, %Y')}
+</p>
+
+<h2>Voltage Traces</h2>
+<div class="viewer-controls">
+  <button data-range="{flights[0][1] - t0:.0f},{flights[-1][2] - t0:.0f}">All</button>
+{buttons}
+{legend}
+</div>
+<canvas id="volts-chart"></canvas>
+<p id="volts-readout" class="small">&nbsp;</p>
+<p class="small">Scroll to zoom, drag to pan, double-click to reset. Zoomed out, each trace is
+min/max-decimated so transient dips stay visible; finer levels, down to every recorded sample,
+are decoded from the embedded data as you zoom in. VDL48 times are aligned to the G1000 flight start.</p>
+{note}
+<h2>G1000 vs VDL48 Statistics</h2>
+<div class="cols">
+  <div>{stats_table_html(s1, f"Flight 1: {r1}")}</div>
+  <div>{stats_table_html(s2, f"Flight 2: {r2}")}</div>
+</div>
+{stats_table_html(sc, "Combined (Both Flights)")}
 
 <p class="small" style="margin-top: 32px; padding-top: 12px; border-top: 1px solid #ddd;">
-  Analysis performed using G1000 NXi data logs and Triplett VDL48 (S/N: 171VD_2506100052,
-  2-sec sampling). Statistical methods: paired t-test, Pearson correlation, linear
-  interpolation to common 2-second grid. All times UTC.
+  G1000 NXi data logs and Triplett VDL48 (S/N: {ctx['vdl_serial']}, {ctx['vdl_sample_s']:g}-sec sampling).
+  Single offline file: data and viewer are embedded, nothing is loaded from the network. All times UTC.
 </p>
 
 </div>
+<script id="volts-data" type="application/json">{{"t0": {t0:.0f}, "series": ["""
+    for k, (name, color, levels) in enumerate(series):
+        yield f'{"," if k else ""}\n{{"name": {json.dumps(name)}, "color": "{color}", "levels": ['
+        for j, (t, v) in enumerate(levels):
+            yield f'{"," if j else ""}\n  {{"n": {len(t)}, "t": "{_f32_base64(t - t0)}", "v": "{_f32_base64(v)}"}}'
+        yield "]}"
+    yield f"""]}}</script>
+<script>
+{VIEWER_JS}</script>
 </body>
-</html>"""
+</html>
+"""
+
+
+def generate_interactive(inv, output_dir=OUTPUT_DIR, images=ImageOptions(), log=print):
+    """Write the interactive report for one Investigation and return its path.
+
+    Only images.max_bytes applies (there are no images); a report over
+    budget raises ReportTooLarge.
+    """
+    inv, a = analyze(inv, log)
+
+    log("Building resolution levels...")
+    windows = [(_epoch(a["g1_times"])[0], _epoch(a["g1_times"])[-1]),
+               (_epoch(a["g2_times"])[0], _epoch(a["g2_times"])[-1])]
+    sources = [
+        [(_epoch(a["g1_times"]), a["g1_volt1"]), (_epoch(a["g2_times"]), a["g2_volt1"])],
+        [(_epoch(a["vdl_f1_times"]), a["vdl_f1_volts"]), (_epoch(a["vdl_f2_times"]), a["vdl_f2_volts"])],
+    ]
+    ecu, ecu_note = ecu_segments(inv, windows)
+    if ecu:
+        sources.append(ecu)
+    series = [(name, color, resolution_levels(segments))
+              for (name, color), segments in zip(SERIES_STYLE, sources)]
+    flights = [(f"Flight {k + 1}: {route}", lo, hi) for k, (route, (lo, hi)) in enumerate(zip(inv.routes, windows))]
+
+    log("Writing interactive HTML report...")
+    ctx = report_context(inv, a["g1_times"], a["g2_times"], a["vdl_voltage"], a["seg_idle"])
+    report_path = Path(output_dir) / interactive_filename(inv)
+    size = write_report(report_path, interactive_sections(ctx, series, flights, np.floor(windows[0][0]),
+                                                          ecu_note, a["s1"], a["s2"], a["sc"]), images)
+    log(f"  {size / 1e6:.2f} MB, {sum(len(l[0]) for _, _, levels in series for l in levels):,} points "
+        f"in {sum(len(levels) for _, _, levels in series)} levels")
+
+    log(f"\nReport saved: {report_path}")
+    return report_path
 
 
 # =============================================================================
 # Main
 # =============================================================================
 
+# Per-investigation failures in a batch (bad inputs, over budget): reported, not fatal
+INVESTIGATION_ERRORS = (ValueError, RuntimeError, OSError, EOFError)
+
+
+def _report_job(inv, output_dir, images, interactive=False):
+    """Worker entry point: one investigation's report, quietly. Returns (path, None)
+    or (None, error message), so one failing investigation does not stop the batch."""
+    write = generate_interactive if interactive else generate
+    try:
+        return str(write(inv, output_dir, images, log=lambda *a: None)), None
+    except INVESTIGATION_ERRORS as e:
+        return None, f"{inv.name}: {e}"
+
+
+def _parse_job(kind, path):
+    """Worker entry point: parse one input into the cache. Returns None, or an error message."""
+    try:
+        if kind == "g1000":
+            parse_g1000(path)
+        else:
+            parse_vdl(path)
+    except INVESTIGATION_ERRORS as e:
+        return str(e) if str(path) in str(e) else f"{path}: {e}"  # OSErrors already name the file
+    return None
+
+
 def main():
-    print("Parsing data...")
-    g1_times, g1_volt1 = parse_g1000(FLIGHT1_CSV)
-    g2_times, g2_volt1 = parse_g1000(FLIGHT2_CSV)
-    vdl_elapsed, vdl_voltage = parse_vdl(VDL_CSV)
+    parser = argparse.ArgumentParser(description="Generate the self-contained HTML voltage report")
+    parser.add_argument("--manifest", default=None,
+                        help="JSON manifest of investigations to report (default: the N238PS 2026-02-08 flights)")
+    parser.add_argument("--output-dir", default=str(OUTPUT_DIR), help="Directory for the reports (default: output)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for batch reports (default: CPU count, 1 = no pool)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the parse cache in data/cache/")
+    parser.add_argument("--image-format", choices=IMAGE_FORMATS, default="png",
+                        help="Embedded image encoding: png, png8 (palette PNG), svg (decimated vector), "
+                             "webp (default: png)")
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI, help=f"Figure DPI (default: {DEFAULT_DPI})")
+    parser.add_argument("--figure-dpi", nargs="+", default=[], metavar="NAME=DPI",
+                        help=f"Per-figure DPI overrides; figures: {', '.join(FIGURE_NAMES)}")
+    parser.add_argument("--max-size", type=float, default=None, metavar="MB",
+                        help="Size budget per report; DPI is lowered to fit, and a report that "
+                             "still does not fit is an error")
+    parser.add_argument("--interactive", action="store_true",
+                        help="Write the interactive report (embedded zoomable data, no images) instead")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.no_cache:
+        disable_cache()
 
-    print("Segmenting VDL...")
-    seg_f1, seg_idle, seg_f2 = segment_vdl(vdl_elapsed, vdl_voltage)
+    dpi_overrides = {}
+    for item in args.figure_dpi:
+        name, _, dpi = item.partition("=")
+        if name not in FIGURE_NAMES or not dpi.isdigit():
+            parser.error(f"--figure-dpi {item!r}: expected NAME=DPI with NAME one of {', '.join(FIGURE_NAMES)}")
+        dpi_overrides[name] = int(dpi)
+    images = ImageOptions(resolve_image_format(args.image_format), args.dpi, dpi_overrides,
+                          round(args.max_size * 1e6) if args.max_size else None)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with profile_run(args):
+        try:
+            if args.manifest:
+                if run_batch(load_manifest(args.manifest), output_dir, args.workers, images, args.interactive):
+                    sys.exit(1)
+            else:
+                (generate_interactive if args.interactive else generate)(DEFAULT_INVESTIGATION, output_dir, images)
+                print("Open in any browser, or print/save as PDF from the browser.")
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
 
-    print("Aligning and resampling...")
-    vdl_f1_times = align_vdl_to_g1000(g1_times, vdl_elapsed, seg_f1)
+
+def run_batch(investigations, output_dir=OUTPUT_DIR, workers=None, images=ImageOptions(), interactive=False):
+    """Generate every investigation's report, in parallel.
+
+    Distinct input files are parsed first, each once, into the parse cache;
+    the reports then read their inputs from it, so shared logger files and
+    flights are not parsed per report. An investigation that fails (an
+    unreadable input, over the size budget, ...) is reported and skipped; the
+    others are still written. Returns the failure messages.
+    """
+    inputs = sorted({("g1000", str(p)) for inv in investigations for p in inv.flights}
+                    | {("vdl", str(inv.reference)) for inv in investigations})
+    n_total = len(investigations)
+    print(f"{n_total} investigations, {len(inputs)} distinct input files")
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 and len(investigations) > 1 else None
+    failures = []
+    try:
+        with stage("parse_inputs", rows=len(inputs)):
+            errors = list(pool.map(_parse_job, *zip(*inputs))) if pool else \
+                [_parse_job(kind, path) for kind, path in inputs]
+        bad_inputs = {path: error for (_, path), error in zip(inputs, errors) if error}
+        resolved = []
+        for inv in investigations:
+            label = inv.name or f"{inv.tail} {Path(inv.flights[0]).name}"
+            bad = [bad_inputs[str(p)] for p in (inv.reference, *inv.flights) if str(p) in bad_inputs]
+            if bad:
+                failures.append(f"{label}: {bad[0]}")
+                continue
+            try:
+                resolved.append(resolve_investigation(inv))
+            except INVESTIGATION_ERRORS as e:
+                failures.append(f"{label}: {e}")
+        investigations = resolved
+        names = [inv.name for inv in investigations]
+        clashes = sorted({n for n in names if names.count(n) > 1})
+        if clashes:
+            raise ValueError(f"Several investigations would write the same report: {', '.join(clashes)}; "
+                             "give them distinct names in the manifest")
+        with stage("reports", rows=len(investigations)):
+            n = len(investigations)
+            results = list(pool.map(_report_job, investigations, [output_dir] * n, [images] * n,
+                                    [interactive] * n)) if pool \
+                else [_report_job(inv, output_dir, images, interactive) for inv in investigations]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    for path, _ in results:
+        if path is not None:
+            print(f"  {path}")
+    failures += [error for _, error in results if error is not None]
+    if failures:
+        print(f"\n{len(failures)} of {n_total} reports failed:")
+        for error in failures:
+            print(f"  {error}")
+    return failures
+
+
+def analyze(inv, log=print):
+    """Parse, segment, align, resample and compare one Investigation's inputs.
+
+    Returns (inv with date and name resolved, dict of the intermediate
+    arrays and the Flight 1 / Flight 2 / combined stats s1, s2, sc).
+    """
+    log("Parsing data...")
+    g1_times, g1_volt1 = parse_g1000(inv.flights[0])
+    g2_times, g2_volt1 = parse_g1000(inv.flights[1])
+    vdl_sample_s, vdl_voltage = parse_vdl(inv.reference)
+    for path, times in zip(inv.flights, (g1_times, g2_times)):
+        if not len(times):
+            raise ValueError(f"{path}: no G1000 samples")
+    inv = resolve_investigation(inv)
+
+    log("Segmenting VDL...")
+    try:
+        seg_f1, seg_idle, seg_f2 = segment_vdl(vdl_voltage)
+    except RuntimeError:
+        raise ValueError(f"cannot find two flights in the VDL48 recording {inv.reference}") from None
+
+    log("Aligning and resampling...")
+    vdl_f1_times = align_vdl_to_g1000(g1_times, vdl_sample_s, seg_f1)
     vdl_f1_volts = vdl_voltage[seg_f1[0]:seg_f1[1]]
-    vdl_f2_times = align_vdl_to_g1000(g2_times, vdl_elapsed, seg_f2)
+    vdl_f2_times = align_vdl_to_g1000(g2_times, vdl_sample_s, seg_f2)
     vdl_f2_volts = vdl_voltage[seg_f2[0]:seg_f2[1]]
 
     common1_t, g1_rs, v1_rs = resample_to_common(g1_times, g1_volt1, vdl_f1_times, vdl_f1_volts)
     common2_t, g2_rs, v2_rs = resample_to_common(g2_times, g2_volt1, vdl_f2_times, vdl_f2_volts)
 
-    print("Computing statistics...")
+    log("Computing statistics...")
     s1 = compute_stats(g1_rs, v1_rs)
     s2 = compute_stats(g2_rs, v2_rs)
     sc = compute_stats(np.concatenate([g1_rs, g2_rs]), np.concatenate([v1_rs, v2_rs]))
 
-    print("Generating figures...")
-    img_overview = make_vdl_overview(vdl_elapsed, vdl_voltage, seg_f1, seg_idle, seg_f2)
-    img_comparison = make_flight_comparison(common1_t, g1_rs, v1_rs, common2_t, g2_rs, v2_rs)
-    img_hist = make_histograms(s1["diff"], s2["diff"])
-    img_scatter = make_scatter(g1_rs, v1_rs, g2_rs, v2_rs)
+    return inv, {
+        "g1_times": g1_times, "g1_volt1": g1_volt1, "g2_times": g2_times, "g2_volt1": g2_volt1,
+        "vdl_sample_s": vdl_sample_s, "vdl_voltage": vdl_voltage,
+        "seg_f1": seg_f1, "seg_idle": seg_idle, "seg_f2": seg_f2,
+        "vdl_f1_times": vdl_f1_times, "vdl_f1_volts": vdl_f1_volts,
+        "vdl_f2_times": vdl_f2_times, "vdl_f2_volts": vdl_f2_volts,
+        "common1_t": common1_t, "g1_rs": g1_rs, "v1_rs": v1_rs,
+        "common2_t": common2_t, "g2_rs": g2_rs, "v2_rs": v2_rs,
+        "s1": s1, "s2": s2, "sc": sc,
+    }
+
+
+def generate(inv, output_dir=OUTPUT_DIR, images=ImageOptions(), log=print):
+    """Write the report for one Investigation and return its path.
 
-    print("Building HTML report...")
-    html = build_html(img_overview, img_comparison, img_hist, img_scatter, s1, s2, sc)
+    If the report exceeds the images.max_bytes budget, figures are
+    re-rendered at lower DPI (BUDGET_DPI_SCALES); ReportTooLarge is raised
+    if even the lowest does not fit.
+    """
+    inv, a = analyze(inv, log)
+    s1, s2, sc = a["s1"], a["s2"], a["sc"]
 
-    report_path = OUTPUT_DIR / "Voltage_Analysis_Report_N238PS_20260208.html"
-    with open(report_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    log("Writing HTML report...")
+    figures = {
+        "overview": lambda: make_vdl_overview(a["vdl_sample_s"], a["vdl_voltage"],
+                                              a["seg_f1"], a["seg_idle"], a["seg_f2"]),
+        "comparison": lambda: make_flight_comparison(a["common1_t"], a["g1_rs"], a["v1_rs"],
+                                                     a["common2_t"], a["g2_rs"], a["v2_rs"], inv.routes),
+        "hist": lambda: make_histograms(s1["diff"], s2["diff"], inv.routes),
+        "scatter": lambda: make_scatter(a["g1_rs"], a["v1_rs"], a["g2_rs"], a["v2_rs"]),
+    }
+    ctx = report_context(inv, a["g1_times"], a["g2_times"], a["vdl_voltage"], a["seg_idle"])
+    report_path = Path(output_dir) / report_filename(inv)
+    for i, scale in enumerate(BUDGET_DPI_SCALES):
+        try:
+            size = write_report(report_path, html_sections(ctx, figures, s1, s2, sc), images, scale)
+            break
+        except ReportTooLarge as e:
+            if i + 1 == len(BUDGET_DPI_SCALES):
+                raise
+            log(f"  {e} - retrying at {BUDGET_DPI_SCALES[i + 1]:.0%} DPI")
+    log(f"  {size / 1e6:.2f} MB, {images.format} images")
 
-    print(f"\nReport saved: {report_path}")
-    print("Open in any browser, or print/save as PDF from the browser.")
+    log(f"\nReport saved: {report_path}")
+    return report_path
 
 
 if __name__ == "__main__":
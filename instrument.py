@@ -0,0 +1,264 @@
+"""
+Per-Stage Instrumentation
+=========================
+Lightweight timing and memory hooks around pipeline stages:
+
+    from instrument import stage, timed
+
+    with stage("parse_ecu_sessions") as s:
+        sessions = parse_ecu_sessions(ecu_dir)
+        s.rows = len(sessions)
+
+    @timed("parse_vdl", rows=lambda result: len(result[1]))
+    def parse_vdl(filepath): ...
+
+Each stage records wall time, CPU time, rows processed, the process's peak
+RSS so far and (with memory tracing on) the tracemalloc peak inside the
+stage, nested stages included. Stages nest; the summary table indents them.
+
+Recording is off by default: stage() then returns a shared no-op context
+manager and timed() wrappers make one flag check, so instrumented code pays
+essentially nothing. Scripts opt in through add_profile_arguments() and
+profile_run(), which give them:
+
+    --profile                 print a per-stage summary table at exit
+    --profile-memory          also trace Python/NumPy allocations (slower)
+    --profile-json PATH       write a Chrome/Perfetto trace (chrome://tracing)
+    --profile-cprofile PATH   write a cProfile dump (python -m pstats PATH)
+
+Stages that run inside worker processes are not recorded; the parent's
+enclosing stage times them as a whole. Use --workers 1 for a per-file
+breakdown.
+"""
+
+import cProfile
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_enabled = False
+_trace_memory = False
+_epoch = 0.0
+_stack = []
+_records = []
+
+
+def max_rss_mb():
+    """Peak resident set size of this process so far (MB), or None if unavailable."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class _NullStage:
+    """Returned by stage() while recording is off; accepts and ignores .rows."""
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "rows", "start", "cpu0", "peak")
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.peak = 0
+
+    def __enter__(self):
+        if _trace_memory:
+            if _stack:
+                # Keep the parent's peak so far before restarting the high-water mark
+                parent = _stack[-1]
+                parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        _stack.append(self)
+        self.cpu0 = time.process_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.start
+        cpu = time.process_time() - self.cpu0
+        _stack.pop()
+        peak = None
+        if _trace_memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            peak = self.peak
+            if _stack:
+                _stack[-1].peak = max(_stack[-1].peak, self.peak)
+            tracemalloc.reset_peak()
+        _records.append({
+            "name": self.name, "depth": len(_stack), "start": self.start - _epoch,
+            "wall": wall, "cpu": cpu, "rows": self.rows,
+            "peak_mb": peak / 1e6 if peak is not None else None, "max_rss_mb": max_rss_mb(),
+        })
+        return False
+
+
+def stage(name, rows=None):
+    """Context manager timing one pipeline stage; set .rows on it to record throughput."""
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name, rows)
+
+
+def timed(name=None, rows=None):
+    """Decorator form of stage(). rows, if given, maps the return value to a row count."""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Stage(label) as s:
+                result = fn(*args, **kwargs)
+                if rows is not None:
+                    s.rows = rows(result)
+            return result
+        return wrapper
+    return decorate
+
+
+def enabled():
+    return _enabled
+
+
+def enable(trace_memory=False):
+    """Start recording stages (clears earlier records)."""
+    global _enabled, _trace_memory, _epoch
+    _records.clear()
+    _stack.clear()
+    _trace_memory = trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _epoch = time.perf_counter()
+    _enabled = True
+
+
+def disable():
+    global _enabled, _trace_memory
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _enabled = _trace_memory = False
+
+
+def records():
+    """Recorded stages in completion order (list of dicts)."""
+    return list(_records)
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def summarize(recs=None):
+    """Aggregate records by stage name, in order of first start."""
+    recs = _records if recs is None else recs
+    totals = {}
+    for r in sorted(recs, key=lambda r: r["start"]):
+        t = totals.setdefault(r["name"], {"name": r["name"], "depth": r["depth"], "calls": 0,
+                                          "wall": 0.0, "cpu": 0.0, "rows": None,
+                                          "peak_mb": None, "max_rss_mb": None})
+        t["depth"] = min(t["depth"], r["depth"])
+        t["calls"] += 1
+        t["wall"] += r["wall"]
+        t["cpu"] += r["cpu"]
+        if r["rows"] is not None:
+            t["rows"] = (t["rows"] or 0) + r["rows"]
+        for key in ("peak_mb", "max_rss_mb"):
+            if r[key] is not None:
+                t[key] = max(t[key] or 0.0, r[key])
+    return list(totals.values())
+
+
+def print_summary(recs=None, file=None):
+    rows = summarize(recs)
+    if not rows:
+        return
+    file = file or sys.stdout
+    print(f"\n{'Stage':<34} {'Calls':>6} {'Wall s':>9} {'CPU s':>9} {'Rows':>11} "
+          f"{'Rows/s':>11} {'Peak MB':>8} {'RSS MB':>8}", file=file)
+    print("-" * 102, file=file)
+    for t in rows:
+        name = ("  " * t["depth"] + t["name"])[:34]
+        n_rows = f"{t['rows']:,}" if t["rows"] is not None else ""
+        rate = f"{t['rows'] / t['wall']:,.0f}" if t["rows"] and t["wall"] > 0 else ""
+        peak = f"{t['peak_mb']:.1f}" if t["peak_mb"] is not None else ""
+        rss = f"{t['max_rss_mb']:.0f}" if t["max_rss_mb"] is not None else ""
+        print(f"{name:<34} {t['calls']:>6} {t['wall']:>9.3f} {t['cpu']:>9.3f} {n_rows:>11} "
+              f"{rate:>11} {peak:>8} {rss:>8}", file=file)
+
+
+def write_trace(path, recs=None):
+    """Write records as Chrome trace events (open in chrome://tracing or ui.perfetto.dev)."""
+    recs = _records if recs is None else recs
+    events = [{
+        "name": r["name"], "ph": "X", "pid": os.getpid(), "tid": 0,
+        "ts": round(r["start"] * 1e6, 1), "dur": round(r["wall"] * 1e6, 1),
+        "args": {k: r[k] for k in ("cpu", "rows", "peak_mb", "max_rss_mb") if r[k] is not None},
+    } for r in recs]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+# =============================================================================
+# Command-line integration
+# =============================================================================
+
+def add_profile_arguments(parser):
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile", action="store_true",
+                       help="Print per-stage wall/CPU time, rows and memory at exit")
+    group.add_argument("--profile-memory", action="store_true",
+                       help="Also record tracemalloc peaks per stage (slower)")
+    group.add_argument("--profile-json", metavar="PATH", default=None,
+                       help="Write a Chrome/Perfetto trace of the stages")
+    group.add_argument("--profile-cprofile", metavar="PATH", default=None,
+                       help="Write a cProfile dump of the whole run")
+
+
+@contextlib.contextmanager
+def profile_run(args, name="total"):
+    """Record stages for the duration of the block if any profiling flag is set."""
+    if not (args.profile or args.profile_memory or args.profile_json or args.profile_cprofile):
+        yield
+        return
+    enable(trace_memory=args.profile_memory)
+    profiler = cProfile.Profile() if args.profile_cprofile else None
+    try:
+        with stage(name):
+            if profiler is not None:
+                profiler.enable()
+            try:
+                yield
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+    finally:
+        disable()
+        print_summary()
+        if args.profile_json:
+            write_trace(args.profile_json)
+            print(f"Stage trace saved to {args.profile_json}")
+        if profiler is not None:
+            profiler.dump_stats(args.profile_cprofile)
+            print(f"cProfile dump saved to {args.profile_cprofile} (python -m pstats {args.profile_cprofile})")
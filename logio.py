@@ -0,0 +1,134 @@
+"""
+Transparent Compressed Log Storage
+==================================
+Raw logs in data/source/ may be stored plain (.csv), gzip-compressed
+(.csv.gz) or zstandard-compressed (.csv.zst). Readers call open_log() and
+get a text stream in every case (open_log_reader() for the raw bytes);
+decompression happens incrementally as lines are read, so a compressed file
+is never inflated in memory or on disk.
+
+The G1000 CSVs are whitespace-padded fixed-width columns and typically
+compress 10x or better, which cuts both archive size and cold-cache read
+I/O from the NAS.
+
+zstandard is optional: without it .zst files cannot be read, and writers
+asked for zstd fall back to gzip.
+"""
+
+import gzip
+import io
+import sys
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Suffix -> compression method
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+METHOD_SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def compression_of(path):
+    """Return 'gzip', 'zstd' or 'none' based on the file suffix."""
+    return COMPRESSION_SUFFIXES.get(Path(path).suffix.lower(), "none")
+
+
+def strip_compression_suffix(name):
+    """Return a filename without its .gz/.zst suffix (e.g. 'x.csv.gz' -> 'x.csv')."""
+    name = str(name)
+    for suffix in COMPRESSION_SUFFIXES:
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def resolve_compression(method):
+    """Resolve a requested method ('none', 'gzip', 'zstd', 'auto') to one we can write.
+
+    'auto' picks zstd when the zstandard module is installed, else gzip.
+    An explicit 'zstd' request without zstandard falls back to gzip with a warning.
+    """
+    if method == "auto":
+        return "zstd" if zstandard is not None else "gzip"
+    if method == "zstd" and zstandard is None:
+        print("  zstandard not installed - falling back to gzip", file=sys.stderr)
+        return "gzip"
+    if method not in METHOD_SUFFIXES:
+        raise ValueError(f"Unknown compression method: {method}")
+    return method
+
+
+def compressed_name(fname, method):
+    """Return the on-disk filename for fname stored with the given method."""
+    return strip_compression_suffix(fname) + METHOD_SUFFIXES[method]
+
+
+def open_log(path, errors=None, encoding=None):
+    """Open a (possibly compressed) log file as a streaming text file object."""
+    method = compression_of(path)
+    if method == "gzip":
+        return gzip.open(path, "rt", encoding=encoding, errors=errors)
+    if method == "zstd":
+        if zstandard is None:
+            raise RuntimeError(f"{Path(path).name} is zstd-compressed but the "
+                               f"zstandard module is not installed (pip install zstandard)")
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(reader, encoding=encoding, errors=errors)
+    return open(path, "r", encoding=encoding, errors=errors)
+
+
+def open_log_reader(path):
+    """Open a (possibly compressed) log file as a streaming binary reader of its content."""
+    method = compression_of(path)
+    if method == "gzip":
+        return gzip.open(path, "rb")
+    if method == "zstd":
+        if zstandard is None:
+            raise RuntimeError(f"{Path(path).name} is zstd-compressed but the "
+                               f"zstandard module is not installed (pip install zstandard)")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def open_log_writer(path, method=None):
+    """Open a binary writer that compresses with `method` (default: from the suffix)."""
+    method = method or compression_of(path)
+    if method == "gzip":
+        return gzip.open(path, "wb", compresslevel=GZIP_LEVEL)
+    if method == "zstd":
+        raw = open(path, "wb")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=True)
+    return open(path, "wb")
+
+
+def stored_forms(directory, fname):
+    """Return every existing path for fname (plain first, then compressed forms)."""
+    base = strip_compression_suffix(fname)
+    candidates = [Path(directory) / (base + suffix)
+                  for suffix in ("",) + tuple(COMPRESSION_SUFFIXES)]
+    return [c for c in candidates if c.exists()]
+
+
+def find_log(directory, fname):
+    """Return the existing path for fname in any storage form, or None."""
+    forms = stored_forms(directory, fname)
+    return forms[0] if forms else None
+
+
+def glob_logs(directory, pattern="*.csv"):
+    """Glob for logs matching pattern in plain or compressed form, sorted by logical name.
+
+    If the same log exists in more than one form, the plain file wins.
+    """
+    directory = Path(directory)
+    found = {}
+    for suffix in ("",) + tuple(COMPRESSION_SUFFIXES):
+        for path in directory.glob(pattern + suffix):
+            found.setdefault(strip_compression_suffix(path.name), path)
+    return [found[name] for name in sorted(found)]
@@ -0,0 +1,77 @@
+"""
+On-disk Parse Cache
+===================
+Parsed per-file arrays are cached as .npz files under data/cache/<kind>/,
+keyed by the source file's absolute path, size and modification time plus
+a per-kind version number. Repeat runs (and parallel workers, and fleet
+runs covering several aircraft) then skip CSV parsing for unchanged files.
+
+Bump the version passed by a caller whenever its parse output changes.
+Set VOLTS_CACHE=0 in the environment to bypass the cache entirely; the
+setting is inherited by worker processes.
+"""
+
+import hashlib
+import os
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+CACHE_DIR = Path(__file__).parent / "data" / "cache"
+
+
+def cache_enabled():
+    return os.environ.get("VOLTS_CACHE", "1") != "0"
+
+
+def disable_cache():
+    """Turn the cache off for this process and any workers it starts."""
+    os.environ["VOLTS_CACHE"] = "0"
+
+
+def file_signature(path):
+    """Identity of a file on disk: absolute path, size and mtime."""
+    st = os.stat(path)
+    return f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+
+
+def cache_path(kind, path, version=1):
+    """Return the cache file location for `path` parsed as `kind`."""
+    key = hashlib.sha1(f"{kind}|{version}|{file_signature(path)}".encode("utf-8")).hexdigest()
+    return CACHE_DIR / kind / f"{key[:24]}.npz"
+
+
+def load_arrays(cpath):
+    """Load a cached dict of arrays, or None if missing or unreadable."""
+    if not cpath.exists():
+        return None
+    try:
+        with np.load(cpath, allow_pickle=False) as z:
+            return {k: z[k] for k in z.files}
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+        return None
+
+
+def save_arrays(cpath, arrays):
+    """Atomically write a dict of arrays (safe with concurrent writers)."""
+    cpath.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cpath.with_name(f"{cpath.stem}.{os.getpid()}.tmp.npz")
+    np.savez(tmp, **arrays)
+    os.replace(tmp, cpath)
+
+
+def cached_arrays(kind, path, compute, version=1):
+    """Return compute(path) through the cache.
+
+    compute must return a dict of numpy arrays (use 0-d arrays for scalars
+    and strings). Cached results come back as the same dict of arrays.
+    """
+    if not cache_enabled():
+        return compute(path)
+    cpath = cache_path(kind, path, version)
+    arrays = load_arrays(cpath)
+    if arrays is None:
+        arrays = compute(path)
+        save_arrays(cpath, arrays)
+    return arrays
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Multi-Resolution Downsampled Pyramid
+====================================
+Precomputes min/mean/max aggregates of every G1000 channel per 1 s, 10 s,
+1 min and 1 h bucket for every flight, stored alongside the raw archive in
+<source>/.pyramid/ (one .npz per flight plus index.json).
+
+Buckets are aligned to absolute UTC time, so buckets from different flights
+line up. Coarser levels are built from the next finer level (min of mins,
+max of maxes, count-weighted mean), and each (channel, level) is a separate
+member of the flight's .npz, so a long-range plot or query loads only the
+resolution it needs.
+
+The pyramid is updated incrementally: only flights whose source file is new
+or changed are rebuilt, and entries for deleted logs are dropped.
+
+Usage:
+    python pyramid.py update                           # data/source/
+    python pyramid.py update --source data/fleet/N541SA
+    python pyramid.py plot --channel volt1             # whole archive, auto resolution
+    python pyramid.py plot --start 2024-02-01 --end 2024-04-01 --level 1min
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+
+from flight_store import epoch_to_datetime, to_epoch
+from g1000_reader import G1000_CHANNELS, load_g1000_channels
+from logio import glob_logs, strip_compression_suffix
+from parse_cache import file_signature, save_arrays
+
+SOURCE_DIR = Path(__file__).parent / "data" / "source"
+OUTPUT_DIR = Path(__file__).parent / "output"
+
+# Level name -> bucket width in seconds, finest first
+LEVELS = {"1s": 1, "10s": 10, "1min": 60, "1h": 3600}
+PYRAMID_VERSION = 1
+MAX_PLOT_POINTS = 4000
+
+
+# =============================================================================
+# Aggregation
+# =============================================================================
+
+def aggregate(t, values, width):
+    """Bucket raw samples: returns (bucket_t, min, mean, max, count), NaNs ignored.
+
+    t must be sorted. bucket_t is the bucket start in POSIX seconds.
+    """
+    valid = ~np.isnan(values)
+    t, values = t[valid], values[valid]
+    if len(t) == 0:
+        empty = np.array([], dtype=float)
+        return empty, empty, empty, empty, np.array([], dtype=np.int32)
+    b = np.floor(t / width) * width
+    starts = np.flatnonzero(np.concatenate(([True], b[1:] != b[:-1])))
+    counts = np.diff(np.append(starts, len(b))).astype(np.int32)
+    return (b[starts],
+            np.minimum.reduceat(values, starts),
+            np.add.reduceat(values, starts) / counts,
+            np.maximum.reduceat(values, starts),
+            counts)
+
+
+def coarsen(bt, mn, mean, mx, n, width):
+    """Merge an existing level into wider buckets (min of mins, weighted mean, max of maxes)."""
+    if len(bt) == 0:
+        return bt, mn, mean, mx, n
+    b = np.floor(bt / width) * width
+    starts = np.flatnonzero(np.concatenate(([True], b[1:] != b[:-1])))
+    counts = np.add.reduceat(n, starts).astype(np.int32)
+    return (b[starts],
+            np.minimum.reduceat(mn, starts),
+            np.add.reduceat(mean * n, starts) / counts,
+            np.maximum.reduceat(mx, starts),
+            counts)
+
+
+def build_flight_pyramid(path):
+    """All levels for all channels of one flight, as a dict of arrays for np.savez."""
+    t, data = load_g1000_channels(path)
+    order = np.argsort(t, kind="stable")
+    t = t[order]
+    arrays = {"t_range": np.array([t[0], t[-1]]) if len(t) else np.array([np.nan, np.nan])}
+    for ch in G1000_CHANNELS:
+        level = None
+        for name, width in LEVELS.items():
+            level = (aggregate(t, data[ch][order], width) if level is None
+                     else coarsen(*level, width))
+            for key, arr in zip(("t", "min", "mean", "max", "n"), level):
+                arrays[f"{ch}_{name}_{key}"] = arr.astype(np.float32) if key in ("min", "mean", "max") else arr
+    return arrays
+
+
+# =============================================================================
+# Archive
+# =============================================================================
+
+def pyramid_dir(source_dir):
+    return Path(source_dir) / ".pyramid"
+
+
+def load_index(source_dir):
+    path = pyramid_dir(source_dir) / "index.json"
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        index = json.load(f)
+    return index if index.get("version") == PYRAMID_VERSION else {}
+
+
+def save_index(source_dir, index):
+    path = pyramid_dir(source_dir) / "index.json"
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, path)
+
+
+def _build_job(job):
+    """Worker entry point: (source path, output npz) -> ((t_start, t_end), None),
+    or (None, error message) for a log that cannot be read."""
+    src, dest = job
+    try:
+        arrays = build_flight_pyramid(src)
+    except Exception as e:  # any unreadable log (truncated gzip, bad zstd frame, ...) is skipped, not fatal
+        return None, f"{Path(src).name}: {type(e).__name__}: {e}"
+    save_arrays(dest, arrays)
+    return (float(arrays["t_range"][0]), float(arrays["t_range"][1])), None
+
+
+def update_pyramid(source_dir, workers=None):
+    """Bring <source_dir>/.pyramid up to date.
+
+    A log that cannot be read is left out of the pyramid (and retried on the
+    next update). Returns (built, unchanged, removed, error message per
+    skipped log).
+    """
+    pdir = pyramid_dir(source_dir)
+    pdir.mkdir(parents=True, exist_ok=True)
+    index = load_index(source_dir)
+    flights = index.get("flights", {})
+
+    current = {strip_compression_suffix(p.name): p for p in glob_logs(source_dir, "*.csv")}
+    removed = [name for name in flights if name not in current]
+    for name in removed:
+        (pdir / f"{name}.npz").unlink(missing_ok=True)
+        del flights[name]
+
+    todo = [(name, p) for name, p in current.items()
+            if flights.get(name, {}).get("signature") != file_signature(p)
+            or not (pdir / f"{name}.npz").exists()]
+    jobs = [(p, pdir / f"{name}.npz") for name, p in todo]
+    if workers == 1 or len(jobs) < 2:
+        results = [_build_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_build_job, jobs, chunksize=2))
+
+    failures = []
+    for (name, p), (t_range, error) in zip(todo, results):
+        if error:
+            # Drop any pyramid built from an earlier version of the file
+            failures.append(error)
+            flights.pop(name, None)
+            (pdir / f"{name}.npz").unlink(missing_ok=True)
+            continue
+        t0, t1 = t_range
+        # Empty logs stay indexed (so they are not rebuilt every run) but with no time range
+        if np.isnan(t0):
+            t0 = t1 = None
+        flights[name] = {"signature": file_signature(p), "start": t0, "end": t1}
+    save_index(source_dir, {"version": PYRAMID_VERSION, "levels": LEVELS, "flights": flights})
+    return len(todo) - len(failures), len(current) - len(todo), len(removed), failures
+
+
+def choose_level(start, end, max_points=MAX_PLOT_POINTS):
+    """Finest level that keeps a [start, end] span under max_points buckets."""
+    span = end - start
+    for name, width in LEVELS.items():
+        if span / width <= max_points:
+            return name
+    return list(LEVELS)[-1]
+
+
+def load_level(source_dir, channel="volt1", level=None, start=None, end=None):
+    """Load one channel at one resolution across all flights overlapping [start, end).
+
+    Only the requested (channel, level) members of each overlapping flight's
+    .npz are read. level=None picks one via choose_level(). Returns a dict of
+    arrays t, min, mean, max, n (sorted by t) plus the chosen level name.
+    """
+    flights = {name: f for name, f in load_index(source_dir).get("flights", {}).items()
+               if f["start"] is not None and not np.isnan(f["start"])}
+    start = to_epoch(start) if start is not None else min((f["start"] for f in flights.values()), default=0.0)
+    end = to_epoch(end) if end is not None else max((f["end"] for f in flights.values()), default=0.0)
+    if level is None:
+        level = choose_level(start, end)
+
+    pdir = pyramid_dir(source_dir)
+    parts = {k: [] for k in ("t", "min", "mean", "max", "n")}
+    for name, meta in flights.items():
+        if meta["end"] < start or meta["start"] >= end:
+            continue
+        with np.load(pdir / f"{name}.npz") as z:
+            bt = z[f"{channel}_{level}_t"]
+            sel = (bt >= start - LEVELS[level]) & (bt < end)
+            for key in parts:
+                parts[key].append(z[f"{channel}_{level}_{key}"][sel])
+    out = {k: (np.concatenate(v) if v else np.array([])) for k, v in parts.items()}
+    order = np.argsort(out["t"], kind="stable")
+    out = {k: v[order] for k, v in out.items()}
+    out["level"] = level
+    return out
+
+
+def plot_range(source_dir, channel, start=None, end=None, level=None, out_path=None):
+    """Long-range min/mean/max plot at the resolution appropriate for the span."""
+    d = load_level(source_dir, channel, level, start, end)
+    if len(d["t"]) == 0:
+        print("No pyramid data in the requested range.")
+        return None
+    dates = [epoch_to_datetime(t) for t in d["t"]]
+    # Break the line between flights so gaps are not drawn as ramps
+    gap = np.concatenate(([False], np.diff(d["t"]) > 3 * LEVELS[d["level"]]))
+    mean = np.where(gap, np.nan, d["mean"])
+
+    fig, ax = plt.subplots(figsize=(16, 6))
+    ax.fill_between(dates, d["min"], d["max"], step="post", color="tab:blue", alpha=0.25,
+                    linewidth=0, label=f"{channel} min-max per {d['level']}")
+    ax.plot(dates, mean, color="tab:blue", linewidth=0.7, label=f"{channel} mean per {d['level']}")
+    if channel.startswith("volt"):
+        ax.axhline(y=28.0, color="green", linestyle="--", alpha=0.5, label="Nominal 28V")
+        ax.axhline(y=25.5, color="red", linestyle="--", alpha=0.5, label="LOW VOLTS region")
+    ax.set_ylabel(channel)
+    ax.set_title(f"{channel} ({G1000_CHANNELS[channel]}) - {dates[0]:%Y-%m-%d} to {dates[-1]:%Y-%m-%d}"
+                 f"  |  {len(dates):,} buckets at {d['level']}")
+    ax.legend(loc="lower left", fontsize=8)
+    ax.grid(True, alpha=0.3)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha="right")
+    plt.tight_layout()
+    out_path = out_path or OUTPUT_DIR / f"pyramid_{channel}_{d['level']}.png"
+    plt.savefig(out_path, dpi=150, bbox_inches="tight")
+    plt.close()
+    return out_path
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-resolution min/mean/max pyramid of G1000 logs")
+    parser.add_argument("--source", default=str(SOURCE_DIR), help="Raw log directory (default: data/source)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_up = sub.add_parser("update", help="Build or incrementally update the pyramid")
+    p_up.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    p_plot = sub.add_parser("plot", help="Plot a channel over a time range")
+    p_plot.add_argument("--channel", default="volt1", choices=list(G1000_CHANNELS))
+    p_plot.add_argument("--start", default=None, help="Range start (YYYY-MM-DD[ HH:MM])")
+    p_plot.add_argument("--end", default=None, help="Range end (YYYY-MM-DD[ HH:MM])")
+    p_plot.add_argument("--level", default=None, choices=list(LEVELS),
+                        help="Resolution (default: finest with <= 4000 buckets)")
+    p_plot.add_argument("--out", default=None, help="Output PNG path")
+    args = parser.parse_args()
+
+    source_dir = Path(args.source)
+    if not source_dir.exists():
+        print(f"Source directory not found: {source_dir}")
+        sys.exit(1)
+
+    if args.command == "update":
+        built, unchanged, removed, failures = update_pyramid(source_dir, args.workers)
+        print(f"Pyramid {pyramid_dir(source_dir)}: {built} built, {unchanged} unchanged, {removed} removed")
+        if failures:
+            print(f"{len(failures)} unreadable log(s) skipped:")
+            for error in failures:
+                print(f"  {error}")
+    elif args.command == "plot":
+        OUTPUT_DIR.mkdir(exist_ok=True)
+        out = plot_range(source_dir, args.channel, args.start, args.end, args.level,
+                         Path(args.out) if args.out else None)
+        if out:
+            print(f"Saved: {out}")
+
+
+if __name__ == "__main__":
+    main()
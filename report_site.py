@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+Incremental Per-Flight Report Site
+==================================
+Static HTML site over the whole G1000 log archive (output/site/): one page
+per flight plus an index page with the history charts.
+
+Each flight page (<tail>/<log name>.html) shows:
+  - the volt1 trend, with flight phases shaded, the dip thresholds, altitude
+    and (when an ECU session overlaps the flight) AE300 channel 808
+  - time and volt1 statistics per flight phase (flight_phases)
+  - every volt1 dip below the thresholds (dip_events.detect_dips)
+  - the paired G1000 - ECU comparison, when an ECU session overlaps
+
+index.html charts cruise volt1, minimum volt1 and dip counts per flight
+over time for every tail, with the maintenance events, and links every
+page. It is drawn from the per-flight summaries kept in site.json, so it
+never reopens a log.
+
+Regeneration is incremental. site.json records a key per page over the
+log's size/mtime, the size/mtime of the ECU files paired with it, the page
+options and a fingerprint of the source of every module that renders a
+page. A run stats the logs and ECU files, rebuilds only pages whose key
+changed, deletes pages of logs that are gone and redraws the index only if
+a page changed, so a nightly run over a multi-year, multi-aircraft archive
+parses just the new flights. --force rebuilds everything.
+
+A log that cannot be read (e.g. a truncated .csv.gz) or whose page fails
+to build is recorded in site.json with the error and listed in a note on
+the index; the rest of the site is still updated, and the log is retried
+once it (or the page code) changes. Two logs that would write the same
+page (X.csv and X.csv.gz passed together) are reported, and only the first
+is used.
+
+Usage:
+    python report_site.py                                     # data/source as N238PS
+    python report_site.py --fleet data/fleet --workers 8      # ECU sessions from <tail>/ecu
+    python report_site.py --source data/N541SA --tail N541SA --ecu data/N541SA/ecu
+    python report_site.py --force --image-format png8
+"""
+
+import argparse
+import hashlib
+import html
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.patches import Patch
+
+from ae3_ingest import AE3_DIR, DecoderUnavailable, ae3_sessions
+from correlate_ecu import compute_pair_stats, resample_pair, session_arrays
+from dip_events import DEFAULT_THRESHOLDS, EVENT_CHANNELS, detect_dips
+from flight_phases import PHASE_NAMES, load_flight_phases, phase_durations
+from flight_store import epoch_to_datetime
+from g1000_reader import load_g1000_channels
+from generate_report import (DEFAULT_DPI, IMAGE_FORMATS, REPORT_CSS, ImageOptions,
+                             resolve_image_format, write_report)
+from instrument import add_profile_arguments, profile_run, stage
+from logio import glob_logs, strip_compression_suffix
+from parse_cache import disable_cache, file_signature
+from session_index import ECU_PARSED_DIR, MIN_OVERLAP_S, IntervalIndex, ecu_sessions
+from voltage_history import HOME_TAIL, MAINT_EVENTS, find_fleet, flight_stats
+
+if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+SCRIPT_DIR = Path(__file__).parent
+SOURCE_DIR = SCRIPT_DIR / "data" / "source"
+SITE_DIR = SCRIPT_DIR / "output" / "site"
+
+SITE_VERSION = 1
+STATE_FILE = "site.json"
+INDEX_FILE = "index.html"
+
+# Modules whose code shapes a page: editing any of them rebuilds every page
+PAGE_MODULES = ("report_site", "generate_report", "g1000_reader", "flight_phases", "dip_events",
+                "flight_store", "voltage_history", "correlate_ecu", "ecu_reader", "pairwise_stats")
+
+PHASE_COLORS = {
+    "pre-start": "#ececec", "taxi": "#fbe3c4", "runup": "#f6c9a0", "takeoff": "#d6ebcf",
+    "cruise": None, "descent": "#d9e4f3", "shutdown": "#ececec",
+}
+TAIL_COLORS = ["#2a5a8a", "#c0392b", "#27ae60", "#8e44ad", "#e67e22", "#16a085", "#7f8c8d"]
+
+SITE_CSS = """\
+  .nav { font-size: 12px; margin-bottom: 16px; }
+  .nav a { color: #2a5a8a; text-decoration: none; }
+  td.num, th.num { text-align: right; }
+"""
+
+
+# =============================================================================
+# Site state
+# =============================================================================
+
+def page_name(path):
+    """Page file name for a log: its name without compression suffix and .csv."""
+    return Path(strip_compression_suffix(Path(path).name)).stem + ".html"
+
+
+def code_fingerprint(images, thresholds, ecu_utc_offset_s):
+    """Hash of the page-rendering modules' source and the page options."""
+    digest = hashlib.sha1(f"{SITE_VERSION}|{tuple(images)}|{tuple(thresholds)}|{ecu_utc_offset_s}".encode())
+    for name in PAGE_MODULES:
+        digest.update((SCRIPT_DIR / f"{name}.py").read_bytes())
+    return digest.hexdigest()
+
+
+def page_key(fingerprint, signature, sessions):
+    """Key of one page: code/options fingerprint, the log and its paired ECU files."""
+    refs = sorted({file_signature(s.path) for s in sessions})
+    return hashlib.sha1("|".join([fingerprint, signature, *refs]).encode("utf-8")).hexdigest()
+
+
+def load_state(site_dir):
+    path = Path(site_dir) / STATE_FILE
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    return state if state.get("version") == SITE_VERSION else {}
+
+
+def save_state(site_dir, state):
+    path = Path(site_dir) / STATE_FILE
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp, path)
+
+
+def tail_ecu_sessions(ecu_dir, utc_offset_s=0.0):
+    """(ECU sessions under ecu_dir, note): session CSVs, else decoded .ae3 dumps.
+
+    note explains why there are none when dumps exist but cannot be decoded.
+    """
+    if ecu_dir is None:
+        return [], None
+    sessions = ecu_sessions(ecu_dir, utc_offset_s)
+    if sessions or not Path(ecu_dir).is_dir():
+        return sessions, None
+    try:
+        return ae3_sessions(ecu_dir, utc_offset_s=utc_offset_s), None
+    except DecoderUnavailable:
+        return [], f"ECU dumps in {ecu_dir} not used: they need a decoder (see ae3_ingest.py)."
+
+
+# =============================================================================
+# Flight page
+# =============================================================================
+
+def _float(x):
+    """float, or None for NaN (site.json stays plain JSON)."""
+    x = float(x)
+    return None if np.isnan(x) else x
+
+
+def phase_stats(t, volt1, phase):
+    """[(phase name, seconds, mean, min, max, std)] for the phases present in the flight."""
+    seconds = phase_durations(t, phase)
+    rows = []
+    for i, name in enumerate(PHASE_NAMES):
+        v = volt1[(phase == i) & (volt1 > 0)]
+        if len(v):
+            rows.append((name, seconds[name], float(v.mean()), float(v.min()), float(v.max()), float(v.std())))
+    return rows
+
+
+def ecu_pair(t, volt1, sessions, utc_offset_s=0.0):
+    """G1000 - ECU pair statistics over the flight (compute_pair_stats dict) and the ECU series, or (None, None)."""
+    if not sessions:
+        return None, None
+    parts = [session_arrays(s, utc_offset_s) for s in sessions]
+    e_t = np.concatenate([p[0] for p in parts])
+    e_v = np.concatenate([p[1] for p in parts])
+    keep = (e_t >= t[0]) & (e_t <= t[-1])
+    e_t, e_v = e_t[keep], e_v[keep]
+    ok = volt1 > 0
+    if len(e_t) < 2 or ok.sum() < 2:
+        return None, None
+    _, g_rs, e_rs = resample_pair(t[ok], volt1[ok], e_t, e_v)
+    if len(g_rs) < 3:
+        return None, (e_t, e_v)
+    return compute_pair_stats(g_rs, e_rs, "G1000", "ECU"), (e_t, e_v)
+
+
+def make_trend(t, data, phase, events, thresholds, ecu=None):
+    """volt1 over the flight: phase bands, thresholds, dip markers, altitude and ECU overlay."""
+    times = t.astype(np.int64).astype("datetime64[s]")
+    fig, ax = plt.subplots(figsize=(12, 4.2))
+
+    alt = data["altind"]
+    if not np.isnan(alt).all():
+        ax_alt = ax.twinx()
+        ax_alt.plot(times, alt, color="#999999", linewidth=0.6, linestyle=":")
+        ax_alt.set_ylabel("Altitude (ft)", color="#999999")
+        ax_alt.tick_params(axis="y", colors="#999999")
+        ax_alt.set_ylim(bottom=0)
+        ax.set_zorder(ax_alt.get_zorder() + 1)
+        ax.patch.set_visible(False)
+
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(phase)) + 1, [len(phase)]))
+    shown = {}
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        name = PHASE_NAMES[phase[a]]
+        if PHASE_COLORS[name]:
+            ax.axvspan(times[a], times[b - 1], color=PHASE_COLORS[name], linewidth=0, zorder=0)
+            shown[name] = PHASE_COLORS[name]
+
+    ax.plot(times, data["volt1"], color="#4A90D9", linewidth=0.7, label="G1000 volt1")
+    if ecu is not None:
+        ax.plot(ecu[0].astype(np.int64).astype("datetime64[s]"), ecu[1], color="#E8943A",
+                linewidth=0.7, alpha=0.8, label="ECU ch808")
+    for thr in thresholds:
+        ax.axhline(thr, color="#c0392b", linestyle="--", linewidth=0.6, alpha=0.6)
+    if len(events["start_time"]):
+        ax.plot(events["start_time"].astype(np.int64).astype("datetime64[s]"), events["min_volt"], "v",
+                color="#c0392b", markersize=4, label="Dip")
+
+    handles, _ = ax.get_legend_handles_labels()
+    handles += [Patch(color=c, label=n) for n, c in shown.items()]
+    ax.legend(handles=handles, loc="lower right", fontsize=8, ncol=4)
+    ax.set_ylabel("Voltage (V)")
+    ax.set_xlabel("Time (UTC)")
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def _title(rec):
+    return f"{rec['tail']} &mdash; {epoch_to_datetime(rec['start']):%Y-%m-%d %H:%M} UTC"
+
+
+def page_sections(rec, phases, events, pair, ecu_numbers, make_figure):
+    """One flight page as HTML text sections plus a ("trend", factory) figure section."""
+    cruise = rec["cruise"]
+    yield f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{rec['tail']} {epoch_to_datetime(rec['start']):%Y-%m-%d %H:%M} - Voltage</title>
+<style>
+{REPORT_CSS}{SITE_CSS}</style>
+</head>
+<body>
+<div class="page">
+<div class="nav"><a href="../{INDEX_FILE}">&larr; All flights</a></div>
+<h1>{_title(rec)}</h1>
+<div class="subtitle">{html.escape(rec['file'])} &bull; {(rec['end'] - rec['start']) / 60:.0f} min &bull;
+{rec['n_samples']} samples</div>
+
+<div class="finding">
+  <p>Cruise volt1: <strong>{f"{cruise['mean']:.2f} V" if cruise else "n/a"}</strong>
+  {f"(std {cruise['std']:.3f} V, {cruise['pct_below_26']:.1f}% below 26 V)" if cruise else "(too little cruise data)"}</p>
+  <p>Minimum volt1: <strong>{f"{rec['min']:.2f} V" if rec['min'] is not None else "n/a"}</strong>;
+  dips: {", ".join(f"{n} below {thr} V" for thr, n in rec['dips'].items())}</p>
+</div>
+
+<h2>volt1 Trend</h2>
+<img src=\""""
+    yield ("trend", make_figure)
+    yield """" alt="volt1 trend">
+
+<h2>Flight Phases</h2>
+<table>
+<tr><th>Phase</th><th class="num">Time (min)</th><th class="num">Mean V</th><th class="num">Min V</th>
+<th class="num">Max V</th><th class="num">Std V</th></tr>
+"""
+    yield "".join(f"<tr><td>{name}</td><td class=\"num\">{sec / 60:.1f}</td><td class=\"num\">{mean:.2f}</td>"
+                  f"<td class=\"num\">{vmin:.2f}</td><td class=\"num\">{vmax:.2f}</td>"
+                  f"<td class=\"num\">{std:.3f}</td></tr>\n" for name, sec, mean, vmin, vmax, std in phases)
+    yield "</table>\n\n<h2>Dip Events</h2>\n"
+    if len(events["start_time"]):
+        baseline = f"{rec['baseline']:.2f} V" if rec["baseline"] is not None else "n/a"
+        yield f"""<p>Runs of volt1 below each threshold; drop is below the running-engine baseline ({baseline}).</p>
+<table>
+<tr><th class="num">Below</th><th>Start (UTC)</th><th class="num">Duration</th><th class="num">Min V</th>
+<th class="num">Drop</th><th class="num">RPM</th><th class="num">IAS</th><th class="num">Alt</th></tr>
+"""
+        order = np.lexsort((events["start_time"], -events["threshold"]))
+        yield "".join(
+            f"<tr><td class=\"num\">{events['threshold'][i]:g}</td>"
+            f"<td>{epoch_to_datetime(events['start_time'][i]):%H:%M:%S}</td>"
+            f"<td class=\"num\">{events['duration'][i]:.0f} s</td><td class=\"num\">{events['min_volt'][i]:.2f}</td>"
+            f"<td class=\"num\">{events['drop_v'][i]:.2f}</td><td class=\"num\">{events['rpm'][i]:.0f}</td>"
+            f"<td class=\"num\">{events['ias'][i]:.0f}</td><td class=\"num\">{events['altind'][i]:.0f}</td></tr>\n"
+            for i in order)
+        yield "</table>\n"
+    else:
+        yield f"<p>No volt1 samples below {', '.join(f'{thr:g}' for thr in rec['dips'])} V.</p>\n"
+
+    yield "\n<h2>ECU Reference</h2>\n"
+    if pair is not None:
+        yield f"""<p>AE300 ECU channel 808 from session{"s" if len(ecu_numbers) > 1 else ""} {", ".join(f"#{n}" for n in ecu_numbers)},
+resampled with G1000 volt1 onto a common 2-second grid.</p>
+<table>
+<tr><th>Metric</th><th class="num">Value</th></tr>
+<tr><td>G1000 mean</td><td class="num">{pair['a_mean']:.2f} V</td></tr>
+<tr><td>ECU mean</td><td class="num">{pair['b_mean']:.2f} V</td></tr>
+<tr><td>Mean difference (G1000 &minus; ECU)</td><td class="num">{pair['diff_mean']:+.3f} V</td></tr>
+<tr><td>Std deviation of difference</td><td class="num">{pair['diff_std']:.3f} V</td></tr>
+<tr><td>95% range</td><td class="num">[{pair['diff_p2_5']:+.3f}, {pair['diff_p97_5']:+.3f}] V</td></tr>
+<tr><td>Pearson r</td><td class="num">{pair['pearson_r']:.3f}</td></tr>
+<tr><td>Paired samples</td><td class="num">{len(pair['diff'])}</td></tr>
+</table>
+"""
+    else:
+        yield "<p>No ECU session overlaps this flight.</p>\n"
+
+    yield f"""
+<p class="small">Generated by report_site.py from {html.escape(rec['file'])}. Phases from flight_phases.py,
+dips from dip_events.py. All times UTC.</p>
+
+</div>
+</body>
+</html>"""
+
+
+def _error_text(e):
+    return f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+
+def _range_job(path):
+    """Worker entry point: ((start, end) or None, error message or None) for one log."""
+    try:
+        t, _ = load_g1000_channels(path, ("volt1",))
+        return ((float(t[0]), float(t[-1])) if len(t) else None), None
+    except Exception as e:  # any unreadable log (truncated gzip, bad zstd frame, ...) is skipped, not fatal
+        return None, _error_text(e)
+
+
+def _page_job(job):
+    """Worker entry point: (build_page record, None), or (None, error message) if it failed."""
+    try:
+        return build_page(job), None
+    except Exception as e:
+        return None, _error_text(e)
+
+
+def _run_jobs(fn, jobs, workers, chunksize):
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 and len(jobs) > 1 else None
+    try:
+        return list(pool.map(fn, jobs, chunksize=chunksize)) if pool else [fn(j) for j in jobs]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def build_page(job):
+    """Worker entry point: write one flight page, return its summary record for site.json."""
+    tail, path, page_path, sessions, thresholds, images, utc_offset_s = job
+    path = Path(path)
+    t, data, phase = load_flight_phases(path, EVENT_CHANNELS)
+    volt1 = data["volt1"]
+    events, baseline = detect_dips(t, data, thresholds)
+    pair, ecu = ecu_pair(t, volt1, sessions, utc_offset_s)
+    flight = flight_stats(path, t, volt1, phase, tail)
+    valid = volt1 > 0
+
+    rec = {
+        "tail": tail, "file": path.name, "start": float(t[0]), "end": float(t[-1]),
+        "n_samples": int(valid.sum()),
+        "min": float(volt1[valid].min()) if valid.any() else None,
+        "baseline": _float(baseline),
+        "cruise": {name: getattr(flight, name) for name in
+                   ("n_cruise", "mean", "median", "std", "max", "pct_below_26")} if flight else None,
+        "dips": {f"{thr:g}": int(np.sum(events["threshold"] == thr)) for thr in thresholds},
+        "ecu": {"sessions": [s.number for s in sessions], "diff_mean": pair["diff_mean"],
+                "diff_std": pair["diff_std"], "r": pair["pearson_r"]} if pair else None,
+    }
+    page_path = Path(page_path)
+    page_path.parent.mkdir(parents=True, exist_ok=True)
+    sections = page_sections(rec, phase_stats(t, volt1, phase), events, pair, rec["ecu"]["sessions"] if pair else [],
+                             lambda: make_trend(t, data, phase, events, thresholds, ecu))
+    write_report(page_path, sections, images)
+    return rec
+
+
+# =============================================================================
+# Index page
+# =============================================================================
+
+def make_history(records_by_tail, thresholds):
+    """Cruise volt1, minimum volt1 and dip count per flight over time, one color per tail."""
+    fig, axes = plt.subplots(3, 1, figsize=(12, 9), sharex=True,
+                             gridspec_kw={"height_ratios": [3, 2, 1.3]})
+    low = f"{max(thresholds):g}"
+    for k, (tail, recs) in enumerate(records_by_tail.items()):
+        color = TAIL_COLORS[k % len(TAIL_COLORS)]
+        dates = np.array([r["start"] for r in recs]).astype(np.int64).astype("datetime64[s]")
+        cruise = np.array([r["cruise"]["mean"] if r["cruise"] else np.nan for r in recs])
+        vmin = np.array([r["min"] if r["min"] is not None else np.nan for r in recs])
+        dips = np.array([r["dips"].get(low, 0) for r in recs])
+        axes[0].plot(dates, cruise, "o", color=color, markersize=3, alpha=0.7, label=tail)
+        axes[1].plot(dates, vmin, "o", color=color, markersize=3, alpha=0.7)
+        axes[2].vlines(dates, 0, dips, color=color, linewidth=1.2)
+        for when, label, ev_color in MAINT_EVENTS.get(tail, []):
+            if dates[0] <= np.datetime64(when) <= dates[-1]:
+                for ax in axes:
+                    ax.axvline(when, color=ev_color, linestyle=":", linewidth=1, alpha=0.7)
+                axes[0].annotate(label, xy=(when, 1), xycoords=("data", "axes fraction"), fontsize=6.5,
+                                 ha="center", va="top", color=ev_color)
+
+    for thr in thresholds:
+        axes[1].axhline(thr, color="#c0392b", linestyle="--", linewidth=0.6, alpha=0.6)
+    axes[0].set_ylabel("Cruise volt1 (V)")
+    axes[0].set_title("Per-flight voltage history", fontweight="bold")
+    axes[0].legend(loc="best", fontsize=8, ncol=len(records_by_tail))
+    axes[1].set_ylabel("Minimum volt1 (V)")
+    axes[2].set_ylabel(f"Dips < {low} V")
+    locator = mdates.AutoDateLocator()
+    axes[2].xaxis.set_major_locator(locator)
+    axes[2].xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+    for ax in axes:
+        ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def _index_row(r, low):
+    """One flight's row in the index table."""
+    return (f"<tr><td><a href=\"{r['page']}\">{epoch_to_datetime(r['start']):%Y-%m-%d %H:%M}</a></td>"
+            f"<td class=\"num\">{(r['end'] - r['start']) / 60:.0f}</td>"
+            f"<td class=\"num\">{_fmt(r['cruise'] and r['cruise']['mean'], '.2f')}</td>"
+            f"<td class=\"num\">{_fmt(r['min'], '.2f')}</td>"
+            f"<td class=\"num\">{r['dips'].get(low, 0)}</td>"
+            f"<td class=\"num\">{_fmt(r['ecu'] and r['ecu']['diff_mean'], '+.3f')}</td>"
+            f"<td>{html.escape(r['file'])}</td></tr>\n")
+
+
+def index_sections(records_by_tail, thresholds, notes):
+    """The index page as HTML text sections plus a ("history", factory) figure section."""
+    n = sum(len(recs) for recs in records_by_tail.values())
+    starts = [r["start"] for recs in records_by_tail.values() for r in recs]
+    span = (f"{epoch_to_datetime(min(starts)):%Y-%m-%d} to {epoch_to_datetime(max(starts)):%Y-%m-%d}"
+            if starts else "no flights")
+    low = f"{max(thresholds):g}"
+    yield f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>G1000 Voltage Flight Archive</title>
+<style>
+{REPORT_CSS}{SITE_CSS}</style>
+</head>
+<body>
+<div class="page">
+<h1>G1000 Voltage Flight Archive</h1>
+<div class="subtitle">{n} flights &bull; {", ".join(records_by_tail) or "no aircraft"} &bull; {span}</div>
+"""
+    for note in notes:
+        yield f"<p class=\"small\">{html.escape(note)}</p>\n"
+    if n:
+        yield "\n<h2>History</h2>\n<img src=\""
+        yield ("history", lambda: make_history(records_by_tail, thresholds))
+        yield "\" alt=\"Voltage history\">\n"
+
+    for tail, recs in records_by_tail.items():
+        yield f"""
+<h2>{tail}</h2>
+<table>
+<tr><th>Date (UTC)</th><th class="num">Duration (min)</th><th class="num">Cruise V</th><th class="num">Min V</th>
+<th class="num">Dips &lt; {low} V</th><th class="num">G1000 &minus; ECU</th><th>Log</th></tr>
+"""
+        yield "".join(_index_row(r, low) for r in reversed(recs))
+        yield "</table>\n"
+
+    yield """
+<p class="small">Generated by report_site.py. Cruise is flight_phases CRUISE (airborne, not descending).
+All times UTC.</p>
+
+</div>
+</body>
+</html>"""
+
+
+# =============================================================================
+# Incremental update
+# =============================================================================
+
+def update_site(files_by_tail, ecu_dirs, site_dir=SITE_DIR, thresholds=DEFAULT_THRESHOLDS,
+                images=ImageOptions(), utc_offset_s=0.0, workers=None, force=False):
+    """Bring the site in site_dir up to date with the logs in files_by_tail.
+
+    files_by_tail maps tail -> G1000 logs, ecu_dirs tail -> ECU session
+    directory (or None). Returns (pages built, pages unchanged, pages
+    removed, index rewritten, problems), problems being one message per log
+    that failed or was skipped as a duplicate page.
+    """
+    site_dir = Path(site_dir)
+    site_dir.mkdir(parents=True, exist_ok=True)
+    state = load_state(site_dir)
+    pages = state.get("pages", {})
+    fingerprint = code_fingerprint(images, thresholds, utc_offset_s)
+
+    current, collisions = {}, []
+    for tail, files in files_by_tail.items():
+        for p in files:
+            rel = f"{tail}/{page_name(p)}"
+            if rel in current:
+                collisions.append(f"{tail}: {Path(p).name} and {current[rel][1].name} both map to "
+                                  f"{page_name(p)}; {Path(p).name} skipped")
+                continue
+            current[rel] = (tail, Path(p))
+    removed = [rel for rel in pages if rel not in current]
+    for rel in removed:
+        (site_dir / rel).unlink(missing_ok=True)
+        del pages[rel]
+
+    # Time ranges: stored for unchanged logs, parsed (through the cache) for new or changed ones.
+    # A log that could not be read keeps its error until it changes.
+    signatures = {rel: file_signature(p) for rel, (_, p) in current.items()}
+    changed = [rel for rel in current if pages.get(rel, {}).get("signature") != signatures[rel]]
+    with stage("flight_ranges", rows=len(changed)):
+        parsed = dict(zip(changed, _run_jobs(_range_job, [current[rel][1] for rel in changed], workers, 8)))
+    ranges, errors = {}, {}
+    for rel in current:
+        if rel in changed:
+            ranges[rel], errors[rel] = parsed[rel]
+        else:
+            ranges[rel] = pages[rel]["range"]
+            errors[rel] = pages[rel].get("error") if ranges[rel] is None else None
+
+    notes, jobs = [], []
+    with stage("pair_ecu"):
+        for tail in files_by_tail:
+            sessions, note = tail_ecu_sessions(ecu_dirs.get(tail), utc_offset_s)
+            if note:
+                notes.append(note)
+            index = IntervalIndex.of(sessions)
+            for rel, (rel_tail, path) in current.items():
+                if rel_tail != tail:
+                    continue
+                if ranges[rel] is None:  # no samples, or unreadable: no page
+                    if errors[rel]:
+                        (site_dir / rel).unlink(missing_ok=True)
+                    pages[rel] = {"signature": signatures[rel], "range": None, "key": None, "record": None,
+                                  "error": errors[rel]}
+                    continue
+                matched = index.overlapping(*ranges[rel], MIN_OVERLAP_S)
+                key = page_key(fingerprint, signatures[rel], matched)
+                entry = pages.get(rel, {})
+                if (force or entry.get("key") != key
+                        or (not entry.get("error") and not (site_dir / rel).exists())):
+                    jobs.append((rel, key, (tail, str(path), str(site_dir / rel), matched,
+                                            tuple(thresholds), images, utc_offset_s)))
+
+    with stage("pages", rows=len(jobs)):
+        results = _run_jobs(_page_job, [job for _, _, job in jobs], workers, 2)
+    for (rel, key, _), (rec, error) in zip(jobs, results):
+        if error:
+            (site_dir / rel).unlink(missing_ok=True)
+        pages[rel] = {"signature": signatures[rel], "range": ranges[rel], "key": key,
+                      "record": dict(rec, page=rel) if rec else None, "error": error}
+
+    failures = [f"{current[rel][0]}: {current[rel][1].name}: {e['error']}"
+                for rel, e in sorted(pages.items()) if e.get("error")]
+    problems = failures + collisions
+    notes += [f"Not included: {problem}" for problem in problems]
+
+    index_key = hashlib.sha1(json.dumps([fingerprint, notes, sorted((rel, e["key"]) for rel, e in pages.items()
+                                                                     if e["record"])]).encode()).hexdigest()
+    rewrite = index_key != state.get("index_key") or not (site_dir / INDEX_FILE).exists()
+    if rewrite:
+        by_tail = {}
+        for entry in sorted((e for e in pages.values() if e["record"]), key=lambda e: e["record"]["start"]):
+            by_tail.setdefault(entry["record"]["tail"], []).append(entry["record"])
+        with stage("index"):
+            write_report(site_dir / INDEX_FILE, index_sections(dict(sorted(by_tail.items())), thresholds, notes),
+                         images)
+    save_state(site_dir, {"version": SITE_VERSION, "index_key": index_key, "pages": pages,
+                          "collisions": collisions})
+    n_built = sum(1 for rec, _ in results if rec)
+    n_pages = sum(1 for e in pages.values() if e["record"])
+    return n_built, n_pages - n_built, len(removed), rewrite, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental static report site: one page per flight plus an index")
+    parser.add_argument("--source", default=str(SOURCE_DIR), help="Directory of CSVs for one aircraft")
+    parser.add_argument("--tail", default=HOME_TAIL, help=f"Tail number for --source (default: {HOME_TAIL})")
+    parser.add_argument("--fleet", default=None,
+                        help="Directory with one subdirectory of CSVs per tail (ECU sessions in <tail>/ecu)")
+    parser.add_argument("--ecu", default=None,
+                        help="ECU session CSVs or .ae3 dumps for --source (default for N238PS: "
+                             "../AustroView/Data/Parsed, then data/ECU)")
+    parser.add_argument("--ecu-utc-offset", type=float, default=0.0,
+                        help="ECU clock offset from UTC in hours (default: 0)")
+    parser.add_argument("--output", default=str(SITE_DIR), help="Site directory (default: output/site)")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=list(DEFAULT_THRESHOLDS),
+                        help="volt1 dip thresholds in V (default: 25.5 24.0)")
+    parser.add_argument("--image-format", choices=IMAGE_FORMATS, default="png",
+                        help="Embedded image encoding (default: png)")
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI, help=f"Figure DPI (default: {DEFAULT_DPI})")
+    parser.add_argument("--force", action="store_true", help="Rebuild every page")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the parse cache in data/cache/")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.no_cache:
+        disable_cache()
+
+    if args.fleet:
+        files_by_tail = find_fleet(args.fleet)
+        ecu_dirs = {tail: Path(args.fleet) / tail / "ecu" for tail in files_by_tail}
+    else:
+        source = Path(args.source)
+        if not source.exists():
+            print(f"Source directory not found: {source}")
+            sys.exit(1)
+        files_by_tail = {args.tail: glob_logs(source, "*.csv")}
+        if args.ecu:
+            ecu_dirs = {args.tail: Path(args.ecu)}
+        elif args.tail == HOME_TAIL:
+            ecu_dirs = {args.tail: ECU_PARSED_DIR if ECU_PARSED_DIR.is_dir() else AE3_DIR}
+        else:
+            ecu_dirs = {}
+    n_files = sum(len(v) for v in files_by_tail.values())
+    if not n_files:
+        print("No CSV files found")
+        sys.exit(1)
+
+    images = ImageOptions(resolve_image_format(args.image_format), args.dpi)
+    print(f"Updating {args.output} for {n_files} logs of {len(files_by_tail)} aircraft...")
+    t0 = time.perf_counter()
+    with profile_run(args):
+        built, unchanged, removed, index, problems = update_site(
+            files_by_tail, ecu_dirs, args.output, args.thresholds, images, args.ecu_utc_offset * 3600,
+            args.workers, args.force)
+    print(f"  {built} pages built, {unchanged} unchanged, {removed} removed; "
+          f"index {'rewritten' if index else 'unchanged'} ({time.perf_counter() - t0:.1f} s)")
+    if problems:
+        print(f"  {len(problems)} log(s) not included:")
+        for problem in problems:
+            print(f"    {problem}")
+    print(f"Open {Path(args.output) / INDEX_FILE}")
+
+
+if __name__ == "__main__":
+    main()
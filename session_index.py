@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Flight / ECU Session Interval Index
+===================================
+Pairs every G1000 flight with the AustroView ECU session(s) recorded during
+it, by time-range overlap instead of hand-picked session numbers.
+
+  - ECU sessions: one per engine run, named
+    DataLog_<export>_session<N>_<YYYYMMDD>_<HHMMSS>.csv. The time range is
+    the first/last Timestamp in the file (cached per file; the filename
+    start is the fallback for empty sessions). A session exported in more
+    than one .ae3 dump is kept once (newest export wins).
+  - G1000 flights: first/last UTC sample time, via the cached g1000_reader
+    parse.
+
+Both sides go into an IntervalIndex (NumPy arrays sorted by start). A
+single overlap query is two binary searches plus a vectorized filter;
+overlap_join() answers all flights at once, so pairing a whole history is
+one batch operation.
+
+    sessions = ecu_sessions(ECU_PARSED_DIR)
+    flights = g1000_flights(glob_logs(SOURCE_DIR, "*.csv"))
+    for flight, matched in pair_flights(flights, sessions):
+        ...
+
+Usage:
+    python session_index.py                                  # data/source vs ../AustroView/Data/Parsed
+    python session_index.py --g1000 data/synth/N238PS --ecu data/synth/N238PS/ecu
+    python session_index.py --min-overlap 120 --ecu-utc-offset -5
+"""
+
+import argparse
+import io
+import re
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from g1000_reader import load_g1000_channels
+from logio import glob_logs, open_log, strip_compression_suffix
+from parse_cache import cached_arrays, disable_cache
+
+if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+SCRIPT_DIR = Path(__file__).parent
+SOURCE_DIR = SCRIPT_DIR / "data" / "source"
+ECU_PARSED_DIR = SCRIPT_DIR / ".." / "AustroView" / "Data" / "Parsed"
+
+SESSION_GLOB = "*_session*_2*.csv"
+SESSION_RE = re.compile(r"session(\d+)_(\d{8})_(\d{6})\.csv$")
+SESSION_RANGE_VERSION = 1
+MIN_OVERLAP_S = 60.0
+
+EcuSession = namedtuple("EcuSession", "number start end path")
+G1000Flight = namedtuple("G1000Flight", "start end path")
+
+
+# =============================================================================
+# Interval index
+# =============================================================================
+
+class IntervalIndex:
+    """Half-open time intervals [start, end) with attached items, sorted by start.
+
+    Overlap queries bound the candidate range with two searchsorted calls:
+    an interval overlapping [lo, hi) must start before hi and, being at
+    most max_len long, at or after lo - max_len.
+    """
+    __slots__ = ("start", "end", "items", "max_len")
+
+    def __init__(self, starts, ends, items):
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        order = np.argsort(starts, kind="stable")
+        self.start = starts[order]
+        self.end = ends[order]
+        self.items = [items[i] for i in order]
+        self.max_len = float(np.max(self.end - self.start)) if len(order) else 0.0
+
+    @classmethod
+    def of(cls, items):
+        """Index of namedtuples (or anything) with .start/.end epoch seconds."""
+        items = list(items)
+        return cls([it.start for it in items], [it.end for it in items], items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def query(self, lo, hi, min_overlap=0.0):
+        """Positions of intervals overlapping [lo, hi) by more than min_overlap seconds, by start."""
+        i0 = np.searchsorted(self.start, lo - self.max_len, side="left")
+        i1 = np.searchsorted(self.start, hi, side="left")
+        cand = np.arange(i0, max(i0, i1))
+        overlap = np.minimum(self.end[cand], hi) - np.maximum(self.start[cand], lo)
+        return cand[overlap > min_overlap]
+
+    def overlapping(self, lo, hi, min_overlap=0.0):
+        """Items overlapping [lo, hi), in start order."""
+        return [self.items[i] for i in self.query(lo, hi, min_overlap)]
+
+    def overlap_join(self, other, min_overlap=0.0):
+        """All overlapping pairs between other's intervals and this index's.
+
+        Returns (i_other, i_self, overlap_seconds) position arrays, grouped by
+        i_other and within each group in start order of this index.
+        """
+        lo_idx = np.searchsorted(self.start, other.start - self.max_len, side="left")
+        hi_idx = np.searchsorted(self.start, other.end, side="left")
+        counts = np.maximum(hi_idx - lo_idx, 0)
+        total = int(counts.sum())
+        i_other = np.repeat(np.arange(len(other)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        i_self = np.repeat(lo_idx, counts) + offsets
+        overlap = (np.minimum(self.end[i_self], other.end[i_other])
+                   - np.maximum(self.start[i_self], other.start[i_other]))
+        keep = overlap > min_overlap
+        return i_other[keep], i_self[keep], overlap[keep]
+
+
+# =============================================================================
+# ECU session ranges
+# =============================================================================
+
+def _stamp_epoch(stamp):
+    """'YYYY-MM-DD HH:MM:SS' -> epoch seconds, or NaN."""
+    try:
+        return float(np.datetime64(stamp.strip().replace(" ", "T"), "s").astype(np.int64))
+    except ValueError:
+        return np.nan
+
+
+def read_session_range(filepath):
+    """(first, last) Timestamp of an AustroView session CSV as epoch seconds (NaN if none)."""
+    first = last = np.nan
+    with open_log(filepath, errors="replace") as f:
+        header = [h.strip() for h in f.readline().split(",")]
+        if "Timestamp" not in header:
+            return first, last
+        idx = header.index("Timestamp")
+        last_line = None
+        for line in f:
+            if np.isnan(first):
+                parts = line.split(",")
+                if len(parts) > idx:
+                    first = _stamp_epoch(parts[idx])
+            if line.strip():
+                last_line = line
+        if last_line is not None:
+            parts = last_line.split(",")
+            if len(parts) > idx:
+                last = _stamp_epoch(parts[idx])
+    return first, last
+
+
+def session_range(filepath):
+    """read_session_range() through the parse cache."""
+    def compute(path):
+        return {"range": np.array(read_session_range(path), dtype=np.float64)}
+
+    first, last = cached_arrays("ecu_range", filepath, compute, version=SESSION_RANGE_VERSION)["range"]
+    return float(first), float(last)
+
+
+def ecu_sessions(ecu_dir, utc_offset_s=0.0):
+    """All ECU sessions under ecu_dir as EcuSession tuples (UTC epoch seconds), by start.
+
+    utc_offset_s is the ECU clock's offset east of UTC (0 if it keeps UTC).
+    Duplicate exports of the same session (same number and start) are
+    collapsed to the last one in filename order.
+    """
+    ecu_dir = Path(ecu_dir)
+    if not ecu_dir.is_dir():
+        return []
+    unique = {}
+    for path in glob_logs(ecu_dir, SESSION_GLOB):
+        m = SESSION_RE.search(strip_compression_suffix(path.name))
+        if not m:
+            continue
+        named = datetime.strptime(m.group(2) + m.group(3), "%Y%m%d%H%M%S")
+        named = named.replace(tzinfo=timezone.utc).timestamp()
+        first, last = session_range(path)
+        start = first if not np.isnan(first) else named
+        end = last if not np.isnan(last) else start
+        unique[(int(m.group(1)), named)] = EcuSession(int(m.group(1)), start - utc_offset_s,
+                                                      end - utc_offset_s, path)
+    return sorted(unique.values(), key=lambda s: s.start)
+
+
+# =============================================================================
+# G1000 flight ranges
+# =============================================================================
+
+def _flight_range_job(path):
+    """Worker entry point: (start, end) UTC epoch seconds of one G1000 log, or None."""
+    t, _ = load_g1000_channels(path, ("volt1",))
+    if len(t) == 0:
+        return None
+    return float(t[0]), float(t[-1])
+
+
+def g1000_flights(paths, workers=None):
+    """G1000Flight tuples (UTC epoch seconds) for the given logs, by start; empty logs are skipped."""
+    paths = list(paths)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 and len(paths) > 1 else None
+    try:
+        ranges = list(pool.map(_flight_range_job, paths, chunksize=8)) if pool else \
+            [_flight_range_job(p) for p in paths]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    flights = [G1000Flight(r[0], r[1], Path(p)) for p, r in zip(paths, ranges) if r is not None]
+    return sorted(flights, key=lambda f: f.start)
+
+
+# =============================================================================
+# Pairing
+# =============================================================================
+
+def pair_flights(flights, sessions, min_overlap_s=MIN_OVERLAP_S):
+    """[(flight, [overlapping sessions in start order])] for every flight, in flight order.
+
+    A session counts if it overlaps the flight by more than min_overlap_s;
+    flights with no ECU coverage get an empty list.
+    """
+    flight_index = IntervalIndex.of(flights)
+    session_index = IntervalIndex.of(sessions)
+    i_flight, i_session, _ = session_index.overlap_join(flight_index, min_overlap_s)
+    matched = [[] for _ in range(len(flight_index))]
+    for i, j in zip(i_flight.tolist(), i_session.tolist()):
+        matched[i].append(session_index.items[j])
+    return list(zip(flight_index.items, matched))
+
+
+def _utc(t):
+    return datetime.fromtimestamp(t, tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pair G1000 flights with overlapping AustroView ECU sessions")
+    parser.add_argument("--g1000", default=str(SOURCE_DIR), help="Directory of G1000 CSVs (default: data/source)")
+    parser.add_argument("--ecu", default=str(ECU_PARSED_DIR),
+                        help="Directory of AustroView session CSVs (default: ../AustroView/Data/Parsed)")
+    parser.add_argument("--min-overlap", type=float, default=MIN_OVERLAP_S,
+                        help=f"Minimum overlap in seconds to count as a match (default: {MIN_OVERLAP_S:g})")
+    parser.add_argument("--ecu-utc-offset", type=float, default=0.0,
+                        help="ECU clock offset from UTC in hours, e.g. -5 for EST (default: 0)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for parsing G1000 logs (default: CPU count, 1 = no pool)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the parse cache in data/cache/")
+    args = parser.parse_args()
+    if args.no_cache:
+        disable_cache()
+
+    sessions = ecu_sessions(args.ecu, args.ecu_utc_offset * 3600)
+    flights = g1000_flights(glob_logs(args.g1000, "*.csv"), args.workers)
+    print(f"{len(flights)} G1000 flights in {args.g1000}, {len(sessions)} ECU sessions in {args.ecu}\n")
+    if not flights:
+        return
+
+    pairs = pair_flights(flights, sessions, args.min_overlap)
+    print(f"{'Flight start (UTC)':<18} {'Min':>5}  {'G1000 log':<44} ECU session(s)")
+    print("-" * 100)
+    used = set()
+    for flight, matched in pairs:
+        minutes = (flight.end - flight.start) / 60
+        if matched:
+            covered = sum(min(s.end, flight.end) - max(s.start, flight.start) for s in matched)
+            names = ", ".join(f"#{s.number}" for s in matched)
+            desc = f"{names}  ({100 * covered / max(flight.end - flight.start, 1):.0f}% covered)"
+            used.update(s.path for s in matched)
+        else:
+            desc = "-"
+        print(f"{_utc(flight.start):<18} {minutes:>5.0f}  {flight.path.name[:44]:<44} {desc}")
+
+    n_paired = sum(1 for _, matched in pairs if matched)
+    print(f"\n{n_paired}/{len(pairs)} flights paired with ECU data; "
+          f"{len(sessions) - len(used)} ECU sessions overlap no flight")
+
+
+if __name__ == "__main__":
+    main()
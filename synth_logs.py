@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Synthetic G1000 / VDL48 / ECU Log Generator
+===========================================
+Writes fleet-scale test data in the exact on-disk formats the analysis
+scripts read:
+
+  - G1000 NXi data logs: same 3-line header, 4 initialization rows and
+    fixed-width right-aligned columns as a real export, one file per flight
+    named like FlySto downloads (log_YYMMDD_HHMMSS_APT.csv)
+  - Triplett VDL48 LOG_VD.CSV files: one per flying day, 2-second samples
+    covering every flight of the day plus the engine-off idle between them
+  - AustroView-style ECU session CSVs: one per engine run
+
+Every flight is simulated at 1 Hz from a shared "true bus voltage": battery
+on the ground, regulator set point once the alternator is online, a
+charging transient after each start and a sag at taxi idle. Each logger sees
+it through its own fault model:
+
+  - G1000 volt1: current-dependent ground-path offset, noise, transient
+    dips, blank-cell dropouts, 0.1 V quantization
+  - VDL48: small noise, clock skew (ppm drift plus a wrong start clock)
+  - ECU: small positive bias, noise, clock offset
+
+Days are generated in parallel with deterministic per-day seeds, so the
+same --seed always produces the same files.
+
+Usage:
+    python synth_logs.py --out data/synth --flights 200
+    python synth_logs.py --out data/fleet_synth --tails N1AA N2BB N3CC --flights 10000 --workers 8
+    python synth_logs.py --out /tmp/s --flights 20 --offset 1.4 --noise 0.2 --dips-per-hour 4 \\
+        --dropouts-per-hour 1 --vdl --ecu --vdl-skew-ppm 50 --compress gzip
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from logio import compressed_name, open_log_writer, resolve_compression
+
+AIRFRAME_LINE = (
+    '#airframe_info, log_version="1.03", log_content_version="1.02", Product="GIFD", '
+    'airframe_name="Diamond DA40NG", unit_software_part_number="006-B1177-6H", '
+    'unit_software_version="20.90", system_software_part_number="006-B1669-14", '
+    'system_id="{system_id}", mode=NORMAL, flightstream_header="{system_id}_{seq:04d}", '
+)
+UNITS_LINE = (
+    "#yyy-mm-dd, hh:mm:ss,   hh:mm,  ident,      degrees,      degrees,      ft,  inch,  ft msl, "
+    "deg C,     kt,     kt,     fpm,    deg,    deg,      G,      G,   deg,   deg, volts, volts,   "
+    "gals,   gals,      gph,      psi,   deg F,     psi,    rpm,       %,  ft wgs,  kt, enum,    deg,"
+    "    MHz,    MHz,     MHz,     MHz,    fsd,    fsd,     kt,   deg,     nm,    deg,    deg,   "
+    "bool,  enum,   enum,   deg,   deg,   fpm,   enum,   mt,    mt,     mt,    mt,     mt"
+)
+HEADER_LINE = (
+    "  Lcl Date, Lcl Time, UTCOfst, AtvWpt,     Latitude,    Longitude,  AltInd, BaroA,  AltMSL,   "
+    "OAT,    IAS, GndSpd,    VSpd,  Pitch,   Roll,  LatAc, NormAc,   HDG,   TRK, volt1, volt2,  "
+    "FQtyL,  FQtyR, E1 FFlow, E1 FPres, E1 OilT, E1 OilP, E1 RPM, E1 %Pwr,  AltGPS, TAS, HSIS,    "
+    "CRS,   NAV1,   NAV2,    COM1,    COM2,   HCDI,   VCDI, WndSpd, WndDr, WptDst, WptBrg, MagVar, "
+    "AfcsOn, RollM, PitchM, RollC, PichC, VSpdG, GPSfix,  HAL,   VAL, HPLwas, HPLfd, VPLwas"
+)
+COLUMNS = [h.strip() for h in HEADER_LINE.split(",")]
+WIDTHS = [len(h) for h in HEADER_LINE.split(",")]
+
+# Simulated columns and their printf precision (None = preformatted string)
+DATA_FORMATS = {
+    "Lcl Date": None, "Lcl Time": None, "Latitude": ".7f", "Longitude": ".7f", "AltInd": ".1f",
+    "AltMSL": ".1f", "OAT": ".1f", "IAS": ".2f", "GndSpd": ".2f", "VSpd": ".2f", "Pitch": ".2f",
+    "Roll": ".2f", "LatAc": ".2f", "NormAc": ".2f", "HDG": ".1f", "TRK": ".1f", "volt1": None,
+    "volt2": ".1f", "FQtyL": ".2f", "FQtyR": ".2f", "E1 FFlow": ".2f", "E1 FPres": ".2f",
+    "E1 OilT": ".2f", "E1 OilP": ".2f", "E1 RPM": ".1f", "E1 %Pwr": ".2f", "AltGPS": ".1f", "TAS": "d",
+}
+INIT_STATIC = {"BaroA": "30.05", "IAS": "0.00", "HSIS": "GPS", "CRS": "53.5", "NAV1": "111.10",
+               "NAV2": "111.10", "COM1": "121.200", "COM2": "123.775", "MagVar": "-6.6",
+               "GPSfix": "NoSoln", "HAL": "3704"}
+AFCS_STATIC = {"AfcsOn": "0", "RollM": "NONE", "PitchM": "NONE"}
+DATA_STATIC = {"UTCOfst": "+00:00", "BaroA": "30.05", "HSIS": "GPS", "CRS": "53.5", "NAV1": "111.10",
+               "NAV2": "111.10", "COM1": "121.200", "COM2": "123.775", "MagVar": "-6.6",
+               "AfcsOn": "0", "RollM": "NONE", "PitchM": "NONE", "GPSfix": "3DDiff", "HAL": "1852"}
+
+AIRPORTS = [("KBOW", 27.9434, -81.7834, 125), ("KSPG", 27.7651, -82.6270, 7),
+            ("KLAL", 27.9889, -82.0186, 142), ("KORL", 28.5455, -81.3329, 113),
+            ("KVRB", 27.6556, -80.4179, 24), ("KSRQ", 27.3954, -82.5544, 30)]
+
+VDL_SAMPLE_S = 2
+BASE_LOAD_A = 15.0
+
+
+@dataclass
+class FaultSpec:
+    """Electrical system and logger fault parameters (volts, seconds, per-hour rates)."""
+    battery_v: float = 24.6          # engine-off bus with avionics load
+    regulator_v: float = 28.0        # alternator-online set point
+    regulator_sd: float = 0.15       # flight-to-flight set point spread
+    idle_sag_v: float = 0.8          # bus sag at taxi idle RPM
+    charge_a: float = 30.0           # battery recharge current right after start
+    charge_tau_s: float = 240.0      # recharge current decay time constant
+    offset: float = 1.3              # G1000 ground-path drop at base load
+    offset_sd: float = 0.3           # flight-to-flight offset spread
+    noise: float = 0.15              # G1000 volt1 noise (std)
+    dips_per_hour: float = 2.0       # transient load spikes
+    dip_depth: float = 2.0           # mean extra drop during a spike
+    dip_seconds: float = 2.0         # mean spike length
+    dropouts_per_hour: float = 0.0   # blank volt1 cells
+    dropout_seconds: float = 5.0
+    vdl_noise: float = 0.02
+    vdl_skew_ppm: float = 0.0        # VDL48 clock rate error
+    vdl_clock_offset_s: float = 0.0  # VDL48 start clock error
+    ecu_bias: float = 0.1
+    ecu_noise: float = 0.05
+    ecu_clock_offset_s: float = 0.0
+    minutes: float = 75.0            # mean block time per flight
+    minutes_sd: float = 30.0
+
+
+# =============================================================================
+# Simulation
+# =============================================================================
+
+def _ramp(a, b, n):
+    return np.linspace(a, b, n) if n > 0 else np.zeros(0)
+
+
+def simulate_flight(rng, spec, origin, dest):
+    """One flight at 1 Hz from avionics on to shutdown.
+
+    Returns a dict of float arrays (seconds from avionics on, true bus
+    voltage, G1000 channels) plus scalar 'engine_start'/'engine_stop' indices.
+    """
+    block = max(25.0, rng.normal(spec.minutes, spec.minutes_sd)) * 60
+    pre, taxi_out, runup = int(rng.uniform(50, 120)), int(rng.uniform(240, 700)), int(rng.uniform(20, 45))
+    roll, taxi_in, post = 25, int(rng.uniform(180, 420)), int(rng.uniform(2, 6))
+    cruise_alt = float(rng.choice([2500, 3000, 4500, 5500, 6500, 7500, 8500]))
+    climb = int(cruise_alt / 600 * 60)
+    descent = int(cruise_alt / 500 * 60)
+    cruise = max(int(block) - (taxi_out + runup + roll + climb + descent + roll + taxi_in), 300)
+    field = origin[3]
+
+    seg = [  # (rpm, ias, gs, vs) start/end values and length per segment
+        ("pre", pre, (0, 0), (0, 0), (0, 0), (0, 0)),
+        ("taxi", taxi_out, (800, 900), (0, 0), (8, 8), (0, 0)),
+        ("runup", runup, (1800, 1800), (0, 0), (0, 0), (0, 0)),
+        ("taxi", 30, (900, 900), (0, 0), (5, 5), (0, 0)),
+        ("roll", roll, (2300, 2300), (0, 60), (0, 60), (0, 0)),
+        ("climb", climb, (2250, 2200), (75, 85), (75, 85), (600, 600)),
+        ("cruise", cruise, (2050, 2050), (118, 118), (122, 122), (0, 0)),
+        ("descent", descent, (1950, 1750), (125, 90), (128, 90), (-500, -500)),
+        ("roll", roll, (900, 800), (60, 0), (60, 10), (0, 0)),
+        ("taxi", taxi_in, (850, 850), (0, 0), (8, 8), (0, 0)),
+        ("post", post, (0, 0), (0, 0), (0, 0), (0, 0)),
+    ]
+    rpm = np.concatenate([_ramp(*s[2], s[1]) for s in seg])
+    ias = np.concatenate([_ramp(*s[3], s[1]) for s in seg])
+    gs = np.concatenate([_ramp(*s[4], s[1]) for s in seg])
+    vs = np.concatenate([_ramp(*s[5], s[1]) for s in seg])
+    n = len(rpm)
+    t = np.arange(n, dtype=float)
+    running = rpm > 0
+    start = int(np.argmax(running))
+    stop = n - int(np.argmax(running[::-1]))
+
+    rpm = np.where(running, rpm + rng.normal(0, 8, n), 0.0)
+    airborne_ias = ias > 0
+    ias = np.where(airborne_ias, ias + rng.normal(0, 1.5, n), 0.0)
+    gs = np.where(gs > 0, gs + rng.normal(0, 1.0, n), 0.0).clip(0)
+    vs = vs + np.where(airborne_ias, rng.normal(0, 60, n), rng.normal(0, 8, n))
+    alt = field + np.cumsum(vs) / 60.0
+    alt = np.maximum(alt, field) + rng.normal(0, 2, n)
+    pct = np.clip((rpm - 700) / 1600, 0, 1) ** 1.3
+    fflow = np.where(running, 1.2 + 8.5 * pct + rng.normal(0, 0.1, n), 0.0)
+    oat_ground = rng.uniform(5, 32)
+    oat = oat_ground - 2.0 * (alt - field) / 1000 + rng.normal(0, 0.2, n)
+    warm = 1 - np.exp(-np.maximum(t - start, 0) / 600.0)
+    oilt = np.where(running | (t >= stop), oat_ground * 1.8 + 32 + (225 - oat_ground * 1.8 - 32) * warm, np.nan)
+    oilp = np.where(running, 55 + 20 * pct + rng.normal(0, 0.5, n), 0.0)
+
+    # Electrical: true bus and load current
+    since = np.maximum(t - start, 0)
+    charge = np.where(running, spec.charge_a * np.exp(-since / spec.charge_tau_s), 0.0)
+    reg = spec.regulator_v + rng.normal(0, spec.regulator_sd)
+    idle = np.clip((1400 - rpm) / 600, 0, 1) * spec.idle_sag_v
+    surface = np.where(t >= stop, 0.9 * np.exp(-(t - stop) / 120.0), 0.0)
+    bus = np.where(running, reg - idle, spec.battery_v + surface) + rng.normal(0, 0.03, n)
+    current = BASE_LOAD_A + charge + np.where(running, 0.0, -5.0)
+
+    # G1000 fault model
+    offset = max(rng.normal(spec.offset, spec.offset_sd), 0.0)
+    drop = offset * current / BASE_LOAD_A
+    n_dips = rng.poisson(spec.dips_per_hour * n / 3600)
+    for s0 in rng.integers(0, n, n_dips):
+        length = max(1, int(round(rng.exponential(spec.dip_seconds))))
+        drop[s0:s0 + length] += rng.exponential(spec.dip_depth)
+    volt1 = np.round(bus - drop + rng.normal(0, spec.noise, n), 1)
+    n_drop = rng.poisson(spec.dropouts_per_hour * n / 3600)
+    for s0 in rng.integers(0, n, n_drop):
+        volt1[s0:s0 + max(1, int(rng.exponential(spec.dropout_seconds)))] = np.nan
+
+    # Navigation: great-circle-ish straight line between airports
+    frac = np.clip(np.cumsum(gs) / max(np.sum(gs), 1.0), 0, 1)
+    lat = origin[1] + (dest[1] - origin[1]) * frac
+    lon = origin[2] + (dest[2] - origin[2]) * frac
+    course = math.degrees(math.atan2(dest[2] - origin[2], dest[1] - origin[1])) % 360
+    hdg = (course + rng.normal(0, 1.5, n)) % 360
+    fuel = 10.5 - np.cumsum(fflow) / 3600 / 2
+
+    return {
+        "t": t, "bus": bus, "running": running, "engine_start": start, "engine_stop": stop,
+        "Latitude": lat, "Longitude": lon, "AltInd": alt, "AltMSL": alt + 15, "AltGPS": alt - 70,
+        "OAT": oat, "IAS": ias, "GndSpd": gs, "VSpd": vs,
+        "Pitch": vs / 120 + rng.normal(0, 0.5, n), "Roll": rng.normal(0, 1.2, n),
+        "LatAc": rng.normal(0, 0.02, n), "NormAc": rng.normal(0, 0.03, n),
+        "HDG": hdg, "TRK": (hdg + rng.normal(0, 2, n)) % 360,
+        "volt1": volt1, "volt2": np.zeros(n), "FQtyL": fuel, "FQtyR": fuel + 0.3,
+        "E1 FFlow": fflow, "E1 FPres": np.where(running, 65 + rng.normal(0, 0.5, n), 0.0),
+        "E1 OilT": oilt, "E1 OilP": oilp, "E1 RPM": rpm, "E1 %Pwr": pct,
+        "TAS": np.round(ias * (1 + (alt - field) / 1000 * 0.02)).astype(int),
+    }
+
+
+# =============================================================================
+# Writers
+# =============================================================================
+
+def _static_row(values):
+    return ",".join(str(values.get(c, "")).rjust(w) for c, w in zip(COLUMNS, WIDTHS))
+
+
+def _row_format():
+    """printf format for one data row: simulated columns as specs, the rest literal."""
+    parts = []
+    for c, w in zip(COLUMNS, WIDTHS):
+        if c in DATA_FORMATS:
+            spec = DATA_FORMATS[c]
+            parts.append(f"%{w}s" if spec is None else f"%{w}{spec}")
+        else:
+            parts.append(DATA_STATIC.get(c, "").rjust(w).replace("%", "%%"))
+    return ",".join(parts)
+
+
+INIT_ROWS = [
+    _static_row(INIT_STATIC),
+    _static_row(INIT_STATIC),
+    _static_row({**INIT_STATIC, **AFCS_STATIC}),
+    _static_row({**INIT_STATIC, **AFCS_STATIC, "HAL": "1852", "VAL": "0"}),
+]
+ROW_FORMAT = _row_format()
+
+
+def g1000_text(sim, start_utc, system_id="26356A116", seq=1):
+    """Full G1000 CSV text for a simulated flight starting at start_utc (naive UTC)."""
+    n = len(sim["t"])
+    stamps = np.datetime_as_string(np.datetime64(start_utc, "s") + np.arange(n).astype("timedelta64[s]"))
+    dates = [s[:10] for s in stamps.tolist()]
+    times = [s[11:] for s in stamps.tolist()]
+    v1 = sim["volt1"]
+    volt1 = [("%6.1f" % v) if v == v else "" for v in v1.tolist()]
+    oilt = np.nan_to_num(sim["E1 OilT"], nan=0.0)
+    cols = []
+    for c in COLUMNS:
+        if c not in DATA_FORMATS:
+            continue
+        if c == "Lcl Date":
+            cols.append(dates)
+        elif c == "Lcl Time":
+            cols.append(times)
+        elif c == "volt1":
+            cols.append(volt1)
+        elif c == "E1 OilT":
+            cols.append(oilt.tolist())
+        else:
+            cols.append(sim[c].tolist())
+    first = _static_row({**INIT_STATIC, **AFCS_STATIC, "Lcl Date": dates[0], "Lcl Time": times[0],
+                         "UTCOfst": "+00:00"})
+    fmt = ROW_FORMAT
+    rows = [fmt % r for r in zip(*cols)]
+    return "\n".join([AIRFRAME_LINE.format(system_id=system_id, seq=seq), UNITS_LINE, HEADER_LINE,
+                      *INIT_ROWS, first, *rows])
+
+
+def vdl_text(t_utc, volts, clock_start):
+    """LOG_VD.CSV text: t_utc are true sample times, clock_start the logger's (skewed) first stamp."""
+    offsets = np.round(t_utc - t_utc[0]).astype("timedelta64[s]")
+    iso = np.datetime_as_string(np.datetime64(clock_start, "s") + offsets).tolist()
+    rows = ["%s%s,%s,%.2f" % (s[5:7], s[8:10], s[11:], v) for s, v in zip(iso, volts.tolist())]
+    last = clock_start + timedelta(seconds=int(offsets[-1].astype(int)))
+    header = [
+        "Model:LOG_VD\0", "Version:V1.0.1.221227   ", "Serial ID:171VD_2506100052\0", "Owner:",
+        "Logger ID:0001", "Record Start Condition:Start upon keypress", f"Sampling Rate:{VDL_SAMPLE_S}Sec",
+        f"Data Count:{len(rows)}", f"Start Time:{clock_start:%m-%d-%Y %H:%M:%S}",
+        f"Stop Time:{last:%m-%d-%Y %H:%M:%S}", "", "Date(MMDD),Time,Voltage(V)",
+    ]
+    return "\n".join(header + rows) + "\n"
+
+
+def ecu_text(sim, start_local, rng, spec):
+    i0, i1 = sim["engine_start"], sim["engine_stop"]
+    stamps = np.datetime_as_string(np.datetime64(start_local, "s") +
+                                   np.arange(i0, i1).astype("timedelta64[s]"))
+    volts = sim["bus"][i0:i1] + spec.ecu_bias + rng.normal(0, spec.ecu_noise, i1 - i0)
+    rows = [f"{s[:10]} {s[11:]},{r:.0f},{v:.2f}"
+            for s, r, v in zip(stamps.tolist(), sim["E1 RPM"][i0:i1].tolist(), volts.tolist())]
+    return "\n".join(["Timestamp,Engine Speed [rpm],Battery Voltage [V]"] + rows) + "\n"
+
+
+def _write(path, text, method):
+    path = Path(compressed_name(str(path), method))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = text.encode("utf-8")
+    with open_log_writer(path, method) as f:
+        f.write(data)
+    return len(data)
+
+
+# =============================================================================
+# Schedule and parallel generation
+# =============================================================================
+
+def schedule(n_flights, tails, start_date, seed):
+    """Split n_flights across tails into flying days: {(tail, day_index): [(dep_time, origin, dest)]}."""
+    rng = np.random.default_rng([seed, 0])
+    per_tail = np.full(len(tails), n_flights // len(tails))
+    per_tail[:n_flights % len(tails)] += 1
+    days = {}
+    for ti, (tail, count) in enumerate(zip(tails, per_tail)):
+        day, here, left = start_date, 0, int(count)
+        while left > 0:
+            legs = min(left, int(rng.integers(1, 4)))
+            dep = day + timedelta(hours=float(rng.uniform(8, 11)))
+            flights = []
+            for _ in range(legs):
+                dest = int(rng.choice([i for i in range(len(AIRPORTS)) if i != here]))
+                flights.append((dep, here, dest))
+                dep += timedelta(minutes=float(rng.uniform(150, 240)))
+                here = dest
+            days[(ti, (day - start_date).days)] = (tail, flights)
+            left -= legs
+            day += timedelta(days=int(rng.integers(1, 5)))
+    return days
+
+
+def _day_job(job):
+    """Worker entry point: generate every file for one tail's flying day. Returns (files, bytes)."""
+    key, tail, flights, out_dir, spec, seed, vdl, ecu, method = job
+    rng = np.random.default_rng([seed, key[0], key[1] + 1])
+    out = Path(out_dir) / tail
+    n_files = n_bytes = 0
+    day_t, day_v = [], []
+    for leg, (dep, o, d) in enumerate(flights):
+        sim = simulate_flight(rng, spec, AIRPORTS[o], AIRPORTS[d])
+        name = f"log_{dep:%y%m%d_%H%M%S}_{AIRPORTS[o][0]}.csv"
+        n_bytes += _write(out / name, g1000_text(sim, dep, seq=key[1] * 4 + leg + 1), method)
+        n_files += 1
+        t_abs = dep.replace(tzinfo=timezone.utc).timestamp() + sim["t"]
+        day_t.append(t_abs)
+        day_v.append(sim["bus"])
+        if ecu:
+            start = dep + timedelta(seconds=int(sim["engine_start"]) + spec.ecu_clock_offset_s)
+            session = key[1] * 4 + leg + 1
+            fname = f"DataLog_{flights[0][0]:%Y%m%d}_session{session}_{start:%Y%m%d_%H%M%S}.csv"
+            n_bytes += _write(out / "ecu" / fname, ecu_text(sim, dep + timedelta(seconds=spec.ecu_clock_offset_s),
+                                                            rng, spec), method)
+            n_files += 1
+
+    if vdl:
+        # Idle between legs: battery resting voltage recovering toward ~25.5 V
+        t_parts, v_parts = [day_t[0]], [day_v[0]]
+        for t_next, v_next in zip(day_t[1:], day_v[1:]):
+            gap = np.arange(t_parts[-1][-1] + 1, t_next[0])
+            rest = 25.4 + (v_parts[-1][-1] - 25.4) * np.exp(-(gap - gap[0]) / 900.0) if len(gap) else gap
+            t_parts += [gap, t_next]
+            v_parts += [rest + rng.normal(0, 0.02, len(gap)), v_next]
+        t_all = np.concatenate(t_parts)
+        v_all = np.concatenate(v_parts)
+        tail_off = np.arange(t_all[-1] + 1, t_all[-1] + 120)  # logger disconnected
+        t_all = np.concatenate([t_all, tail_off])
+        v_all = np.concatenate([v_all, np.zeros(len(tail_off))])
+        grid = np.arange(t_all[0], t_all[-1], VDL_SAMPLE_S * (1 + spec.vdl_skew_ppm * 1e-6))
+        volts = np.interp(grid, t_all, v_all)
+        volts = np.where(volts > 1.0, volts + rng.normal(0, spec.vdl_noise, len(grid)), 0.0)
+        clock = (datetime.fromtimestamp(t_all[0], tz=timezone.utc).replace(tzinfo=None)
+                 + timedelta(seconds=spec.vdl_clock_offset_s))
+        # The logger stamps its own (skewed) clock at nominal 2 s steps
+        nominal = t_all[0] + np.arange(len(grid)) * VDL_SAMPLE_S
+        fname = f"LOG_VD_{flights[0][0]:%Y%m%d}.CSV"
+        n_bytes += _write(out / "vdl" / fname, vdl_text(nominal, volts, clock), method)
+        n_files += 1
+    return n_files, n_bytes
+
+
+def generate(out_dir, n_flights, tails=("N238PS",), spec=None, seed=0, start_date=datetime(2024, 1, 1),
+             vdl=False, ecu=False, compress="none", workers=None):
+    """Write n_flights of synthetic logs under out_dir/<tail>/. Returns (files, bytes)."""
+    spec = spec or FaultSpec()
+    method = resolve_compression(compress) if compress != "none" else "none"
+    days = schedule(n_flights, list(tails), start_date, seed)
+    jobs = [(key, tail, flights, str(out_dir), spec, seed, vdl, ecu, method)
+            for key, (tail, flights) in sorted(days.items())]
+    if workers == 1 or len(jobs) < 2:
+        results = [_day_job(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_day_job, jobs, chunksize=8))
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic G1000 / VDL48 / ECU logs")
+    parser.add_argument("--out", required=True, help="Output directory (one subdirectory per tail)")
+    parser.add_argument("--flights", type=int, default=100, help="Total number of flights")
+    parser.add_argument("--tails", nargs="+", default=["N238PS"], help="Tail numbers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", default="2024-01-01", help="First flying day (YYYY-MM-DD)")
+    parser.add_argument("--vdl", action="store_true", help="Also write a VDL48 LOG_VD file per flying day")
+    parser.add_argument("--ecu", action="store_true", help="Also write an ECU session CSV per engine run")
+    parser.add_argument("--compress", choices=["none", "gzip", "zstd", "auto"], default="none")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    defaults = FaultSpec()
+    for field, value in asdict(defaults).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=float, default=value)
+    args = parser.parse_args()
+
+    spec = FaultSpec(**{f: getattr(args, f) for f in asdict(defaults)})
+    out = Path(args.out)
+    print(f"Generating {args.flights} flights for {', '.join(args.tails)} into {out}"
+          f"{' + VDL48' if args.vdl else ''}{' + ECU' if args.ecu else ''}...")
+    t0 = time.perf_counter()
+    n_files, n_bytes = generate(out, args.flights, args.tails, spec, args.seed,
+                                datetime.fromisoformat(args.start), args.vdl, args.ecu,
+                                args.compress, args.workers)
+    dt = time.perf_counter() - t0
+    print(f"  {n_files} files, {n_bytes / 1e6:.1f} MB uncompressed in {dt:.1f} s "
+          f"({args.flights / dt:.0f} flights/s, {os.cpu_count()} CPUs)")
+
+
+if __name__ == "__main__":
+    main()
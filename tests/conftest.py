@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The analysis modules are top-level scripts in the repo root
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+DATA_DIR = REPO_DIR / "data"
+FLIGHT_CSV = DATA_DIR / "N238PS_KBOW-KSPG_20260208-1551UTC.csv"
+
+
+@pytest.fixture(autouse=True)
+def no_parse_cache(monkeypatch):
+    """Keep tests out of data/cache/ (and independent of what is cached there)."""
+    monkeypatch.setenv("VOLTS_CACHE", "0")
+
+
+@pytest.fixture
+def bad_logs(tmp_path):
+    """An empty log and a garbage (headerless) log."""
+    empty = tmp_path / "empty.csv"
+    empty.write_bytes(b"")
+    garbage = tmp_path / "garbage.csv"
+    garbage.write_text("not,a,g1000\nlog\n1,2,3\n4,5,6\n", encoding="utf-8")
+    return [empty, garbage]
+
+
+@pytest.fixture
+def malformed_vdl(tmp_path):
+    """A short VDL48 recording whose 3rd and 5th data rows are malformed."""
+    path = tmp_path / "LOG_VD.CSV"
+    path.write_text("Model:LOG_VD\nSampling Rate:2Sec\nData Count:6\nStart Time:03-01-2019 01:28:59\n\n"
+                    "Date(MMDD),Time,Voltage(V)\n"
+                    "0301,01:28:59,28.10\n0301,01:29:01,28.20\n0301,01:29:03,--\n"
+                    "0301,01:29:05,28.40\ngarbage\n0301,01:29:09,28.60\n", encoding="utf-8")
+    return path
@@ -0,0 +1,51 @@
+"""Regression tests for correlation.run_store()."""
+
+import numpy as np
+
+from correlation import run_store, sufficient_stats, summarize
+from flight_store import CHANNELS, FlightStore
+
+
+def _flight(t0, sign, n=120):
+    """One synthetic flight whose volt1 tracks rpm with the given sign."""
+    t = t0 + np.arange(n, dtype=float)
+    rpm = 2400 + 100 * np.sin(np.arange(n) / 5.0)
+    data = {c: np.full(n, 1.0) for c in CHANNELS}
+    data["rpm"] = rpm
+    data["volt1"] = 27.5 + sign * (rpm - 2400) / 1000
+    return t, data
+
+
+def test_run_store_names_follow_time_order_not_ingest_order(tmp_path):
+    db = tmp_path / "flights.sqlite"
+    with FlightStore(db) as store:
+        # Later flight ingested first, so flight ids run against start-time order
+        store.add_flight("N1AA", "late.csv", "sig-late", *_flight(1_700_100_000.0, -1))
+        store.add_flight("N1AA", "early.csv", "sig-early", *_flight(1_700_000_000.0, +1))
+
+    res = run_store(db, channels=("rpm",), phase="all")
+
+    r = dict(zip(res["names"], res["r_flight"][:, 0]))
+    assert r["early.csv"] > 0.99
+    assert r["late.csv"] < -0.99
+
+
+def test_pooled_regression_ignores_flights_missing_a_channel():
+    rng = np.random.default_rng(0)
+
+    def flight(slope, with_amps=True, n=500):
+        amps = rng.uniform(10, 60, n)
+        rpm = rng.uniform(2000, 2500, n)
+        y = 27.0 + slope * amps + 0.0002 * rpm + rng.normal(0, 0.01, n)
+        return np.column_stack([y, amps if with_amps else np.full(n, np.nan), rpm])
+
+    stats = [sufficient_stats(flight(0.010)), sufficient_stats(flight(0.010)),
+             sufficient_stats(flight(0.010, with_amps=False))]
+    res = summarize(["a", "b", "c"], stats, "volt1", ("amps", "rpm"))
+
+    assert res["n_regression_flights"] == 2
+    assert abs(res["coef_pooled"][1] - 0.010) < 5e-4
+    assert abs(res["coef_pooled"][2] - 0.0002) < 5e-5
+    # The flight without amps still gets its own fit
+    assert res["coef_flight"][2][1] == 0.0
+    assert abs(res["coef_flight"][2][2] - 0.0002) < 5e-5
@@ -0,0 +1,27 @@
+"""Tests for dip_events.DipCatalog."""
+
+import gzip
+import shutil
+
+import pytest
+
+from conftest import FLIGHT_CSV
+from dip_events import DipCatalog
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_scan_skips_unreadable_logs(tmp_path, bad_logs, workers):
+    good = tmp_path / FLIGHT_CSV.name
+    shutil.copy(FLIGHT_CSV, good)
+    truncated = tmp_path / "truncated.csv.gz"
+    data = gzip.compress(FLIGHT_CSV.read_bytes())
+    truncated.write_bytes(data[:len(data) // 2])
+
+    with DipCatalog(tmp_path / "dips.sqlite") as catalog:
+        n_flights, _, failures = catalog.scan({"N1AA": [good, truncated] + bad_logs}, workers=workers)
+        assert n_flights == 1 + len(bad_logs)
+        assert len(failures) == 1 and failures[0].startswith("N1AA/truncated.csv.gz: EOFError")
+
+        # the skipped log is retried next time; everything else is up to date
+        n_flights, _, failures = catalog.scan({"N1AA": [good, truncated] + bad_logs}, workers=workers)
+        assert n_flights == 0 and len(failures) == 1
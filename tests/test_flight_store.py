@@ -0,0 +1,32 @@
+"""Tests for flight_store.FlightStore."""
+
+import gzip
+import shutil
+
+import pytest
+
+from conftest import FLIGHT_CSV
+from flight_store import FlightStore
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ingest_skips_unreadable_logs(tmp_path, bad_logs, workers):
+    good = tmp_path / FLIGHT_CSV.name
+    shutil.copy(FLIGHT_CSV, good)
+    truncated = tmp_path / "truncated.csv.gz"
+    data = gzip.compress(FLIGHT_CSV.read_bytes())
+    truncated.write_bytes(data[:len(data) // 2])
+
+    with FlightStore(tmp_path / "flights.sqlite") as store:
+        n, failures = store.ingest({"N1AA": [good, truncated] + bad_logs}, workers)
+        assert n == 1
+        assert len(failures) == 1 and failures[0].startswith("N1AA/truncated.csv.gz: EOFError")
+        assert list(store.flights()["file"]) == [FLIGHT_CSV.name]
+
+
+def test_sample_queries_reject_unknown_channels(tmp_path):
+    with FlightStore(tmp_path / "flights.sqlite") as store:
+        for query in (lambda: store.samples(["volt1", "bogus"]),
+                      lambda: store.samples_between(0, 1, ["volt1", "t FROM flights; --"])):
+            with pytest.raises(ValueError, match="Unknown channel"):
+                query()
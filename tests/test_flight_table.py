@@ -0,0 +1,48 @@
+"""Tests for flight_table.FlightTable."""
+
+from datetime import datetime
+
+import numpy as np
+
+from flight_table import FlightRecord, FlightTable
+
+
+def record(tail, day, mean, file=None):
+    return FlightRecord(tail, datetime(2025, 1, day), file or f"{tail}_{day}.csv", 100, 80,
+                        mean, mean, 0.1, mean - 1, mean + 1, 0.0, 0)
+
+
+TABLE = FlightTable.from_records([
+    record("N2", 3, 27.9), record("N1", 1, 28.1), None, record("N2", 1, 28.1),
+    record("N1", 2, 27.5), record("N3", 5, 28.0),
+])
+
+
+def test_from_records_skips_none():
+    assert len(TABLE) == 5
+    assert TABLE.columns["tail"].dtype.kind == "U"
+    assert TABLE[1] == record("N1", 1, 28.1)
+
+
+def test_sort_single_and_multiple_keys():
+    assert TABLE.sort("date").file.tolist() == ["N1_1.csv", "N2_1.csv", "N1_2.csv", "N2_3.csv", "N3_5.csv"]
+    # ties on mean keep their original order (stable)
+    assert TABLE.sort("mean").file.tolist() == ["N1_2.csv", "N2_3.csv", "N3_5.csv", "N1_1.csv", "N2_1.csv"]
+    assert TABLE.sort(["tail", "date"], descending=True).file.tolist() == [
+        "N3_5.csv", "N2_3.csv", "N2_1.csv", "N1_2.csv", "N1_1.csv"]
+
+
+def test_split_keeps_row_order():
+    parts = TABLE.split("tail")
+    assert list(parts) == ["N1", "N2", "N3"]
+    assert parts["N1"].file.tolist() == ["N1_1.csv", "N1_2.csv"]
+    assert parts["N2"].file.tolist() == ["N2_3.csv", "N2_1.csv"]
+    assert FlightTable.concat(parts.values()).sort("file").records() == TABLE.sort("file").records()
+    assert FlightTable.empty().split("tail") == {}
+
+
+def test_masks_and_slices_return_tables():
+    recent = TABLE[TABLE.date >= np.datetime64("2025-01-02")]
+    assert isinstance(recent, FlightTable) and len(recent) == 3
+    assert TABLE.filter(TABLE.mean > 28.0).tail.tolist() == ["N1", "N2"]
+    assert len(TABLE[:2]) == 2
@@ -0,0 +1,52 @@
+"""Tests for flysto_download.download_file against fake_flysto."""
+
+import gzip
+
+import pytest
+import requests
+
+import flysto_download
+from conftest import FLIGHT_CSV
+from fake_flysto import DEFAULT_EMAIL, DEFAULT_PASSWORD, FakeFlySto, build_corpus, serve_in_background
+
+
+@pytest.fixture
+def flysto(monkeypatch):
+    """A fake FlySto serving FLIGHT_CSV as its one log: (server state, log, logged-in session)."""
+    monkeypatch.setattr(flysto_download, "RETRY_BACKOFF_S", 0.0)
+    logs = build_corpus(1, [FLIGHT_CSV])
+    state = FakeFlySto(logs, seed=1)
+    server, url = serve_in_background(state)
+    monkeypatch.setattr(flysto_download, "FLYSTO_URL", url)
+    with requests.Session() as session:
+        assert flysto_download.login(session, DEFAULT_EMAIL, DEFAULT_PASSWORD)
+        state.counters["requests"] = 0
+        yield state, logs[0], session
+    server.shutdown()
+
+
+def download(session, log, dest, compression="none"):
+    return flysto_download.download_file(session, log["id"], log["format"], log["file"],
+                                         str(dest), compression)
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip"])
+def test_cut_off_downloads_resume(flysto, tmp_path, compression):
+    state, log, session = flysto
+    state.truncate_rate = 0.5
+    dest = tmp_path / ("log.csv.gz" if compression == "gzip" else "log.csv")
+    assert download(session, log, dest, compression)
+    data = gzip.decompress(dest.read_bytes()) if compression == "gzip" else dest.read_bytes()
+    assert data == FLIGHT_CSV.read_bytes()
+    assert state.counters["truncated"] >= 1
+    # the completing request fetched only the part the cut-off ones were missing
+    assert state.counters["bytes"] < len(data)
+    assert not (tmp_path / (dest.name + ".part")).exists()
+
+
+def test_one_retry_budget_per_download(flysto, tmp_path):
+    state, log, session = flysto
+    state.fail_rate, state.truncate_rate = 0.5, 1.0  # every request fails one way or the other
+    assert not download(session, log, tmp_path / "log.csv")
+    assert state.counters["requests"] == flysto_download.MAX_ATTEMPTS
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,32 @@
+"""Tests for g1000_reader and the history run over unreadable logs."""
+
+import shutil
+
+import numpy as np
+
+from conftest import FLIGHT_CSV
+from g1000_reader import read_g1000_channels
+from voltage_history import collect_flights
+
+
+def test_empty_and_headerless_logs_have_no_rows(bad_logs):
+    for path in bad_logs:
+        t, data = read_g1000_channels(path, ("volt1", "rpm"))
+        assert len(t) == 0
+        assert set(data) == {"volt1", "rpm"}
+        assert all(len(v) == 0 for v in data.values())
+
+
+def test_real_log_parses():
+    t, data = read_g1000_channels(FLIGHT_CSV, ("volt1",))
+    assert len(t) > 1000
+    assert len(data["volt1"]) == len(t)
+    assert t.min() == 1770565807.0  # 2026-02-08 15:50:07 UTC
+    assert np.nanmax(data["volt1"]) > 27
+
+
+def test_history_skips_empty_and_headerless_logs(tmp_path, bad_logs):
+    good = tmp_path / FLIGHT_CSV.name
+    shutil.copy(FLIGHT_CSV, good)
+    flights = collect_flights({"N238PS": [good] + bad_logs})
+    assert len(flights["N238PS"]) == 1
@@ -0,0 +1,32 @@
+"""Tests for generate_report helpers."""
+
+import base64
+import io
+
+import numpy as np
+import pytest
+
+from generate_report import Base64Writer, minmax_indices
+
+
+@pytest.mark.parametrize("sizes", [[], [1], [2, 2, 2], [3, 3], [5, 1, 7, 0, 4], [1] * 11])
+def test_base64_writer_matches_b64encode(sizes):
+    data = bytes(range(256)) * 2
+    out = io.StringIO()
+    w = Base64Writer(out)
+    pos = 0
+    for n in sizes:
+        assert w.write(memoryview(data[pos:pos + n])) == n
+        assert len(w.pending) < 3
+        pos += n
+    w.close()
+    assert out.getvalue() == base64.b64encode(data[:pos]).decode("ascii")
+    assert not out.closed
+
+
+def test_minmax_indices_keeps_extremes_and_ignores_nan():
+    y = np.array([1.0, 5.0, np.nan, 2.0, -3.0, 4.0, 0.0, np.nan, 9.0, 1.0])
+    keep = minmax_indices(y, 2)
+    assert {0, 1, 4, 8, 9} <= set(keep.tolist())
+    assert not np.isnan(y[keep]).any()
+    assert (np.diff(keep) > 0).all()
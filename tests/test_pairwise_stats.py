@@ -0,0 +1,49 @@
+"""Tests for pairwise_stats against the scipy per-pair statistics."""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from pairwise_stats import all_pairs, pair_records, pairwise_stats
+
+
+def test_matches_scipy_for_every_pair():
+    rng = np.random.default_rng(0)
+    base = 28.0 + 0.3 * np.sin(np.linspace(0, 20, 500))
+    x = np.vstack([base + rng.normal(0, 0.05, 500),
+                   base - 0.4 + rng.normal(0, 0.08, 500),
+                   0.9 * base + 2.5 + rng.normal(0, 0.1, 500),
+                   # unrelated to the others, so its p-values are not all ~0
+                   28.0 + rng.normal(0, 0.3, 500)])
+    res = pairwise_stats(x, ["G1000", "VDL48", "ECU", "noise"])
+    records = pair_records(res)
+    assert [(r["a_label"], r["b_label"]) for r in records] == [
+        ("G1000", "VDL48"), ("G1000", "ECU"), ("G1000", "noise"),
+        ("VDL48", "ECU"), ("VDL48", "noise"), ("ECU", "noise")]
+    assert 0.01 < res["p_corr"][2] < 0.99 and 0.01 < res["p_paired"][2] < 0.99
+
+    for (a, b), r in zip(all_pairs(4), records):
+        d = x[a] - x[b]
+        pearson = stats.pearsonr(x[a], x[b])
+        paired = stats.ttest_rel(x[a], x[b])
+        fit = stats.linregress(x[b], x[a])
+        assert r["diff_mean"] == pytest.approx(np.mean(d))
+        assert r["diff_std"] == pytest.approx(np.std(d))
+        assert r["diff_median"] == pytest.approx(np.median(d))
+        assert (r["diff_p2_5"], r["diff_p97_5"]) == pytest.approx(tuple(np.percentile(d, [2.5, 97.5])))
+        assert (r["diff_min"], r["diff_max"]) == (d.min(), d.max())
+        assert r["pearson_r"] == pytest.approx(pearson[0])
+        assert r["p_corr"] == pytest.approx(pearson[1], rel=1e-6, abs=1e-300)
+        assert r["t_stat"] == pytest.approx(paired.statistic)
+        assert r["p_paired"] == pytest.approx(paired.pvalue, rel=1e-6, abs=1e-300)
+        assert (r["slope"], r["intercept"]) == pytest.approx((fit.slope, fit.intercept))
+        np.testing.assert_array_equal(r["diff"], d)
+
+
+def test_explicit_pairs_and_source_stats():
+    x = np.array([[1.0, 2.0, 4.0, 3.0], [1.5, 1.0, 3.0, 3.5]])
+    res = pairwise_stats(x, ["a", "b"], pairs=[1, 0])
+    assert res["a_label"].tolist() == ["b"] and res["b_label"].tolist() == ["a"]
+    np.testing.assert_allclose(res["diff"], [x[1] - x[0]])
+    np.testing.assert_allclose(res["source_mean"], x.mean(axis=1))
+    np.testing.assert_allclose(res["source_std"], x.std(axis=1))
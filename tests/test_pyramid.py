@@ -0,0 +1,27 @@
+"""Tests for pyramid.update_pyramid."""
+
+import gzip
+import shutil
+
+import pytest
+
+from conftest import FLIGHT_CSV
+from pyramid import load_index, load_level, update_pyramid
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_update_skips_unreadable_logs(tmp_path, bad_logs, workers):
+    shutil.copy(FLIGHT_CSV, tmp_path / FLIGHT_CSV.name)
+    truncated = tmp_path / "truncated.csv.gz"
+    data = gzip.compress(FLIGHT_CSV.read_bytes())
+    truncated.write_bytes(data[:len(data) // 2])
+
+    built, unchanged, removed, failures = update_pyramid(tmp_path, workers)
+    assert (built, unchanged, removed) == (1 + len(bad_logs), 0, 0)
+    assert len(failures) == 1 and failures[0].startswith("truncated.csv.gz: EOFError")
+    assert "truncated.csv" not in load_index(tmp_path)["flights"]
+    assert len(load_level(tmp_path, level="1min")["t"]) > 0
+
+    # the skipped log is retried next time; everything else is up to date
+    built, unchanged, _, failures = update_pyramid(tmp_path, workers)
+    assert (built, unchanged, len(failures)) == (0, 1 + len(bad_logs), 1)
@@ -0,0 +1,67 @@
+"""Tests for session_index.IntervalIndex."""
+
+import numpy as np
+import pytest
+
+from session_index import IntervalIndex
+
+
+def brute_force_join(index, other, min_overlap=0.0):
+    """overlap_join() by checking every pair."""
+    rows = []
+    for i in range(len(other)):
+        for j in range(len(index)):
+            overlap = min(index.end[j], other.end[i]) - max(index.start[j], other.start[i])
+            if overlap > min_overlap:
+                rows.append((i, j, overlap))
+    return rows
+
+
+def join_rows(index, other, min_overlap=0.0):
+    return [(int(i), int(j), float(o)) for i, j, o in zip(*index.overlap_join(other, min_overlap))]
+
+
+def test_touching_intervals_do_not_overlap():
+    sessions = IntervalIndex([0.0, 100.0], [100.0, 200.0], ["s0", "s1"])
+    flights = IntervalIndex([200.0, 50.0], [300.0, 100.0], ["after", "inside s0"])
+    # flights are sorted by start: "inside s0" (50-100) then "after" (200-300)
+    assert join_rows(sessions, flights) == [(0, 0, 50.0)]
+
+
+def test_min_overlap():
+    sessions = IntervalIndex([0.0, 90.0], [100.0, 400.0], ["short", "long"])
+    flights = IntervalIndex([40.0], [160.0], ["f"])
+    assert join_rows(sessions, flights) == [(0, 0, 60.0), (0, 1, 70.0)]
+    assert join_rows(sessions, flights, min_overlap=60.0) == [(0, 1, 70.0)]
+
+
+def test_flight_spanning_two_sessions():
+    sessions = IntervalIndex([1000.0, 0.0, 5000.0], [2000.0, 900.0, 6000.0], ["b", "a", "c"])
+    flights = IntervalIndex([500.0], [1500.0], ["f"])
+    i_flight, i_session, overlap = sessions.overlap_join(flights)
+    assert [sessions.items[i] for i in i_session] == ["a", "b"]
+    np.testing.assert_array_equal(i_flight, [0, 0])
+    np.testing.assert_array_equal(overlap, [400.0, 500.0])
+
+
+def test_empty_index():
+    full = IntervalIndex([0.0, 10.0], [20.0, 30.0], ["a", "b"])
+    empty = IntervalIndex([], [], [])
+    for index, other in ((empty, full), (full, empty), (empty, empty)):
+        i_other, i_self, overlap = index.overlap_join(other)
+        assert len(i_other) == len(i_self) == len(overlap) == 0
+    assert len(empty.query(0.0, 100.0)) == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_overlap_join_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    starts = rng.uniform(0, 10_000, 60)
+    index = IntervalIndex(starts, starts + rng.uniform(0, 900, 60), list(range(60)))
+    starts = rng.uniform(0, 10_000, 40)
+    other = IntervalIndex(starts, starts + rng.uniform(0, 3000, 40), list(range(40)))
+    for min_overlap in (0.0, 120.0):
+        assert join_rows(index, other, min_overlap) == brute_force_join(index, other, min_overlap)
+        for i in range(len(other)):
+            expected = [j for k, j, _ in brute_force_join(index, other, min_overlap) if k == i]
+            assert index.query(other.start[i], other.end[i], min_overlap).tolist() == expected
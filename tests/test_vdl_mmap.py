@@ -0,0 +1,30 @@
+"""Tests for vdl_mmap and the report's use of it."""
+
+import numpy as np
+import pytest
+
+from conftest import DATA_DIR
+from generate_report import segment_vdl
+from vdl_mmap import load_vdl_mapped, segment_stats, segment_voltage
+
+VDL_CSV = DATA_DIR / "LOG_VD.CSV"
+
+
+def test_load_vdl_mapped_has_no_time_array():
+    sample_s, volts = load_vdl_mapped(VDL_CSV)
+    assert sample_s == 2.0
+    assert isinstance(volts, np.memmap) and volts.dtype == np.float32
+    assert segment_vdl(volts) == ((0, 1651), (1651, 4192), (4192, 6422))
+
+
+def test_segment_voltage_without_two_flights():
+    with pytest.raises(RuntimeError, match="Could not segment"):
+        segment_voltage(np.full(500, 28.0, dtype=np.float32))
+
+
+def test_malformed_rows_keep_their_sample_slot(malformed_vdl):
+    sample_s, volts = load_vdl_mapped(malformed_vdl)
+    assert sample_s == 2.0
+    np.testing.assert_allclose(volts, [28.1, 28.2, np.nan, 28.4, np.nan, 28.6], rtol=1e-6)
+    stats = segment_stats(volts, 0, len(volts))
+    assert stats["n"] == 4 and abs(stats["mean"] - 28.325) < 1e-5
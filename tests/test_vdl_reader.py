@@ -0,0 +1,29 @@
+"""Tests for vdl_reader."""
+
+import numpy as np
+
+from vdl_reader import logger_stamps, read_vdl
+
+
+def test_malformed_rows_keep_their_sample_slot(malformed_vdl):
+    rec = read_vdl(malformed_vdl)
+    np.testing.assert_array_equal(rec.elapsed, [0, 2, 4, 6, 8, 10])
+    np.testing.assert_array_equal(rec.voltage, [28.1, 28.2, np.nan, 28.4, np.nan, 28.6])
+    assert np.isnat(rec.stamps[4]) and rec.stamps[5] == np.datetime64("2019-03-01T01:29:09")
+
+
+def test_logger_stamps_roll_over_midnight_and_new_year():
+    mmdd = np.array(["1231", "1231", "0101", "0101", "0102"])
+    hhmmss = np.array(["23:59:58", "23:59:59", "00:00:00", "00:00:01", "00:00:00"])
+    stamps = logger_stamps(mmdd, hhmmss, 2018)
+    expected = np.array(["2018-12-31T23:59:58", "2018-12-31T23:59:59", "2019-01-01T00:00:00",
+                         "2019-01-01T00:00:01", "2019-01-02T00:00:00"], dtype="datetime64[s]")
+    np.testing.assert_array_equal(stamps, expected)
+
+
+def test_logger_stamps_unparseable_are_nat():
+    stamps = logger_stamps(np.array(["1231", "13xx", "0101", ""]),
+                           np.array(["23:59:59", "00:00:00", "bad", "00:00:00"]), 2018)
+    assert stamps[0] == np.datetime64("2018-12-31T23:59:59")
+    assert np.isnat(stamps[1:]).all()
+    assert len(logger_stamps(np.array([], dtype=str), np.array([], dtype=str), 2018)) == 0
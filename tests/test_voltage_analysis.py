@@ -0,0 +1,23 @@
+"""Tests for voltage_analysis and correlate_ecu's G1000 parsing."""
+
+import gzip
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import correlate_ecu
+import voltage_analysis
+from conftest import FLIGHT_CSV
+
+
+@pytest.mark.parametrize("module", [voltage_analysis, correlate_ecu])
+def test_parse_g1000_streams_plain_and_compressed_logs(tmp_path, module):
+    compressed = tmp_path / (FLIGHT_CSV.name + ".gz")
+    compressed.write_bytes(gzip.compress(FLIGHT_CSV.read_bytes()))
+    times, volt1 = module.parse_g1000(FLIGHT_CSV)
+    assert len(times) == len(volt1) == 3454
+    assert times[0] == datetime(2026, 2, 8, 15, 50, 53)
+    gz_times, gz_volt1 = module.parse_g1000(compressed)
+    np.testing.assert_array_equal(gz_times, times)
+    np.testing.assert_array_equal(gz_volt1, volt1)
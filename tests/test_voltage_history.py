@@ -0,0 +1,33 @@
+"""Tests for voltage_history."""
+
+import numpy as np
+import pytest
+
+from voltage_history import pettitt_test
+
+
+def pettitt_reference(x):
+    """The original triple-loop Pettitt statistic."""
+    n = len(x)
+    U = np.zeros(n, dtype=float)
+    for t in range(n):
+        for i in range(t + 1):
+            for j in range(t + 1, n):
+                U[t] += np.sign(x[i] - x[j])
+    cp = np.argmax(np.abs(U))
+    K = np.abs(U[cp])
+    p = 2.0 * np.exp(-6.0 * K**2 / (n**3 + n**2))
+    return cp, K, p, U
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 40, 101])
+@pytest.mark.parametrize("seed", range(3))
+def test_pettitt_matches_triple_loop(n, seed):
+    rng = np.random.default_rng(seed)
+    # 0.1 V rounding gives plenty of ties, and a shift halfway gives a change point
+    x = np.round(rng.normal(28.0, 0.3, n) - 0.4 * (np.arange(n) >= n // 2), 1)
+    cp, K, p, U = pettitt_test(x)
+    ref_cp, ref_K, ref_p, ref_U = pettitt_reference(x)
+    np.testing.assert_array_equal(U, ref_U)
+    assert (cp, K) == (ref_cp, ref_K)
+    assert p == pytest.approx(ref_p)
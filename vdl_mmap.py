@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Out-of-Core VDL48 Processing
+============================
+A Triplett VDL48 left running for weeks at 2 s sampling produces LOG_VD.CSV
+files with millions of rows. This module never holds the whole recording
+in memory:
+
+  1. The CSV is parsed in fixed-size chunks (np.loadtxt per chunk) and
+     appended to a flat float32 file next to the parse cache
+     (data/cache/vdl_mmap/), keyed like every other cached parse. With the
+     cache disabled it goes to a scratch temp file that is deleted as soon
+     as it is mapped (at exit on Windows, which cannot delete mapped files).
+  2. The file is opened as a read-only np.memmap; elapsed time is implicit
+     (sample index x the header's sampling period), so no time array
+     exists at all -- callers compute times only for the slice they use.
+  3. Segmentation (flight / engine-off idle / flight / disconnected) and
+     per-segment statistics walk the mapped array chunk by chunk. Medians
+     and percentiles come from a 0.01 V histogram, which is exact at the
+     logger's 0.01 V resolution.
+
+Working memory is bounded by --memory-mb regardless of recording length;
+the OS pages the mapped file in and out as needed.
+
+The segment_vdl() of voltage_analysis, generate_report and correlate_ecu
+use the same chunked window search, so the in-memory path no longer scans
+windows in a Python loop either. Their parse_vdl() reads through
+load_vdl_mapped(), so they never hold the CSV text in memory.
+
+Usage:
+    python vdl_mmap.py data/LOG_VD.CSV
+    python vdl_mmap.py /path/to/LOG_VD_3weeks.CSV --memory-mb 32
+    python vdl_mmap.py data/LOG_VD.CSV --rebuild
+"""
+
+import argparse
+import atexit
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from instrument import max_rss_mb
+from logio import open_log
+from parse_cache import cache_enabled, cache_path
+from vdl_reader import read_vdl_header, vdl_header
+
+if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+VDL_MMAP_VERSION = 2
+
+FLIGHT_THRESHOLD = 27.0      # volts - below this is not alternator-charging
+ZERO_THRESHOLD = 1.0         # volts - below this means disconnected
+WINDOW = 30                  # samples (~60 sec) for sustained detection
+
+DEFAULT_MEMORY_MB = 64
+ROW_BYTES = 160              # parse-time cost per buffered row (line string + list slot + float)
+
+HIST_MAX_V = 40.0
+HIST_STEP_V = 0.01
+
+
+def chunk_rows(memory_mb=DEFAULT_MEMORY_MB):
+    """Rows per chunk that keep parse/scan working memory within memory_mb."""
+    return max(int(memory_mb * 2**20) // ROW_BYTES, 10_000)
+
+
+# =============================================================================
+# Chunked parse into a memory-mapped float32 file
+# =============================================================================
+
+def _parse_chunk(lines):
+    """Voltage column of a block of data lines, NaN for malformed lines.
+
+    Malformed lines keep their slot so later samples keep their elapsed time.
+    """
+    try:
+        return np.loadtxt(lines, delimiter=",", usecols=2, dtype=np.float32, ndmin=1)
+    except ValueError:
+        values = np.full(len(lines), np.nan, dtype=np.float32)
+        for i, line in enumerate(lines):
+            parts = line.split(",")
+            if len(parts) < 3:
+                continue
+            try:
+                values[i] = float(parts[2])
+            except ValueError:
+                continue
+        return values
+
+
+def convert_vdl(filepath, out_path, rows_per_chunk):
+    """Stream LOG_VD.CSV into a raw float32 file at out_path. Returns the sample count."""
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(f"{out_path.stem}.{os.getpid()}.tmp")
+    n = 0
+    with open_log(filepath) as f, open(tmp, "wb") as out:
+        read_vdl_header(f)
+        lines = []
+        for line in f:
+            if line.strip():
+                lines.append(line)
+            if len(lines) >= rows_per_chunk:
+                block = _parse_chunk(lines)
+                out.write(block.tobytes())
+                n += len(block)
+                lines = []
+        if lines:
+            block = _parse_chunk(lines)
+            out.write(block.tobytes())
+            n += len(block)
+    os.replace(tmp, out_path)
+    return n
+
+
+def mmap_path(filepath):
+    return cache_path("vdl_mmap", filepath, VDL_MMAP_VERSION).with_suffix(".f32")
+
+
+def _map(path):
+    if path.stat().st_size == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(path, dtype=np.float32, mode="r")
+
+
+def _scratch_vdl(filepath, memory_mb):
+    """Convert into a temp file that is removed once mapped (cache disabled)."""
+    fd, name = tempfile.mkstemp(prefix="volts_vdl_", suffix=".f32")
+    os.close(fd)
+    path = Path(name)
+    try:
+        convert_vdl(filepath, path, chunk_rows(memory_mb))
+        volts = _map(path)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    try:
+        path.unlink()  # POSIX keeps the mapping alive after unlink
+    except OSError:
+        atexit.register(lambda: path.unlink(missing_ok=True))
+    return volts
+
+
+def open_vdl(filepath, memory_mb=DEFAULT_MEMORY_MB, rebuild=False):
+    """Read-only float32 memmap of a VDL recording's voltages, converting on first use."""
+    if not cache_enabled():
+        return _scratch_vdl(filepath, memory_mb)
+    mpath = mmap_path(filepath)
+    if rebuild or not mpath.exists():
+        convert_vdl(filepath, mpath, chunk_rows(memory_mb))
+    return _map(mpath)
+
+
+def load_vdl_mapped(filepath, memory_mb=DEFAULT_MEMORY_MB):
+    """(sampling period in seconds, voltage), with voltage the open_vdl() memmap.
+
+    Sample i was taken i x sample_s after the start of the recording. No
+    elapsed-time array is built: a float64 one would be twice the size of
+    the mapped float32 voltages, so callers compute times for the slice
+    they need, e.g. np.arange(lo, hi) * sample_s.
+    """
+    return vdl_header(filepath).sample_s, open_vdl(filepath, memory_mb)
+
+
+# =============================================================================
+# Chunked segmentation and statistics
+# =============================================================================
+
+def first_window(volts, predicate, start, stop, window=WINDOW, rows=None):
+    """First i in [start, stop) where predicate holds for all of volts[i:i + window].
+
+    Windows running past the end of the array are truncated, as with a
+    slice. volts may be an ndarray or a memmap; it is read one chunk (plus
+    window - 1 samples of overlap) at a time. Returns None if no such i.
+    """
+    rows = rows or chunk_rows()
+    n = len(volts)
+    for lo in range(max(start, 0), stop, rows):
+        hi = min(lo + rows, stop)
+        seg = np.asarray(volts[lo:hi + window - 1])
+        ok = predicate(seg)
+        short = (hi + window - 1) - (lo + len(seg))
+        if short > 0:
+            ok = np.concatenate([ok, np.ones(short, dtype=bool)])
+        c = np.concatenate(([0], np.cumsum(ok, dtype=np.int64)))
+        full = np.flatnonzero(c[window:window + hi - lo] - c[:hi - lo] == window)
+        if len(full):
+            return lo + int(full[0])
+        if hi >= n:
+            break
+    return None
+
+
+def last_connected(volts, rows=None):
+    """Index of the last sample at or above ZERO_THRESHOLD (0 if none)."""
+    rows = rows or chunk_rows()
+    for hi in range(len(volts), 0, -rows):
+        lo = max(hi - rows, 0)
+        idx = np.flatnonzero(np.asarray(volts[lo:hi]) >= ZERO_THRESHOLD)
+        if len(idx):
+            return lo + int(idx[-1])
+    return 0
+
+
+def segment_voltage(volts, rows=None):
+    """(flight 1, idle, flight 2) sample ranges; see voltage_analysis.segment_vdl."""
+    last = last_connected(volts, rows)
+    end_f1 = first_window(volts, lambda v: v < FLIGHT_THRESHOLD, WINDOW, last, rows=rows)
+    start_f2 = None
+    if end_f1 is not None:
+        start_f2 = first_window(volts, lambda v: v > FLIGHT_THRESHOLD, end_f1 + WINDOW, last, rows=rows)
+    if end_f1 is None or start_f2 is None:
+        raise RuntimeError("Could not segment VDL data into flight phases.")
+    return (0, end_f1), (end_f1, start_f2), (start_f2, last + 1)
+
+
+def segment_stats(volts, start, stop, rows=None):
+    """Count, mean, std, min, max, median and 2.5/97.5 percentiles of volts[start:stop].
+
+    NaN samples (malformed rows) are left out.
+    """
+    rows = rows or chunk_rows()
+    edges = np.arange(0.0, HIST_MAX_V + HIST_STEP_V, HIST_STEP_V)
+    hist = np.zeros(len(edges), dtype=np.int64)
+    n, s, q = 0, 0.0, 0.0
+    vmin, vmax = np.inf, -np.inf
+    for lo in range(start, stop, rows):
+        v = np.asarray(volts[lo:min(lo + rows, stop)], dtype=np.float64)
+        v = v[~np.isnan(v)]
+        if not len(v):
+            continue
+        n += len(v)
+        s += v.sum()
+        q += np.dot(v, v)
+        vmin, vmax = min(vmin, v.min()), max(vmax, v.max())
+        bins = np.clip(np.rint(v / HIST_STEP_V).astype(np.int64), 0, len(edges) - 1)
+        hist += np.bincount(bins, minlength=len(edges))
+    if n == 0:
+        return None
+    mean = s / n
+    cum = np.cumsum(hist)
+
+    def value_at(rank):
+        return edges[np.searchsorted(cum, rank + 1)]
+
+    def quantile(p):
+        # Linear interpolation between order statistics, as np.percentile
+        pos = p * (n - 1)
+        lo = int(np.floor(pos))
+        return float(value_at(lo) + (pos - lo) * (value_at(min(lo + 1, n - 1)) - value_at(lo)))
+
+    return {
+        "n": n, "mean": float(mean), "std": float(np.sqrt(max(q / n - mean * mean, 0.0))),
+        "min": float(vmin), "max": float(vmax), "median": quantile(0.5),
+        "p2_5": quantile(0.025), "p97_5": quantile(0.975),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Out-of-core VDL48 segmentation and statistics")
+    parser.add_argument("vdl", help="LOG_VD.CSV (optionally .gz / .zst)")
+    parser.add_argument("--memory-mb", type=float, default=DEFAULT_MEMORY_MB,
+                        help=f"Working-memory budget for parsing and scanning (default: {DEFAULT_MEMORY_MB})")
+    parser.add_argument("--rebuild", action="store_true", help="Re-parse even if a mapped file exists")
+    args = parser.parse_args()
+
+    rows = chunk_rows(args.memory_mb)
+    t0 = time.perf_counter()
+    volts = open_vdl(args.vdl, args.memory_mb, args.rebuild)
+    t_open = time.perf_counter() - t0
+    sample_s = vdl_header(args.vdl).sample_s
+    hours = len(volts) * sample_s / 3600
+    print(f"{args.vdl}: {len(volts):,} samples ({hours:.1f} h at {sample_s:g} s), "
+          f"mapped in {t_open:.2f} s, {rows:,} rows per chunk")
+
+    t0 = time.perf_counter()
+    segments = segment_voltage(volts, rows)
+    print(f"Segmented in {time.perf_counter() - t0:.2f} s\n")
+    print(f"{'Segment':<20} {'Start':>9} {'End':>9} {'Samples':>10} {'Mean':>7} {'Std':>6} "
+          f"{'Min':>6} {'Median':>7} {'Max':>6}")
+    for name, (lo, hi) in zip(("Flight 1", "Idle (engine off)", "Flight 2"), segments):
+        st = segment_stats(volts, lo, hi, rows)
+        if st is None:
+            continue
+        print(f"{name:<20} {lo * sample_s / 3600:>7.2f} h {hi * sample_s / 3600:>7.2f} h {st['n']:>10,} "
+              f"{st['mean']:>7.2f} {st['std']:>6.3f} {st['min']:>6.2f} {st['median']:>7.2f} {st['max']:>6.2f}")
+
+    rss = max_rss_mb()
+    if rss is not None:
+        print(f"\nPeak RSS: {rss:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Triplett VDL48 CSV Reader
+=========================
+Header-driven reader for LOG_VD.CSV recordings. The file starts with a
+"Key:Value" header block:
+
+    Model:LOG_VD
+    Serial ID:171VD_2506100052
+    Sampling Rate:2Sec
+    Data Count:9263
+    Start Time:03-01-2019 01:28:59
+    Stop Time:03-01-2019 06:37:43
+
+followed by a blank line, the column header "Date(MMDD),Time,Voltage(V)"
+and one row per sample. The data start is found from the column header
+rather than a fixed line number, so firmware that adds or drops header
+fields still parses.
+
+Elapsed time is built arithmetically (sample index x sampling period from
+the header): the logger samples on a fixed period, and the stamped clock is
+often wrong (never set, or set to the wrong zone). A malformed data row
+therefore still occupies its sample slot, as a NaN voltage (and NaT stamp),
+so the samples after it keep their times. The stamps are still
+decoded, with the year taken from Start Time and day rollover taken from the
+Date(MMDD) column, so a recording that crosses midnight (or New Year) gets
+monotonic logger timestamps as well.
+
+load_vdl() returns just (elapsed, voltage) through the parse cache, for
+callers that read the same recording repeatedly (e.g. batch reports).
+"""
+
+import re
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from logio import open_log
+from parse_cache import cached_arrays
+
+VDL_COLUMNS_PREFIX = "Date("
+VDL_TIME_FORMAT = "%m-%d-%Y %H:%M:%S"
+VDL_DEFAULT_SAMPLE_S = 2.0
+MAX_HEADER_LINES = 64
+VDL_CACHE_VERSION = 2
+
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "sec": 1.0, "second": 1.0, "m": 60.0, "min": 60.0,
+                 "minute": 60.0, "h": 3600.0, "hr": 3600.0, "hour": 3600.0}
+
+VdlHeader = namedtuple("VdlHeader", "fields sample_s data_count start_time stop_time columns header_lines")
+VdlRecording = namedtuple("VdlRecording", "header elapsed voltage stamps")
+
+
+def parse_sampling_rate(text):
+    """'2Sec' / '1 Min' / '500ms' -> seconds per sample (None if unrecognized)."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", text)
+    if not m:
+        return None
+    unit = m.group(2).lower() or "s"
+    if unit not in _UNIT_SECONDS and unit.endswith("s"):
+        unit = unit[:-1]  # plurals: "Mins", "Hours"
+    if unit not in _UNIT_SECONDS:
+        return None
+    return float(m.group(1)) * _UNIT_SECONDS[unit]
+
+
+def _parse_time(text):
+    try:
+        return datetime.strptime(text.strip(), VDL_TIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def _parse_int(text):
+    try:
+        return int(text.strip())
+    except ValueError:
+        return None
+
+
+# =============================================================================
+# Header
+# =============================================================================
+
+def read_vdl_header(f):
+    """Consume the header block from an open text file, up to and including
+    the column header line, and return a VdlHeader.
+
+    fields holds every "Key:Value" line verbatim (NUL padding stripped);
+    sample_s falls back to the VDL48's 2 s default if Sampling Rate is
+    missing or unreadable. Raises ValueError if no column header is found.
+    """
+    fields = {}
+    for n, raw in enumerate(f, start=1):
+        line = raw.replace("\0", "").strip()
+        if line.startswith(VDL_COLUMNS_PREFIX):
+            sample_s = parse_sampling_rate(fields.get("Sampling Rate", "")) or VDL_DEFAULT_SAMPLE_S
+            return VdlHeader(
+                fields=fields,
+                sample_s=sample_s,
+                data_count=_parse_int(fields.get("Data Count", "")),
+                start_time=_parse_time(fields.get("Start Time", "")),
+                stop_time=_parse_time(fields.get("Stop Time", "")),
+                columns=[c.strip() for c in line.split(",")],
+                header_lines=n,
+            )
+        if ":" in line:
+            key, value = line.split(":", 1)
+            fields[key.strip()] = value.strip()
+        if n >= MAX_HEADER_LINES:
+            break
+    raise ValueError(f"No '{VDL_COLUMNS_PREFIX}MMDD),Time,...' column header in the VDL48 header block")
+
+
+def vdl_header(filepath):
+    """Header of a VDL48 recording without reading its data."""
+    with open_log(filepath) as f:
+        return read_vdl_header(f)
+
+
+# =============================================================================
+# Data rows
+# =============================================================================
+
+def _split_rows(lines):
+    """(MMDD, HH:MM:SS, voltage) columns of data lines.
+
+    Every line yields a row: a malformed one gets NaN voltage (and empty
+    date/time if those columns are missing too).
+    """
+    try:
+        cols = np.loadtxt(lines, delimiter=",", dtype=str, ndmin=2)
+        if cols.shape[1] >= 3:
+            return cols[:, 0], cols[:, 1], cols[:, 2].astype(np.float64)
+    except ValueError:
+        pass
+    dates, times, volts = [], [], []
+    for line in lines:
+        parts = line.split(",")
+        if len(parts) < 3:
+            dates.append("")
+            times.append("")
+            volts.append(np.nan)
+            continue
+        try:
+            v = float(parts[2])
+        except ValueError:
+            v = np.nan
+        dates.append(parts[0].strip())
+        times.append(parts[1].strip())
+        volts.append(v)
+    return np.array(dates, dtype=str), np.array(times, dtype=str), np.array(volts, dtype=np.float64)
+
+
+def logger_stamps(mmdd, hhmmss, year):
+    """Vectorized Date(MMDD) + Time columns -> datetime64[s] logger stamps.
+
+    The year starts at `year` and advances whenever the month goes backwards
+    (December -> January); days advance with the Date column itself, so
+    midnight rollover needs no special casing. Unparseable stamps are NaT.
+    """
+    if len(mmdd) == 0:
+        return np.array([], dtype="datetime64[s]")
+    digits = np.char.isdigit(mmdd) & (np.char.str_len(mmdd) == 4)
+    code = np.where(digits, mmdd, "0").astype(np.int64)
+    month, day = code // 100, code % 100
+    valid = (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+    wraps = np.zeros(len(code), dtype=np.int64)
+    wraps[valid] = np.concatenate(([0], np.cumsum(np.diff(month[valid]) < 0)))
+    months = np.datetime64(f"{year:04d}-01", "M") + (np.where(valid, month, 1) - 1 + 12 * wraps)
+    days = months.astype("datetime64[D]") + (np.where(valid, day, 1) - 1)
+    try:
+        tod = (np.char.add("1970-01-01T", hhmmss).astype("datetime64[s]")
+               - np.datetime64(0, "s"))
+    except ValueError:
+        good = np.array([re.fullmatch(r"\d\d:\d\d:\d\d", t) is not None for t in hhmmss], dtype=bool)
+        valid &= good
+        tod = (np.char.add("1970-01-01T", np.where(good, hhmmss, "00:00:00")).astype("datetime64[s]")
+               - np.datetime64(0, "s"))
+    stamps = days.astype("datetime64[s]") + tod
+    stamps[~valid] = np.datetime64("NaT")
+    return stamps
+
+
+def read_vdl(filepath):
+    """Read a VDL48 recording (optionally .gz / .zst) into a VdlRecording.
+
+    elapsed is sample index x header sampling period (seconds from the
+    first sample); voltage is in volts, NaN for malformed rows; stamps are
+    the logger's own
+    datetime64[s] timestamps, rollover-corrected but otherwise as recorded.
+    """
+    with open_log(filepath) as f:
+        header = read_vdl_header(f)
+        lines = [line for line in f if line.strip()]
+    mmdd, hhmmss, voltage = _split_rows(lines)
+    year = header.start_time.year if header.start_time else 1970
+    stamps = logger_stamps(mmdd, hhmmss, year)
+    elapsed = np.arange(len(voltage), dtype=np.float64) * header.sample_s
+    return VdlRecording(header, elapsed, voltage, stamps)
+
+
+def load_vdl(filepath):
+    """(elapsed, voltage) of read_vdl() through the parse cache."""
+    def compute(path):
+        rec = read_vdl(path)
+        return {"elapsed": rec.elapsed, "voltage": rec.voltage}
+
+    arrays = cached_arrays("vdl_voltage", filepath, compute, version=VDL_CACHE_VERSION)
+    return arrays["elapsed"], arrays["voltage"]
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Real-Time LOW VOLTS Monitor
+===========================
+Streams volt1 samples from a G1000 NXi data log as they are written (or
+from a recorded log replayed at accelerated speed) and raises alerts on the
+sample where a condition is met:
+
+  - volt1 below 24.0 V (LOW VOLTS annunciation) for a sustained period
+  - volt1 below 25.5 V (LOW VOLTS region) for a sustained period
+  - rolling G1000 - reference offset beyond the 0.3 V pass criterion, when
+    a reference logger stream (VDL48) is available
+
+All per-sample work is O(1) (amortized): rolling mean/std come from running
+sums over a time window, rolling min/max from monotonic deques, and the
+excursion trackers are small state machines. Per-sample processing latency
+is measured and reported so it can be checked to stay flat over a 5-hour
+flight.
+
+Usage:
+    python volt_monitor.py follow path/to/live_log.csv           # tail a growing log
+    python volt_monitor.py replay                                # all data/*.csv, as fast as possible
+    python volt_monitor.py replay data/N238PS_KBOW-KSPG_20260208-1551UTC.csv --speed 60
+    python volt_monitor.py replay --reference vdl                # + G1000 vs VDL48 offset
+    python volt_monitor.py replay --repeat 5                     # ~5 h of samples, latency check
+"""
+
+import argparse
+import io
+import sys
+import time
+from collections import deque, namedtuple
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from logio import open_log, strip_compression_suffix
+
+# Fix Windows console encoding for Unicode characters
+if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+DATA_DIR = Path(__file__).parent / "data"
+
+LOW_VOLTS = 24.0        # G1000 LOW VOLTS annunciation threshold
+LOW_VOLTS_REGION = 25.5  # caution region used throughout the analysis
+SUSTAIN_SECONDS = 3.0    # excursion must persist this long to alert
+WINDOW_SECONDS = 60.0    # rolling statistics window
+OFFSET_LIMIT = 0.3       # |mean G1000 - reference| pass criterion (V)
+OFFSET_CLEAR = 0.8       # offset alert clears below this fraction of the limit
+REF_MAX_AGE = 5.0        # reference sample older than this is stale (s)
+
+EPOCH = datetime(1970, 1, 1)
+
+Alert = namedtuple("Alert", "t kind message")
+
+
+# =============================================================================
+# O(1) streaming building blocks
+# =============================================================================
+
+class RollingWindow:
+    """Mean, std, min and max over the last `seconds` of a stream.
+
+    Each push is amortized O(1): running sums (shifted by the first value to
+    avoid cancellation) give mean/std, monotonic deques give min/max.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.samples = deque()
+        self.mins = deque()
+        self.maxs = deque()
+        self.shift = None
+        self.sum = 0.0
+        self.sumsq = 0.0
+
+    def push(self, t, v):
+        if self.shift is None:
+            self.shift = v
+        d = v - self.shift
+        self.samples.append((t, d))
+        self.sum += d
+        self.sumsq += d * d
+        while self.mins and self.mins[-1][1] >= v:
+            self.mins.pop()
+        self.mins.append((t, v))
+        while self.maxs and self.maxs[-1][1] <= v:
+            self.maxs.pop()
+        self.maxs.append((t, v))
+
+        cutoff = t - self.seconds
+        while self.samples[0][0] <= cutoff:
+            _, old = self.samples.popleft()
+            self.sum -= old
+            self.sumsq -= old * old
+        while self.mins[0][0] <= cutoff:
+            self.mins.popleft()
+        while self.maxs[0][0] <= cutoff:
+            self.maxs.popleft()
+
+    def __len__(self):
+        return len(self.samples)
+
+    @property
+    def mean(self):
+        return self.shift + self.sum / len(self.samples) if self.samples else float("nan")
+
+    @property
+    def std(self):
+        n = len(self.samples)
+        if n < 2:
+            return 0.0
+        m = self.sum / n
+        return max(self.sumsq / n - m * m, 0.0) ** 0.5
+
+    @property
+    def min(self):
+        return self.mins[0][1] if self.mins else float("nan")
+
+    @property
+    def max(self):
+        return self.maxs[0][1] if self.maxs else float("nan")
+
+
+class ExcursionTracker:
+    """State machine for 'value below threshold for at least min_seconds'.
+
+    update() returns an Alert on the sample where the excursion becomes
+    sustained and again on the sample where it ends, otherwise None.
+    """
+
+    def __init__(self, threshold, min_seconds, label):
+        self.threshold = threshold
+        self.min_seconds = min_seconds
+        self.label = label
+        self.start = None
+        self.low = None
+        self.active = False
+        self.count = 0
+
+    def update(self, t, v):
+        if v < self.threshold:
+            if self.start is None:
+                self.start, self.low = t, v
+            else:
+                self.low = min(self.low, v)
+            if not self.active and t - self.start >= self.min_seconds:
+                self.active = True
+                self.count += 1
+                return Alert(t, "start", f"{self.label}: volt1 < {self.threshold:.1f} V for "
+                                         f"{t - self.start:.0f} s (min {self.low:.2f} V)")
+            return None
+        if self.start is None:
+            return None
+        alert = None
+        if self.active:
+            alert = Alert(t, "end", f"{self.label} cleared after {t - self.start:.0f} s "
+                                    f"(min {self.low:.2f} V)")
+        self.start, self.low, self.active = None, None, False
+        return alert
+
+
+class VoltsMonitor:
+    """Rolling volt1 statistics, excursion alerts and reference offset tracking."""
+
+    def __init__(self, window=WINDOW_SECONDS, sustain=SUSTAIN_SECONDS,
+                 offset_limit=OFFSET_LIMIT, on_alert=None):
+        self.stats = RollingWindow(window)
+        self.offset = RollingWindow(window)
+        self.trackers = [ExcursionTracker(LOW_VOLTS, sustain, "LOW VOLTS"),
+                         ExcursionTracker(LOW_VOLTS_REGION, sustain, "LOW VOLTS region")]
+        self.offset_limit = offset_limit
+        self.offset_flagged = False
+        self.ref_t = None
+        self.ref_v = None
+        self.n = 0
+        self.alerts = []
+        self.on_alert = on_alert
+
+    def push_reference(self, t, v):
+        """Latest reference logger sample (sample-and-hold until the next one)."""
+        self.ref_t, self.ref_v = t, v
+
+    def update(self, t, v):
+        """Process one volt1 sample; returns the alerts it raised."""
+        self.n += 1
+        self.stats.push(t, v)
+        raised = [a for a in (tr.update(t, v) for tr in self.trackers) if a is not None]
+
+        if self.ref_t is not None and t - self.ref_t <= REF_MAX_AGE:
+            self.offset.push(t, v - self.ref_v)
+            if len(self.offset) >= 10:
+                off = self.offset.mean
+                if not self.offset_flagged and abs(off) > self.offset_limit:
+                    self.offset_flagged = True
+                    raised.append(Alert(t, "offset", f"G1000 - reference offset {off:+.2f} V over last "
+                                                     f"{self.offset.seconds:.0f} s (limit "
+                                                     f"{self.offset_limit:.1f} V)"))
+                elif self.offset_flagged and abs(off) <= self.offset_limit * OFFSET_CLEAR:
+                    self.offset_flagged = False
+                    raised.append(Alert(t, "offset", f"G1000 - reference offset back within limit "
+                                                     f"({off:+.2f} V)"))
+
+        if raised:
+            self.alerts.extend(raised)
+            if self.on_alert is not None:
+                for a in raised:
+                    self.on_alert(a, self)
+        return raised
+
+    def status(self):
+        s = self.stats
+        line = (f"volt1 {s.mean:5.2f} V  std {s.std:4.2f}  min {s.min:5.2f}  max {s.max:5.2f}"
+                f"  ({len(s)} samples / {s.seconds:.0f} s)")
+        if len(self.offset):
+            line += f"  offset {self.offset.mean:+.2f} V"
+        return line
+
+
+# =============================================================================
+# Sample sources
+# =============================================================================
+
+def _header_indices(header_line):
+    headers = [h.strip() for h in header_line.split(",")]
+    return headers.index("Lcl Date"), headers.index("Lcl Time"), headers.index("volt1")
+
+
+def _parse_row(line, idx):
+    """One G1000 CSV data line -> (seconds, volt1) or None for init/blank rows."""
+    date_idx, time_idx, volt1_idx = idx
+    parts = line.split(",")
+    if len(parts) <= volt1_idx:
+        return None
+    d, tm, v = parts[date_idx].strip(), parts[time_idx].strip(), parts[volt1_idx].strip()
+    if not d or not tm or not v:
+        return None
+    try:
+        dt = datetime.strptime(f"{d} {tm}", "%Y-%m-%d %H:%M:%S")
+        return (dt - EPOCH).total_seconds(), float(v)
+    except ValueError:
+        return None
+
+
+def follow_g1000(path, poll=0.5, idle_timeout=60.0):
+    """Yield (t, volt1) from a G1000 CSV that is still being written.
+
+    Partial lines are held until their newline arrives. Stops once the file
+    has not grown for idle_timeout seconds.
+    """
+    with open(path, "r", errors="replace") as f:
+        head, pending, idle = [], "", 0.0
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                if idle >= idle_timeout:
+                    return
+                time.sleep(poll)
+                idle += poll
+                continue
+            idle = 0.0
+            pending += chunk
+            if not pending.endswith("\n"):
+                continue
+            line, pending = pending, ""
+            if len(head) < 3:
+                head.append(line)
+                if len(head) == 3:
+                    idx = _header_indices(head[2])
+                continue
+            row = _parse_row(line, idx)
+            if row is not None:
+                yield row
+
+
+def read_g1000_rows(path):
+    """All (t, volt1) rows of a recorded log, streamed through open_log."""
+    with open_log(path, errors="replace") as f:
+        head = [f.readline() for _ in range(3)]
+        idx = _header_indices(head[2])
+        rows = [_parse_row(line, idx) for line in f]
+    return [r for r in rows if r is not None]
+
+
+def vdl_reference(flight_csv):
+    """VDL48 samples aligned to one of the 2026-02-08 flights, as (t, volts) rows.
+
+    Uses the segmentation and alignment from voltage_analysis.py; returns []
+    for logs without a VDL48 recording.
+    """
+    from voltage_analysis import (FLIGHT1_CSV, FLIGHT2_CSV, VDL_CSV, align_vdl_to_g1000,
+                                  parse_g1000, parse_vdl, segment_vdl)
+
+    name = strip_compression_suffix(Path(flight_csv).name)
+    flights = {FLIGHT1_CSV.name: 0, FLIGHT2_CSV.name: 2}
+    if name not in flights or not VDL_CSV.exists():
+        return []
+    g_times, _ = parse_g1000(flight_csv)
+    vdl_sample_s, vdl_voltage = parse_vdl(VDL_CSV)
+    seg = segment_vdl(vdl_voltage)[flights[name]]
+    times = align_vdl_to_g1000(g_times, vdl_sample_s, seg)
+    return [((dt - EPOCH).total_seconds(), float(v))
+            for dt, v in zip(times, vdl_voltage[seg[0]:seg[1]]) if not np.isnan(v)]
+
+
+def replay_events(g_rows, ref_rows=(), repeat=1):
+    """Merge G1000 and reference rows into one time-ordered ('g'|'ref', t, v) stream.
+
+    repeat > 1 plays the flight back-to-back that many times (times shifted)
+    to produce a long synthetic flight for latency checks.
+    """
+    if not g_rows:
+        return []
+    span = g_rows[-1][0] - g_rows[0][0] + 1.0
+    events = []
+    for k in range(repeat):
+        shift = k * span
+        events.extend(("ref", t + shift, v) for t, v in ref_rows)
+        events.extend(("g", t + shift, v) for t, v in g_rows)
+    events.sort(key=lambda e: (e[1], e[0] == "g"))  # reference first on ties
+    return events
+
+
+# =============================================================================
+# Drivers
+# =============================================================================
+
+def print_alert(alert, monitor):
+    stamp = (EPOCH + timedelta(seconds=alert.t)).strftime("%Y-%m-%d %H:%M:%S")
+    tag = {"start": "ALERT", "end": "clear", "offset": "OFFSET"}[alert.kind]
+    print(f"  [{stamp}] {tag:6s} {alert.message}")
+    if alert.kind == "start":
+        print(f"  {'':21s} {monitor.status()}")
+
+
+def latency_report(latencies_ns):
+    """Per-sample latency summary (microseconds), split by first/second half of the stream."""
+    lat = np.asarray(latencies_ns, dtype=float) / 1000.0
+    if len(lat) == 0:
+        return "  no samples"
+    half = len(lat) // 2 or 1
+    return (f"  Per-sample latency: p50 {np.percentile(lat, 50):.1f} us, p99 {np.percentile(lat, 99):.1f} us, "
+            f"max {lat.max():.1f} us over {len(lat):,} samples\n"
+            f"  First half p50 {np.median(lat[:half]):.1f} us vs second half p50 {np.median(lat[half:]):.1f} us")
+
+
+def run_events(events, monitor, speed=0.0):
+    """Feed a merged event stream to the monitor, optionally paced at `speed` x real time."""
+    latencies = []
+    wall0 = time.perf_counter()
+    t0 = events[0][1] if events else 0.0
+    for kind, t, v in events:
+        if speed > 0:
+            delay = wall0 + (t - t0) / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        if kind == "ref":
+            monitor.push_reference(t, v)
+            continue
+        start = time.perf_counter_ns()
+        monitor.update(t, v)
+        latencies.append(time.perf_counter_ns() - start)
+    return latencies
+
+
+def replay(files, speed=0.0, reference=None, repeat=1, sustain=SUSTAIN_SECONDS):
+    for path in files:
+        g_rows = read_g1000_rows(path)
+        ref_rows = vdl_reference(path) if reference == "vdl" else []
+        events = replay_events(g_rows, ref_rows, repeat)
+        hours = (events[-1][1] - events[0][1]) / 3600 if events else 0.0
+        print(f"\n{Path(path).name}: {len(g_rows):,} samples x{repeat} ({hours:.1f} h)"
+              f"{f', {len(ref_rows):,} VDL48 reference samples' if ref_rows else ''}"
+              f"{f', {speed:g}x real time' if speed > 0 else ''}")
+        monitor = VoltsMonitor(sustain=sustain, on_alert=print_alert)
+        latencies = run_events(events, monitor, speed)
+        n_low = monitor.trackers[0].count
+        n_region = monitor.trackers[1].count
+        print(f"  {n_low} LOW VOLTS (<{LOW_VOLTS:.1f} V) and {n_region} region (<{LOW_VOLTS_REGION:.1f} V) "
+              f"excursions >= {sustain:.0f} s")
+        print(f"  Final: {monitor.status()}")
+        print(latency_report(latencies))
+
+
+def follow(path, poll, idle_timeout, sustain=SUSTAIN_SECONDS):
+    print(f"Following {path} (Ctrl-C to stop)...")
+    monitor = VoltsMonitor(sustain=sustain, on_alert=print_alert)
+    latencies = []
+    try:
+        for t, v in follow_g1000(path, poll, idle_timeout):
+            start = time.perf_counter_ns()
+            monitor.update(t, v)
+            latencies.append(time.perf_counter_ns() - start)
+            if monitor.n % 60 == 0:
+                print(f"  {(EPOCH + timedelta(seconds=t)):%H:%M:%S}  {monitor.status()}")
+    except KeyboardInterrupt:
+        pass
+    print(latency_report(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real-time LOW VOLTS monitor for G1000 NXi data logs")
+    parser.add_argument("--sustain", type=float, default=SUSTAIN_SECONDS,
+                        help=f"Seconds below threshold before alerting (default: {SUSTAIN_SECONDS:g})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_follow = sub.add_parser("follow", help="Tail a G1000 CSV that is being written")
+    p_follow.add_argument("path")
+    p_follow.add_argument("--poll", type=float, default=0.5, help="Poll interval in seconds")
+    p_follow.add_argument("--idle-timeout", type=float, default=60.0,
+                          help="Stop after the file stops growing for this many seconds")
+    p_replay = sub.add_parser("replay", help="Replay recorded logs through the monitor")
+    p_replay.add_argument("files", nargs="*", help="G1000 CSVs (default: data/*.csv flight logs)")
+    p_replay.add_argument("--speed", type=float, default=0.0,
+                          help="Playback speed as a multiple of real time (default: unpaced)")
+    p_replay.add_argument("--reference", choices=["vdl"], default=None,
+                          help="Feed the aligned VDL48 log as the reference voltage")
+    p_replay.add_argument("--repeat", type=int, default=1,
+                          help="Play each flight back-to-back N times (long-flight latency check)")
+    args = parser.parse_args()
+
+    if args.command == "follow":
+        follow(args.path, args.poll, args.idle_timeout, args.sustain)
+        return
+
+    files = args.files or sorted(p for p in DATA_DIR.glob("*.csv") if p.name != "LOG_VD.CSV")
+    if not files:
+        print(f"No G1000 CSV files found in {DATA_DIR}")
+        sys.exit(1)
+    replay(files, args.speed, args.reference, args.repeat, args.sustain)
+
+
+if __name__ == "__main__":
+    main()
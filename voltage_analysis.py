@@ -11,6 +11,7 @@ Flight 2: KSPG -> KBOW (18:10 - 19:25 UTC)
 
 import sys
 import io
+import argparse
 import csv
 import numpy as np
 import matplotlib
@@ -21,6 +22,10 @@ from datetime import datetime, timedelta
 from scipy import stats
 from pathlib import Path
 
+from instrument import add_profile_arguments, profile_run, stage, timed
+from logio import open_log
+from vdl_mmap import load_vdl_mapped, segment_voltage
+
 # Fix Windows console encoding for Unicode characters (e.g. minus signs from numpy)
 if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
@@ -41,6 +46,7 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 # Parsing
 # =============================================================================
 
+@timed("parse_g1000", rows=lambda result: len(result[1]))
 def parse_g1000(filepath):
     """Parse a G1000 NXi data log CSV, returning timestamps and volt1 values.
 
@@ -51,80 +57,61 @@ def parse_g1000(filepath):
     times = []
     volt1 = []
 
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-
-    # Row 3 (index 2) has the column headers
-    headers = [h.strip() for h in lines[2].split(",")]
-    date_idx = headers.index("Lcl Date")
-    time_idx = headers.index("Lcl Time")
-    volt1_idx = headers.index("volt1")
-
-    # Data rows start at line 8 (index 7)
-    for line in lines[7:]:
-        parts = line.split(",")
-        if len(parts) <= volt1_idx:
-            continue
-        date_str = parts[date_idx].strip()
-        time_str = parts[time_idx].strip()
-        v1_str = parts[volt1_idx].strip()
-        if not date_str or not time_str or not v1_str:
-            continue
-        try:
-            dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-            v1 = float(v1_str)
-            times.append(dt)
-            volt1.append(v1)
-        except ValueError:
-            continue
+    # Stream the rows rather than reading the whole log into a list of lines
+    with open_log(filepath) as f:
+        # Row 3 has the column headers
+        for _ in range(2):
+            next(f, "")
+        headers = [h.strip() for h in next(f, "").split(",")]
+        date_idx = headers.index("Lcl Date")
+        time_idx = headers.index("Lcl Time")
+        volt1_idx = headers.index("volt1")
+
+        # Data rows start at line 8
+        for _ in range(4):
+            next(f, "")
+        for line in f:
+            parts = line.split(",")
+            if len(parts) <= volt1_idx:
+                continue
+            date_str = parts[date_idx].strip()
+            time_str = parts[time_idx].strip()
+            v1_str = parts[volt1_idx].strip()
+            if not date_str or not time_str or not v1_str:
+                continue
+            try:
+                dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
+                v1 = float(v1_str)
+                times.append(dt)
+                volt1.append(v1)
+            except ValueError:
+                continue
 
     return np.array(times), np.array(volt1)
 
 
+@timed("parse_vdl", rows=lambda result: len(result[1]))
 def parse_vdl(filepath):
-    """Parse the Triplett VDL48 CSV, returning elapsed seconds and voltage.
-
-    The VDL has 10 header lines, a blank line, then a column header line,
-    with data starting at line 13.  The date/time stamped by the logger is
-    incorrect, but the 2-second sampling period is reliable, so we compute
-    elapsed seconds from the first sample.
+    """Parse the Triplett VDL48 CSV, returning the sampling period (s) and voltage.
+
+    The header block (Sampling Rate, Data Count, Start Time, ...) is read
+    up to the Date(MMDD),Time,Voltage(V) column line, so the data start is
+    not hardcoded. The date/time stamped by the logger is incorrect, but
+    the sampling period is reliable, so elapsed seconds are sample index x
+    the header's sampling rate -- monotonic even when the recording runs
+    past midnight. See vdl_reader.read_vdl for the logger stamps. The
+    voltages are a float32 memmap (vdl_mmap.open_vdl), parsed in chunks;
+    elapsed times are computed per segment, never for the whole recording.
     """
-    times_str = []
-    voltages = []
-
-    with open(filepath, "r") as f:
-        lines = f.readlines()
-
-    for line in lines[12:]:  # data starts at line 13 (index 12)
-        line = line.strip()
-        if not line:
-            continue
-        parts = line.split(",")
-        if len(parts) < 3:
-            continue
-        try:
-            t = parts[1].strip()
-            v = float(parts[2].strip())
-            times_str.append(t)
-            voltages.append(v)
-        except ValueError:
-            continue
-
-    # Build elapsed seconds array from time strings
-    t0 = datetime.strptime(times_str[0], "%H:%M:%S")
-    elapsed = []
-    for ts in times_str:
-        dt = datetime.strptime(ts, "%H:%M:%S")
-        elapsed.append((dt - t0).total_seconds())
-
-    return np.array(elapsed), np.array(voltages)
+    return load_vdl_mapped(filepath)
 
 
 # =============================================================================
 # VDL Segmentation
 # =============================================================================
 
-def segment_vdl(elapsed, voltage):
+@timed()
+def segment_vdl(voltage):
     """Segment VDL data into Flight 1, Idle, and Flight 2.
 
     Strategy:
@@ -139,67 +126,40 @@ def segment_vdl(elapsed, voltage):
          -> end of idle / start of flight 2.
       3. Find where voltage drops to near 0
          -> end of flight 2 / logger disconnected.
-    """
-    FLIGHT_THRESHOLD = 27.0  # volts  - below this is not alternator-charging
-    ZERO_THRESHOLD = 1.0     # volts  - below this means disconnected
-    WINDOW = 30              # samples (~60 sec) for sustained detection
-
-    # Remove trailing zeros (disconnected)
-    last_nonzero = len(voltage) - 1
-    while last_nonzero > 0 and voltage[last_nonzero] < ZERO_THRESHOLD:
-        last_nonzero -= 1
-
-    # Find end of flight 1: first sustained period below threshold
-    end_f1 = None
-    for i in range(WINDOW, last_nonzero):
-        if all(voltage[i:i + WINDOW] < FLIGHT_THRESHOLD):
-            end_f1 = i
-            break
-
-    # Find start of flight 2: after idle, first sustained period above threshold
-    start_f2 = None
-    if end_f1 is not None:
-        for i in range(end_f1 + WINDOW, last_nonzero):
-            if all(voltage[i:i + WINDOW] > FLIGHT_THRESHOLD):
-                start_f2 = i
-                break
-
-    end_f2 = last_nonzero + 1  # up to last non-zero reading
 
-    if end_f1 is None or start_f2 is None:
-        raise RuntimeError("Could not segment VDL data into flight phases.")
-
-    seg_flight1 = (0, end_f1)
-    seg_idle = (end_f1, start_f2)
-    seg_flight2 = (start_f2, end_f2)
-
-    return seg_flight1, seg_idle, seg_flight2
+    The window searches run chunk-wise over the array (vdl_mmap), so the
+    same code handles in-memory arrays and memory-mapped multi-week
+    recordings.
+    """
+    return segment_voltage(voltage)
 
 
 # =============================================================================
 # Time Alignment
 # =============================================================================
 
-def align_vdl_to_g1000(g1000_times, vdl_elapsed, vdl_seg):
+def align_vdl_to_g1000(g1000_times, sample_s, vdl_seg):
     """Create a datetime array for a VDL segment aligned to G1000 timestamps.
 
     We match the start of the VDL segment to the start of the G1000 flight,
-    then space VDL samples at their original 2-second intervals.
+    then space VDL samples at their original sampling interval.
     """
     seg_start, seg_end = vdl_seg
     g1000_start = g1000_times[0]
-    vdl_seg_elapsed = vdl_elapsed[seg_start:seg_end] - vdl_elapsed[seg_start]
+    vdl_seg_elapsed = np.arange(seg_end - seg_start) * sample_s
     aligned_times = np.array([
         g1000_start + timedelta(seconds=float(s)) for s in vdl_seg_elapsed
     ])
     return aligned_times
 
 
+@timed("resample", rows=lambda result: len(result[0]))
 def resample_to_common(g_times, g_volts, v_times, v_volts):
     """Resample both series to a common 2-second grid for direct comparison.
 
     We use the overlapping time range and linearly interpolate both signals
-    onto a shared grid.
+    onto a shared grid. NaN VDL samples (malformed rows) are interpolated
+    across.
     """
     # Convert to seconds-from-epoch for interpolation
     g_epoch = np.array([(t - g_times[0]).total_seconds() for t in g_times])
@@ -211,7 +171,8 @@ def resample_to_common(g_times, g_volts, v_times, v_volts):
     common_t = np.arange(t_start, t_end, 2.0)  # 2-second grid
 
     g_interp = np.interp(common_t, g_epoch, g_volts)
-    v_interp = np.interp(common_t, v_epoch, v_volts)
+    ok = ~np.isnan(v_volts)
+    v_interp = np.interp(common_t, v_epoch[ok], v_volts[ok])
 
     common_dt = np.array([
         g_times[0] + timedelta(seconds=float(s)) for s in common_t
@@ -223,6 +184,7 @@ def resample_to_common(g_times, g_volts, v_times, v_volts):
 # Statistics
 # =============================================================================
 
+@timed("compute_stats", rows=lambda result: len(result[1]))
 def compute_stats(g1000_v, vdl_v, label):
     """Compute and print correlation statistics between G1000 and VDL."""
     diff = g1000_v - vdl_v  # G1000 minus VDL (expect negative = G1000 reads low)
@@ -298,10 +260,11 @@ def plot_flight_comparison(ax, common_dt, g_volts, v_volts, diff, title):
     ax.grid(True, alpha=0.3)
 
 
-def plot_full_vdl_overview(vdl_elapsed, vdl_voltage, seg_f1, seg_idle, seg_f2):
+@timed()
+def plot_full_vdl_overview(sample_s, vdl_voltage, seg_f1, seg_idle, seg_f2):
     """Plot the full VDL recording with segments shaded."""
     fig, ax = plt.subplots(figsize=(14, 4))
-    minutes = vdl_elapsed / 60.0
+    minutes = np.arange(len(vdl_voltage)) * (sample_s / 60.0)
 
     ax.plot(minutes, vdl_voltage, color="black", linewidth=0.5, alpha=0.8)
 
@@ -323,6 +286,7 @@ def plot_full_vdl_overview(vdl_elapsed, vdl_voltage, seg_f1, seg_idle, seg_f2):
     return fig
 
 
+@timed()
 def plot_difference_histograms(diff1, diff2):
     """Histogram of voltage differences for both flights."""
     fig, axes = plt.subplots(1, 2, figsize=(12, 4), sharey=True)
@@ -350,6 +314,7 @@ def plot_difference_histograms(diff1, diff2):
     return fig
 
 
+@timed()
 def plot_scatter(g1, v1, g2, v2):
     """Scatter plot: G1000 vs VDL with 1:1 reference line."""
     fig, ax = plt.subplots(figsize=(6, 6))
@@ -385,6 +350,14 @@ def plot_scatter(g1, v1, g2, v2):
 # =============================================================================
 
 def main():
+    parser = argparse.ArgumentParser(description="G1000 NXi vs Triplett VDL48 voltage correlation analysis")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profile_run(args):
+        run()
+
+
+def run():
     print("Voltage Correlation Analysis: G1000 NXi vs Triplett VDL48")
     print("Aircraft: N238PS (Diamond DA40NG)  Date: 2026-02-08")
     print("=" * 65)
@@ -401,25 +374,26 @@ def main():
           f"{g2_times[0].strftime('%H:%M:%S')} - {g2_times[-1].strftime('%H:%M:%S')} UTC")
 
     print("Parsing VDL48 log...")
-    vdl_elapsed, vdl_voltage = parse_vdl(VDL_CSV)
+    vdl_sample_s, vdl_voltage = parse_vdl(VDL_CSV)
+    vdl_span = (len(vdl_voltage) - 1) * vdl_sample_s
     print(f"  {len(vdl_voltage)} samples over "
-          f"{vdl_elapsed[-1]/60:.1f} min ({vdl_elapsed[-1]/3600:.2f} hr)")
+          f"{vdl_span/60:.1f} min ({vdl_span/3600:.2f} hr)")
 
     # --- Segment VDL ---
     print("\nSegmenting VDL data into flight phases...")
-    seg_f1, seg_idle, seg_f2 = segment_vdl(vdl_elapsed, vdl_voltage)
+    seg_f1, seg_idle, seg_f2 = segment_vdl(vdl_voltage)
     for label, (s, e) in [("Flight 1", seg_f1), ("Idle", seg_idle),
                            ("Flight 2", seg_f2)]:
-        dur = (vdl_elapsed[min(e, len(vdl_elapsed)-1)] - vdl_elapsed[s]) / 60
-        mean_v = np.mean(vdl_voltage[s:e])
+        dur = (min(e, len(vdl_voltage)-1) - s) * vdl_sample_s / 60
+        mean_v = np.nanmean(vdl_voltage[s:e])
         print(f"  {label}: indices {s}–{e} ({dur:.1f} min, mean {mean_v:.2f} V)")
 
     # --- Align VDL segments to G1000 timestamps ---
     print("\nAligning VDL segments to G1000 flight times...")
-    vdl_f1_times = align_vdl_to_g1000(g1_times, vdl_elapsed, seg_f1)
+    vdl_f1_times = align_vdl_to_g1000(g1_times, vdl_sample_s, seg_f1)
     vdl_f1_volts = vdl_voltage[seg_f1[0]:seg_f1[1]]
 
-    vdl_f2_times = align_vdl_to_g1000(g2_times, vdl_elapsed, seg_f2)
+    vdl_f2_times = align_vdl_to_g1000(g2_times, vdl_sample_s, seg_f2)
     vdl_f2_volts = vdl_voltage[seg_f2[0]:seg_f2[1]]
 
     # --- Resample to common grid ---
@@ -452,18 +426,19 @@ def main():
     print("\nGenerating plots...")
 
     # 1. Full VDL overview
-    plot_full_vdl_overview(vdl_elapsed, vdl_voltage, seg_f1, seg_idle, seg_f2)
+    plot_full_vdl_overview(vdl_sample_s, vdl_voltage, seg_f1, seg_idle, seg_f2)
 
     # 2. Side-by-side flight comparisons
-    fig, axes = plt.subplots(2, 1, figsize=(14, 8), sharex=False)
-    plot_flight_comparison(axes[0], common1_t, g1_rs, v1_rs,
-                           g1_rs - v1_rs, "Flight 1: KBOW -> KSPG")
-    plot_flight_comparison(axes[1], common2_t, g2_rs, v2_rs,
-                           g2_rs - v2_rs, "Flight 2: KSPG -> KBOW")
-    fig.suptitle("G1000 volt1 vs VDL48 Reference Voltage", fontsize=13, y=1.01)
-    fig.tight_layout()
-    fig.savefig(OUTPUT_DIR / "flight_comparison.png", dpi=150,
-                bbox_inches="tight")
+    with stage("plot_flight_comparison"):
+        fig, axes = plt.subplots(2, 1, figsize=(14, 8), sharex=False)
+        plot_flight_comparison(axes[0], common1_t, g1_rs, v1_rs,
+                               g1_rs - v1_rs, "Flight 1: KBOW -> KSPG")
+        plot_flight_comparison(axes[1], common2_t, g2_rs, v2_rs,
+                               g2_rs - v2_rs, "Flight 2: KSPG -> KBOW")
+        fig.suptitle("G1000 volt1 vs VDL48 Reference Voltage", fontsize=13, y=1.01)
+        fig.tight_layout()
+        fig.savefig(OUTPUT_DIR / "flight_comparison.png", dpi=150,
+                    bbox_inches="tight")
     print(f"Saved: {OUTPUT_DIR / 'flight_comparison.png'}")
 
     # 3. Difference histograms
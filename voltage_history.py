@@ -7,29 +7,50 @@ statistics over time to identify when the voltage measurement issue
 first appeared on N238PS.
 
 For each flight, computes:
-- Mean volt1 during cruise (alternator online, volt1 > 25V)
+- Mean volt1 during cruise (flight_phases CRUISE: airborne, not descending)
 - Minimum volt1
 - Standard deviation of volt1
 - Number of samples below 25.5V (LOW VOLTS threshold region)
 
 Output: Console summary + PNG plots in output/
 
+Fleet mode processes a directory with one subdirectory of CSVs per tail
+number. Flights of all aircraft are parsed on one shared worker pool and
+through the shared parse cache, and per-tail trends plus a fleet
+comparison are written to output/fleet/.
+
 Usage:
     python voltage_history.py
+    python voltage_history.py --source data/N541SA --tail N541SA
+    python voltage_history.py --fleet data/fleet --workers 8
+    python voltage_history.py --samples      # add an all-samples min/mean/max chart (pyramid.py)
 """
 
 import sys
 import io
 import os
 import re
+import argparse
+import contextlib
 import numpy as np
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+from ae3_ingest import AE3_DIR, DecoderUnavailable, ae3_session_stats
+from ecu_catalog import DEFAULT_DB as ECU_CATALOG_DB, EcuCatalog
+from flight_phases import CRUISE, load_flight_phases
+from flight_store import epoch_to_datetime
+from flight_table import FlightRecord, FlightTable
+from instrument import add_profile_arguments, profile_run, stage, timed
+from logio import glob_logs
+from parse_cache import cache_enabled, disable_cache
+from pyramid import plot_range, update_pyramid
+
 if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
@@ -39,60 +60,20 @@ ECU_PARSED_DIR = Path(__file__).parent / ".." / "AustroView" / "Data" / "Parsed"
 OUTPUT_DIR = Path(__file__).parent / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+HOME_TAIL = "N238PS"
 
-def parse_g1000_voltage(filepath):
-    """Parse a G1000 NXi CSV and return (flight_date, volt1_array).
-
-    Returns (datetime or None, numpy array of volt1 values).
-    Skips rows where volt1 is blank or zero.
-    """
-    try:
-        with open(filepath, "r", errors="replace") as f:
-            lines = f.readlines()
-    except Exception as e:
-        print(f"  Error reading {filepath.name}: {e}", file=sys.stderr)
-        return None, np.array([])
-
-    if len(lines) < 8:
-        return None, np.array([])
-
-    # Row 3 (index 2) has column headers
-    headers = [h.strip() for h in lines[2].split(",")]
-    try:
-        date_idx = headers.index("Lcl Date")
-        time_idx = headers.index("Lcl Time")
-        volt1_idx = headers.index("volt1")
-    except ValueError:
-        return None, np.array([])
-
-    flight_date = None
-    voltages = []
-
-    for line in lines[7:]:
-        parts = line.split(",")
-        if len(parts) <= volt1_idx:
-            continue
-        v1_str = parts[volt1_idx].strip()
-        if not v1_str:
-            continue
-        try:
-            v1 = float(v1_str)
-        except ValueError:
-            continue
-        if v1 <= 0:
-            continue
-        voltages.append(v1)
-
-        if flight_date is None:
-            date_str = parts[date_idx].strip()
-            time_str = parts[time_idx].strip()
-            if date_str and time_str:
-                try:
-                    flight_date = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    pass
-
-    return flight_date, np.array(voltages)
+# Maintenance events from aircraft logs (correlated with voltage data), per tail
+MAINT_EVENTS = {
+    "N238PS": [
+        (datetime(2024, 2, 28), 'Engine R&R\n(oil leak)', 'red'),
+        (datetime(2024, 3, 27), 'Alt #2\nreplaced', 'orange'),
+        (datetime(2024, 4, 15), 'Voltage reg\nreplaced', 'orange'),
+        (datetime(2024, 6, 30), 'VR replaced\n+wire repair', 'orange'),
+        (datetime(2024, 7, 26), 'G1000 P2413\nrepinned', 'blue'),
+        (datetime(2025, 2, 21), 'Main alt +\nVR replaced', 'orange'),
+        (datetime(2025, 7, 1),  'Engine R&R\n(piston)+batt', 'red'),
+    ],
+}
 
 
 def extract_date_from_filename(fname):
@@ -114,140 +95,149 @@ def extract_date_from_filename(fname):
     return None
 
 
-def parse_ecu_sessions(ecu_dir):
-    """Parse all AustroView ECU session CSVs and return per-session voltage stats.
+def flight_stats(fpath, t, volt1, phase, tail=HOME_TAIL):
+    """Per-flight cruise statistics as a FlightRecord, or None if the flight has too little data.
 
-    Each session corresponds to one engine run (start to shutdown).
-    Returns list of dicts sorted by date, only for sessions with meaningful
-    cruise data (alternator online, voltage > 25V, at least 60 samples).
+    Cruise samples are the ones flight_phases labels CRUISE (airborne and
+    not descending), whatever their voltage.
+    """
+    valid = volt1 > 0  # blank (NaN) and zero readings are avionics initializing
+    voltages = volt1[valid]
+    if len(voltages) < 30:
+        return None
+
+    # Use date from data, fall back to filename
+    flight_date = epoch_to_datetime(t[valid][0]) if len(t) else None
+    if flight_date is None:
+        flight_date = extract_date_from_filename(fpath.name)
+    if flight_date is None:
+        return None
+
+    cruise_volts = volt1[valid & (phase == CRUISE)]
+
+    if len(cruise_volts) < 10:
+        return None
+
+    return FlightRecord(
+        tail=tail,
+        date=flight_date,
+        file=fpath.name,
+        n_samples=len(voltages),
+        n_cruise=len(cruise_volts),
+        mean=float(np.mean(cruise_volts)),
+        median=float(np.median(cruise_volts)),
+        std=float(np.std(cruise_volts)),
+        min=float(np.min(voltages)),
+        max=float(np.max(cruise_volts)),
+        pct_below_26=float(np.sum(cruise_volts < 26.0) / len(cruise_volts) * 100),
+        n_below_255=int(np.sum(voltages < 25.5)),
+    )
+
+
+def process_flight(job):
+    """Worker entry point: (tail, path) -> FlightRecord or None."""
+    tail, fpath = job
+    with stage("load_flight_phases") as s:
+        t, data, phase = load_flight_phases(fpath)
+        s.rows = len(t)
+    with stage("flight_stats"):
+        return flight_stats(fpath, t, data["volt1"], phase, tail)
+
+
+def collect_flights(files_by_tail, pool=None):
+    """Parse every flight of every aircraft on one shared worker pool.
+
+    files_by_tail maps tail number -> list of CSV paths. All (tail, file)
+    jobs are submitted together, so parsing is parallel across aircraft as
+    well as across flights. With pool=None parsing runs in-process.
+    Returns {tail: FlightTable sorted by date}.
     """
-    import csv as csv_mod
-
-    files = sorted(ecu_dir.glob("*_session*_2*.csv"))
-    if not files:
-        return []
-
-    sessions = []
-    seen_dates = set()
-    for fpath in files:
-        m = re.search(r'session(\d+)_(\d{8})_(\d{6})\.csv$', fpath.name)
-        if not m:
-            continue
-        sess_date = datetime.strptime(m.group(2) + m.group(3), "%Y%m%d%H%M%S")
-
-        # Deduplicate: same session may exist from multiple ae3 files
-        date_key = sess_date.strftime("%Y%m%d%H%M%S")
-        if date_key in seen_dates:
-            continue
-        seen_dates.add(date_key)
-
-        voltages = []
-        with open(fpath, 'r') as f:
-            reader = csv_mod.DictReader(f)
-            for row in reader:
-                try:
-                    v = float(row["Battery Voltage [V]"])
-                    if v > 0:
-                        voltages.append(v)
-                except (ValueError, KeyError):
-                    continue
-
-        if len(voltages) < 60:
-            continue
-
-        varr = np.array(voltages)
-        cruise = varr[varr > 25.0]
-        if len(cruise) < 30:
-            continue
-
-        sessions.append({
-            'date': sess_date,
-            'file': fpath.name,
-            'mean': float(np.mean(cruise)),
-            'std': float(np.std(cruise)),
-            'min': float(np.min(varr)),
-            'n_cruise': len(cruise),
-        })
-
-    sessions.sort(key=lambda s: s['date'])
-    return sessions
+    jobs = [(tail, fpath) for tail, files in files_by_tail.items() for fpath in files]
+    with stage("collect_flights", rows=len(jobs)):
+        if pool is None:
+            results = [process_flight(job) for job in jobs]
+        else:
+            results = list(pool.map(process_flight, jobs, chunksize=4))
 
+    by_tail = FlightTable.from_records(results).split("tail")
+    return {tail: by_tail[tail].sort("date") if tail in by_tail else FlightTable.empty()
+            for tail in files_by_tail}
 
-def main():
-    if not SOURCE_DIR.exists():
-        print(f"Source directory not found: {SOURCE_DIR}")
-        print("Run flysto_download.py first to download the G1000 log files.")
-        sys.exit(1)
 
-    csv_files = sorted(SOURCE_DIR.glob("*.csv"))
-    if not csv_files:
-        print(f"No CSV files found in {SOURCE_DIR}")
-        sys.exit(1)
+@timed("parse_ecu_sessions", rows=len)
+def parse_ecu_sessions(ecu_dir):
+    """Per-session ECU voltage stats from all AustroView session CSVs.
 
-    print(f"Found {len(csv_files)} CSV files in {SOURCE_DIR}")
-    print("Parsing voltage data from each flight...\n")
+    Each session corresponds to one engine run (start to shutdown).
+    Returns list of dicts sorted by date, only for sessions with meaningful
+    cruise data (at least 60 samples, 30 of them in cruise); see
+    ecu_catalog.session_stats. Sessions go through the ECU session catalog:
+    duplicate exports from several .ae3 dumps are recognised by start time,
+    length and content hash without being parsed, and cruise stats are
+    cached, so repeat runs do not open the CSVs at all.
+
+    Without the AustroView export directory, sessions are decoded straight
+    from the .ae3 dumps in data/ECU (see ae3_ingest).
+    """
+    if not Path(ecu_dir).is_dir():
+        # No AustroView export: decode the raw dumps in data/ECU instead
+        try:
+            return ae3_session_stats(AE3_DIR)
+        except DecoderUnavailable as e:
+            print(f"\nECU: {ecu_dir} not found, and the .ae3 dumps in {AE3_DIR} cannot be decoded:\n  {e}")
+            return []
+    with EcuCatalog(ECU_CATALOG_DB if cache_enabled() else ":memory:") as catalog:
+        return catalog.sessions(ecu_dir)
 
-    # Collect per-flight statistics
-    flights = []  # list of dicts
-
-    for fpath in csv_files:
-        flight_date, voltages = parse_g1000_voltage(fpath)
-
-        if len(voltages) < 30:
-            continue
-
-        # Use date from data, fall back to filename
-        if flight_date is None:
-            flight_date = extract_date_from_filename(fpath.name)
-        if flight_date is None:
-            continue
-
-        # Filter to "alternator online" samples (typically > 25V)
-        cruise_mask = voltages > 25.0
-        cruise_volts = voltages[cruise_mask]
-
-        if len(cruise_volts) < 10:
-            continue
-
-        stats = {
-            'date': flight_date,
-            'file': fpath.name,
-            'n_samples': len(voltages),
-            'n_cruise': len(cruise_volts),
-            'mean': float(np.mean(cruise_volts)),
-            'median': float(np.median(cruise_volts)),
-            'std': float(np.std(cruise_volts)),
-            'min': float(np.min(voltages)),
-            'max': float(np.max(cruise_volts)),
-            'pct_below_26': float(np.sum(cruise_volts < 26.0) / len(cruise_volts) * 100),
-            'n_below_255': int(np.sum(voltages < 25.5)),
-        }
-        flights.append(stats)
-
-    # Sort by date
-    flights.sort(key=lambda f: f['date'])
 
-    print(f"Successfully parsed {len(flights)} flights with voltage data.\n")
+def print_flight_table(flights):
     print(f"{'Date':<20} {'Mean V':>7} {'Min V':>7} {'Std':>6} {'%<26V':>6} {'Samples':>8}  File")
     print("-" * 100)
-    for f in flights:
-        print(f"{f['date'].strftime('%Y-%m-%d %H:%M'):<20} "
-              f"{f['mean']:>7.2f} {f['min']:>7.2f} {f['std']:>6.3f} "
-              f"{f['pct_below_26']:>5.1f}% {f['n_cruise']:>8}  {f['file']}")
-
-    if len(flights) < 2:
-        print("\nNot enough flights to generate history plots.")
-        return
-
-    # Extract arrays for plotting
-    dates = [f['date'] for f in flights]
-    means = [f['mean'] for f in flights]
-    mins = [f['min'] for f in flights]
-    stds = [f['std'] for f in flights]
-    pct_below_26 = [f['pct_below_26'] for f in flights]
-
-    # --- Load ECU session data as independent reference ---
-    ecu_sessions = parse_ecu_sessions(ECU_PARSED_DIR)
+    for date, mean, vmin, std, pct, n_cruise, fname in zip(
+            flights.dates(), flights.mean, flights.min, flights.std,
+            flights.pct_below_26, flights.n_cruise, flights.file):
+        print(f"{date.strftime('%Y-%m-%d %H:%M'):<20} "
+              f"{mean:>7.2f} {vmin:>7.2f} {std:>6.3f} "
+              f"{pct:>5.1f}% {n_cruise:>8}  {fname}")
+
+
+@timed("pettitt", rows=lambda result: len(result[3]))
+def pettitt_test(x):
+    """Pettitt's nonparametric test for a single change-point in location.
+
+    U[t] = sum_{i<=t} sum_{j>t} sign(x[i] - x[j]). Because the sign matrix is
+    antisymmetric this equals the cumulative sum of its row sums, and row i
+    sums to (#values below x[i]) - (#values above x[i]), which comes from
+    the sorted distinct values in O(n log n) without the n x n matrix.
+    Returns (change-point index, K statistic, approximate p-value, U).
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    _, inverse, counts = np.unique(x, return_inverse=True, return_counts=True)
+    below = np.cumsum(counts) - counts
+    U = np.cumsum(2 * below[inverse] + counts[inverse] - n)
+    cp = int(np.argmax(np.abs(U)))
+    K = np.abs(U[cp])
+    # Approximate p-value
+    p = 2.0 * np.exp(-6.0 * K**2 / (n**3 + n**2))
+    return cp, K, p, U
+
+
+@timed()
+def analyze_tail(tail, flights, out_dir, ecu_sessions=()):
+    """Plot and summarize the voltage history of one aircraft.
+
+    Writes the history, noise, change-point, before/after and maintenance
+    plots to out_dir and returns a summary dict for fleet comparison.
+    """
+    # Columns of the FlightTable feed the plots directly
+    dates = flights.date
+    means = flights.mean
+    mins = flights.min
+    stds = flights.std
+    pct_below_26 = flights.pct_below_26
+
+    # --- ECU session data as independent reference ---
     ecu_dates = [s['date'] for s in ecu_sessions]
     ecu_means = [s['mean'] for s in ecu_sessions]
     ecu_stds = [s['std'] for s in ecu_sessions]
@@ -259,27 +249,15 @@ def main():
     else:
         print("\nNo ECU session data found - skipping ECU overlay.")
 
-    # Maintenance events from N238PS aircraft logs (correlated with voltage data)
-    maint_events = [
-        (datetime(2024, 2, 28), 'Engine R&R\n(oil leak)', 'red'),
-        (datetime(2024, 3, 27), 'Alt #2\nreplaced', 'orange'),
-        (datetime(2024, 4, 15), 'Voltage reg\nreplaced', 'orange'),
-        (datetime(2024, 6, 30), 'VR replaced\n+wire repair', 'orange'),
-        (datetime(2024, 7, 26), 'G1000 P2413\nrepinned', 'blue'),
-        (datetime(2025, 2, 21), 'Main alt +\nVR replaced', 'orange'),
-        (datetime(2025, 7, 1),  'Engine R&R\n(piston)+batt', 'red'),
-    ]
-    maint_date = datetime(2024, 2, 28)  # primary event - aligns with change-point
+    maint_events = MAINT_EVENTS.get(tail, [])
 
     # === Plot 1: Mean voltage over time ===
     fig, axes = plt.subplots(3, 1, figsize=(14, 12), sharex=True)
-    fig.suptitle("N238PS Voltage History - G1000 vs ECU Reference", fontsize=14, fontweight='bold')
+    fig.suptitle(f"{tail} Voltage History - G1000 vs ECU Reference", fontsize=14, fontweight='bold')
 
     ax1 = axes[0]
     ax1.plot(dates, means, 'b.-', markersize=4, linewidth=0.8, label='G1000 Mean V (cruise)')
-    ax1.fill_between(dates,
-                     [m - s for m, s in zip(means, stds)],
-                     [m + s for m, s in zip(means, stds)],
+    ax1.fill_between(dates, means - stds, means + stds,
                      alpha=0.2, color='blue', label='G1000 +/- 1 std dev')
     if ecu_sessions:
         ax1.plot(ecu_dates, ecu_means, 'g^', markersize=5, alpha=0.7,
@@ -313,7 +291,7 @@ def main():
 
     # === Plot 3: Percentage of samples below 26V ===
     ax3 = axes[2]
-    ax3.bar(dates, pct_below_26, width=2, color='orange', alpha=0.7, label='% cruise samples < 26V')
+    ax3.bar(dates, pct_below_26, width=np.timedelta64(2, 'D'), color='orange', alpha=0.7, label='% cruise samples < 26V')
     for md, mlabel, mcolor in maint_events:
         ax3.axvline(x=md, color=mcolor, linestyle=':', linewidth=1.5, alpha=0.6)
     ax3.set_ylabel("% Samples < 26V")
@@ -325,8 +303,9 @@ def main():
     plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45, ha='right')
 
     plt.tight_layout()
-    out_path = OUTPUT_DIR / "voltage_history.png"
-    plt.savefig(out_path, dpi=150, bbox_inches='tight')
+    out_path = out_dir / "voltage_history.png"
+    with stage("savefig_png"):
+        plt.savefig(out_path, dpi=150, bbox_inches='tight')
     print(f"\nSaved voltage history plot to {out_path}")
     plt.close()
 
@@ -335,42 +314,28 @@ def main():
     ax.plot(dates, stds, 'g.-', markersize=4, linewidth=0.8)
     ax.set_ylabel("Std Dev (V)")
     ax.set_xlabel("Flight Date")
-    ax.set_title("N238PS G1000 Voltage Noise (Std Dev) per Flight")
+    ax.set_title(f"{tail} G1000 Voltage Noise (Std Dev) per Flight")
     ax.grid(True, alpha=0.3)
     ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
     ax.xaxis.set_major_locator(mdates.MonthLocator(interval=2))
     plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
     plt.tight_layout()
-    out_path2 = OUTPUT_DIR / "voltage_noise_history.png"
-    plt.savefig(out_path2, dpi=150, bbox_inches='tight')
+    out_path2 = out_dir / "voltage_noise_history.png"
+    with stage("savefig_png"):
+        plt.savefig(out_path2, dpi=150, bbox_inches='tight')
     print(f"Saved voltage noise plot to {out_path2}")
     plt.close()
 
     # =================================================================
     # Change-Point Detection & Visualization
     # =================================================================
-    mean_arr = np.array(means)
-    std_arr = np.array(stds)
+    mean_arr = means
+    std_arr = stds
     n = len(mean_arr)
 
-    # --- Pettitt's test (nonparametric single change-point in location) ---
-    # Computes U statistic: max of cumulative sign-rank differences
-    def pettitt_test(x):
-        n = len(x)
-        U = np.zeros(n, dtype=float)
-        for t in range(n):
-            for i in range(t + 1):
-                for j in range(t + 1, n):
-                    U[t] += np.sign(x[i] - x[j])
-        cp = np.argmax(np.abs(U))
-        K = np.abs(U[cp])
-        # Approximate p-value
-        p = 2.0 * np.exp(-6.0 * K**2 / (n**3 + n**2))
-        return cp, K, p, U
-
     print("\nRunning Pettitt's change-point test on mean cruise voltage...")
     cp_idx, K_stat, p_val, U_stat = pettitt_test(mean_arr)
-    cp_date = flights[cp_idx]['date']
+    cp_date = dates[cp_idx].item()
     before_mean = np.mean(mean_arr[:cp_idx + 1])
     after_mean = np.mean(mean_arr[cp_idx + 1:])
     before_std = np.mean(std_arr[:cp_idx + 1])
@@ -382,7 +347,7 @@ def main():
 
     # === Plot: Change-Point Detection (3 panels) ===
     fig, axes = plt.subplots(3, 1, figsize=(14, 14))
-    fig.suptitle("N238PS G1000 Voltage Change-Point Analysis",
+    fig.suptitle(f"{tail} G1000 Voltage Change-Point Analysis",
                  fontsize=14, fontweight='bold')
 
     # --- Panel 1: Mean voltage with change point annotated ---
@@ -419,9 +384,9 @@ def main():
 
     # --- Panel 2: CUSUM ---
     ax2 = axes[1]
-    ax2.fill_between(dates, 0, cusum, where=[c >= 0 for c in cusum],
+    ax2.fill_between(dates, 0, cusum, where=cusum >= 0,
                      color='green', alpha=0.3, interpolate=True)
-    ax2.fill_between(dates, 0, cusum, where=[c < 0 for c in cusum],
+    ax2.fill_between(dates, 0, cusum, where=cusum < 0,
                      color='red', alpha=0.3, interpolate=True)
     ax2.plot(dates, cusum, 'k-', linewidth=1.5)
     ax2.axvline(x=cp_date, color='black', linestyle='--', linewidth=2)
@@ -430,7 +395,7 @@ def main():
     ax2.axhline(y=0, color='gray', linestyle='-', linewidth=0.5)
     # Annotate the peak
     peak_idx = np.argmax(cusum)
-    ax2.annotate(f'Peak: {dates[peak_idx].strftime("%Y-%m-%d")}\n'
+    ax2.annotate(f'Peak: {dates[peak_idx].item().strftime("%Y-%m-%d")}\n'
                  f'(last flight above trend)',
                  xy=(dates[peak_idx], cusum[peak_idx]),
                  xytext=(dates[peak_idx], cusum[peak_idx] + 2),
@@ -467,8 +432,9 @@ def main():
     plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45, ha='right')
 
     plt.tight_layout()
-    out_cp = OUTPUT_DIR / "voltage_changepoint.png"
-    plt.savefig(out_cp, dpi=150, bbox_inches='tight')
+    out_cp = out_dir / "voltage_changepoint.png"
+    with stage("savefig_png"):
+        plt.savefig(out_cp, dpi=150, bbox_inches='tight')
     print(f"Saved change-point analysis to {out_cp}")
     plt.close()
 
@@ -501,22 +467,20 @@ def main():
     ax_a.set_xlim(25.5, 28.5)
 
     plt.tight_layout()
-    out_dist = OUTPUT_DIR / "voltage_before_after.png"
-    plt.savefig(out_dist, dpi=150, bbox_inches='tight')
+    out_dist = out_dir / "voltage_before_after.png"
+    with stage("savefig_png"):
+        plt.savefig(out_dist, dpi=150, bbox_inches='tight')
     print(f"Saved before/after distribution to {out_dist}")
     plt.close()
 
     # === Plot: Maintenance Correlation Timeline ===
     fig, ax = plt.subplots(figsize=(16, 7))
-    fig.suptitle("N238PS Voltage vs Maintenance Events", fontsize=14, fontweight='bold')
+    fig.suptitle(f"{tail} Voltage vs Maintenance Events", fontsize=14, fontweight='bold')
 
     # G1000 mean voltage
     ax.plot(dates, means, 'b.-', markersize=4, linewidth=0.8, alpha=0.8,
             label='G1000 Mean V (cruise)')
-    ax.fill_between(dates,
-                    [m - s for m, s in zip(means, stds)],
-                    [m + s for m, s in zip(means, stds)],
-                    alpha=0.15, color='blue')
+    ax.fill_between(dates, means - stds, means + stds, alpha=0.15, color='blue')
     # ECU reference
     if ecu_sessions:
         ax.plot(ecu_dates, ecu_means, 'g^', markersize=4, alpha=0.5,
@@ -544,8 +508,9 @@ def main():
     ax.xaxis.set_major_locator(mdates.MonthLocator(interval=2))
     plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
     plt.tight_layout()
-    out_maint = OUTPUT_DIR / "voltage_maintenance_correlation.png"
-    plt.savefig(out_maint, dpi=150, bbox_inches='tight')
+    out_maint = out_dir / "voltage_maintenance_correlation.png"
+    with stage("savefig_png"):
+        plt.savefig(out_maint, dpi=150, bbox_inches='tight')
     print(f"Saved maintenance correlation plot to {out_maint}")
     plt.close()
 
@@ -554,7 +519,8 @@ def main():
     print("SUMMARY")
     print(f"{'='*60}")
     print(f"Total flights analyzed: {len(flights)}")
-    print(f"Date range: {flights[0]['date'].strftime('%Y-%m-%d')} to {flights[-1]['date'].strftime('%Y-%m-%d')}")
+    first, last = dates[0].item(), dates[-1].item()
+    print(f"Date range: {first.strftime('%Y-%m-%d')} to {last.strftime('%Y-%m-%d')}")
     print(f"Overall mean voltage: {np.mean(means):.2f} V")
     print(f"Overall mean std dev: {np.mean(stds):.3f} V")
     print(f"\nChange-point detected: {cp_date.strftime('%Y-%m-%d')} (flight #{cp_idx + 1})")
@@ -563,7 +529,7 @@ def main():
     print(f"  After  ({len(after_vals)} flights): mean={after_mean:.2f}V, noise={after_std:.3f}V")
     print(f"  Voltage drop: {before_mean - after_mean:.2f}V")
     print(f"  Noise increase: {(after_std/before_std - 1)*100:.0f}%")
-    print(f"  File at change point: {flights[cp_idx]['file']}")
+    print(f"  File at change point: {flights.file[cp_idx]}")
 
     if ecu_sessions:
         print(f"\nECU Reference (independent measurement):")
@@ -573,13 +539,215 @@ def main():
         print(f"  Mean noise (std dev): {np.mean(ecu_stds):.3f}V")
         print(f"  G1000 under-reports by: {np.mean(ecu_means) - np.mean(means):.2f}V on average")
 
-    print(f"\nMaintenance Events (from aircraft logs):")
-    for md, mlabel, mcolor in maint_events:
-        print(f"  {md.strftime('%Y-%m-%d')}: {mlabel.replace(chr(10), ' ')}")
-    print(f"\nConclusion: Engine R&R on 2024-02-28 coincides with statistically")
-    print(f"  detected change-point. Subsequent voltage regulator replacements (3x),")
-    print(f"  alternator replacements (2x), and wire repairs did not resolve the")
-    print(f"  underlying G1000 measurement path issue.")
+    if maint_events:
+        print(f"\nMaintenance Events (from aircraft logs):")
+        for md, mlabel, mcolor in maint_events:
+            print(f"  {md.strftime('%Y-%m-%d')}: {mlabel.replace(chr(10), ' ')}")
+    if tail == HOME_TAIL:
+        print(f"\nConclusion: Engine R&R on 2024-02-28 coincides with statistically")
+        print(f"  detected change-point. Subsequent voltage regulator replacements (3x),")
+        print(f"  alternator replacements (2x), and wire repairs did not resolve the")
+        print(f"  underlying G1000 measurement path issue.")
+
+    return {
+        'tail': tail,
+        'n_flights': len(flights),
+        'first': first,
+        'last': last,
+        'mean': float(np.mean(means)),
+        'noise': float(np.mean(stds)),
+        'cp_date': cp_date,
+        'p_value': float(p_val),
+        'before_mean': float(before_mean),
+        'after_mean': float(after_mean),
+    }
+
+
+# =============================================================================
+# Fleet mode
+# =============================================================================
+
+def find_fleet(fleet_dir):
+    """Map tail number -> CSV logs for each subdirectory of fleet_dir that has any."""
+    files_by_tail = {}
+    for sub in sorted(p for p in Path(fleet_dir).iterdir() if p.is_dir()):
+        files = glob_logs(sub, "*.csv")
+        if files:
+            files_by_tail[sub.name] = files
+    return files_by_tail
+
+
+def fleet_tail_job(job):
+    """Worker entry point: analyze one aircraft, capturing its console report to summary.txt."""
+    tail, flights, out_dir, ecu_sessions = job
+    out_dir.mkdir(parents=True, exist_ok=True)
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        print(f"{tail}: {len(flights)} flights\n")
+        print_flight_table(flights)
+        summary = analyze_tail(tail, flights, out_dir, ecu_sessions)
+    (out_dir / "summary.txt").write_text(buf.getvalue(), encoding="utf-8")
+    return summary
+
+
+@timed()
+def plot_fleet_comparison(flights_by_tail, out_path):
+    """Fleet comparison: per-flight mean voltage over time and per-tail distributions."""
+    tails = [t for t, fl in flights_by_tail.items() if fl]
+    # Order distributions by median mean voltage so outliers stand out at the ends
+    tails.sort(key=lambda t: np.median(flights_by_tail[t].mean))
+
+    fig, axes = plt.subplots(3, 1, figsize=(14, 15),
+                             height_ratios=[3, 2, 2])
+    fig.suptitle(f"Fleet Voltage Comparison - {len(tails)} Aircraft",
+                 fontsize=14, fontweight='bold')
+
+    ax1 = axes[0]
+    cmap = plt.get_cmap('tab20')
+    for i, tail in enumerate(tails):
+        fl = flights_by_tail[tail]
+        ax1.plot(fl.date, fl.mean, '.-',
+                 markersize=3, linewidth=0.6, color=cmap(i % 20), alpha=0.8, label=tail)
+    ax1.axhline(y=28.0, color='green', linestyle='--', alpha=0.5)
+    ax1.axhline(y=25.5, color='red', linestyle='--', alpha=0.5)
+    ax1.set_ylabel("Mean Cruise Voltage (V)")
+    ax1.set_title("Mean Cruise Voltage per Flight")
+    ax1.legend(loc='lower left', fontsize=7, ncol=max(1, len(tails) // 10))
+    ax1.grid(True, alpha=0.3)
+    ax1.set_ylim(24, 30)
+    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+
+    for ax, key, ylabel, title in [
+        (axes[1], 'mean', "Mean Cruise Voltage (V)", "Distribution of Per-Flight Mean Voltage"),
+        (axes[2], 'std', "Std Dev (V)", "Distribution of Per-Flight Voltage Noise"),
+    ]:
+        ax.boxplot([flights_by_tail[t][key] for t in tails],
+                   showfliers=True, flierprops=dict(markersize=2))
+        ax.set_xticklabels(tails)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.grid(True, alpha=0.3, axis='y')
+        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+
+    plt.tight_layout()
+    with stage("savefig_png"):
+        plt.savefig(out_path, dpi=150, bbox_inches='tight')
+    plt.close()
+
+
+def run_fleet(fleet_dir, workers=None):
+    """Process every aircraft under fleet_dir (one subdirectory per tail number)."""
+    files_by_tail = find_fleet(fleet_dir)
+    if not files_by_tail:
+        print(f"No tail-number subdirectories with CSV files found in {fleet_dir}")
+        sys.exit(1)
+
+    n_files = sum(len(v) for v in files_by_tail.values())
+    print(f"Fleet: {len(files_by_tail)} aircraft, {n_files} CSV files in {fleet_dir}")
+    print("Parsing voltage data from every flight of every aircraft...\n")
+
+    out_root = OUTPUT_DIR / "fleet"
+    ecu_sessions = parse_ecu_sessions(ECU_PARSED_DIR) if HOME_TAIL in files_by_tail else []
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        flights_by_tail = collect_flights(files_by_tail, pool)
+        jobs = [(tail, flights, out_root / tail, ecu_sessions if tail == HOME_TAIL else [])
+                for tail, flights in flights_by_tail.items() if len(flights) >= 2]
+        if pool is None:
+            summaries = [fleet_tail_job(job) for job in jobs]
+        else:
+            summaries = list(pool.map(fleet_tail_job, jobs))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    skipped = sorted(set(flights_by_tail) - {s['tail'] for s in summaries})
+    print(f"{'Tail':<10} {'Flights':>7} {'First':>11} {'Last':>11} {'Mean V':>7} {'Noise':>6} "
+          f"{'Change pt':>11} {'Drop V':>7} {'p':>9}")
+    print("-" * 90)
+    for s in summaries:
+        print(f"{s['tail']:<10} {s['n_flights']:>7} {s['first'].strftime('%Y-%m-%d'):>11} "
+              f"{s['last'].strftime('%Y-%m-%d'):>11} {s['mean']:>7.2f} {s['noise']:>6.3f} "
+              f"{s['cp_date'].strftime('%Y-%m-%d'):>11} "
+              f"{s['before_mean'] - s['after_mean']:>7.2f} {s['p_value']:>9.1e}")
+    if skipped:
+        print(f"\nSkipped (fewer than 2 usable flights): {', '.join(skipped)}")
+
+    if summaries:
+        out_path = out_root / "fleet_comparison.png"
+        plot_fleet_comparison({s['tail']: flights_by_tail[s['tail']] for s in summaries}, out_path)
+        print(f"\nSaved fleet comparison plot to {out_path}")
+        print(f"Per-aircraft plots and summaries in {out_root}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historical G1000 voltage analysis")
+    parser.add_argument("--source", default=str(SOURCE_DIR),
+                        help="Directory of G1000 CSVs for one aircraft (default: data/source)")
+    parser.add_argument("--tail", default=HOME_TAIL, help=f"Tail number (default: {HOME_TAIL})")
+    parser.add_argument("--fleet", default=None,
+                        help="Fleet mode: directory containing one subdirectory of CSVs per tail number")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for parsing (default: CPU count, 1 = no pool)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the parse cache in data/cache/")
+    parser.add_argument("--samples", action="store_true",
+                        help="Also plot every sample's min/mean/max from the <source>/.pyramid aggregates")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profile_run(args):
+        run(args)
+
+
+def run(args):
+    """Single-aircraft or fleet history run for parsed command-line arguments."""
+    if args.no_cache:
+        disable_cache()
+    if args.fleet:
+        run_fleet(Path(args.fleet), args.workers)
+        return
+
+    source_dir = Path(args.source)
+    if not source_dir.exists():
+        print(f"Source directory not found: {source_dir}")
+        print("Run flysto_download.py first to download the G1000 log files.")
+        sys.exit(1)
+
+    csv_files = glob_logs(source_dir, "*.csv")
+    if not csv_files:
+        print(f"No CSV files found in {source_dir}")
+        sys.exit(1)
+
+    print(f"Found {len(csv_files)} CSV files in {source_dir}")
+    print("Parsing voltage data from each flight...\n")
+
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers != 1 else None
+    try:
+        flights = collect_flights({args.tail: csv_files}, pool)[args.tail]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    print(f"Successfully parsed {len(flights)} flights with voltage data.\n")
+    print_flight_table(flights)
+
+    if len(flights) < 2:
+        print("\nNot enough flights to generate history plots.")
+        return
+
+    ecu_sessions = parse_ecu_sessions(ECU_PARSED_DIR) if args.tail == HOME_TAIL else []
+    analyze_tail(args.tail, flights, OUTPUT_DIR, ecu_sessions)
+
+    if args.samples:
+        with stage("update_pyramid"):
+            built, unchanged, _, failures = update_pyramid(source_dir, args.workers)
+        print(f"\nPyramid: {built} flights aggregated, {unchanged} up to date")
+        for error in failures:
+            print(f"  Skipped unreadable log {error}")
+        with stage("plot_range"):
+            out = plot_range(source_dir, "volt1", out_path=OUTPUT_DIR / f"{args.tail}_volt1_all_samples.png")
+        if out:
+            print(f"Saved: {out}")
 
 
 if __name__ == '__main__':